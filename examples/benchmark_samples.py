@@ -0,0 +1,58 @@
+"""
+Compare memory use and encode/decode throughput of the pydantic sample models against the compact sample tuples.
+
+    python examples/benchmark_samples.py [number of samples]
+"""
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+from mercuto_client.modules._samples import (decode_sample_tuples,
+                                             encode_sample_tuples)
+from mercuto_client.modules.data import (SecondaryDataSample, SecondarySample,
+                                         _SecondarySamplelistAdapter)
+
+COUNT = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+CHANNELS = [f'channel-{i:02d}' for i in range(20)]
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def rows() -> list[tuple[str, datetime, float]]:
+    # Shaped like a logger file: every row has one timestamp shared by all channels.
+    timestamps = [START + timedelta(minutes=i) for i in range(COUNT // len(CHANNELS))]
+    return [(channel, t, float(i)) for i, t in enumerate(timestamps) for channel in CHANNELS]
+
+
+def measure(label: str, build):  # type: ignore[no-untyped-def]
+    tracemalloc.start()
+    start = time.perf_counter()
+    samples = build()
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f'{label:<28} build {elapsed * 1000:8.1f} ms  memory {size / len(samples):6.0f} B/sample')
+    return samples
+
+
+def timed(label: str, func) -> object:  # type: ignore[no-untyped-def]
+    start = time.perf_counter()
+    result = func()
+    print(f'{label:<28} {(time.perf_counter() - start) * 1000:8.1f} ms')
+    return result
+
+
+def main() -> None:
+    data = rows()
+    print(f'{len(data)} samples')
+    models = measure('SecondaryDataSample', lambda: [SecondaryDataSample(channel=c, timestamp=t, value=v) for c, t, v in data])
+    tuples = measure('SecondarySample', lambda: [SecondarySample(c, t, v) for c, t, v in data])
+
+    body = timed('encode models (pydantic)', lambda: _SecondarySamplelistAdapter.dump_json(models))
+    timed('encode tuples', lambda: encode_sample_tuples(tuples))
+    timed('decode models (pydantic)', lambda: _SecondarySamplelistAdapter.validate_json(body))
+    timed('decode tuples', lambda: decode_sample_tuples(body, SecondarySample))  # type: ignore[arg-type]
+
+
+if __name__ == '__main__':
+    main()
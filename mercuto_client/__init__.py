@@ -1,7 +1,38 @@
+import importlib
+from typing import TYPE_CHECKING, Any
+
 from .client import MercutoClient
+from .compression import CompressionConfig
 from .exceptions import MercutoClientException, MercutoHTTPException
+from .instrumentation import LatencyHistogram, RequestEvent, RequestHook
+from .retry import NO_RETRY, RetryPolicy
+
+if TYPE_CHECKING:
+    from .batching import BatchSizeConfig
+    from .caching import CacheConfig
+    from .pooling import PoolConfig
+    from .result_cache import ResultCacheConfig
+    from .spool import SpoolConfig
+
+__all__ = ['MercutoClient', 'MercutoHTTPException', 'MercutoClientException', 'PoolConfig', 'RetryPolicy', 'NO_RETRY',
+           'CompressionConfig', 'RequestHook', 'RequestEvent', 'LatencyHistogram',
+           'CacheConfig', 'BatchSizeConfig', 'ResultCacheConfig', 'SpoolConfig']
+
+# Options of optional features are imported on first access, so importing the package does not load the features.
+_LAZY = {
+    'BatchSizeConfig': 'batching',
+    'CacheConfig': 'caching',
+    'PoolConfig': 'pooling',
+    'ResultCacheConfig': 'result_cache',
+    'SpoolConfig': 'spool',
+}
+
 
-__all__ = ['MercutoClient', 'MercutoHTTPException', 'MercutoClientException']
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(f'.{module}', __name__), name)
 
 
 def connect(*args, **kwargs) -> MercutoClient:
@@ -0,0 +1,101 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Iterator, NamedTuple, Optional
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+
+class RecordedRequest(NamedTuple):
+    method: str
+    path: str
+    query: dict[str, list[str]]
+    headers: dict[str, str]
+    body: bytes
+
+
+class FakeResponse(NamedTuple):
+    status: int = 200
+    body: bytes = b'{}'
+    headers: dict[str, str] = {}
+
+
+class _Server(ThreadingHTTPServer):
+    # Room for many clients connecting at once, the default backlog of 5 makes concurrent connects stall on SYN retries.
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class FakeServer:
+    """
+    Minimal keep-alive HTTP server for exercising MercutoClient's transport.
+    Responses are taken from `script` in order, then from `handler`, then default to 200 `{}`.
+    """
+
+    def __init__(self) -> None:
+        self.requests: list[RecordedRequest] = []
+        self.script: list[FakeResponse] = []
+        self.handler: Optional[Callable[[RecordedRequest], FakeResponse]] = None
+        self._lock = threading.Lock()
+        self._httpd = _Server(('127.0.0.1', 0), self._make_handler())
+        self.url = f'http://127.0.0.1:{self._httpd.server_address[1]}'
+
+    def respond(self, status: int = 200, body: Any = None, headers: Optional[dict[str, str]] = None) -> None:
+        encoded = body if isinstance(body, bytes) else json.dumps({} if body is None else body).encode()
+        self.script.append(FakeResponse(status, encoded, headers or {}))
+
+    def calls(self) -> list[str]:
+        return [f'{r.method} {r.path}' for r in self.requests]
+
+    def _next_response(self, request: RecordedRequest) -> FakeResponse:
+        with self._lock:
+            self.requests.append(request)
+            if self.script:
+                return self.script.pop(0)
+        if self.handler is not None:
+            return self.handler(request)
+        return FakeResponse()
+
+    def _make_handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def _reply(self) -> None:
+                length = int(self.headers.get('Content-Length', 0))
+                body = self.rfile.read(length) if length else b''
+                parts = urlsplit(self.path)
+                response = server._next_response(RecordedRequest(
+                    self.command, parts.path, parse_qs(parts.query), dict(self.headers.items()), body))
+                self.send_response(response.status)
+                for k, v in response.headers.items():
+                    self.send_header(k, v)
+                if 'Content-Type' not in response.headers:
+                    self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(response.body)))
+                self.end_headers()
+                if self.command != 'HEAD':
+                    self.wfile.write(response.body)
+
+            do_GET = do_HEAD = do_PUT = do_POST = do_PATCH = do_DELETE = _reply
+
+            def log_message(self, format: str, *args: object) -> None:
+                pass
+
+        return Handler
+
+    def __enter__(self) -> 'FakeServer':
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture
+def fake_server() -> Iterator[FakeServer]:
+    with FakeServer() as server:
+        yield server
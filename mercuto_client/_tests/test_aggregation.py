@@ -0,0 +1,190 @@
+import bisect
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from .. import MercutoClient
+from ..mocks import mock_mercuto
+from ..modules._aggregation import BUCKET_ORIGIN, aggregate_frame
+from ..modules.data import (AggregationInterval, AggregationMethod,
+                            AggregationOptions, FrameFormat, SecondarySample)
+
+_START = datetime(2024, 3, 28, tzinfo=timezone.utc)
+
+
+def _samples(seed: int = 1, rows: int = 2000) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    timestamps = _START + pd.to_timedelta(np.sort(rng.integers(0, 45 * 86_400, rows)), unit='s')
+    values = rng.normal(0, 10, rows)
+    values[rng.random(rows) < 0.05] = np.nan
+    return pd.DataFrame({'channel': rng.choice(['a', 'b', 'c'], rows), 'timestamp': timestamps, 'value': values}) \
+        .drop_duplicates(['channel', 'timestamp']).sort_values(['channel', 'timestamp'], ignore_index=True)
+
+
+def _reference(group: pd.Series, method: AggregationMethod) -> float:
+    group = group.dropna()
+    if method == AggregationMethod.COUNT:
+        return float(len(group))
+    if group.empty:
+        return np.nan
+    if method == AggregationMethod.PEAK_TO_PEAK:
+        return float(group.max() - group.min())
+    if method == AggregationMethod.GREATEST:
+        return float(group.iloc[np.argmax(np.abs(group.to_numpy()))])
+    return float(getattr(group, method.value)())
+
+
+def test_rolling_mean_matches_mock_server() -> None:
+    with mock_mercuto():
+        client = MercutoClient()
+        project = client.core().create_project('p', 'R1', 'P', client.identity().create_tenant('T', 'T1').code, timezone='UTC')
+        codes = [client.data().create_channel(project.code, label=label).code for label in 'ab']
+        rng = np.random.default_rng(7)
+        offsets = np.sort(rng.choice(10 * 24 * 60, 600, replace=False))
+        client.data().insert_secondary_samples(project.code, [
+            SecondarySample(codes[i % 2], _START + timedelta(minutes=int(m)), float(rng.normal()))
+            for i, m in enumerate(offsets)])
+
+        end = _START + timedelta(days=10)
+        aggregation = AggregationOptions(method=AggregationMethod.MEAN, interval='day', rolling=True)
+        for frame_format in FrameFormat:
+            raw = client.data().load_dataframe(_START, end, channels=codes, frame_format=frame_format)
+            expected = client.data().load_dataframe(_START, end, channels=codes, frame_format=frame_format, aggregation=aggregation)
+            actual = client.data().aggregate_dataframe(raw, aggregation)
+            pd.testing.assert_frame_equal(actual, expected, check_freq=False, check_index_type=False, check_column_type=False)
+
+
+# Small two-channel series with hand-computed aggregates. 'a' has a NaN sample and a bucket (03:00) with only NaN.
+_HAND_SAMPLES = [('a', '00:00', 1.0), ('a', '00:30', -4.0), ('a', '01:00', np.nan), ('a', '01:10', 3.0), ('a', '02:05', 2.0),
+                 ('a', '03:20', np.nan), ('b', '00:15', 5.0), ('b', '01:45', -1.0)]
+_NAN = np.nan
+# Hourly buckets: a at 00, 01, 02 and 03, then b at 00 and 01.
+_HAND_BUCKETS = {
+    AggregationMethod.MIN: [-4.0, 3.0, 2.0, _NAN, 5.0, -1.0],
+    AggregationMethod.MAX: [1.0, 3.0, 2.0, _NAN, 5.0, -1.0],
+    AggregationMethod.MEAN: [-1.5, 3.0, 2.0, _NAN, 5.0, -1.0],
+    AggregationMethod.SUM: [-3.0, 3.0, 2.0, _NAN, 5.0, -1.0],
+    AggregationMethod.COUNT: [2.0, 1.0, 1.0, 0.0, 1.0, 1.0],
+    AggregationMethod.GREATEST: [-4.0, 3.0, 2.0, _NAN, 5.0, -1.0],
+    AggregationMethod.PEAK_TO_PEAK: [5.0, 0.0, 0.0, _NAN, 0.0, 0.0],
+}
+# Rolling one-hour windows (t - 1h, t], one per sample in the order of _HAND_SAMPLES.
+_HAND_WINDOWS = {
+    AggregationMethod.MIN: [1.0, -4.0, -4.0, -4.0, 2.0, _NAN, 5.0, -1.0],
+    AggregationMethod.MAX: [1.0, 1.0, -4.0, 3.0, 3.0, _NAN, 5.0, -1.0],
+    AggregationMethod.MEAN: [1.0, -1.5, -4.0, -0.5, 2.5, _NAN, 5.0, -1.0],
+    AggregationMethod.SUM: [1.0, -3.0, -4.0, -1.0, 5.0, _NAN, 5.0, -1.0],
+    AggregationMethod.COUNT: [1.0, 2.0, 1.0, 2.0, 2.0, 0.0, 1.0, 1.0],
+    AggregationMethod.GREATEST: [1.0, -4.0, -4.0, -4.0, 3.0, _NAN, 5.0, -1.0],
+    AggregationMethod.PEAK_TO_PEAK: [0.0, 5.0, 0.0, 7.0, 1.0, _NAN, 0.0, 0.0],
+}
+
+
+def _hand_frame() -> pd.DataFrame:
+    return pd.DataFrame({'channel': [channel for channel, _, _ in _HAND_SAMPLES],
+                         'timestamp': pd.DatetimeIndex([f'2024-03-28T{time}Z' for _, time, _ in _HAND_SAMPLES]).as_unit('ns'),
+                         'value': [value for _, _, value in _HAND_SAMPLES]})
+
+
+@pytest.mark.parametrize('method', list(AggregationMethod))
+def test_fixed_buckets_match_hand_computed_values(method: AggregationMethod) -> None:
+    result = aggregate_frame(_hand_frame(), AggregationOptions(method=method, interval='hour'))
+
+    assert list(zip(result['channel'], result['timestamp'].dt.strftime('%H:%M'))) == \
+        [('a', '00:00'), ('a', '01:00'), ('a', '02:00'), ('a', '03:00'), ('b', '00:00'), ('b', '01:00')]
+    np.testing.assert_allclose(result['value'], _HAND_BUCKETS[method], equal_nan=True)
+
+
+@pytest.mark.parametrize('method', list(AggregationMethod))
+def test_rolling_windows_match_hand_computed_values(method: AggregationMethod) -> None:
+    samples = _hand_frame()
+    result = aggregate_frame(samples, AggregationOptions(method=method, interval=timedelta(hours=1), rolling=True))
+
+    pd.testing.assert_frame_equal(result[['channel', 'timestamp']], samples[['channel', 'timestamp']])
+    np.testing.assert_allclose(result['value'], _HAND_WINDOWS[method], equal_nan=True)
+
+
+@pytest.mark.parametrize('method', list(AggregationMethod))
+def test_column_frames_match_hand_computed_values(method: AggregationMethod) -> None:
+    # In a COLUMNS frame an empty cell is no sample, so the NaN samples of 'a' drop out, which leaves its windows unchanged.
+    samples = _hand_frame()
+    columns = samples.pivot(index='timestamp', columns='channel', values='value')
+    result = aggregate_frame(columns, AggregationOptions(method=method, interval=timedelta(hours=1), rolling=True))
+
+    present = samples['value'].notna().to_numpy()
+    expected = samples[present].assign(value=np.array(_HAND_WINDOWS[method])[present]) \
+        .pivot(index='timestamp', columns='channel', values='value')
+    pd.testing.assert_frame_equal(result, expected, check_freq=False)
+
+
+@pytest.mark.parametrize('method', list(AggregationMethod))
+def test_fixed_buckets_match_pandas(method: AggregationMethod) -> None:
+    samples = _samples()
+    result = aggregate_frame(samples, AggregationOptions(method=method, interval=timedelta(minutes=90)))
+
+    expected = samples.set_index('timestamp').groupby('channel')['value'] \
+        .resample('90min', origin=pd.Timestamp(BUCKET_ORIGIN)).apply(lambda group: _reference(group, method))
+    # pandas also emits the empty buckets between samples, the server does not.
+    merged = result.merge(expected.rename('expected').reset_index(), on=['channel', 'timestamp'], how='left')
+    np.testing.assert_allclose(merged['value'], merged['expected'], equal_nan=True)
+    assert result['timestamp'].dt.tz == timezone.utc
+
+
+@pytest.mark.parametrize('interval', ['hour', 'day', 'week', 'month', 'year'])
+def test_wall_clock_buckets_follow_time_zone(interval: AggregationInterval) -> None:
+    samples = _samples(seed=2)
+    # India is +05:30, so its hours are not UTC hours.
+    zone = 'Asia/Kolkata' if interval == 'hour' else 'Australia/Sydney'
+    result = aggregate_frame(samples, AggregationOptions(method=AggregationMethod.SUM, interval=interval), timezone=zone)
+
+    local = samples['timestamp'].dt.tz_convert(zone)
+    if interval == 'week':
+        starts = local.dt.normalize() - pd.to_timedelta(local.dt.dayofweek, unit='D')
+    else:
+        frequency = {'hour': 'h', 'day': 'D', 'month': 'M', 'year': 'Y'}[str(interval)]
+        starts = local.dt.tz_localize(None).dt.to_period(frequency).dt.start_time.dt.tz_localize(zone)
+    expected = samples.groupby(['channel', starts.dt.tz_convert('UTC').rename('bucket')])['value'].sum(min_count=1).reset_index()
+
+    assert result['channel'].tolist() == expected['channel'].tolist()
+    assert result['timestamp'].tolist() == expected['bucket'].tolist()
+    np.testing.assert_allclose(result['value'], expected['value'], equal_nan=True)
+    if interval == 'day':
+        # 7 April 2024 is 25 hours long in Sydney, clocks went back from +11 to +10.
+        assert pd.Timestamp('2024-04-06T13:00Z') in set(result['timestamp'])
+        assert pd.Timestamp('2024-04-07T14:00Z') in set(result['timestamp'])
+
+
+@pytest.mark.parametrize('method', list(AggregationMethod))
+@pytest.mark.parametrize('interval', [timedelta(hours=6), 'day', 'month'])
+def test_rolling_windows_match_pandas(method: AggregationMethod, interval: AggregationInterval) -> None:
+    samples = _samples(seed=3, rows=300)
+    aggregation = AggregationOptions(method=method, interval=interval, rolling=True)
+    result = aggregate_frame(samples, aggregation)
+
+    length = pd.DateOffset(months=1) if interval == 'month' else pd.Timedelta(days=1) if interval == 'day' else interval
+    expected = []
+    for _, channel in samples.groupby('channel'):
+        timestamps = channel['timestamp'].tolist()
+        for i, end in enumerate(timestamps):
+            start = bisect.bisect_right(timestamps, end - length)
+            expected.append(_reference(channel['value'].iloc[start:i + 1], method))
+
+    assert result['channel'].tolist() == samples['channel'].tolist()
+    assert result['timestamp'].tolist() == samples['timestamp'].tolist()
+    np.testing.assert_allclose(result['value'], expected, equal_nan=True, rtol=1e-9, atol=1e-9)
+
+
+def test_frame_layouts_are_preserved() -> None:
+    samples = _samples(seed=4, rows=300)
+    samples['timestamp'] = samples['timestamp'].dt.tz_localize(None)
+    aggregation = AggregationOptions(method=AggregationMethod.MAX, interval='day')
+    flat = aggregate_frame(samples, aggregation)
+    indexed = aggregate_frame(samples.set_index(['channel', 'timestamp']), aggregation)
+    columns = aggregate_frame(samples.pivot(index='timestamp', columns='channel', values='value'), aggregation)
+
+    assert flat['timestamp'].dt.tz is None
+    pd.testing.assert_frame_equal(indexed, flat.set_index(['channel', 'timestamp']))
+    pd.testing.assert_frame_equal(columns, flat.pivot(index='timestamp', columns='channel', values='value'))
+    assert aggregate_frame(samples.iloc[:0], aggregation).empty
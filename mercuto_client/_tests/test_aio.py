@@ -0,0 +1,94 @@
+import asyncio
+import json
+from typing import Any, Callable
+
+import httpx
+import pytest
+
+from ..aio import AsyncMercutoClient
+from ..exceptions import MercutoHTTPException
+from ..modules.core import Project
+
+PROJECT = {
+    'code': 'p1',
+    'name': 'Project',
+    'project_number': 'R1',
+    'active': True,
+    'description': 'Test',
+    'latitude': None,
+    'longitude': None,
+    'timezone': 'UTC',
+    'display_timezone': None,
+    'tenant': 't1',
+    'status': {'last_ping': None, 'ip_address': None},
+    'commission_date': '2020-01-01T00:00:00Z',
+}
+
+
+def _client(handler: Callable[[httpx.Request], httpx.Response]) -> AsyncMercutoClient:
+    session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return AsyncMercutoClient('https://testserver', active_session=session).connect(api_key='key')
+
+
+def test_get_project_returns_shared_model() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.headers['X-Api-Key'] == 'key'
+        return httpx.Response(200, json={**PROJECT, 'code': request.url.path.rsplit('/', 1)[-1]})
+
+    async def run() -> list[Project]:
+        async with _client(handler) as client:
+            return await asyncio.gather(*(client.core().get_project(code) for code in ['a', 'b', 'c']))
+
+    projects = asyncio.run(run())
+    assert all(isinstance(p, Project) for p in projects)
+    assert [p.code for p in projects] == ['a', 'b', 'c']
+
+
+def test_list_datatables_pages() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        offset = int(request.url.params['offset'])
+        count = 100 if offset == 0 else 5
+        return httpx.Response(200, json=[{'code': f'dt{offset + i}', 'project': 'p1', 'name': 'x',
+                                          'enabled': True, 'columns': []} for i in range(count)])
+
+    async def run() -> int:
+        async with _client(handler) as client:
+            return len(await client.data().list_datatables('p1'))
+
+    assert asyncio.run(run()) == 105
+
+
+def test_insert_samples_encodes_nan() -> None:
+    from datetime import datetime, timezone
+
+    from ..modules.data import SecondaryDataSample
+    bodies: list[Any] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.headers['Content-Type'] == 'application/json'
+        bodies.append(json.loads(request.content))
+        return httpx.Response(202)
+
+    async def run() -> None:
+        async with _client(handler) as client:
+            await client.data().insert_secondary_samples('p1', [
+                SecondaryDataSample(channel='c1', timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc), value=float('nan'))
+            ])
+
+    asyncio.run(run())
+    assert len(bodies) == 1
+    assert bodies[0][0]['channel'] == 'c1'
+
+
+def test_error_raises_http_exception() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(403, json={'detail': 'Forbidden'})
+
+    async def run() -> None:
+        async with _client(handler) as client:
+            await client.core().get_project('p1')
+
+    with pytest.raises(MercutoHTTPException) as e:
+        asyncio.run(run())
+    assert e.value.status_code == 403
+    assert e.value.message == 'Forbidden'
@@ -0,0 +1,164 @@
+import dataclasses
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import pytest
+import requests
+
+from .. import NO_RETRY, BatchSizeConfig, MercutoClient, MercutoHTTPException
+from ..batching import (AdaptiveBatchSize, BatchResult, BatchSizeStats,
+                        upload_batches, upload_report)
+from ..instrumentation import RequestEvent, RequestHook
+from ..modules.data import SecondaryDataSample
+from .conftest import FakeResponse, FakeServer, RecordedRequest
+
+_START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _samples(count: int) -> list[SecondaryDataSample]:
+    return [SecondaryDataSample(channel='c1', timestamp=_START + timedelta(seconds=i), value=float(i)) for i in range(count)]
+
+
+class SlowSink:
+    def __init__(self, delay: float = 0.0, fail: frozenset[bytes] = frozenset()) -> None:
+        self.delay = delay
+        self.fail = fail
+        self.sent: list[bytes] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, body: bytes) -> None:
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+            self.sent.append(body)
+        if body in self.fail:
+            raise MercutoHTTPException('boom', 500)
+
+
+def _encode(batch: object) -> bytes:
+    return json.dumps(list(batch)).encode()  # type: ignore[call-overload]
+
+
+def test_in_flight_window_is_bounded() -> None:
+    sink = SlowSink(delay=0.02)
+    report = upload_batches([[i] for i in range(12)], _encode, sink, max_in_flight=3)
+    assert report.ok and report.inserted == 12
+    assert sink.max_in_flight == 3
+    assert [batch.index for batch in report.batches] == list(range(12))
+
+
+def test_failures_are_reported_with_their_items() -> None:
+    sink = SlowSink(fail=frozenset({b'[2, 3]', b'[6]'}))
+    report = upload_batches([[0, 1], [2, 3], [4, 5], [6]], _encode, sink, stop_on_error=False)
+    assert len(sink.sent) == 4
+    assert report.inserted == 4
+    assert [(b.index, b.offset, list(b.items)) for b in report.failed] == [(1, 2, [2, 3]), (3, 6, [6])]
+    assert isinstance(report.failed[0].error, MercutoHTTPException)
+    assert report.batches[0].items == ()
+
+
+def test_stop_on_error_raises_after_draining() -> None:
+    sink = SlowSink(fail=frozenset({b'[0]'}))
+    with pytest.raises(MercutoHTTPException):
+        upload_batches(([i] for i in range(50)), _encode, sink, max_in_flight=1)
+    assert sink.sent == [b'[0]']
+
+
+def test_stop_on_error_attaches_report() -> None:
+    sink = SlowSink(fail=frozenset({b'[2]'}))
+    with pytest.raises(MercutoHTTPException) as raised:
+        upload_batches(([i] for i in range(50)), _encode, sink, max_in_flight=1)
+    report = upload_report(raised.value)
+    assert report is not None
+    assert [(batch.index, batch.ok) for batch in report.batches] == [(0, True), (1, True), (2, False)]
+    assert report.inserted == 2 and list(report.failed[0].items) == [2]
+
+
+def test_insert_secondary_samples_pipelines_requests(fake_server: FakeServer) -> None:
+    # Every request waits until all four have arrived, which only happens if they are in flight together.
+    arrived = threading.Barrier(4, timeout=5)
+
+    def handler(request: RecordedRequest) -> FakeResponse:
+        arrived.wait()
+        return FakeResponse(status=500 if json.loads(request.body)[0]['value'] == 5000.0 else 202)
+
+    fake_server.handler = handler
+    events: list[RequestEvent] = []
+
+    class Recorder(RequestHook):
+        def on_parse_done(self, event: RequestEvent) -> None:
+            events.append(event)
+
+    client = MercutoClient(fake_server.url, verify_ssl=False, retry=NO_RETRY)
+    client.add_hook(Recorder())
+    samples = _samples(20_000)
+    report = client.data().insert_secondary_samples('p1', samples, max_in_flight=4, stop_on_error=False)
+
+    assert fake_server.calls() == ['PUT /v2/data/samples/secondary'] * 4
+    assert report.inserted == 15_000
+    assert [(b.index, b.offset, b.count) for b in report.failed] == [(1, 5000, 5000)]
+    assert report.failed[0].items[0].value == 5000.0
+    assert not arrived.broken
+    assert {event.operation for event in events} == {'insert_secondary_samples'}
+
+
+def _result(count: int, duration: float = 0.1, nbytes: int = 0, error: Optional[BaseException] = None) -> BatchResult:
+    return BatchResult(index=0, offset=0, count=count, duration=duration, nbytes=nbytes, error=error)
+
+
+def test_batch_size_follows_throughput() -> None:
+    size = AdaptiveBatchSize(BatchSizeConfig(initial=1000, minimum=10, maximum=8000, target_seconds=1.0))
+    # 1000 items in 0.1s: ten times faster than the target, growth is capped at 2x per batch.
+    size.observe(_result(1000, duration=0.1))
+    assert size.size == 2000
+    size.observe(_result(2000, duration=0.1))
+    size.observe(_result(4000, duration=0.1))
+    assert size.size == 8000
+    # 8000 items in 4s is 2000/s, so the size shrinks towards 2000 but at most by half.
+    size.observe(_result(8000, duration=4.0))
+    assert size.size == 4000
+    assert size.stats() == BatchSizeStats(size=4000, batches=4, items=15000, oversized=0, smallest=1000, largest=8000,
+                                          throughput=2000.0)
+
+
+def test_batch_size_respects_byte_budget() -> None:
+    size = AdaptiveBatchSize(BatchSizeConfig(initial=1000, max_bytes=150_000))
+    size.observe(_result(1000, duration=0.01, nbytes=100_000))
+    assert size.size == 1500
+
+
+def test_oversized_batches_shrink_immediately() -> None:
+    size = AdaptiveBatchSize(BatchSizeConfig(initial=1000, minimum=100))
+    size.observe(_result(1000, error=MercutoHTTPException('too large', 413)))
+    assert size.size == 500
+    size.observe(_result(500, error=requests.ReadTimeout()))
+    size.observe(_result(250, error=MercutoHTTPException('bad', 400)))
+    assert size.size == 250
+    size.observe(dataclasses.replace(_result(250), splits=1))
+    assert size.size == 125
+    assert size.stats().oversized == 3
+
+
+def test_rejected_batches_are_split(fake_server: FakeServer) -> None:
+    def handler(request: RecordedRequest) -> FakeResponse:
+        return FakeResponse(status=413 if len(json.loads(request.body)) > 1500 else 202)
+
+    fake_server.handler = handler
+    client = MercutoClient(fake_server.url, verify_ssl=False, batching=BatchSizeConfig(initial=4000, minimum=100))
+    report = client.data().insert_secondary_samples('p1', _samples(6000), max_in_flight=1)
+
+    assert report.ok and report.inserted == 6000
+    # 4000 is split twice into 1000s, the size then drops to 2000 which is split once more.
+    assert [len(json.loads(r.body)) for r in fake_server.requests] == [4000, 2000, 1000, 1000, 2000, 1000, 1000, 2000, 1000, 1000]
+    stats = client.batch_stats()['samples/secondary']
+    assert stats.oversized == 2
+    assert stats.size == 1000
+    assert client.copy().batch_stats() == client.batch_stats()
@@ -0,0 +1,77 @@
+import pytest
+import requests
+
+from .. import CacheConfig, MercutoClient
+from ..caching import ResponseCache
+from .conftest import FakeServer
+
+_UNITS = [{'code': 'u1', 'name': 'Metres', 'unit': 'm'}]
+
+
+def test_fresh_entries_skip_the_network(fake_server: FakeServer) -> None:
+    fake_server.respond(200, _UNITS)
+    client = MercutoClient(fake_server.url, verify_ssl=False, cache=CacheConfig())
+    assert client.data().list_units()[0].code == 'u1'
+    assert client.data().list_units()[0].code == 'u1'
+    assert fake_server.calls() == ['GET /v2/data/units']
+    stats = client.cache_stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+
+
+def test_uncached_routes_and_params(fake_server: FakeServer) -> None:
+    client = MercutoClient(fake_server.url, verify_ssl=False, cache=CacheConfig())
+    client.request('/v2/data/samples/secondary', 'GET')
+    client.request('/v2/data/samples/secondary', 'GET')
+    client.request('/v2/data/datatables', 'GET', params={'project': 'a'})
+    client.request('/v2/data/datatables', 'GET', params={'project': 'b'})
+    client.request('/v2/data/datatables', 'GET', params={'project': 'b'}, cache=False)
+    assert len(fake_server.requests) == 5
+
+
+def test_keyed_by_credentials(fake_server: FakeServer) -> None:
+    client = MercutoClient(fake_server.url, verify_ssl=False, cache=CacheConfig())
+    with client.as_credentials(api_key='one') as one:
+        one.request('/projects', 'GET')
+        one.request('/projects', 'GET')
+    with client.as_credentials(api_key='two') as two:
+        two.request('/projects', 'GET')
+    assert len(fake_server.requests) == 2
+
+
+def test_stale_entries_revalidate(fake_server: FakeServer) -> None:
+    fake_server.respond(200, _UNITS, headers={'ETag': '"v1"'})
+    fake_server.respond(304, b'')
+    client = MercutoClient(fake_server.url, verify_ssl=False, cache=CacheConfig(ttl=0))
+    client.data().list_units()
+    assert client.data().list_units()[0].code == 'u1'
+    assert fake_server.requests[1].headers['If-None-Match'] == '"v1"'
+    assert client.cache_stats().revalidations == 1
+
+
+def test_mutations_invalidate(fake_server: FakeServer) -> None:
+    client = MercutoClient(fake_server.url, verify_ssl=False, cache=CacheConfig())
+    client.request('/v2/data/channels', 'GET', params={'project': 'p'})
+    client.request('/v2/data/channels/abc', 'GET')
+    client.request('/v2/data/units', 'GET')
+    client.request('/v2/data/channels/abc', 'PATCH', json={})
+    assert client.cache_stats().entries == 1
+
+    client.invalidate_cache()
+    assert client.cache_stats().entries == 0
+
+
+def test_lru_eviction() -> None:
+    cache = ResponseCache(CacheConfig(max_entries=2))
+    response = requests.Response()
+    response.status_code = 200
+    response._content = b'{}'
+    for path in ('/a', '/b'):
+        cache.store(('', path), path, response)
+    assert cache.get(('', '/a')) is not None
+    cache.store(('', '/c'), '/c', response)
+    assert cache.get(('', '/b')) is None
+    assert cache.get(('', '/a')) is not None
+    assert cache.stats().evictions == 1
+
+    with pytest.raises(ValueError):
+        CacheConfig(max_entries=0)
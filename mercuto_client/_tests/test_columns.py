@@ -0,0 +1,105 @@
+import json
+import math
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from .. import BatchSizeConfig, MercutoClient
+from ..modules import _columns
+from ..modules._columns import encode_sample_rows
+from .conftest import FakeResponse, FakeServer, RecordedRequest
+
+_START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _decode(body: bytes) -> list[dict]:
+    return json.loads(body)
+
+
+def test_insert_secondary_columns_batches(fake_server: FakeServer) -> None:
+    client = MercutoClient(fake_server.url, verify_ssl=False)
+    timestamps = np.datetime64('2024-01-01T00:00:00') + np.arange(12_000).astype('timedelta64[s]')
+    values = np.arange(12_000, dtype=float)
+    values[1] = np.nan
+    report = client.data().insert_secondary_columns('p1', 'c1', timestamps, values, known_channels={'c1'}, batch_size=5000)
+
+    assert report.inserted == 12_000
+    assert [batch.count for batch in report.batches] == [5000, 5000, 2000]
+    assert fake_server.calls() == ['PUT /v2/data/samples/secondary'] * 3
+    # Batches are uploaded concurrently, so they may arrive in any order.
+    first = min((_decode(r.body) for r in fake_server.requests), key=lambda rows: rows[0]['timestamp'])
+    assert len(first) == 5000
+    assert first[0] == {'channel': 'c1', 'timestamp': '2024-01-01T00:00:00.000000Z', 'value': 0.0}
+    assert math.isnan(first[1]['value'])
+    assert fake_server.requests[0].query == {'project': ['p1']}
+
+
+def test_insert_columns_adapts_and_splits_batches(fake_server: FakeServer) -> None:
+    def handler(request: RecordedRequest) -> FakeResponse:
+        return FakeResponse(status=413 if len(json.loads(request.body)) > 1500 else 202)
+
+    fake_server.handler = handler
+    client = MercutoClient(fake_server.url, verify_ssl=False, batching=BatchSizeConfig(initial=4000, minimum=100))
+    values = np.arange(6000, dtype=float)
+    report = client.data().insert_secondary_columns('p1', 'c1', values, values, max_in_flight=1)
+
+    assert report.ok and report.inserted == 6000
+    assert [len(json.loads(r.body)) for r in fake_server.requests] == [4000, 2000, 1000, 1000, 2000, 1000, 1000, 2000, 1000, 1000]
+    accepted = [row['value'] for r in fake_server.requests for row in json.loads(r.body) if len(json.loads(r.body)) <= 1500]
+    assert accepted == values.tolist()
+    assert client.batch_stats()['samples/secondary'].oversized == 2
+
+
+def test_failed_column_batches_report_row_positions(fake_server: FakeServer) -> None:
+    fake_server.handler = lambda request: FakeResponse(status=400 if json.loads(request.body)[0]['value'] == 2.0 else 202)
+    client = MercutoClient(fake_server.url, verify_ssl=False)
+    report = client.data().insert_secondary_columns('p1', 'c1', [0.0, 1.0, 2.0, 3.0, 4.0], [0.0, 1.0, 2.0, 3.0, 4.0],
+                                                    batch_size=2, stop_on_error=False)
+
+    assert report.inserted == 3
+    assert [list(batch.items) for batch in report.failed] == [[2, 3]]
+
+
+def test_insert_metric_columns_from_frame(fake_server: FakeServer) -> None:
+    client = MercutoClient(fake_server.url, verify_ssl=False)
+    frame = pd.DataFrame({
+        'channel': ['a', 'b'],
+        'timestamp': pd.to_datetime(['2024-01-01 10:00', '2024-01-01 10:01']).tz_localize('Australia/Brisbane'),
+        'value': [1.5, -math.inf],
+        'event': ['e1', 'e1'],
+    })
+    assert client.data().insert_metric_columns('p1', frame=frame).inserted == 2
+    rows = _decode(fake_server.requests[0].body)
+    assert fake_server.calls() == ['PUT /v2/data/samples/metric']
+    assert rows[0] == {'channel': 'a', 'timestamp': '2024-01-01T00:00:00.000000Z', 'value': 1.5, 'event': 'e1'}
+    assert rows[1]['value'] == -math.inf
+
+
+def test_epoch_seconds_and_datetimes_agree() -> None:
+    datetimes = [_START + timedelta(seconds=1.25 * i) for i in range(3)]
+    epochs = [d.timestamp() for d in datetimes]
+    assert encode_sample_rows('c', datetimes, [1, 2, 3]) == encode_sample_rows('c', np.array(epochs), [1, 2, 3])
+
+
+@pytest.mark.parametrize('kwargs, message', [
+    ({'timestamps': np.array([0.0, np.inf])}, 'finite'),
+    ({'timestamps': np.array(['2024-01-01', 'NaT'], dtype='datetime64[s]')}, 'NaT'),
+    ({'timestamps': [datetime(2024, 1, 1), datetime(2024, 1, 2)]}, 'timezone-aware'),
+    ({'channels': ['c1', 'zz']}, 'Unknown channel'),
+    ({'values': [1.0]}, 'rows'),
+])
+def test_validation(kwargs: dict, message: str) -> None:
+    columns = {'channels': ['c1', 'c2'], 'timestamps': np.array([0, 1]), 'values': [1.0, 2.0], **kwargs}
+    with pytest.raises(ValueError, match=message):
+        encode_sample_rows(columns['channels'], columns['timestamps'], columns['values'], known_channels={'c1', 'c2'})
+
+
+def test_pure_python_fallback(monkeypatch: pytest.MonkeyPatch) -> None:
+    with_numpy = encode_sample_rows(['a', 'b'], [_START, _START + timedelta(seconds=1)], [1.0, math.nan])
+    monkeypatch.setattr(_columns, '_numpy', lambda: None)
+    without_numpy = encode_sample_rows(['a', 'b'], [_START, _START + timedelta(seconds=1)], [1.0, math.nan])
+    assert with_numpy == without_numpy
+    with pytest.raises(ValueError, match='finite'):
+        encode_sample_rows('a', [math.nan], [1.0])
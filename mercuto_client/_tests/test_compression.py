@@ -0,0 +1,55 @@
+import gzip
+import json
+import math
+import zlib
+
+import pytest
+
+from .. import CompressionConfig, MercutoClient
+from ..compression import compress_body
+from .conftest import FakeServer
+
+
+def _samples(count: int) -> dict:
+    return {'samples': [{'channel_code': 'CHAN0001', 'timestamp': '2024-01-01T00:00:00+00:00', 'value': float(i)}
+                        for i in range(count)]}
+
+
+def test_large_body_is_gzipped(fake_server: FakeServer) -> None:
+    client = MercutoClient(fake_server.url, verify_ssl=False, compression=CompressionConfig())
+    payload = _samples(2000)
+    client.request('/v2/data/samples/secondary', 'PUT', json=payload)
+
+    request = fake_server.requests[0]
+    assert request.headers['Content-Encoding'] == 'gzip'
+    assert 'gzip' in request.headers['Accept-Encoding']
+    assert json.loads(gzip.decompress(request.body)) == payload
+    assert len(request.body) * 5 < len(json.dumps(payload))
+
+
+def test_small_body_is_not_compressed(fake_server: FakeServer) -> None:
+    client = MercutoClient(fake_server.url, verify_ssl=False, compression=CompressionConfig(threshold=1024))
+    client.request('/v2/data/channels', 'PUT', json={'label': 'x'})
+    assert 'Content-Encoding' not in fake_server.requests[0].headers
+    assert json.loads(fake_server.requests[0].body) == {'label': 'x'}
+
+
+def test_disabled_by_default(fake_server: FakeServer) -> None:
+    client = MercutoClient(fake_server.url, verify_ssl=False)
+    client.request('/v2/data/samples/secondary', 'PUT', json=_samples(2000))
+    assert 'Content-Encoding' not in fake_server.requests[0].headers
+
+
+def test_deflate_preserves_nan(fake_server: FakeServer) -> None:
+    client = MercutoClient(fake_server.url, verify_ssl=False, compression=CompressionConfig(encoding='deflate', threshold=0))
+    client.copy().request('/v2/data/samples/secondary', 'PUT', json={'value': math.nan})
+    request = fake_server.requests[0]
+    assert request.headers['Content-Encoding'] == 'deflate'
+    assert zlib.decompress(request.body) == b'{"value": NaN}'
+
+
+def test_compress_body_streams_in_chunks() -> None:
+    body = b'0123456789' * 100_000
+    assert gzip.decompress(compress_body(body, CompressionConfig(level=1))) == body
+    with pytest.raises(ValueError):
+        CompressionConfig(encoding='br')  # type: ignore[arg-type]
@@ -0,0 +1,91 @@
+import json
+import math
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import pytest
+
+from .. import MercutoClient, MercutoHTTPException
+from ..batching import BatchResult, UploadReport
+from ..dedup import DeduplicationStats, HighWaterMarks
+from ..modules.data import SecondarySample
+from .conftest import FakeResponse, FakeServer, RecordedRequest
+
+_START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _sample(channel: str, minutes: int, value: float = 1.0) -> SecondarySample:
+    return SecondarySample(channel, _START + timedelta(minutes=minutes), value)
+
+
+def _channel(code: str, last_valid_timestamp: Optional[str]) -> dict:
+    return {'code': code, 'project': 'p1', 'units': None, 'sampling_period': None, 'classification': 'SECONDARY',
+            'label': code, 'metric': None, 'source': None, 'aggregate': None, 'value_range_min': None,
+            'value_range_max': None, 'multiplier': 1.0, 'offset': 0.0, 'last_valid_timestamp': last_valid_timestamp,
+            'is_wallclock_interval': False}
+
+
+def test_filter_drops_stale_samples_and_exact_duplicates() -> None:
+    marks = HighWaterMarks()
+    marks.record([_sample('a', 10)], UploadReport([BatchResult(index=0, offset=0, count=1)]))
+
+    samples = [_sample('a', 9), _sample('a', 10), _sample('a', 11), _sample('b', 0), _sample('a', 11), _sample('a', 11, 2.0),
+               SecondarySample('b', datetime(2024, 1, 1), 1.0)]
+    assert marks.filter(samples) == [_sample('a', 11), _sample('b', 0), _sample('a', 11, 2.0),
+                                     SecondarySample('b', datetime(2024, 1, 1), 1.0)]
+    assert marks.stats() == DeduplicationStats(stale=2, duplicates=1)
+
+
+def test_repeated_nan_samples_are_duplicates() -> None:
+    marks = HighWaterMarks()
+    samples = [_sample('a', 0, math.nan), _sample('a', 0, float('nan')), _sample('a', 0, 1.0), _sample('a', 1, math.nan)]
+    assert marks.filter(samples) == [samples[0], samples[2], samples[3]]
+    assert marks.stats() == DeduplicationStats(duplicates=1)
+
+
+def test_marks_stop_short_of_failed_samples() -> None:
+    marks = HighWaterMarks()
+    samples = [_sample('a', 0), _sample('b', 0), _sample('a', 1), _sample('b', 1), _sample('a', 2), _sample('b', 2)]
+    marks.record(samples, UploadReport([BatchResult(index=0, offset=0, count=2), BatchResult(index=1, offset=2, count=2, error=OSError()),
+                                        BatchResult(index=2, offset=4, count=2)]))
+    assert marks.get('a') == marks.get('b') == _START
+    # The failed batch can be retried.
+    assert marks.filter(samples[2:4]) == samples[2:4]
+
+
+def test_insert_skips_samples_the_server_has(fake_server: FakeServer) -> None:
+    uploaded: list[list[dict]] = []
+
+    def handler(request: RecordedRequest) -> FakeResponse:
+        if request.method == 'GET':
+            return FakeResponse(body=json.dumps([_channel('a', (_START + timedelta(minutes=4)).isoformat()), _channel('b', None)]).encode())
+        uploaded.append(json.loads(request.body))
+        return FakeResponse()
+
+    fake_server.handler = handler
+    client = MercutoClient(fake_server.url, verify_ssl=False)
+    marks = client.data().high_water_marks('p1')
+    rows = [_sample(channel, minute) for minute in range(10) for channel in 'ab']
+
+    report = client.data().insert_secondary_samples('p1', rows[:12], high_water_marks=marks)
+    assert report.inserted == 7
+    report = client.data().insert_secondary_samples('p1', rows, high_water_marks=marks)
+    assert report.inserted == 8
+    expected = [s for s in rows if s.channel == 'b' or s.timestamp > _START + timedelta(minutes=4)]
+    assert [(s['channel'], datetime.fromisoformat(s['timestamp'].replace('Z', '+00:00'))) for body in uploaded for s in body] == \
+        [(s.channel, s.timestamp) for s in expected]
+
+
+def test_failed_insert_advances_marks_over_sent_batches(fake_server: FakeServer) -> None:
+    def handler(request: RecordedRequest) -> FakeResponse:
+        body = json.loads(request.body)
+        return FakeResponse(status=422 if body[0]['channel'] == 'b' else 202, body=b'{"detail": "unknown channel"}')
+
+    fake_server.handler = handler
+    client = MercutoClient(fake_server.url, verify_ssl=False)
+    marks = HighWaterMarks()
+    rows = [_sample('a', minute) for minute in range(4)] + [_sample('b', 0)]
+    with pytest.raises(MercutoHTTPException):
+        client.data().insert_secondary_samples('p1', rows, batch_size=2, max_in_flight=1, high_water_marks=marks)
+    assert marks.get('a') == _START + timedelta(minutes=3)
+    assert marks.get('b') is None
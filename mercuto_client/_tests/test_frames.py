@@ -0,0 +1,104 @@
+import base64
+import io
+from datetime import datetime, timezone
+from typing import Any
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+import requests
+
+from .. import MercutoClient, MercutoHTTPException
+from ..modules._frames import download_result, iter_frames, read_frame
+from ..modules.data import FileFormat
+from .conftest import FakeResponse, FakeServer, RecordedRequest
+
+_START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _frame(rows: int = 1000) -> pd.DataFrame:
+    return pd.DataFrame({
+        'channel': ['c1', 'c2'] * (rows // 2),
+        'timestamp': pd.date_range(_START, periods=rows, freq='s'),
+        'value': [float(i) for i in range(rows)],
+    })
+
+
+def _parquet(frame: pd.DataFrame, row_group_size: int) -> bytes:
+    buffer = io.BytesIO()
+    pq.write_table(pa.Table.from_pandas(frame, preserve_index=False), buffer, row_group_size=row_group_size)
+    return buffer.getvalue()
+
+
+def _serve_result(fake_server: FakeServer, body: bytes) -> None:
+    def handler(request: RecordedRequest) -> FakeResponse:
+        if request.path == '/results/file':
+            return FakeResponse(body=body, headers={'Content-Type': 'application/octet-stream'})
+        return FakeResponse()
+
+    fake_server.handler = handler
+    fake_server.respond(body={
+        'request_id': 'r1', 'status_code': 200, 'message': 'ok', 'requested_at': None, 'completed_at': None,
+        'result': {'result_url': f'{fake_server.url}/results/file', 'expires_at': '2030-01-01T00:00:00Z',
+                   'mime_type': 'application/parquet', 'file_size': len(body), 'metadata': {'first_timestamp': None}},
+    })
+
+
+def test_stream_dataframe_yields_row_groups(fake_server: FakeServer) -> None:
+    frame = _frame()
+    _serve_result(fake_server, _parquet(frame, row_group_size=300))
+    client = MercutoClient(fake_server.url, verify_ssl=False)
+    client.session().headers['X-Api-Key'] = 'secret'
+
+    pieces = list(client.data().stream_dataframe(_START, _START, channels=['c1', 'c2']))
+
+    assert [len(piece) for piece in pieces] == [300, 300, 300, 100]
+    pd.testing.assert_frame_equal(pd.concat(pieces, ignore_index=True), frame)
+    assert fake_server.calls() == ['POST /v2/data/requests', 'GET /results/file']
+    # The presigned URL must not receive the API key.
+    assert 'X-Api-Key' not in fake_server.requests[1].headers
+
+
+def test_load_dataframe_selects_columns(fake_server: FakeServer) -> None:
+    frame = _frame()
+    _serve_result(fake_server, _parquet(frame, row_group_size=300))
+    client = MercutoClient(fake_server.url, verify_ssl=False)
+    loaded = client.data().load_dataframe(_START, _START, channels=['c1'], columns=['timestamp', 'value'])
+    pd.testing.assert_frame_equal(loaded, frame[['timestamp', 'value']])
+
+
+@pytest.mark.parametrize('spool_size', [1 << 30, 1024])
+def test_feather_in_memory_and_memory_mapped(spool_size: int) -> None:
+    frame = _frame()
+    buffer = io.BytesIO()
+    frame.to_feather(buffer, chunksize=400)
+    url = 'data:application/feather;base64,' + base64.b64encode(buffer.getvalue()).decode()
+
+    with download_result(url, spool_size=spool_size, chunk_size=1000) as spool:
+        assert spool._rolled == (spool_size == 1024)  # type: ignore[attr-defined]
+        pd.testing.assert_frame_equal(read_frame(spool, FileFormat.FEATHER.value, spool_size=spool_size), frame)
+        pieces = list(iter_frames(spool, FileFormat.FEATHER.value, spool_size=spool_size, columns=['value']))
+    assert [len(piece) for piece in pieces] == [400, 400, 200]
+    assert list(pd.concat(pieces, ignore_index=True)['value']) == list(frame['value'])
+
+
+def test_download_follows_client_ssl_verification(fake_server: FakeServer, monkeypatch: pytest.MonkeyPatch) -> None:
+    _serve_result(fake_server, _parquet(_frame(), row_group_size=1000))
+    verified: list[bool] = []
+    get = requests.get
+
+    def recording_get(url: str, **kwargs: Any) -> requests.Response:
+        verified.append(kwargs['verify'])
+        return get(url, **kwargs)
+
+    monkeypatch.setattr(requests, 'get', recording_get)
+    client = MercutoClient(fake_server.url, verify_ssl=False)
+    client.data().load_dataframe(_START, _START, channels=['c1'])
+    assert verified == [False]
+
+
+def test_failed_download_raises(fake_server: FakeServer) -> None:
+    fake_server.respond(status=403, body=b'expired')
+    with pytest.raises(MercutoHTTPException, match='expired'):
+        download_result(f'{fake_server.url}/results/file')
@@ -0,0 +1,41 @@
+import subprocess
+import sys
+
+# Optional features and what they pull in; none of them should load unless the client is configured to use them.
+OPTIONAL_MODULES = {'mercuto_client.batching', 'mercuto_client.caching', 'mercuto_client.pooling',
+                    'mercuto_client.registry', 'mercuto_client.result_cache', 'mercuto_client.spool',
+                    'sqlite3', 'uuid'}
+
+
+def _imported_modules(statement: str) -> set[str]:
+    """
+    Run `statement` in a fresh interpreter and return the names of all modules loaded afterwards.
+    """
+    result = subprocess.run([sys.executable, '-c', f'{statement}\nimport sys\nprint("\\n".join(sys.modules))'],
+                            capture_output=True, text=True, check=True)
+    return set(result.stdout.splitlines())
+
+
+def test_service_modules_load_lazily() -> None:
+    modules = _imported_modules('import mercuto_client; mercuto_client.MercutoClient("http://localhost", verify_ssl=False)')
+    assert not {m for m in modules if m.startswith('mercuto_client.modules')}
+
+    modules = _imported_modules('import mercuto_client; mercuto_client.MercutoClient("http://localhost", verify_ssl=False).data()')
+    assert 'mercuto_client.modules.data' in modules
+    assert 'mercuto_client.modules.media' not in modules
+    assert 'numpy' not in modules
+
+
+def test_package_import_skips_optional_features() -> None:
+    modules = _imported_modules('import mercuto_client')
+    assert not modules & OPTIONAL_MODULES
+
+
+def test_default_client_skips_unused_features() -> None:
+    modules = _imported_modules('import mercuto_client; mercuto_client.MercutoClient("http://localhost", verify_ssl=False)')
+    assert not modules & {'mercuto_client.caching', 'mercuto_client.result_cache', 'mercuto_client.spool', 'sqlite3'}
+
+
+def test_feature_options_import_on_access() -> None:
+    modules = _imported_modules('import mercuto_client; mercuto_client.SpoolConfig')
+    assert 'mercuto_client.spool' in modules
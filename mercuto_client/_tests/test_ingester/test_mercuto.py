@@ -50,3 +50,24 @@ def test_samples_upload(mock_client: MercutoClient) -> None:
         end_time=datetime.fromisoformat('2023-12-07T00:04:00+00:00'),
     )
     assert len(data) == 8
+
+
+def test_deduplicate_skips_rows_already_uploaded(mock_client: MercutoClient) -> None:
+    tenant = mock_client.identity().create_tenant('Test Tenant', 'T123456789')
+    project = mock_client.core().create_project('test_project', 'R123456789', 'Test Project', tenant.code, timezone='UTC')
+    for label in ['VWu_1', 'VWu_2']:
+        mock_client.data().create_channel(project=project.code, label=label)
+
+    ingester = MercutoIngester(project_code=project.code, api_key='test_api_key', timezone='UTC', deduplicate=True)
+    assert ingester.process_file(CAMPBELL_SAMPLE_FILE)
+    marks = ingester._high_water_marks
+    assert marks is not None and marks.stats().stale == 0
+
+    # A logger re-sending the same file uploads nothing new.
+    assert ingester.process_file(CAMPBELL_SAMPLE_FILE)
+    assert marks.stats().stale > 0
+
+    # A fresh ingester starts from the server's last timestamps.
+    restarted = MercutoIngester(project_code=project.code, api_key='test_api_key', timezone='UTC', deduplicate=True)
+    assert restarted.process_file(CAMPBELL_SAMPLE_FILE)
+    assert restarted._high_water_marks is not None and restarted._high_water_marks.stats().stale == marks.stats().stale
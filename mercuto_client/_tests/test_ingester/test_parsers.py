@@ -4,9 +4,11 @@ import tempfile
 
 import pytest
 
-from ...ingester.parsers import (detect_parser, parse_campbell_file,
+from ...ingester.parsers import (detect_parser, detect_sample_parser,
+                                 parse_campbell_file,
                                  parse_worldsensing_compact_file,
                                  parse_worldsensing_standard_file)
+from ...modules.data import SecondaryDataSample, SecondarySample
 
 RESOURCES_DIR = os.path.join(os.path.dirname(__file__), "resources")
 
@@ -143,3 +145,17 @@ def test_detect_file_type():
 
         with pytest.raises(ValueError):
             detect_parser(unknown_file)
+
+
+@pytest.mark.parametrize('filename', ["worldsensing-compacted-sample-file.dat", "worldsensing-standard-sample-file.csv",
+                                      "campbell-sample-file.dat"])
+def test_sample_parsers_match_model_parsers(filename: str) -> None:
+    file = os.path.join(RESOURCES_DIR, filename)
+    mapper = {label: label for label in ("channel1", "channel2", "AtmPressure-85544-in-mbar", "VWu_1", "Therm(1)")}
+    models = detect_parser(file)(file, mapper)
+    samples = detect_sample_parser(file)(file, mapper)
+    assert samples
+    assert all(isinstance(model, SecondaryDataSample) for model in models)
+    assert all(isinstance(sample, SecondarySample) for sample in samples)
+    # Compared as JSON, NaN values are not equal to themselves.
+    assert [sample.to_model().model_dump_json() for sample in samples] == [model.model_dump_json() for model in models]
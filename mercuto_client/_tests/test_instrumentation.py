@@ -0,0 +1,148 @@
+import json
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from .. import (LatencyHistogram, MercutoClient, MercutoHTTPException,
+                RequestEvent, RequestHook, retry)
+from ..instrumentation import instrumented, route_template
+from ..modules.data import Channel, SecondarySample
+from .conftest import FakeResponse, FakeServer, RecordedRequest
+
+_CHANNEL = {
+    'code': 'abc', 'project': 'p1', 'units': None, 'sampling_period': None, 'classification': 'SECONDARY',
+    'label': 'Channel', 'metric': None, 'source': None, 'aggregate': None, 'value_range_min': None,
+    'value_range_max': None, 'multiplier': 1.0, 'offset': 0.0, 'last_valid_timestamp': None, 'is_wallclock_interval': False,
+}
+
+
+class Recorder(RequestHook):
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, RequestEvent]] = []
+
+    def on_request_start(self, event: RequestEvent) -> None:
+        self.calls.append(('start', event))
+
+    def on_response_headers(self, event: RequestEvent) -> None:
+        self.calls.append(('headers', event))
+
+    def on_response_body(self, event: RequestEvent) -> None:
+        self.calls.append(('body', event))
+
+    def on_parse_done(self, event: RequestEvent) -> None:
+        self.calls.append(('parsed', event))
+
+
+def test_service_call_emits_all_phases(fake_server: FakeServer) -> None:
+    fake_server.respond(200, _CHANNEL)
+    client = MercutoClient(fake_server.url, verify_ssl=False)
+    recorder = Recorder()
+    client.add_hook(recorder)
+
+    channel = client.data().get_channel('abc')
+    assert channel is not None and channel.code == 'abc'
+
+    assert [name for name, _ in recorder.calls] == ['start', 'headers', 'body', 'parsed']
+    event = recorder.calls[-1][1]
+    assert (event.module, event.operation, event.method) == ('data', 'get_channel', 'GET')
+    assert event.route == '/v2/data/channels/{code}'
+    assert event.status_code == 200
+    assert event.bytes_in > 0
+    assert event.parsed_at is not None and event.body_at is not None and event.headers_at is not None
+    assert event.started_at <= event.headers_at <= event.body_at <= event.parsed_at
+
+
+def test_direct_request_and_errors(fake_server: FakeServer, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(retry, 'sleep', lambda _: None)
+    fake_server.respond(503)
+    fake_server.respond(404, {'detail': 'missing'})
+    client = MercutoClient(fake_server.url, verify_ssl=False)
+    recorder = Recorder()
+    client.copy().add_hook(recorder)
+
+    with pytest.raises(MercutoHTTPException):
+        client.request('/projects/12', 'GET')
+    event = recorder.calls[-1][1]
+    assert (event.module, event.route, event.status_code, event.retries) == ('', '/projects/{id}', 404, 1)
+    assert isinstance(event.error, MercutoHTTPException)
+
+    client.remove_hook(recorder)
+    client.request('/projects', 'PUT', json={'name': 'x'})
+    assert len(recorder.calls) == 4
+
+
+def test_latency_histogram(fake_server: FakeServer) -> None:
+    client = MercutoClient(fake_server.url, verify_ssl=False)
+    histogram = LatencyHistogram(buckets=[0.001, 100])
+    client.add_hook(histogram)
+    for _ in range(3):
+        client.request('/healthcheck', 'GET')
+    client.request('/projects', 'PUT', json={'name': 'x'})
+
+    assert {key for key, _ in histogram.top(2)} == {('', 'GET', '/healthcheck'), ('', 'PUT', '/projects')}
+    stats = histogram.snapshot()[('', 'GET', '/healthcheck')]
+    assert stats.count == 3 and stats.errors == 0
+    assert sum(stats.counts) == 3
+    assert stats.quantile(1.0) <= 100
+    assert histogram.snapshot()[('', 'PUT', '/projects')].bytes_out == len(b'{"name": "x"}')
+
+    histogram.reset()
+    assert histogram.snapshot() == {}
+
+
+@instrumented('test')
+class _Sequential:
+    def __init__(self, client: MercutoClient) -> None:
+        self._client = client
+
+    def fetch(self, count: int) -> None:
+        for _ in range(count):
+            self._client.request('/healthcheck', 'GET').json()
+
+    def channels(self, project: str) -> list[Channel]:
+        return list(self._client.data().iter_channels(project, page_size=2, prefetch=2))
+
+
+def test_each_request_is_timed_on_its_own(fake_server: FakeServer) -> None:
+    def slow(request: RecordedRequest) -> FakeResponse:
+        time.sleep(0.05)
+        return FakeResponse()
+
+    fake_server.handler = slow
+    client = MercutoClient(fake_server.url, verify_ssl=False)
+    recorder = Recorder()
+    client.add_hook(recorder)
+
+    started = time.monotonic()
+    _Sequential(client).fetch(4)
+    client.data().insert_secondary_samples('p1', [SecondarySample('c', datetime.now(timezone.utc), 1.0)] * 4,
+                                           batch_size=1, max_in_flight=1)
+    elapsed = time.monotonic() - started
+
+    parsed = [event for name, event in recorder.calls if name == 'parsed']
+    assert [event.module for event in parsed] == ['test'] * 4 + ['data'] * 4
+    # Request durations do not include the requests made after them.
+    assert sum(event.total_time for event in parsed) <= elapsed
+    assert all(event.parsed_at is not None and event.parsed_at < later.started_at + 0.01 for event, later in zip(parsed, parsed[1:]))
+
+
+def test_prefetched_pages_are_attributed_to_the_operation(fake_server: FakeServer) -> None:
+    def pages(request: RecordedRequest) -> FakeResponse:
+        offset = int(request.query['offset'][0])
+        return FakeResponse(body=json.dumps([{**_CHANNEL, 'code': f'c{offset + i}'} for i in range(2 if offset < 6 else 1)]).encode())
+
+    fake_server.handler = pages
+    client = MercutoClient(fake_server.url, verify_ssl=False)
+    recorder = Recorder()
+    client.add_hook(recorder)
+
+    assert len(_Sequential(client).channels('p1')) == 7
+    parsed = [event for name, event in recorder.calls if name == 'parsed']
+    assert len(parsed) >= 4
+    assert {(event.module, event.operation, event.route) for event in parsed} == {('test', 'channels', '/v2/data/channels')}
+
+
+def test_route_template() -> None:
+    assert route_template('/v2/data/channels/c-1/samples', {'code': 'c-1'}) == '/v2/data/channels/{code}/samples'
+    assert route_template('/events/3fa85f64-5717-4562-b3fc-2c963f66afa6') == '/events/{id}'
@@ -0,0 +1,71 @@
+import json
+import math
+from datetime import datetime, timedelta, timezone
+
+from .. import MercutoClient
+from ..modules._latest import LatestSampleTracker
+from ..modules.data import LatestDataSample
+from .conftest import FakeResponse, FakeServer, RecordedRequest
+
+_NOW = datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+
+
+def _sample(channel: str, seconds: float, value: float) -> LatestDataSample:
+    return LatestDataSample(channel=channel, timestamp=_NOW + timedelta(seconds=seconds), value=value)
+
+
+def test_tracker_reports_changes_and_schedules_polls() -> None:
+    tracker = LatestSampleTracker(min_interval=1, max_interval=60, idle_backoff=2)
+    assert len(tracker.update([_sample('fast', 0, 1), _sample('slow', 0, 1), _sample('late', -600, 1)])) == 3
+    assert tracker.update([_sample('fast', 10, 1), _sample('slow', 0, 2), _sample('late', -600, 1)]) == [
+        _sample('fast', 10, 1), _sample('slow', 0, 2)]
+
+    periods: dict[str, timedelta] = {'fast': timedelta(seconds=15), 'slow': timedelta(minutes=5), 'late': timedelta(seconds=1)}
+    unknown: dict[str, timedelta] = {}
+    # 'fast' is next due 25s from now; 'late' is overdue and ignored.
+    assert tracker.next_delay(periods.get, now=_NOW) == 25
+    assert tracker.next_delay(periods.get, now=_NOW + timedelta(seconds=24.5)) == 1
+    assert tracker.next_delay(unknown.get, now=_NOW) == 1
+
+    # Idle polls back off exponentially up to max_interval.
+    delays = []
+    for _ in range(8):
+        tracker.update([_sample('fast', 10, 1)])
+        delays.append(tracker.next_delay(unknown.get, now=_NOW))
+    assert delays == [2, 4, 8, 16, 32, 60, 60, 60]
+    tracker.update([_sample('fast', 20, 1)])
+    assert tracker.next_delay(unknown.get, now=_NOW) == 1
+
+
+def test_tracker_treats_repeated_nan_as_unchanged() -> None:
+    tracker = LatestSampleTracker()
+    assert len(tracker.update([_sample('a', 0, math.nan)])) == 1
+    assert tracker.update([_sample('a', 0, math.nan)]) == []
+    assert tracker.idle_polls == 1
+    assert tracker.update([_sample('a', 0, 1.0)]) == [_sample('a', 0, 1.0)]
+    assert len(tracker.update([_sample('a', 0, math.nan)])) == 1
+    assert len(tracker.update([_sample('a', 5, math.nan)])) == 1
+
+
+def test_watch_latest_yields_only_changes(fake_server: FakeServer) -> None:
+    values = iter([[1, 1], [1, 1], [2, 1], [2, 1], [2, 3]])
+    polls = []
+
+    def handler(request: RecordedRequest) -> FakeResponse:
+        if request.path.endswith('/channels') or request.path.endswith('/datatables'):
+            return FakeResponse(body=b'[]')
+        polls.append(request)
+        a, b = next(values)
+        return FakeResponse(body=json.dumps([
+            {'channel': 'a', 'timestamp': _NOW.isoformat(), 'value': a},
+            {'channel': 'b', 'timestamp': _NOW.isoformat(), 'value': b},
+        ]).encode())
+
+    fake_server.handler = handler
+    client = MercutoClient(fake_server.url, verify_ssl=False)
+    feed = client.data().watch_latest('p1', min_interval=0.01, max_interval=0.05)
+    changes = [[(s.channel, s.value) for s in next(feed)] for _ in range(3)]
+    feed.close()  # type: ignore[attr-defined]
+
+    assert changes == [[('a', 1), ('b', 1)], [('a', 2)], [('b', 3)]]
+    assert len(polls) == 5
@@ -0,0 +1,145 @@
+import bisect
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import pytest
+
+from .. import MercutoClient
+from ..mocks import mock_mercuto
+from ..modules.data import ChannelClassification, SecondarySample
+from ..pagination import paginate, paginate_by_timestamp
+from .conftest import FakeResponse, FakeServer, RecordedRequest
+
+
+class PagedSource:
+    def __init__(self, total: int, delay: float = 0.0) -> None:
+        self.total = total
+        self.delay = delay
+        self.offsets: list[int] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, limit: int, offset: int) -> list[int]:
+        with self._lock:
+            self.offsets.append(offset)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        return list(range(offset, min(offset + limit, self.total)))
+
+
+def test_yields_every_item_in_order() -> None:
+    source = PagedSource(total=95)
+    assert list(paginate(source, page_size=10, prefetch=3)) == list(range(95))
+
+
+def test_single_short_page_makes_one_request() -> None:
+    source = PagedSource(total=5)
+    assert list(paginate(source, page_size=10, prefetch=3)) == list(range(5))
+    assert source.offsets == [0]
+
+
+def test_in_flight_requests_are_capped() -> None:
+    source = PagedSource(total=200, delay=0.02)
+    assert len(list(paginate(source, page_size=10, prefetch=6, max_in_flight=2))) == 200
+    assert source.max_in_flight == 2
+
+
+def test_sequential_without_prefetch() -> None:
+    source = PagedSource(total=30)
+    assert list(paginate(source, page_size=10, prefetch=0)) == list(range(30))
+    assert source.offsets == [0, 10, 20, 30]
+
+
+def test_early_stop_cancels_pending_pages() -> None:
+    source = PagedSource(total=10_000, delay=0.01)
+    iterator = paginate(source, page_size=10, prefetch=2, max_in_flight=1)
+    assert [next(iterator) for _ in range(15)] == list(range(15))
+    iterator.close()  # type: ignore[attr-defined]
+    time.sleep(0.05)
+    assert len(source.offsets) <= 5
+
+    with pytest.raises(ValueError):
+        next(paginate(source, page_size=0))
+
+
+def test_iter_events_pages_through_api(fake_server: FakeServer) -> None:
+    def events(request: RecordedRequest) -> FakeResponse:
+        offset, limit = int(request.query['offset'][0]), int(request.query['limit'][0])
+        page = [{'code': f'e{i}', 'project': {'code': 'p1'}, 'start_time': '2024-01-01T00:00:00Z',
+                 'end_time': '2024-01-01T00:01:00Z', 'objects': [], 'tags': []}
+                for i in range(offset, min(offset + limit, 25))]
+        return FakeResponse(body=json.dumps(page).encode())
+
+    fake_server.handler = events
+    client = MercutoClient(fake_server.url, verify_ssl=False)
+    codes = [event.code for event in client.core().iter_events('p1', page_size=10)]
+    assert codes == [f'e{i}' for i in range(25)]
+    assert sorted(int(r.query['offset'][0]) for r in fake_server.requests)[:3] == [0, 10, 20]
+
+
+_START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class TimestampedSource:
+    """
+    Serves the first `limit` samples at or after a start time, in timestamp order.
+    """
+
+    def __init__(self, samples: list[SecondarySample]) -> None:
+        self.samples = sorted(samples, key=lambda s: (s.timestamp, s.channel))
+        self.requests: list[tuple[Optional[datetime], int]] = []
+
+    def __call__(self, start: Optional[datetime], limit: int) -> list[SecondarySample]:
+        self.requests.append((start, limit))
+        first = 0 if start is None else bisect.bisect_left([s.timestamp for s in self.samples], start)
+        return self.samples[first:first + limit]
+
+
+def test_cursor_keeps_ties_across_page_boundaries() -> None:
+    samples = [SecondarySample(c, _START + timedelta(seconds=t), t) for t in range(20) for c in ('a', 'b', 'c')]
+    source = TimestampedSource(samples)
+    result = list(paginate_by_timestamp(source, key=lambda s: s.channel, page_size=4))
+    assert result == source.samples
+    # Every page after the first starts at the timestamp of the last sample already yielded.
+    assert [start for start, _ in source.requests[1:3]] == [_START + timedelta(seconds=1), _START + timedelta(seconds=2)]
+
+
+def test_cursor_grows_page_past_long_ties() -> None:
+    samples = [SecondarySample(f'c{i:02}', _START, i) for i in range(10)] + [SecondarySample('a', _START + timedelta(seconds=1), 0)]
+    source = TimestampedSource(samples)
+    assert list(paginate_by_timestamp(source, key=lambda s: s.channel, start_time=_START, page_size=3, prefetch=False)) == source.samples
+    assert [limit for _, limit in source.requests] == [3, 6, 9, 12]
+
+
+def test_cursor_prefetches_next_page() -> None:
+    source = TimestampedSource([SecondarySample('a', _START + timedelta(seconds=t), t) for t in range(100)])
+    iterator = paginate_by_timestamp(source, key=lambda s: s.channel, page_size=10)
+    next(iterator)
+    deadline = time.monotonic() + 1
+    while len(source.requests) < 2 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    assert len(source.requests) == 2
+    assert len(list(iterator)) == 99
+
+
+def test_iter_secondary_samples_covers_range() -> None:
+    with mock_mercuto():
+        client = MercutoClient()
+        project = client.core().create_project('p', 'R1', 'P', client.identity().create_tenant('T', 'T1').code, timezone='UTC')
+        codes = [client.data().create_channel(project.code, label=f'c{i}').code for i in range(3)]
+        assert all(client.data().get_channel(code).classification == ChannelClassification.SECONDARY  # type: ignore[union-attr]
+                   for code in codes)
+        client.data().insert_secondary_samples(
+            project.code, [SecondarySample(code, _START + timedelta(minutes=m), m) for m in range(50) for code in codes])
+
+        samples = list(client.data().iter_secondary_samples_compact(codes, _START, _START + timedelta(minutes=40), page_size=7))
+    assert len(samples) == 3 * 41
+    assert len(set(samples)) == len(samples)
+    assert [s.timestamp for s in samples] == sorted(s.timestamp for s in samples)
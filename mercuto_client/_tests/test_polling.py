@@ -0,0 +1,88 @@
+import itertools
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from .. import MercutoClient, MercutoClientException, MercutoHTTPException
+from ..modules._sharding import DataRequestShard
+from .conftest import FakeResponse, FakeServer, RecordedRequest
+
+_START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class SlowRequestServer:
+    """
+    Each data request completes on the Nth poll, where N is the first channel code. Code 'fail' errors on its first poll
+    and 'never' stays pending.
+    """
+
+    def __init__(self, fake_server: FakeServer) -> None:
+        self.url = fake_server.url
+        self.channels: dict[str, str] = {}
+        self.polls: dict[str, list[float]] = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        fake_server.handler = self
+
+    def _status(self, request_id: str, status_code: int) -> FakeResponse:
+        result = {'result_url': f'{self.url}/results/{request_id}', 'expires_at': '2030-01-01T00:00:00Z',
+                  'mime_type': 'application/parquet', 'file_size': 0, 'metadata': {'first_timestamp': None}}
+        return FakeResponse(body=json.dumps({'request_id': request_id, 'status_code': status_code, 'message': 'boom',
+                                             'requested_at': None, 'completed_at': None,
+                                             'result': result if status_code == 200 else None}).encode())
+
+    def __call__(self, request: RecordedRequest) -> FakeResponse:
+        with self._lock:
+            if request.method == 'POST':
+                request_id = f'r{next(self._ids)}'
+                self.channels[request_id] = json.loads(request.body)['channels'][0]
+                self.polls[request_id] = []
+                return self._status(request_id, 202)
+            request_id = request.path.split('/')[-1]
+            self.polls[request_id].append(time.monotonic())
+            code = self.channels[request_id]
+        if code == 'fail':
+            return self._status(request_id, 500)
+        if code == 'never' or len(self.polls[request_id]) < int(code):
+            return self._status(request_id, 202)
+        return self._status(request_id, 200)
+
+
+def _requests(*codes: str) -> list[DataRequestShard]:
+    return [DataRequestShard((code,), _START, _START + timedelta(hours=1)) for code in codes]
+
+
+def test_results_arrive_in_completion_order_with_backoff(fake_server: FakeServer) -> None:
+    server = SlowRequestServer(fake_server)
+    client = MercutoClient(fake_server.url, verify_ssl=False)
+
+    completed = list(client.data().load_data_requests(_requests('4', '1', '3', '1'), poll_interval=0.01, max_poll_interval=0.04))
+
+    assert [index for index, _ in completed[:2]] in ([1, 3], [3, 1])
+    assert [index for index, _ in completed[2:]] == [2, 0]
+    slowest = next(request_id for request_id, code in server.channels.items() if code == '4')
+    assert completed[-1][1].result_url.endswith(f'/results/{slowest}')
+    # One poll per request per attempt, with the delay doubling up to max_poll_interval between attempts.
+    polls = server.polls[slowest]
+    assert len(polls) == 4
+    gaps = [b - a for a, b in zip(polls, polls[1:])]
+    assert all(gap >= expected for gap, expected in zip(gaps, [0.02, 0.04, 0.04]))
+
+
+def test_failures_and_shared_deadline(fake_server: FakeServer) -> None:
+    SlowRequestServer(fake_server)
+    client = MercutoClient(fake_server.url, verify_ssl=False)
+
+    with pytest.raises(MercutoHTTPException, match='boom'):
+        list(client.data().load_data_requests(_requests('2', 'fail'), poll_interval=0.01))
+
+    started = time.monotonic()
+    completed = []
+    with pytest.raises(MercutoClientException, match='1 of 2 data requests'):
+        for index, _ in client.data().load_data_requests(_requests('1', 'never'), poll_interval=0.01, timeout=0.2):
+            completed.append(index)
+    assert completed == [0]
+    assert 0.2 <= time.monotonic() - started < 1
@@ -0,0 +1,42 @@
+import concurrent.futures
+
+from .. import MercutoClient, PoolConfig
+from .conftest import FakeServer
+
+
+def test_threaded_requests_reuse_connections(fake_server: FakeServer) -> None:
+    client = MercutoClient(fake_server.url, verify_ssl=False, pool=PoolConfig(max_per_host=4, block=True, tcp_keepalive=True))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(lambda _: client.request('/healthcheck', 'GET'), range(40)))
+
+    stats = client.pool_stats()
+    assert stats.requests == 40
+    assert stats.misses <= 4
+    assert stats.hits >= 36
+    assert stats.discarded == 0
+
+
+def test_warm_up_on_login(fake_server: FakeServer) -> None:
+    client = MercutoClient(fake_server.url, verify_ssl=False, pool=PoolConfig(warm_connections=2))
+    client.connect(api_key='key')
+    assert client.pool_stats().new_connections == 2
+
+    client.request('/healthcheck', 'GET')
+    assert client.pool_stats().new_connections == 2
+
+
+def test_idle_timeout_closes_connections(fake_server: FakeServer) -> None:
+    client = MercutoClient(fake_server.url, verify_ssl=False, pool=PoolConfig(idle_timeout=0))
+    client.request('/healthcheck', 'GET')
+    client.request('/healthcheck', 'GET')
+    stats = client.pool_stats()
+    assert stats.idle_expiries == 1
+    assert stats.new_connections == 2
+
+
+def test_copies_share_pool(fake_server: FakeServer) -> None:
+    client = MercutoClient(fake_server.url, verify_ssl=False)
+    with client.as_credentials(api_key='key') as other:
+        other.request('/healthcheck', 'GET')
+    client.request('/healthcheck', 'GET')
+    assert client.pool_stats().hits == 1
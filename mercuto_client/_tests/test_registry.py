@@ -0,0 +1,70 @@
+import json
+import time
+
+from .. import MercutoClient
+from ..modules.data import ChannelClassification
+from .conftest import FakeResponse, FakeServer, RecordedRequest
+
+
+def _channel(code: str, label: str, classification: str = 'SECONDARY', metric: str | None = None) -> dict:
+    return {'code': code, 'project': 'p1', 'units': None, 'sampling_period': None, 'classification': classification,
+            'label': label, 'metric': metric, 'source': None, 'aggregate': None, 'value_range_min': None,
+            'value_range_max': None, 'multiplier': 1.0, 'offset': 0.0, 'last_valid_timestamp': None,
+            'is_wallclock_interval': False}
+
+
+class MetadataServer:
+    def __init__(self, fake_server: FakeServer) -> None:
+        self.channels = [_channel('c1', 'Temp'), _channel('c2', 'Strain'), _channel('c3', 'Temp', 'EVENT_METRIC', metric='max')]
+        self.datatables = [{'code': 'dt1', 'project': 'p1', 'name': 'Table1', 'enabled': True, 'sampling_period': None,
+                            'columns': [{'channel': 'c2', 'column_label': 'Strain_Avg'}]}]
+        self.loads = 0
+        fake_server.handler = self
+
+    def __call__(self, request: RecordedRequest) -> FakeResponse:
+        offset = int(request.query['offset'][0])
+        if request.path.endswith('/channels'):
+            if offset == 0:
+                self.loads += 1
+            return FakeResponse(body=json.dumps(self.channels[offset:]).encode())
+        return FakeResponse(body=json.dumps(self.datatables[offset:]).encode())
+
+
+def test_lookups_share_one_snapshot(fake_server: FakeServer) -> None:
+    server = MetadataServer(fake_server)
+    client = MercutoClient(fake_server.url, verify_ssl=False)
+    registry = client.data().channel_registry('p1')
+
+    assert registry.get('c1').label == 'Temp'  # type: ignore[union-attr]
+    assert registry.get_by_label('Temp', ChannelClassification.EVENT_METRIC).code == 'c3'  # type: ignore[union-attr]
+    assert registry.get_by_column('dt1', 'Strain_Avg').code == 'c2'  # type: ignore[union-attr]
+    assert [c.code for c in registry.with_classification(ChannelClassification.SECONDARY)] == ['c1', 'c2']
+    assert [c.code for c in registry.with_metric('max')] == ['c3']
+    assert registry.with_aggregate('daily') == ()
+
+    # Copies, such as as_credentials clients, reuse the snapshot.
+    with client.as_credentials(api_key='key') as other:
+        assert other.data().channel_registry('p1').get('c2') is not None
+    assert server.loads == 1
+
+
+def test_unknown_lookups_and_ttl_reload(fake_server: FakeServer) -> None:
+    server = MetadataServer(fake_server)
+    client = MercutoClient(fake_server.url, verify_ssl=False)
+    registry = client.data().channel_registry('p1', ttl=0.2, miss_refresh_interval=0.05)
+    registry.index()
+
+    server.channels.append(_channel('c4', 'Tilt'))
+    # A miss right after loading does not reload, one after miss_refresh_interval does.
+    assert registry.get_by_label('Tilt') is None
+    assert server.loads == 1
+    time.sleep(0.06)
+    assert registry.get_by_label('Tilt').code == 'c4'  # type: ignore[union-attr]
+    assert server.loads == 2
+    assert registry.get_by_label('Missing') is None
+    assert server.loads == 2
+
+    server.channels.pop(0)
+    time.sleep(0.21)
+    assert [c.code for c in registry.channels()] == ['c2', 'c3', 'c4']
+    assert server.loads == 3
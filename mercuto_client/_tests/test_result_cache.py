@@ -0,0 +1,168 @@
+import io
+import itertools
+import json
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pytest
+
+from .. import MercutoClient, ResultCacheConfig
+from ..modules.data import AggregationMethod, AggregationOptions
+from ..result_cache import ResultCache
+from .conftest import FakeResponse, FakeServer, RecordedRequest
+
+_START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _hours(n: float) -> datetime:
+    return _START + timedelta(hours=n)
+
+
+class ResultServer:
+    """
+    Completes every data request immediately with one sample per channel per minute over the requested range.
+    """
+
+    def __init__(self, fake_server: FakeServer) -> None:
+        self.url = fake_server.url
+        self.requests: dict[str, dict] = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        fake_server.handler = self
+
+    def ranges(self) -> list[tuple[datetime, datetime]]:
+        return [(datetime.fromisoformat(b['start_time']), datetime.fromisoformat(b['end_time'])) for b in self.requests.values()]
+
+    def __call__(self, request: RecordedRequest) -> FakeResponse:
+        if request.method == 'POST':
+            with self._lock:
+                request_id = f'r{next(self._ids)}'
+                self.requests[request_id] = json.loads(request.body)
+            result = {'result_url': f'{self.url}/results/{request_id}', 'expires_at': '2030-01-01T00:00:00Z',
+                      'mime_type': 'application/parquet', 'file_size': 0, 'metadata': {'first_timestamp': None}}
+            return FakeResponse(body=json.dumps({'request_id': request_id, 'status_code': 200, 'message': '',
+                                                 'requested_at': None, 'completed_at': None, 'result': result}).encode())
+        body = self.requests[request.path.split('/')[-1]]
+        times = pd.date_range(body['start_time'], body['end_time'], freq='min')
+        frame = pd.DataFrame([(c, t, float(t.value // 60_000_000_000)) for t in times for c in body['channels']],
+                             columns=['channel', 'timestamp', 'value'])
+        buffer = io.BytesIO()
+        frame.to_parquet(buffer, index=False)
+        return FakeResponse(body=buffer.getvalue())
+
+
+@pytest.fixture
+def server(fake_server: FakeServer) -> ResultServer:
+    return ResultServer(fake_server)
+
+
+def _client(server: ResultServer, directory: str, max_bytes: int = 1 << 30) -> MercutoClient:
+    return MercutoClient(server.url, verify_ssl=False, result_cache=ResultCacheConfig(directory=directory, max_bytes=max_bytes))
+
+
+def test_overlapping_requests_fetch_only_missing_tail(server: ResultServer, tmp_path: str) -> None:
+    client = _client(server, str(tmp_path))
+    first = client.data().load_dataframe(_hours(0), _hours(10), channels=['b', 'a'])
+    assert len(first) == 2 * 601
+
+    contained = client.data().load_dataframe(_hours(2), _hours(8), channels=['a', 'b'])
+    assert len(server.requests) == 1
+    assert len(contained) == 2 * 361 and contained['timestamp'].min() == pd.Timestamp(_hours(2))
+
+    # A fresh client on the same directory reuses the stored result and only asks for the last two hours.
+    extended = _client(server, str(tmp_path)).data().load_dataframe(_hours(5), _hours(12), channels=['a', 'b'],
+                                                                    columns=['timestamp', 'value'])
+    assert server.ranges()[-1] == (_hours(10), _hours(12))
+    assert len(extended) == 2 * 421 and list(extended.columns) == ['timestamp', 'value']
+    assert extended['timestamp'].is_monotonic_increasing
+
+    head = client.data().load_dataframe(_hours(-1), _hours(1), channels=['a', 'b'])
+    assert server.ranges()[-1] == (_hours(-1), _hours(0))
+    assert not head.duplicated(['channel', 'timestamp']).any() and len(head) == 2 * 121
+    assert client.result_cache_stats().hits == 1 and client.result_cache_stats().partial_hits == 1
+    assert client.result_cache_stats().entries == 1
+
+
+@pytest.mark.parametrize('aggregation', [
+    AggregationOptions(method=AggregationMethod.MEAN, interval='hour'),
+    AggregationOptions(method=AggregationMethod.MAX, interval='minute', rolling=True),
+])
+def test_aggregated_results_are_only_reused_for_the_same_range(server: ResultServer, tmp_path: str,
+                                                               aggregation: AggregationOptions) -> None:
+    client = _client(server, str(tmp_path))
+    client.data().load_dataframe(_hours(0), _hours(10), channels=['a'], aggregation=aggregation)
+    client.data().load_dataframe(_hours(0), _hours(10), channels=['a'], aggregation=aggregation)
+    client.data().load_dataframe(_hours(1), _hours(9), channels=['a'], aggregation=aggregation)
+    client.data().load_dataframe(_hours(5), _hours(12), channels=['a'], aggregation=aggregation)
+    assert server.ranges() == [(_hours(0), _hours(10)), (_hours(1), _hours(9)), (_hours(5), _hours(12))]
+    assert client.result_cache_stats().hits == 1
+    client.data().load_dataframe(_hours(1), _hours(2), channels=['a'], cache=False)
+    assert len(server.requests) == 4
+
+
+def test_recent_samples_are_fetched_again(server: ResultServer, tmp_path: str) -> None:
+    client = _client(server, str(tmp_path))
+    now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    before = datetime.now(timezone.utc)
+    client.data().load_dataframe(now - timedelta(hours=2), now + timedelta(hours=1), channels=['a'])
+    after = datetime.now(timezone.utc)
+
+    client.data().load_dataframe(now - timedelta(hours=2), now + timedelta(hours=1), channels=['a'])
+    tail_start, tail_end = server.ranges()[-1]
+    margin = timedelta(seconds=ResultCacheConfig().settle_margin)
+    assert before - margin <= tail_start <= after - margin
+    assert tail_end == now + timedelta(hours=1)
+
+    aggregation = AggregationOptions(method=AggregationMethod.MEAN, interval='hour')
+    for _ in range(2):
+        client.data().load_dataframe(now - timedelta(hours=2), now, channels=['a'], aggregation=aggregation)
+    assert server.ranges()[-2:] == [(now - timedelta(hours=2), now)] * 2
+
+
+def test_least_recently_used_results_are_evicted(server: ResultServer, tmp_path: str) -> None:
+    client = _client(server, str(tmp_path))
+    for code in ('a', 'b', 'c'):
+        client.data().load_dataframe(_hours(0), _hours(1), channels=[code])
+    size = client.result_cache_stats().size // 3
+
+    small = _client(server, str(tmp_path), max_bytes=size * 2 + size // 2)
+    small.data().load_dataframe(_hours(0), _hours(1), channels=['a'])  # Touch 'a' so 'b' is the oldest.
+    small.data().load_dataframe(_hours(0), _hours(1), channels=['d'])
+    assert small.result_cache_stats().entries == 2
+    assert small.result_cache_stats().evictions == 2
+    requests = len(server.requests)
+    small.data().load_dataframe(_hours(0), _hours(1), channels=['a'])
+    assert len(server.requests) == requests
+    assert len([f for f in os.listdir(tmp_path) if f.endswith('.parquet')]) == 2
+
+
+def test_results_are_keyed_by_credentials(server: ResultServer, tmp_path: str) -> None:
+    client = _client(server, str(tmp_path))
+    client.connect(api_key='first')
+    client.data().load_dataframe(_hours(0), _hours(1), channels=['a'])
+    client.data().load_dataframe(_hours(0), _hours(1), channels=['a'])
+    assert len(server.requests) == 1
+    other = _client(server, str(tmp_path))
+    other.connect(api_key='second')
+    other.data().load_dataframe(_hours(0), _hours(1), channels=['a'])
+    assert len(server.requests) == 2
+
+
+def test_caches_sharing_a_directory_keep_every_entry(tmp_path: str) -> None:
+    frame = pd.DataFrame({'channel': ['a'], 'timestamp': [pd.Timestamp(_START)], 'value': [1.0]})
+    # Separate instances do not share a thread lock, like separate processes.
+    caches = [ResultCache(ResultCacheConfig(directory=str(tmp_path))) for _ in range(4)]
+
+    def fill(cache: ResultCache, prefix: int) -> None:
+        for i in range(10):
+            cache.put(f'{prefix}-{i}', _START, _START, frame)
+
+    threads = [threading.Thread(target=fill, args=(cache, n)) for n, cache in enumerate(caches)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert caches[0].stats().entries == 40
+    assert len([f for f in os.listdir(tmp_path) if f.endswith('.parquet')]) == 40
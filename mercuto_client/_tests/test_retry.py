@@ -0,0 +1,124 @@
+import email.parser
+import email.policy
+import io
+from typing import Any, Optional
+
+import pytest
+import requests
+
+from .. import (NO_RETRY, MercutoClient, MercutoHTTPException, RetryPolicy,
+                retry)
+from .conftest import FakeServer, RecordedRequest
+
+
+@pytest.fixture
+def sleeps(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    recorded: list[float] = []
+    monkeypatch.setattr(retry, 'sleep', recorded.append)
+    return recorded
+
+
+def test_get_retried_until_success(fake_server: FakeServer, sleeps: list[float]) -> None:
+    fake_server.respond(503)
+    fake_server.respond(502)
+    client = MercutoClient(fake_server.url, verify_ssl=False, retry=RetryPolicy(max_attempts=3, jitter=False, backoff_base=1))
+    assert client.request('/v2/data/channels', 'GET').status_code == 200
+    assert sleeps == [1, 2]
+    stats = client.retry_stats()
+    assert stats.requests == 1
+    assert stats.retries == 2
+    assert stats.by_status == {503: 1, 502: 1}
+
+
+def test_retry_after_is_honoured(fake_server: FakeServer, sleeps: list[float]) -> None:
+    fake_server.respond(429, headers={'Retry-After': '7'})
+    client = MercutoClient(fake_server.url, verify_ssl=False, retry=RetryPolicy(jitter=False))
+    client.request('/projects', 'GET')
+    assert sleeps == [7]
+
+
+def test_sample_insert_retried_but_not_other_puts(fake_server: FakeServer, sleeps: list[float]) -> None:
+    client = MercutoClient(fake_server.url, verify_ssl=False)
+
+    fake_server.respond(503)
+    client.request('/v2/data/samples/secondary', 'PUT', json={})
+    assert fake_server.calls() == ['PUT /v2/data/samples/secondary'] * 2
+
+    fake_server.requests.clear()
+    fake_server.respond(503)
+    with pytest.raises(MercutoHTTPException):
+        client.request('/v2/data/channels', 'PUT', json={})
+    assert fake_server.calls() == ['PUT /v2/data/channels']
+
+
+def test_per_call_override(fake_server: FakeServer, sleeps: list[float]) -> None:
+    client = MercutoClient(fake_server.url, verify_ssl=False)
+
+    fake_server.respond(503)
+    with pytest.raises(MercutoHTTPException):
+        client.request('/projects', 'GET', retry=False)
+
+    fake_server.respond(503)
+    client.request('/projects', 'POST', retry=True)
+    assert len(fake_server.requests) == 3
+
+
+def test_exhausted_attempts_raise(fake_server: FakeServer, sleeps: list[float]) -> None:
+    for _ in range(3):
+        fake_server.respond(503)
+    client = MercutoClient(fake_server.url, verify_ssl=False, retry=RetryPolicy(max_attempts=3))
+    with pytest.raises(MercutoHTTPException) as e:
+        client.request('/projects', 'GET')
+    assert e.value.status_code == 503
+    assert client.retry_stats().exhausted == 1
+
+    assert MercutoClient(fake_server.url, verify_ssl=False, retry=NO_RETRY).copy()._retry_policy.max_attempts == 1
+
+
+def _parts(request: RecordedRequest) -> list[tuple[Optional[str], Any]]:
+    message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+        f'Content-Type: {request.headers["Content-Type"]}\r\n\r\n'.encode() + request.body)
+    return [(part.get_filename(), part.get_payload(decode=True)) for part in message.iter_parts()]  # type: ignore[attr-defined]
+
+
+class _Unseekable(io.RawIOBase):
+    def __init__(self, data: bytes) -> None:
+        self._data = io.BytesIO(data)
+        self.name = 'stream.csv'
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        return self._data.readinto(buffer)
+
+
+def _fail_to_connect(monkeypatch: pytest.MonkeyPatch, times: int) -> None:
+    send = requests.Session.send
+    failures = [requests.ConnectTimeout('timed out')] * times
+
+    def flaky_send(session: requests.Session, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        if failures:
+            raise failures.pop()
+        return send(session, request, **kwargs)
+
+    monkeypatch.setattr(requests.Session, 'send', flaky_send)
+
+
+@pytest.mark.parametrize('make_file', [io.BytesIO, _Unseekable])
+def test_file_bodies_survive_connect_timeouts(fake_server: FakeServer, sleeps: list[float], monkeypatch: pytest.MonkeyPatch,
+                                              make_file: Any) -> None:
+    _fail_to_connect(monkeypatch, 2)
+    client = MercutoClient(fake_server.url, verify_ssl=False)
+    contents = b'a,b\n' + b''.join(b'%d,%d\n' % (i, i) for i in range(100))
+    client.request('/files', 'POST', files={'file': ('x.csv', make_file(contents), 'text/csv'), 'raw': make_file(contents)})
+
+    assert len(fake_server.requests) == 1 and len(sleeps) == 2
+    assert [payload for _, payload in _parts(fake_server.requests[0])] == [contents, contents]
+
+
+def test_upload_file_survives_connect_timeout(fake_server: FakeServer, sleeps: list[float], monkeypatch: pytest.MonkeyPatch) -> None:
+    _fail_to_connect(monkeypatch, 1)
+    contents = b'a,b\n1,2\n3,4\n'
+    MercutoClient(fake_server.url, verify_ssl=False).data().upload_file('p', 'dt', io.BytesIO(contents), filename='x.csv')
+    assert _parts(fake_server.requests[0]) == [('x.csv', contents)]
@@ -0,0 +1,76 @@
+import math
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+import pytz
+
+from .. import MercutoClient
+from ..modules._samples import decode_sample_tuples, encode_sample_tuples
+from ..modules.data import (MetricDataSample, MetricSample,
+                            SecondaryDataSample, SecondarySample,
+                            _MetricSamplelistAdapter,
+                            _SecondarySamplelistAdapter)
+from .conftest import FakeServer
+
+_START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+_AWKWARD = [
+    SecondarySample('c1', _START, 1.0),
+    SecondarySample('c"2', _START + timedelta(microseconds=500), 1e20),
+    SecondarySample('c3', pytz.timezone('Australia/Brisbane').localize(datetime(2024, 1, 1, 10)), -0.0),
+    SecondarySample('c4', datetime(2024, 1, 1, 10), math.nan),
+    SecondarySample('ç5', _START, -math.inf),
+    SecondarySample('c6', _START, 3),  # type: ignore[arg-type]
+]
+
+
+def test_tuple_encoding_matches_models() -> None:
+    assert encode_sample_tuples(_AWKWARD) == _SecondarySamplelistAdapter.dump_json([s.to_model() for s in _AWKWARD])
+    metric = [MetricSample(s.channel, s.timestamp, s.value, 'e"1') for s in _AWKWARD]
+    assert encode_sample_tuples(metric, with_event=True) == _MetricSamplelistAdapter.dump_json([s.to_model() for s in metric])
+    # Models mixed in with tuples are encoded the same way.
+    assert encode_sample_tuples([_AWKWARD[0].to_model(), _AWKWARD[1]]) == encode_sample_tuples(_AWKWARD[:2])
+
+
+def test_tuple_decoding_matches_models() -> None:
+    body = _SecondarySamplelistAdapter.dump_json([s.to_model() for s in _AWKWARD])
+    decoded = decode_sample_tuples(body, SecondarySample)
+    expected = [SecondarySample.from_model(m) for m in _SecondarySamplelistAdapter.validate_json(body)]
+    assert [(s.channel, s.timestamp, s.value) for s in decoded if not math.isnan(s.value)] == \
+        [(s.channel, s.timestamp, s.value) for s in expected if not math.isnan(s.value)]
+    assert all(isinstance(s, SecondarySample) for s in decoded)
+    assert decode_sample_tuples(b'[{"channel":"a","timestamp":"2024-01-01T00:00:00.5+10:00","value":1,"event":"e"}]',
+                                MetricSample, with_event=True) == [
+        MetricSample('a', datetime(2024, 1, 1, 0, 0, 0, 500000, tzinfo=timezone(timedelta(hours=10))), 1.0, 'e')]
+
+
+def test_insert_and_load_tuples(fake_server: FakeServer) -> None:
+    client = MercutoClient(fake_server.url, verify_ssl=False)
+    client.data().insert_secondary_samples('p1', _AWKWARD)
+    client.data().insert_secondary_samples('p1', [s.to_model() for s in _AWKWARD])
+    assert fake_server.requests[0].body == fake_server.requests[1].body
+
+    fake_server.respond(body=b'[{"channel":"c1","timestamp":"2024-01-01T00:00:00Z","value":NaN,"event":"e1"}]')
+    samples = client.data().load_metric_samples_compact(['c1'], project='p1')
+    assert samples[0][:2] == ('c1', _START) and math.isnan(samples[0].value) and samples[0].event == 'e1'
+    assert fake_server.requests[-1].query == {'limit': ['100'], 'project': ['p1'], 'channels': ['c1']}
+    assert isinstance(samples[0].to_model(), MetricDataSample)
+
+
+def _allocated(build) -> int:  # type: ignore[no-untyped-def]
+    tracemalloc.start()
+    try:
+        kept = build()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del kept
+    return size
+
+
+def test_tuples_use_a_fraction_of_model_memory() -> None:
+    timestamps = [_START + timedelta(seconds=i) for i in range(20_000)]
+    models = _allocated(lambda: [SecondaryDataSample(channel='c1', timestamp=t, value=1.5) for t in timestamps])
+    tuples = _allocated(lambda: [SecondarySample('c1', t, 1.5) for t in timestamps])
+    # Roughly 100 bytes per tuple against several hundred per model instance.
+    assert tuples * 3 < models
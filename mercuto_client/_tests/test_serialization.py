@@ -0,0 +1,44 @@
+import gzip
+import json
+from datetime import datetime, timedelta, timezone
+
+from .. import CompressionConfig, MercutoClient
+from ..modules.data import (MetricDataSample, SecondaryDataSample,
+                            _SecondarySamplelistAdapter)
+from .conftest import FakeServer
+
+_START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def test_secondary_samples_encoded_in_one_pass(fake_server: FakeServer) -> None:
+    client = MercutoClient(fake_server.url, verify_ssl=False)
+    samples = [SecondaryDataSample(channel='c1', timestamp=_START + timedelta(seconds=i), value=float(i)) for i in range(5001)]
+    samples[3] = SecondaryDataSample(channel='c1', timestamp=_START, value=float('nan'))
+    client.data().insert_secondary_samples('p1', samples)
+
+    assert fake_server.calls() == ['PUT /v2/data/samples/secondary'] * 2
+    # Batches are uploaded concurrently, so they may arrive in either order.
+    first, second = sorted(fake_server.requests, key=lambda r: len(r.body), reverse=True)
+    assert first.headers['Content-Type'] == 'application/json'
+    assert first.query == {'project': ['p1']}
+    assert b'"value":NaN' in first.body
+    decoded = json.loads(first.body)
+    assert len(decoded) == 5000
+    assert decoded[0] == {'channel': 'c1', 'timestamp': '2024-01-01T00:00:00Z', 'value': 0.0}
+    assert len(json.loads(second.body)) == 1
+
+
+def test_metric_samples_keep_nan(fake_server: FakeServer) -> None:
+    client = MercutoClient(fake_server.url, verify_ssl=False)
+    client.data().insert_metric_samples('p1', [MetricDataSample(channel='c1', timestamp=_START, value=float('inf'), event='e1')])
+    assert json.loads(fake_server.requests[0].body) == [
+        {'channel': 'c1', 'timestamp': '2024-01-01T00:00:00Z', 'value': float('inf'), 'event': 'e1'}]
+
+
+def test_request_accepts_encoded_bytes(fake_server: FakeServer) -> None:
+    client = MercutoClient(fake_server.url, verify_ssl=False, compression=CompressionConfig(threshold=0))
+    body = _SecondarySamplelistAdapter.dump_json([SecondaryDataSample(channel='c1', timestamp=_START, value=1.0)])
+    client.request('/v2/data/samples/secondary', 'PUT', json=body)
+    request = fake_server.requests[0]
+    assert request.headers['Content-Type'] == 'application/json'
+    assert gzip.decompress(request.body) == body
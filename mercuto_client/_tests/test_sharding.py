@@ -0,0 +1,106 @@
+import io
+import itertools
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pytest
+
+from .. import MercutoClient
+from ..modules._sharding import effective_period, plan_shards
+from ..modules.data import Channel, ChannelClassification
+from .conftest import FakeResponse, FakeServer, RecordedRequest
+
+_START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _channel(code: str, period: timedelta | None) -> Channel:
+    return Channel(code=code, project='p1', units=None, sampling_period=period, classification=ChannelClassification.SECONDARY,
+                   label=code, metric=None, source=None, aggregate=None, value_range_min=None, value_range_max=None,
+                   multiplier=1.0, offset=0.0, last_valid_timestamp=None, is_wallclock_interval=False)
+
+
+def test_plan_covers_range_within_budget() -> None:
+    channels = [(f'fast{i}', timedelta(seconds=1)) for i in range(3)] + [(f'slow{i}', timedelta(minutes=10)) for i in range(50)]
+    end = _START + timedelta(days=30)
+    shards = plan_shards(channels, _START, end, max_samples=500_000, max_channels=40)
+
+    assert all(shard.expected_samples <= 500_000 for shard in shards)
+    assert all(len(shard.channels) <= 40 for shard in shards)
+    # Slow channels are grouped apart from fast ones and need a single window.
+    slow = [shard.channels for shard in shards if shard.channels[0].startswith('slow')]
+    assert sorted(map(len, slow)) == [10, 40]
+    assert all(code.startswith('slow') for group in slow for code in group)
+    for code, _ in channels:
+        windows = sorted((s.start_time, s.end_time) for s in shards if code in s.channels)
+        assert windows[0][0] == _START and windows[-1][1] == end
+        assert all(a[1] == b[0] for a, b in zip(windows, windows[1:]))
+    fast = [s for s in shards if s.channels[0].startswith('fast')]
+    # Each 1Hz channel has 2.6M samples over 30 days and gets six windows of its own.
+    assert len(fast) == 18 and all(len(s.channels) == 1 for s in fast)
+
+
+def test_aggregation_coarsens_period() -> None:
+    assert effective_period(timedelta(seconds=1), 'day') == timedelta(days=1)
+    assert effective_period(timedelta(hours=2), timedelta(minutes=1)) == timedelta(hours=2)
+    assert effective_period(None) == timedelta(minutes=1)
+    with pytest.raises(ValueError):
+        plan_shards([('a', timedelta(seconds=1))], _START, _START)
+
+
+class ShardedServer:
+    """
+    Answers data requests with a Parquet file holding one sample per channel per minute, boundaries included.
+    Each request reports in progress on creation and completes on its first poll.
+    """
+
+    def __init__(self, fake_server: FakeServer) -> None:
+        self.url = fake_server.url
+        self.bodies: dict[str, dict] = {}
+        self.polls = 0
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        fake_server.handler = self
+
+    def _status(self, request_id: str, done: bool) -> bytes:
+        result = {'result_url': f'{self.url}/results/{request_id}', 'expires_at': '2030-01-01T00:00:00Z',
+                  'mime_type': 'application/parquet', 'file_size': 0, 'metadata': {'first_timestamp': None}}
+        return json.dumps({'request_id': request_id, 'status_code': 200 if done else 202, 'message': '',
+                           'requested_at': None, 'completed_at': None, 'result': result if done else None}).encode()
+
+    def __call__(self, request: RecordedRequest) -> FakeResponse:
+        if request.method == 'POST':
+            with self._lock:
+                request_id = f'r{next(self._ids)}'
+                self.bodies[request_id] = json.loads(request.body)
+            return FakeResponse(body=self._status(request_id, done=False))
+        kind, request_id = request.path.split('/')[-2:]
+        if kind == 'requests':
+            with self._lock:
+                self.polls += 1
+            return FakeResponse(body=self._status(request_id, done=True))
+        body = self.bodies[request_id]
+        times = pd.date_range(body['start_time'], body['end_time'], freq='min')
+        frame = pd.DataFrame([(c, t, t.minute) for t in times for c in body['channels']], columns=['channel', 'timestamp', 'value'])
+        buffer = io.BytesIO()
+        frame.to_parquet(buffer, index=False)
+        return FakeResponse(body=buffer.getvalue())
+
+
+def test_load_sharded_dataframe_merges_in_order(fake_server: FakeServer) -> None:
+    server = ShardedServer(fake_server)
+    client = MercutoClient(fake_server.url, verify_ssl=False)
+    channels = [_channel('a', timedelta(minutes=1)), _channel('b', timedelta(minutes=1)), _channel('c', None)]
+    end = _START + timedelta(hours=10)
+
+    frame = client.data().load_sharded_dataframe(channels, _START, end, project='p1', max_samples_per_request=400,
+                                                 poll_interval=0.01)
+
+    # 600 samples per channel over 10 hours: every channel is requested on its own in two windows.
+    assert len(server.bodies) == 6
+    assert server.polls == 6
+    assert len(frame) == 3 * 601
+    assert frame['timestamp'].is_monotonic_increasing
+    assert not frame.duplicated(['channel', 'timestamp']).any()
+    assert list(frame['channel'][:3]) == ['a', 'b', 'c']
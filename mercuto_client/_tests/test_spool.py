@@ -0,0 +1,230 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import pytest
+
+from .. import MercutoClient, MercutoHTTPException, RetryPolicy, SpoolConfig
+from ..dedup import HighWaterMarks
+from ..modules.data import SecondarySample
+from .conftest import FakeResponse, FakeServer, RecordedRequest
+
+_START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class SampleServer:
+    def __init__(self, fake_server: FakeServer) -> None:
+        self.available = False
+        self.max_samples = 1_000_000
+        self.delay = 0.0
+        self.bodies: list[list[dict]] = []
+        self.keys: list[Optional[str]] = []
+        self._lock = threading.Lock()
+        fake_server.handler = self
+
+    def __call__(self, request: RecordedRequest) -> FakeResponse:
+        if not self.available:
+            return FakeResponse(status=503, body=b'{"detail": "down"}')
+        body = json.loads(request.body)
+        if any(sample['channel'] == 'bad' for sample in body):
+            return FakeResponse(status=422, body=b'{"detail": "unknown channel"}')
+        if len(body) > self.max_samples:
+            return FakeResponse(status=413, body=b'{"detail": "too large"}')
+        time.sleep(self.delay)
+        with self._lock:
+            self.bodies.append(body)
+            self.keys.append(request.headers.get('X-Api-Key'))
+        return FakeResponse()
+
+    def samples(self) -> list[tuple[str, float]]:
+        return [(sample['channel'], sample['value']) for body in self.bodies for sample in body]
+
+
+def _client(fake_server: FakeServer, path: str, api_key: Optional[str] = None) -> MercutoClient:
+    # A long backoff keeps the flusher out of the way once it has failed, so the tests drain the spool with flush().
+    client = MercutoClient(fake_server.url, verify_ssl=False, retry=RetryPolicy(max_attempts=1),
+                           spool=SpoolConfig(path=path, batch_size=25, backoff_base=60))
+    if api_key is not None:
+        client.connect(api_key=api_key)
+    return client
+
+
+def _samples(channel: str, count: int, first: int = 0) -> list[SecondarySample]:
+    return [SecondarySample(channel, _START + timedelta(seconds=i), float(i)) for i in range(first, first + count)]
+
+
+def test_inserts_are_spooled_during_outage_and_sent_in_order(fake_server: FakeServer, tmp_path: str) -> None:
+    server = SampleServer(fake_server)
+    client = _client(fake_server, f'{tmp_path}/spool.sqlite3')
+    spool = client.spool()
+    assert spool is not None
+
+    inserts = [_samples('a', 10), _samples('b', 30), _samples('a', 10, first=10)]
+    for samples in inserts:
+        report = client.data().insert_secondary_samples('p1', samples)
+        assert report.ok and report.inserted == len(samples)
+    assert client.spool_stats().pending == 50
+    with pytest.raises(MercutoHTTPException, match='down'):
+        spool.flush()
+
+    server.available = True
+    assert spool.flush()
+    stats = client.spool_stats()
+    assert (stats.pending, stats.lag, stats.sent) == (0, 0, 50)
+    assert stats.failures >= 2
+    assert server.samples() == [(s.channel, s.value) for samples in inserts for s in samples]
+    # Inserts are spooled in batches of up to batch_size samples, consecutive ones are merged up to the same size.
+    assert [len(body) for body in server.bodies] == [10, 25, 15]
+    spool.close()
+
+
+def test_rejected_insert_is_set_aside(fake_server: FakeServer, tmp_path: str) -> None:
+    server = SampleServer(fake_server)
+    client = _client(fake_server, f'{tmp_path}/spool.sqlite3')
+    spool = client.spool()
+    assert spool is not None
+    for channel in ['a', 'bad', 'c']:
+        client.data().insert_secondary_samples('p1', _samples(channel, 5))
+
+    server.available = True
+    assert spool.flush()
+    assert server.samples() == [(s.channel, s.value) for s in _samples('a', 5) + _samples('c', 5)]
+    stats = client.spool_stats()
+    assert (stats.pending, stats.rejected) == (0, 5)
+    assert stats.last_error is not None and 'unknown channel' in stats.last_error
+    spool.close()
+
+
+def test_pending_samples_survive_restart(fake_server: FakeServer, tmp_path: str) -> None:
+    server = SampleServer(fake_server)
+    path = f'{tmp_path}/spool.sqlite3'
+    client = _client(fake_server, path)
+    client.data().insert_secondary_samples('p1', _samples('a', 5))
+    client.spool().close()  # type: ignore[union-attr]
+
+    server.available = True
+    restarted = _client(fake_server, path)
+    assert restarted.spool_stats().pending == 5
+    restarted.spool().start()  # type: ignore[union-attr]
+    deadline = time.monotonic() + 5
+    while restarted.spool_stats().pending and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert server.samples() == [('a', float(i)) for i in range(5)]
+    assert fake_server.requests[-1].query['project'] == ['p1']
+    restarted.spool().close()  # type: ignore[union-attr]
+
+
+def test_samples_are_sent_with_the_credentials_they_were_inserted_with(fake_server: FakeServer, tmp_path: str) -> None:
+    server = SampleServer(fake_server)
+    path = f'{tmp_path}/spool.sqlite3'
+    first = _client(fake_server, path, api_key='first')
+    first.data().insert_secondary_samples('p1', _samples('a', 5))
+    first.spool().close()  # type: ignore[union-attr]
+    second = _client(fake_server, path, api_key='second')
+    assert second.spool_stats().pending == 0
+    second.data().insert_secondary_samples('p1', _samples('b', 3))
+
+    server.available = True
+    assert second.spool().flush()  # type: ignore[union-attr]
+    assert (server.samples(), server.keys) == ([('b', float(i)) for i in range(3)], ['second'])
+    first = _client(fake_server, path, api_key='first')
+    assert first.spool_stats().pending == 5
+    assert first.spool().flush()  # type: ignore[union-attr]
+    assert server.keys == ['second', 'first']
+    for client in (first, second):
+        client.spool().close()  # type: ignore[union-attr]
+
+
+def test_oversized_requests_are_split(fake_server: FakeServer, tmp_path: str) -> None:
+    server = SampleServer(fake_server)
+    server.max_samples = 10
+    client = _client(fake_server, f'{tmp_path}/spool.sqlite3')
+    for first in range(0, 30, 6):
+        client.data().insert_secondary_samples('p1', _samples('a', 6, first=first))
+
+    server.available = True
+    assert client.spool().flush()  # type: ignore[union-attr]
+    assert server.samples() == [('a', float(i)) for i in range(30)]
+    # Merged requests of 24 samples were rejected as too large and re-sent in halves, nothing was set aside.
+    assert max(len(body) for body in server.bodies) <= 10
+    assert (client.spool_stats().pending, client.spool_stats().rejected) == (0, 0)
+    client.spool().close()  # type: ignore[union-attr]
+
+
+def test_concurrent_flushers_send_every_sample_once(fake_server: FakeServer, tmp_path: str) -> None:
+    server = SampleServer(fake_server)
+    server.delay = 0.005
+    path = f'{tmp_path}/spool.sqlite3'
+    clients = [_client(fake_server, path, api_key='key') for _ in range(3)]
+    inserts = [_samples(channel, 5, first=5 * i) for i in range(10) for channel in 'ab']
+    for samples in inserts:
+        clients[0].data().insert_secondary_samples('p1', samples)
+
+    server.available = True
+    threads = [threading.Thread(target=client.spool().flush) for client in clients]  # type: ignore[union-attr]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert server.samples() == [(s.channel, s.value) for samples in inserts for s in samples]
+    for client in clients:
+        client.spool().close()  # type: ignore[union-attr]
+
+
+def test_columnar_inserts_are_spooled(fake_server: FakeServer, tmp_path: str) -> None:
+    server = SampleServer(fake_server)
+    client = _client(fake_server, f'{tmp_path}/spool.sqlite3')
+    samples = _samples('a', 12)
+    assert client.data().insert_secondary_columns('p1', 'a', [s.timestamp for s in samples], [s.value for s in samples],
+                                                  batch_size=5).inserted == 12
+    assert client.spool_stats().pending == 12
+
+    server.available = True
+    assert client.spool().flush()  # type: ignore[union-attr]
+    assert server.samples() == [('a', float(i)) for i in range(12)]
+    client.spool().close()  # type: ignore[union-attr]
+
+
+def test_close_during_a_send_lets_the_flusher_finish(fake_server: FakeServer, tmp_path: str,
+                                                     caplog: pytest.LogCaptureFixture) -> None:
+    server = SampleServer(fake_server)
+    server.available = True
+    server.delay = 1.0
+    path = f'{tmp_path}/spool.sqlite3'
+    client = _client(fake_server, path)
+    spool = client.spool()
+    assert spool is not None
+    client.data().insert_secondary_samples('p1', _samples('a', 5))
+    deadline = time.monotonic() + 5
+    while not fake_server.requests and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    with caplog.at_level(logging.WARNING, logger='mercuto_client.spool'):
+        started = time.monotonic()
+        spool.close(timeout=0.01)
+        # close() does not wait for the send, the flusher closes the database once the send is done.
+        assert time.monotonic() - started < 0.5
+        assert spool._thread is not None
+        spool._thread.join(5)
+    assert not caplog.records
+    assert server.samples() == [('a', float(i)) for i in range(5)]
+    with pytest.raises(sqlite3.ProgrammingError):
+        spool.stats()
+    reopened = _client(fake_server, path)
+    assert reopened.spool_stats().pending == 0
+    reopened.spool().close()  # type: ignore[union-attr]
+
+
+def test_spooled_inserts_do_not_advance_high_water_marks(fake_server: FakeServer, tmp_path: str) -> None:
+    SampleServer(fake_server)
+    client = _client(fake_server, f'{tmp_path}/spool.sqlite3')
+    marks = HighWaterMarks()
+    report = client.data().insert_secondary_samples('p1', _samples('a', 5), high_water_marks=marks)
+
+    assert report.inserted == 5
+    assert marks.get('a') is None
+    client.spool().close()  # type: ignore[union-attr]
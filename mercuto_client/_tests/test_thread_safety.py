@@ -0,0 +1,95 @@
+import concurrent.futures
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import requests
+
+from .. import MercutoClient, PoolConfig
+from ..modules.data import SecondarySample
+from .conftest import FakeResponse, FakeServer, RecordedRequest
+
+THREADS = 32
+
+
+def _echo_identity(request: RecordedRequest) -> FakeResponse:
+    # Hand every identity a session cookie so any cookie leaking between identities shows up in later requests.
+    key = request.headers.get('X-Api-Key', '')
+    time.sleep(0.02)
+    return FakeResponse(headers={'Set-Cookie': f'sid={key}; Path=/'})
+
+
+def test_shared_client_serves_worker_pool_without_cross_talk(fake_server: FakeServer) -> None:
+    fake_server.handler = _echo_identity
+    client = MercutoClient(fake_server.url, verify_ssl=False, thread_safe=True,
+                           pool=PoolConfig(max_per_host=THREADS, block=True))
+    start = threading.Barrier(THREADS)
+
+    def work(worker: int) -> set[int]:
+        start.wait()
+        assert client.data() is client.data()
+        sessions = set()
+        with client.as_credentials(api_key=f'key-{worker}') as scoped:
+            for _ in range(4):
+                scoped.request('/healthcheck', 'GET')
+                sessions.add(id(scoped.session()))
+        return sessions
+
+    began = time.monotonic()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=THREADS) as executor:
+        results = list(executor.map(work, range(THREADS)))
+    elapsed = time.monotonic() - began
+
+    assert all(len(sessions) == 1 for sessions in results)
+    assert len(set.union(*results)) == THREADS
+    assert len(fake_server.requests) == THREADS * 4
+    for request in fake_server.requests:
+        cookie = request.headers.get('Cookie')
+        assert cookie is None or cookie == f"sid={request.headers['X-Api-Key']}"
+    # 128 requests of 20ms each would take over 2.5s if they were serialised.
+    assert elapsed < 1.5
+    assert client.pool_stats().new_connections <= THREADS
+
+
+def test_module_instances_are_built_once() -> None:
+    client = MercutoClient('http://localhost', verify_ssl=False, thread_safe=True)
+    barrier = threading.Barrier(THREADS)
+
+    def get_module(_: int) -> object:
+        barrier.wait()
+        return client.core()
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=THREADS) as executor:
+        assert len({id(module) for module in executor.map(get_module, range(THREADS))}) == 1
+
+
+def test_default_mode_keeps_single_session() -> None:
+    client = MercutoClient('http://localhost', verify_ssl=False)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        assert len({id(s) for s in executor.map(lambda _: client.session(), range(4))}) == 1
+
+
+def test_default_mode_gives_internal_workers_their_own_sessions(fake_server: FakeServer, monkeypatch: pytest.MonkeyPatch) -> None:
+    fake_server.handler = lambda request: FakeResponse(status=202)
+    used: dict[str, set[int]] = {}
+    lock = threading.Lock()
+    send = requests.Session.send
+
+    def recording_send(session: requests.Session, *args, **kwargs) -> requests.Response:
+        with lock:
+            used.setdefault(threading.current_thread().name, set()).add(id(session))
+        time.sleep(0.02)
+        return send(session, *args, **kwargs)
+
+    monkeypatch.setattr(requests.Session, 'send', recording_send)
+    client = MercutoClient(fake_server.url, verify_ssl=False)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    samples = [SecondarySample('c1', start + timedelta(seconds=i), float(i)) for i in range(40)]
+    assert client.data().insert_secondary_samples('p1', samples, batch_size=5, max_in_flight=4).inserted == 40
+
+    workers = {name: sessions for name, sessions in used.items() if name.startswith('mercuto-upload')}
+    assert len(workers) > 1
+    assert all(len(sessions) == 1 for sessions in workers.values())
+    assert len(set.union(*workers.values())) == len(workers)
+    assert id(client.session()) not in set.union(*workers.values())
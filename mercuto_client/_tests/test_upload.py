@@ -0,0 +1,97 @@
+import email.parser
+import email.policy
+import io
+
+import pytest
+
+from .. import MercutoClient, MercutoHTTPException, RetryPolicy
+from ..modules._chunked import UploadProgress
+from .conftest import FakeResponse, FakeServer, RecordedRequest
+
+_HEADER = (b'"TOA5","1174","GRANITE9"\r\n"TIMESTAMP","RECORD","VWu_1"\r\n"TS","RN",""\r\n"","","Smp"\r\n')
+_ROWS = [f'"2023-12-07 {i // 60:02}:{i % 60:02}:00",{i},{i * 0.5}\r\n'.encode() for i in range(400)]
+_FILE = _HEADER + b''.join(_ROWS)
+
+
+def _uploaded(request: RecordedRequest) -> bytes:
+    message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+        f'Content-Type: {request.headers["Content-Type"]}\r\n\r\n'.encode() + request.body)
+    part = next(message.iter_parts())  # type: ignore[attr-defined]
+    payload = part.get_payload(decode=True)
+    assert isinstance(payload, bytes)
+    return payload
+
+
+class UploadServer:
+    def __init__(self, fake_server: FakeServer, fail_at: int = -1) -> None:
+        self.files: list[bytes] = []
+        self.fail_at = fail_at
+        fake_server.handler = self
+
+    def __call__(self, request: RecordedRequest) -> FakeResponse:
+        if len(self.files) == self.fail_at:
+            return FakeResponse(status=503, body=b'{"detail": "busy"}')
+        self.files.append(_uploaded(request))
+        return FakeResponse()
+
+
+def _client(fake_server: FakeServer) -> MercutoClient:
+    return MercutoClient(fake_server.url, verify_ssl=False, retry=RetryPolicy(max_attempts=2, backoff_base=0.001))
+
+
+def test_large_file_is_sent_in_whole_line_chunks(fake_server: FakeServer, tmp_path: str) -> None:
+    server = UploadServer(fake_server)
+    path = f'{tmp_path}/backfill.dat'
+    with open(path, 'wb') as f:
+        f.write(_FILE)
+    progress: list[UploadProgress] = []
+
+    _client(fake_server).data().upload_file('p1', 'dt1', path, chunk_size=4000, on_progress=progress.append)
+
+    assert len(server.files) == len(progress) > 1
+    assert all(chunk.startswith(_HEADER) and chunk.endswith(b'\r\n') for chunk in server.files)
+    assert b''.join(chunk[len(_HEADER):] for chunk in server.files) == b''.join(_ROWS)
+    assert progress[-1] == UploadProgress(offset=len(_FILE), total=len(_FILE), chunks=len(server.files))
+    assert progress[-1].done
+    assert fake_server.requests[0].query['datatable'] == ['dt1']
+
+
+def test_failed_chunk_resumes_from_last_acknowledged_offset(fake_server: FakeServer) -> None:
+    server = UploadServer(fake_server, fail_at=3)
+    client = _client(fake_server)
+    progress: list[UploadProgress] = []
+
+    with pytest.raises(MercutoHTTPException, match='busy'):
+        client.data().upload_file('p1', 'dt1', _FILE, chunk_size=2000, on_progress=progress.append)
+    # The failed chunk was retried before giving up.
+    assert len(server.files) == 3 and len(fake_server.requests) == 5
+
+    server.fail_at = -1
+    client.data().upload_file('p1', 'dt1', io.BytesIO(_FILE), chunk_size=2000, resume_from=progress[-1].offset)
+    assert b''.join(chunk[len(_HEADER):] for chunk in server.files) == b''.join(_ROWS)
+
+
+def test_small_files_use_a_single_request(fake_server: FakeServer) -> None:
+    server = UploadServer(fake_server)
+    _client(fake_server).data().upload_file('p1', 'dt1', io.StringIO(_FILE.decode()), chunk_size=100)
+    _client(fake_server).data().upload_file('p1', 'dt1', _FILE)
+    assert server.files == [_FILE, _FILE]
+
+
+@pytest.mark.parametrize('header', [b'"TIMESTAMP","VWu_1"\r\n', b'"Datalogger","compacted"\r\n"Date-and-time","VWu_1"\r\n',
+                                    b''.join(b'"Node ID","%d"\r\n' % i for i in range(9)) + b'"Date-and-time","VWu_1"\r\n'])
+def test_header_lines_follow_file_format(fake_server: FakeServer, header: bytes) -> None:
+    server = UploadServer(fake_server)
+    rows = [f'"2023-12-07 {i // 60:02}:{i % 60:02}:00",{i * 0.5}\r\n'.encode() for i in range(400)]
+    _client(fake_server).data().upload_file('p1', 'dt1', header + b''.join(rows), chunk_size=2000)
+
+    assert len(server.files) > 1
+    assert all(chunk.startswith(header) for chunk in server.files)
+    assert b''.join(chunk[len(header):] for chunk in server.files) == b''.join(rows)
+
+
+def test_streams_cannot_resume(fake_server: FakeServer) -> None:
+    UploadServer(fake_server)
+    with pytest.raises(ValueError, match='resume_from'):
+        _client(fake_server).data().upload_file('p1', 'dt1', io.StringIO(_FILE.decode()), resume_from=100)
+    assert not fake_server.requests
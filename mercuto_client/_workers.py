@@ -0,0 +1,24 @@
+import concurrent.futures
+import threading
+
+_local = threading.local()
+
+
+def mark_worker_thread() -> None:
+    """
+    Mark the calling thread as started by the client. `MercutoClient.session()` gives such threads their own session
+    even outside thread-safe mode, as a requests.Session must not be used from several threads at once.
+    """
+    _local.worker = True
+
+
+def is_worker_thread() -> bool:
+    return getattr(_local, 'worker', False)
+
+
+def worker_pool(max_workers: int, thread_name_prefix: str) -> concurrent.futures.ThreadPoolExecutor:
+    """
+    Thread pool for the client's own concurrent work, its threads are marked with `mark_worker_thread`.
+    """
+    return concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix,
+                                                 initializer=mark_worker_thread)
@@ -0,0 +1,6 @@
+"""
+asyncio interface to the Mercuto API. Requires the optional `httpx` dependency.
+"""
+from .client import AsyncMercutoClient
+
+__all__ = ['AsyncMercutoClient']
@@ -0,0 +1,244 @@
+import contextlib
+import json as json_stdlib
+import logging
+import os
+import time
+from typing import (TYPE_CHECKING, Any, AsyncIterator, Literal, Mapping,
+                    Optional, Protocol, Type, TypeVar, Union)
+
+try:
+    import httpx
+except ImportError as e:  # pragma: no cover
+    raise ImportError("AsyncMercutoClient requires httpx. Install it with `pip install mercuto-client[async]`.") from e
+
+from .._authentication import (IAuthenticationMethod,
+                               create_authentication_method)
+from ..exceptions import MercutoClientException, MercutoHTTPException
+
+if TYPE_CHECKING:
+    from .modules.alerts import AsyncMercutoAlertService
+    from .modules.connect import AsyncMercutoConnectService
+    from .modules.core import AsyncMercutoCoreService
+    from .modules.data import AsyncMercutoDataService
+    from .modules.fatigue import AsyncMercutoFatigueService
+    from .modules.identity import AsyncMercutoIdentityService
+    from .modules.media import AsyncMercutoMediaService
+    from .modules.notifications import AsyncMercutoNotificationService
+    from .modules.reports import AsyncMercutoReportService
+
+logger = logging.getLogger(__name__)
+
+
+class _AsyncModuleBase(Protocol):
+    def __init__(self, client: 'AsyncMercutoClient', *args: Any, **kwargs: Any) -> None:
+        pass
+
+
+_T = TypeVar('_T', bound=_AsyncModuleBase)
+
+
+class AsyncMercutoClient:
+    """
+    asyncio counterpart of `MercutoClient`.
+
+    Exposes the same service modules (`data()`, `core()`, ...) with coroutine methods that return the same
+    pydantic models as the blocking client, so calls can be fanned out with `asyncio.gather`:
+
+    ```python
+    async with AsyncMercutoClient().connect(api_key='<YOUR API KEY>') as client:
+        projects = await asyncio.gather(*(client.core().get_project(code) for code in codes))
+    ```
+
+    All copies made with `copy()` or `as_credentials()` share the same underlying `httpx.AsyncClient`
+    and connection pool. Call `aclose()` (or use the client as an async context manager) when finished.
+    """
+
+    def __init__(self, url: Optional[str] = None, verify_ssl: bool = True,
+                 active_session: Optional[httpx.AsyncClient] = None) -> None:
+        if url is None:
+            url = os.environ.get('MERCUTO_API_URL', 'https://api.rockfieldcloud.com.au')
+        assert isinstance(url, str)
+
+        if url.endswith('/'):
+            url = url[:-1]
+
+        if verify_ssl and not url.startswith('https://'):
+            raise ValueError(f'Url must be https, is {url}')
+
+        self._url = url
+        self.verify_ssl = verify_ssl
+
+        if active_session is None:
+            self._current_session = httpx.AsyncClient(verify=verify_ssl)
+        else:
+            self._current_session = active_session
+
+        self._auth_method: Optional[IAuthenticationMethod] = None
+
+        self._modules: dict[str, _AsyncModuleBase] = {}
+
+    def url(self) -> str:
+        return self._url
+
+    def credentials_key(self) -> str:
+        """
+        Generate a unique key that identifies the current credentials set.
+        """
+        if self._auth_method is None:
+            raise MercutoClientException("No credentials set")
+        return self._auth_method.unique_key()
+
+    def copy(self) -> 'AsyncMercutoClient':
+        return AsyncMercutoClient(self._url, self.verify_ssl, self._current_session)
+
+    @contextlib.asynccontextmanager
+    async def as_credentials(self, api_key: Optional[str] = None,
+                             service_token: Optional[str] = None,
+                             bearer_token: Optional[str] = None,
+                             headers: Optional[Mapping[str, str]] = None) -> AsyncIterator['AsyncMercutoClient']:
+        """
+        Same as .connect(), but as a context manager. Will automatically logout when exiting the context.
+        The underlying connection pool is shared with this client and is not closed on exit.
+        """
+        other = self.copy()
+        try:
+            yield other.connect(api_key=api_key, service_token=service_token, bearer_token=bearer_token, headers=headers)
+        finally:
+            other.logout()
+
+    def connect(self, *, api_key: Optional[str] = None,
+                service_token: Optional[str] = None,
+                bearer_token: Optional[str] = None,
+                headers: Optional[Mapping[str, str]] = None) -> 'AsyncMercutoClient':
+        """
+        Attempt to connect using any available method. See `MercutoClient.connect()`.
+        """
+        authentication = create_authentication_method(api_key=api_key, service_token=service_token, bearer_token=bearer_token, headers=headers)
+        self.login(authentication)
+        return self
+
+    def _update_headers(self, headers: Mapping[str, str]) -> dict[str, str]:
+        base: dict[str, str] = {}
+
+        if self._auth_method is not None:
+            self._auth_method.update_header(base)
+        base.update(headers)
+        return base
+
+    def session(self) -> httpx.AsyncClient:
+        return self._current_session
+
+    async def request(self, url: str, method: Literal['GET', 'POST', 'PUT', 'DELETE', 'PATCH', 'HEAD', 'OPTIONS'],
+                      params: Optional[dict[str, Any]] = None,
+                      json: Optional[Union[dict[str, Any], bytes]] = None,
+                      raise_for_status: bool = True,
+                      **kwargs: Any) -> httpx.Response:
+        """
+        Make an HTTP request to the Mercuto API.
+        :param url: The URL path (relative to the base API URL) to make the request to.
+        :param method: The HTTP method to use (e.g., 'GET', 'POST', etc.).
+        :param params: Optional dictionary of query parameters to include in the request.
+        :param json: Optional dictionary to send as a JSON payload in the request body.
+            Bytes are treated as an already encoded JSON document and sent without re-serializing.
+        :param raise_for_status: Whether to raise an exception for HTTP error responses.
+        :param kwargs: Additional keyword arguments to pass to `httpx.AsyncClient.request`.
+        :return: The HTTP response object.
+        """
+        return await self._http_request(url, method, params=params, json=json, raise_for_status=raise_for_status, **kwargs)
+
+    async def _http_request(self, url: str, method: str,
+                            params: Optional[dict[str, Any]] = None,
+                            json: Optional[Union[dict[str, Any], bytes]] = None,
+                            raise_for_status: bool = True,
+                            **kwargs: Any) -> httpx.Response:
+        if url.startswith('/'):
+            url = url[1:]
+        full_url = f"{self._url}/{url}"
+
+        if 'timeout' not in kwargs:
+            kwargs['timeout'] = 10
+        kwargs['headers'] = self._update_headers(kwargs.get('headers', {}))
+
+        # Custom parsing json to support NAN
+        if json is not None and kwargs.get('content') is None:
+            kwargs['content'] = json if isinstance(json, bytes) else json_stdlib.dumps(json, allow_nan=True)
+            kwargs['headers']['Content-Type'] = 'application/json'
+
+        start = time.time()
+        resp = await self._current_session.request(method, full_url, params=params, **kwargs)
+        duration = time.time() - start
+        logger.debug("Made request to %s %s in %.2f seconds (code=%s)", method, full_url, duration, resp.status_code)
+        if raise_for_status and not resp.is_success:
+            try:
+                error_json = resp.json()
+            except Exception:
+                raise MercutoHTTPException(resp.text, resp.status_code)
+            else:
+                if 'detail' in error_json and isinstance(error_json['detail'], str):
+                    raise MercutoHTTPException(error_json['detail'], resp.status_code)
+                else:
+                    raise MercutoHTTPException(resp.text, resp.status_code)
+        return resp
+
+    def _add_and_fetch_module(self, name: str, module: Type[_T]) -> _T:
+        if name not in self._modules:
+            self._modules[name] = module(self)
+        return self._modules[name]  # type: ignore
+
+    def identity(self) -> 'AsyncMercutoIdentityService':
+        from .modules.identity import AsyncMercutoIdentityService
+        return self._add_and_fetch_module('identity', AsyncMercutoIdentityService)
+
+    def fatigue(self) -> 'AsyncMercutoFatigueService':
+        from .modules.fatigue import AsyncMercutoFatigueService
+        return self._add_and_fetch_module('fatigue', AsyncMercutoFatigueService)
+
+    def data(self) -> 'AsyncMercutoDataService':
+        from .modules.data import AsyncMercutoDataService
+        return self._add_and_fetch_module('data', AsyncMercutoDataService)
+
+    def core(self) -> 'AsyncMercutoCoreService':
+        from .modules.core import AsyncMercutoCoreService
+        return self._add_and_fetch_module('core', AsyncMercutoCoreService)
+
+    def media(self) -> 'AsyncMercutoMediaService':
+        from .modules.media import AsyncMercutoMediaService
+        return self._add_and_fetch_module('media', AsyncMercutoMediaService)
+
+    def reports(self) -> 'AsyncMercutoReportService':
+        from .modules.reports import AsyncMercutoReportService
+        return self._add_and_fetch_module('reports', AsyncMercutoReportService)
+
+    def notifications(self) -> 'AsyncMercutoNotificationService':
+        from .modules.notifications import AsyncMercutoNotificationService
+        return self._add_and_fetch_module('notifications', AsyncMercutoNotificationService)
+
+    def alerts(self) -> 'AsyncMercutoAlertService':
+        from .modules.alerts import AsyncMercutoAlertService
+        return self._add_and_fetch_module('alerts', AsyncMercutoAlertService)
+
+    def connectivity(self) -> 'AsyncMercutoConnectService':
+        from .modules.connect import AsyncMercutoConnectService
+        return self._add_and_fetch_module('connect', AsyncMercutoConnectService)
+
+    def login(self, authentication: IAuthenticationMethod) -> None:
+        self._auth_method = authentication
+
+    def logout(self) -> None:
+        self._auth_method = None
+
+    def is_logged_in(self) -> bool:
+        return self._auth_method is not None
+
+    async def aclose(self) -> None:
+        """
+        Close the underlying HTTP connection pool.
+        """
+        await self._current_session.aclose()
+
+    async def __aenter__(self) -> 'AsyncMercutoClient':
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        self.logout()
+        await self.aclose()
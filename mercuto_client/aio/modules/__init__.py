@@ -0,0 +1,4 @@
+"""
+Coroutine versions of the service modules in `mercuto_client.modules`.
+Models and TypeAdapters are imported from the blocking modules so both clients return identical objects.
+"""
@@ -0,0 +1,96 @@
+from typing import TYPE_CHECKING, Any, Literal, Optional
+
+from ...modules import PayloadType
+from ...modules.alerts import (Alarm, AlarmLog, Condition, ConditionLog,
+                               Healthcheck, _AlarmListAdapter,
+                               _AlarmLogListAdapter, _ConditionListAdapter,
+                               _ConditionLogListAdapter)
+
+if TYPE_CHECKING:
+    from ..client import AsyncMercutoClient
+
+
+class AsyncMercutoAlertService:
+    def __init__(self, client: 'AsyncMercutoClient', path: str = '/v2/alerts') -> None:
+        self._client = client
+        self._path = path
+
+    async def healthcheck(self) -> Healthcheck:
+        r = await self._client.request(f"{self._path}/healthcheck", "GET")
+        return Healthcheck.model_validate_json(r.text)
+
+    # --- Conditions ---
+    async def list_conditions(self, project: str) -> list[Condition]:
+        r = await self._client.request(
+            f"{self._path}/conditions", "GET", params={"project": project})
+        return _ConditionListAdapter.validate_json(r.text)
+
+    async def create_condition(self, /, **args: Any) -> Condition:
+        r = await self._client.request(f"{self._path}/conditions", "POST", json=args)
+        return Condition.model_validate_json(r.text)
+
+    async def get_condition(self, condition_code: str) -> Condition:
+        r = await self._client.request(
+            f"{self._path}/conditions/{condition_code}", "GET")
+        return Condition.model_validate_json(r.text)
+
+    async def update_condition(self, condition_code: str, /, **args: Any) -> Condition:
+        r = await self._client.request(
+            f"{self._path}/conditions/{condition_code}", "PUT", json=args)
+        return Condition.model_validate_json(r.text)
+
+    async def delete_condition(self, condition_code: str) -> None:
+        await self._client.request(
+            f"{self._path}/conditions/{condition_code}", "DELETE")
+        return None
+
+    # --- Condition Logs ---
+    async def list_condition_logs(self, project: str) -> list[ConditionLog]:
+        r = await self._client.request(
+            f"{self._path}/condition-logs", "GET", params={"project": project})
+        return _ConditionLogListAdapter.validate_json(r.text)
+
+    # --- Alarms ---
+    async def list_alarms(self, project: str) -> list[Alarm]:
+        r = await self._client.request(
+            f"{self._path}/alarms", "GET", params={"project": project})
+        return _AlarmListAdapter.validate_json(r.text)
+
+    async def create_alarm(self, /, **args: Any) -> Alarm:
+        r = await self._client.request(f"{self._path}/alarms", "POST", json=args)
+        return Alarm.model_validate_json(r.text)
+
+    async def get_alarm(self, alarm_code: str) -> Alarm:
+        r = await self._client.request(f"{self._path}/alarms/{alarm_code}", "GET")
+        return Alarm.model_validate_json(r.text)
+
+    async def update_alarm(self, alarm_code: str, /, **args: Any) -> Alarm:
+        r = await self._client.request(
+            f"{self._path}/alarms/{alarm_code}", "PUT", json=args)
+        return Alarm.model_validate_json(r.text)
+
+    async def delete_alarm(self, alarm_code: str) -> None:
+        await self._client.request(f"{self._path}/alarms/{alarm_code}", "DELETE")
+        return None
+
+    # --- Alarm Logs ---
+    async def list_alarm_logs(self, project: str,
+                              alarm: Optional[str] = None,
+                              acknowledged: Literal['yes', 'no', 'any'] = 'any') -> list[AlarmLog]:
+        params: PayloadType = {"project": project,
+                               "acknowledged": acknowledged}
+        if alarm is not None:
+            params["alarm"] = alarm
+        r = await self._client.request(
+            f"{self._path}/alarm-logs", "GET", params=params)
+        return _AlarmLogListAdapter.validate_json(r.text)
+
+    async def get_alarm_log(self, alarm_log_code: str) -> AlarmLog:
+        r = await self._client.request(
+            f"{self._path}/alarm-logs/{alarm_log_code}", "GET")
+        return AlarmLog.model_validate_json(r.text)
+
+    async def acknowledge_alarm_log(self, alarm_log_code: str) -> AlarmLog:
+        r = await self._client.request(
+            f"{self._path}/alarm-logs/{alarm_log_code}/acknowledge", "POST")
+        return AlarmLog.model_validate_json(r.text)
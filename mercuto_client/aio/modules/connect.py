@@ -0,0 +1,185 @@
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional
+
+from ...exceptions import MercutoHTTPException
+from ...modules import PayloadType
+from ...modules.connect import (SshServerInfo, SshTunnel, WireguardEvent,
+                                WireguardPeer, WireguardPeerSummary,
+                                WireguardServerInfo, WireguardSnapshot,
+                                _SshTunnelListAdapter,
+                                _WireguardEventListAdapter,
+                                _WireguardPeerListAdapter,
+                                _WireguardPeerSummaryListAdapter,
+                                _WireguardSnapshotListAdapter)
+
+if TYPE_CHECKING:
+    from ..client import AsyncMercutoClient
+
+
+class AsyncMercutoConnectService:
+    def __init__(self, client: 'AsyncMercutoClient', path: str = '/connect') -> None:
+        self._client = client
+        self._path = path
+
+    # ── WireGuard Peers ──────────────────────────────────
+
+    async def list_wireguard_peers(self,
+                                   isolation_group: Optional[str] = None,
+                                   project: Optional[str] = None,
+                                   peer_type: Optional[str] = None) -> list[WireguardPeer]:
+        params: PayloadType = {}
+        if isolation_group is not None:
+            params['isolation_group'] = isolation_group
+        if project is not None:
+            params['project'] = project
+        if peer_type is not None:
+            params['peer_type'] = peer_type
+        r = await self._client.request(f"{self._path}/wireguard/peers/", "GET",
+                                       params=params if params else None)
+        return _WireguardPeerListAdapter.validate_json(r.text)
+
+    async def get_wireguard_peer(self, peer_id: str) -> WireguardPeer:
+        r = await self._client.request(f"{self._path}/wireguard/peers/{peer_id}", "GET")
+        return WireguardPeer.model_validate_json(r.text)
+
+    async def create_wireguard_peer(self, name: str, peer_type: str,
+                                    isolation_group: Optional[str] = None,
+                                    project: Optional[str] = None,
+                                    user_code: Optional[str] = None,
+                                    description: Optional[str] = None) -> WireguardPeer:
+        body: PayloadType = {
+            'name': name,
+            'peer_type': peer_type,
+        }
+        if isolation_group is not None:
+            body['isolation_group'] = isolation_group
+        if project is not None:
+            body['project'] = project
+        if user_code is not None:
+            body['user_code'] = user_code
+        if description is not None:
+            body['description'] = description
+        r = await self._client.request(f"{self._path}/wireguard/peers/", "POST", json=body)
+        return WireguardPeer.model_validate_json(r.text)
+
+    async def update_wireguard_peer(self, peer_id: str, name: str, is_enabled: bool,
+                                    description: Optional[str] = None,
+                                    isolation_group: Optional[str] = None,
+                                    project: Optional[str] = None) -> WireguardPeer:
+        body: PayloadType = {
+            'name': name,
+            'is_enabled': is_enabled,
+        }
+        if description is not None:
+            body['description'] = description
+        if isolation_group is not None:
+            body['isolation_group'] = isolation_group
+        if project is not None:
+            body['project'] = project
+        r = await self._client.request(f"{self._path}/wireguard/peers/{peer_id}", "PUT", json=body)
+        return WireguardPeer.model_validate_json(r.text)
+
+    async def get_wireguard_peer_key(self, peer_id: str) -> str:
+        r = await self._client.request(f"{self._path}/wireguard/peers/{peer_id}/key", "GET")
+        return r.json()['private_key']
+
+    async def delete_wireguard_peer(self, peer_id: str) -> None:
+        await self._client.request(f"{self._path}/wireguard/peers/{peer_id}", "DELETE")
+
+    # ── SSH Tunnels ──────────────────────────────────────
+
+    async def list_ssh_tunnels(self, project: Optional[str] = None) -> list[SshTunnel]:
+        params: PayloadType = {}
+        if project is not None:
+            params['project'] = project
+        r = await self._client.request(f"{self._path}/ssh/tunnels/", "GET",
+                                       params=params if params else None)
+        return _SshTunnelListAdapter.validate_json(r.text)
+
+    async def get_ssh_tunnel(self, tunnel_id: str) -> SshTunnel:
+        r = await self._client.request(f"{self._path}/ssh/tunnels/{tunnel_id}", "GET")
+        return SshTunnel.model_validate_json(r.text)
+
+    async def create_ssh_tunnel(self, name: str, project: str,
+                                description: Optional[str] = None) -> SshTunnel:
+        body: PayloadType = {'name': name, 'project': project}
+        if description is not None:
+            body['description'] = description
+        r = await self._client.request(f"{self._path}/ssh/tunnels/", "POST", json=body)
+        return SshTunnel.model_validate_json(r.text)
+
+    async def update_ssh_tunnel(self, tunnel_id: str, name: str, project: str,
+                                is_enabled: bool,
+                                description: Optional[str] = None) -> SshTunnel:
+        body: PayloadType = {
+            'name': name,
+            'project': project,
+            'is_enabled': is_enabled,
+        }
+        if description is not None:
+            body['description'] = description
+        r = await self._client.request(f"{self._path}/ssh/tunnels/{tunnel_id}", "PUT", json=body)
+        return SshTunnel.model_validate_json(r.text)
+
+    async def get_ssh_tunnel_key(self, tunnel_id: str) -> str:
+        r = await self._client.request(f"{self._path}/ssh/tunnels/{tunnel_id}/key", "GET")
+        return r.json()['device_private_key']
+
+    async def delete_ssh_tunnel(self, tunnel_id: str) -> None:
+        await self._client.request(f"{self._path}/ssh/tunnels/{tunnel_id}", "DELETE")
+
+    # ── Server Info ──────────────────────────────────────
+
+    async def get_wireguard_server_info(self) -> Optional[WireguardServerInfo]:
+        r = await self._client.request(f"{self._path}/wireguard/server-info", "GET", raise_for_status=False)
+        if r.status_code == 503:
+            return None
+        if not r.is_success:
+            raise MercutoHTTPException(r.text, r.status_code)
+        return WireguardServerInfo.model_validate_json(r.text)
+
+    async def get_ssh_server_info(self) -> Optional[SshServerInfo]:
+        r = await self._client.request(f"{self._path}/ssh/server-info", "GET", raise_for_status=False)
+        if r.status_code == 503:
+            return None
+        if not r.is_success:
+            raise MercutoHTTPException(r.text, r.status_code)
+        return SshServerInfo.model_validate_json(r.text)
+
+    # ── WireGuard Peer Stats ────────────────────────────
+
+    async def get_wireguard_peer_summary(self, peer_id: str) -> WireguardPeerSummary:
+        r = await self._client.request(f"{self._path}/wireguard/peer-stats/summary/{peer_id}", "GET")
+        return WireguardPeerSummary.model_validate_json(r.text)
+
+    async def list_wireguard_peer_summaries(self,
+                                            isolation_group: Optional[str] = None,
+                                            project: Optional[str] = None) -> list[WireguardPeerSummary]:
+        params: PayloadType = {}
+        if isolation_group is not None:
+            params['isolation_group'] = isolation_group
+        if project is not None:
+            params['project'] = project
+        r = await self._client.request(f"{self._path}/wireguard/peer-stats/summary/", "GET",
+                                       params=params if params else None)
+        return _WireguardPeerSummaryListAdapter.validate_json(r.text)
+
+    async def get_wireguard_snapshots(self, peer_id: str,
+                                      since: Optional[datetime] = None,
+                                      limit: int = 100) -> list[WireguardSnapshot]:
+        params: PayloadType = {'limit': limit}
+        if since is not None:
+            params['since'] = since.isoformat()
+        r = await self._client.request(f"{self._path}/wireguard/peer-stats/snapshots/{peer_id}", "GET",
+                                       params=params)
+        return _WireguardSnapshotListAdapter.validate_json(r.text)
+
+    async def get_wireguard_events(self, peer_id: str,
+                                   since: Optional[datetime] = None,
+                                   limit: int = 100) -> list[WireguardEvent]:
+        params: PayloadType = {'limit': limit}
+        if since is not None:
+            params['since'] = since.isoformat()
+        r = await self._client.request(f"{self._path}/wireguard/peer-stats/events/{peer_id}", "GET",
+                                       params=params)
+        return _WireguardEventListAdapter.validate_json(r.text)
@@ -0,0 +1,306 @@
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Optional
+
+from ...modules import PayloadType
+from ...modules._util import serialise_timedelta
+from ...modules.core import (AlertConfiguration, AlertSummary, Condition,
+                             Dashboards, Device, DeviceChannel, DeviceGroup,
+                             DeviceType, Event, EventAggregate,
+                             EventStatisticsOut, Healthcheck, Project,
+                             ProjectEventDetection, _ConditionListAdapter,
+                             _DeviceGroupListAdapter, _DevicesListAdapter,
+                             _DeviceTypeListAdapter, _EventsListAdapter,
+                             _ProjectListAdapter)
+
+if TYPE_CHECKING:
+    from ..client import AsyncMercutoClient
+
+
+class AsyncMercutoCoreService:
+    def __init__(self, client: 'AsyncMercutoClient') -> None:
+        self._client = client
+
+    async def healthcheck(self) -> Healthcheck:
+        r = await self._client.request("/healthcheck", "GET")
+        return Healthcheck.model_validate_json(r.text)
+
+    # Projects
+
+    async def get_project(self, code: str) -> Project:
+        if len(code) == 0:
+            raise ValueError("Project code must not be empty")
+        r = await self._client.request(f'/projects/{code}', 'GET')
+        return Project.model_validate_json(r.text)
+
+    async def list_projects(self) -> list[Project]:
+        r = await self._client.request('/projects', 'GET')
+        return _ProjectListAdapter.validate_json(r.text)
+
+    async def create_project(self, name: str, project_number: str, description: str, tenant: str,
+                             timezone: str,
+                             latitude: Optional[float] = None,
+                             longitude: Optional[float] = None) -> Project:
+
+        payload: PayloadType = {
+            'name': name,
+            'project_number': project_number,
+            'description': description,
+            'tenant_code': tenant,
+            'timezone': timezone,
+        }
+        if latitude is not None:
+            payload['latitude'] = latitude
+        if longitude is not None:
+            payload['longitude'] = longitude
+
+        r = await self._client.request('/projects', 'PUT', json=payload)
+        return Project.model_validate_json(r.text)
+
+    async def ping_project(self, project: str, ip_address: str) -> None:
+        await self._client.request(
+            f'/projects/{project}/ping', 'POST', json={'ip_address': ip_address})
+
+    async def create_dashboard(self, project_code: str, dashboards: Dashboards) -> None:
+        json = dashboards.model_dump()
+        await self._client.request(
+            f'/projects/{project_code}/dashboard', 'POST', json=json)
+
+    async def set_project_event_detection(self, project: str, datatables: list[str]) -> ProjectEventDetection:
+        if len(datatables) == 0:
+            raise ValueError(
+                'At least one datatable must be provided to enable event detection')
+
+        params: PayloadType = {
+            "enabled": True,
+            "datatables": datatables
+        }
+        r = await self._client.request(
+            f'/projects/{project}/event-detection', 'POST', json=params)
+        return ProjectEventDetection.model_validate_json(r.text)
+
+    # EVENTS
+
+    async def create_event(self, project: str, start_time: datetime, end_time: datetime) -> Event:
+        if start_time.tzinfo is None or end_time.tzinfo is None:
+            raise ValueError("Timestamp must be timezone aware")
+
+        json: PayloadType = {
+            'project': project,
+            'start_time': start_time.isoformat(),
+            'end_time': end_time.isoformat(),
+        }
+        r = await self._client.request('/events', 'PUT', json=json)
+        return Event.model_validate_json(r.text)
+
+    async def list_events(self, project: str,
+                          start_time: Optional[datetime] = None,
+                          end_time: Optional[datetime] = None,
+                          limit: Optional[int] = None, offset: Optional[int] = 0,
+                          ascending: bool = True) -> list[Event]:
+        """
+        Lists events for a project, optionally filtered by time range.
+        :param project: Project code to list events for.
+        :param start_time: Optional start time to filter events from.
+        :param end_time: Optional end time to filter events to.
+        :param limit: Optional maximum number of events to return. Default is set by API (usually 10).
+        :param offset: Optional offset for pagination.
+        :param ascending: Whether to sort events in ascending order by start time.
+        :return: List of Event objects.
+        """
+        params: PayloadType = {'project_code': project, 'ascending': ascending}
+        if start_time is not None:
+            params['start_time'] = start_time.isoformat()
+        if end_time is not None:
+            params['end_time'] = end_time.isoformat()
+        if limit is not None:
+            params['limit'] = limit
+        if offset is not None:
+            params['offset'] = offset
+        r = await self._client.request('/events', 'GET', params=params)
+        return _EventsListAdapter.validate_json(r.text)
+
+    async def get_event(self, event: str) -> Event:
+        r = await self._client.request(f'/events/{event}', 'GET')
+        return Event.model_validate_json(r.text)
+
+    async def delete_event(self, event: str) -> None:
+        await self._client.request(f'/events/{event}', 'DELETE')
+
+    async def get_nearest_event(
+        self,
+        project_code: str,
+        to: datetime,
+        maximum_delta: timedelta | None = None,
+    ) -> Event:
+        params: PayloadType = {
+            'project_code': project_code,
+            'to': to.isoformat(),
+        }
+        if maximum_delta is not None:
+            params['maximum_delta'] = serialise_timedelta(maximum_delta)
+
+        r = await self._client.request('/events/nearest', 'GET', params=params)
+        return Event.model_validate_json(r.text)
+
+    async def get_event_statistics(
+        self,
+        project_code: str,
+        start_time: datetime,
+        end_time: datetime,
+    ) -> EventStatisticsOut:
+        params: PayloadType = {
+            'project_code': project_code,
+            'start_time': start_time.isoformat(),
+            'end_time': end_time.isoformat(),
+        }
+
+        r = await self._client.request('/events/statistics', 'GET', params=params)
+        return EventStatisticsOut.model_validate_json(r.text)
+
+    async def set_event_aggregates(self, project: str, aggregates: list[EventAggregate]) -> None:
+        await self._client.request('/aggregates', 'PUT',
+                                   json=[agg.model_dump(mode='json') for agg in aggregates],  # type: ignore
+                                   params={'project_code': project})
+
+    # ALERTS
+    async def list_conditions(self, project: str, limit: int = 100, offset: int = 0) -> list[Condition]:
+        params: PayloadType = {
+            'project': project,
+            'limit': limit,
+            'offset': offset
+        }
+        r = await self._client.request('/alerts/conditions', 'GET', params=params)
+        return _ConditionListAdapter.validate_json(r.text)
+
+    async def get_condition(self, code: str) -> Condition:
+        r = await self._client.request(f'/alerts/conditions/{code}', 'GET')
+        return Condition.model_validate_json(r.text)
+
+    async def create_condition(self, source: str, description: str, *,
+                               lower_bound: Optional[float] = None,
+                               upper_bound: Optional[float] = None,
+                               neutral_position: float = 0) -> Condition:
+        json: PayloadType = {
+            'source_channel_code': source,
+            'description': description,
+            'neutral_position': neutral_position
+        }
+        if lower_bound is not None:
+            json['lower_inclusive_bound'] = lower_bound
+        if upper_bound is not None:
+            json['upper_exclusive_bound'] = upper_bound
+        r = await self._client.request('/alerts/conditions', 'PUT',  json=json)
+        return Condition.model_validate_json(r.text)
+
+    async def create_alert_configuration(self, label: str,
+                                         conditions: list[str],
+                                         contact_group: Optional[str] = None) -> AlertConfiguration:
+        json: PayloadType = {
+            'label': label,
+            'conditions': conditions,
+
+        }
+        if contact_group is not None:
+            json['contact_group'] = contact_group
+        r = await self._client.request(
+            '/alerts/configurations', 'PUT', json=json)
+        return AlertConfiguration.model_validate_json(r.text)
+
+    async def get_alert_configuration(self, code: str) -> AlertConfiguration:
+        r = await self._client.request(f'/alerts/configurations/{code}', 'GET')
+        return AlertConfiguration.model_validate_json(r.text)
+
+    async def list_alert_logs(
+                  self,
+                  project: str | None = None,
+                  configuration: str | None = None,
+                  channels: list[str] | None = None,
+                  start_time: datetime | str | None = None,
+                  end_time: datetime | str | None = None,
+                  limit: int = 10,
+                  offset: int = 0,
+                  latest_only: bool = False,
+    ) -> AlertSummary:
+        params: PayloadType = {
+            'limit': limit,
+            'offset': offset,
+            'latest_only': latest_only,
+        }
+
+        if project is not None:
+            params['project'] = project
+        if configuration is not None:
+            params['configuration_code'] = configuration
+        if channels is not None:
+            params['channels'] = channels
+        if start_time is not None:
+            params['start_time'] = start_time.isoformat() if isinstance(
+                start_time, datetime) else start_time
+        if end_time is not None:
+            params['end_time'] = end_time.isoformat() if isinstance(
+                end_time, datetime) else end_time
+
+        r = await self._client.request('/alerts/logs', 'GET', params=params)
+        return AlertSummary.model_validate_json(r.text)
+
+    # DEVICES
+
+    async def list_device_types(self) -> list[DeviceType]:
+        r = await self._client.request('/devices/types', 'GET')
+        return _DeviceTypeListAdapter.validate_json(r.text)
+
+    async def create_device_type(self, description: str, manufacturer: str, model_number: str) -> DeviceType:
+        json: PayloadType = {
+            'description': description,
+            'manufacturer': manufacturer,
+            'model_number': model_number
+        }
+        r = await self._client.request('/devices/types', 'PUT',  json=json)
+        return DeviceType.model_validate_json(r.text)
+
+    async def list_devices(self, project_code: str, limit: int, offset: int) -> list[Device]:
+        params: PayloadType = {
+            'project_code': project_code,
+            'limit': limit,
+            'offset': offset
+        }
+        r = await self._client.request('/devices', 'GET', params=params)
+        return _DevicesListAdapter.validate_json(r.text)
+
+    async def get_device(self, device_code: str) -> Device:
+        r = await self._client.request(f'/devices/{device_code}', 'GET')
+        return Device.model_validate_json(r.text)
+
+    async def create_device(self,
+                            project_code: str,
+                            label: str,
+                            device_type_code: str,
+                            groups: list[str],
+                            location_description: Optional[str] = None,
+                            channels: Optional[list[DeviceChannel]] = None,
+                            latitude: Optional[float] = None,
+                            longitude: Optional[float] = None,
+                            altitude: Optional[float] = None
+                            ) -> Device:
+        json: PayloadType = {
+            'project_code': project_code,
+            'label': label,
+            'device_type_code': device_type_code,
+            'groups': groups,
+        }
+        if location_description is not None:
+            json['location_description'] = location_description
+        if channels is not None:
+            json['channels'] = [channel.model_dump(mode='json') for channel in channels]  # type: ignore[assignment]
+        if latitude is not None:
+            json['latitude'] = latitude
+        if longitude is not None:
+            json['longitude'] = longitude
+        if altitude is not None:
+            json['altitude'] = altitude
+        r = await self._client.request('/devices', 'PUT', json=json)
+        return Device.model_validate_json(r.text)
+
+    async def list_device_groups(self, project: str) -> list[DeviceGroup]:
+        r = await self._client.request('/devices/groups', 'GET', params={'project_code': project})
+        return _DeviceGroupListAdapter.validate_json(r.text)
@@ -0,0 +1,534 @@
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta
+from typing import (TYPE_CHECKING, Any, AsyncIterator, BinaryIO, Collection,
+                    Optional, TextIO)
+
+from ...exceptions import MercutoClientException, MercutoHTTPException
+from ...modules import PayloadType, raise_for_response
+from ...modules._latest import (DEFAULT_IDLE_BACKOFF, DEFAULT_MAX_INTERVAL,
+                                DEFAULT_MIN_INTERVAL, LatestSampleTracker)
+from ...modules._util import serialise_timedelta
+from ...modules.data import (AggregationOptions, Channel,
+                             ChannelClassification, ChannelFormat, Datatable,
+                             Expression, FileFormat, FrameFormat,
+                             GetStatusRequestResponse, Healthcheck,
+                             LatestDataSample, MetricDataSample,
+                             SecondaryDataSample, Units, _ChannellistAdapter,
+                             _DatatablelistAdapter, _LatestSampleListAdapter,
+                             _MetricSamplelistAdapter,
+                             _SecondarySamplelistAdapter, _UnitslistAdapter)
+from ...util import batched
+
+if TYPE_CHECKING:
+    from ..client import AsyncMercutoClient
+
+
+class AsyncMercutoDataService:
+    def __init__(self, client: 'AsyncMercutoClient', path: str = '/v2/data') -> None:
+        self._client = client
+        self._path = path
+
+    async def healthcheck(self) -> Healthcheck:
+        r = await self._client.request(f"{self._path}/healthcheck", "GET")
+        return Healthcheck.model_validate_json(r.text)
+
+    async def refresh_continuous_aggregates(self) -> None:
+        """
+        Request a refresh of continuous aggregates on all tables
+        """
+        await self._client.request(f"{self._path}/meta/refresh-aggregates", "POST")
+
+    """
+    Channels
+    """
+
+    async def list_channels(self, project: str, classification: Optional[ChannelClassification] = None,
+                            aggregate: Optional[str] = None, metric: Optional[str] = None,
+                            show_hidden: bool = False) -> list[Channel]:
+        params: dict[str, Any] = {
+            'project': project,
+            'limit': 100,
+            'offset': 0,
+            'show_hidden': show_hidden,
+        }
+        if classification:
+            params['classification'] = classification.value
+        if aggregate:
+            params['aggregate'] = aggregate
+        if metric:
+            params['metric'] = metric
+
+        all_channels: list[Channel] = []
+        while True:
+            r = await self._client.request(
+                f'{self._path}/channels', 'GET', params=params)
+
+            channels = _ChannellistAdapter.validate_json(r.text)
+            all_channels.extend(channels)
+            if len(channels) < params['limit']:
+                break
+            params['offset'] += params['limit']
+        return all_channels
+
+    async def get_channel(self, code: str) -> Optional[Channel]:
+        r = await self._client.request(
+            f'{self._path}/channels/{code}', 'GET', raise_for_status=False)
+        if r.status_code == 404:
+            return None
+        raise_for_response(r)
+        return Channel.model_validate_json(r.text)
+
+    async def update_channel(self, code: str, label: Optional[str] = None, units: Optional[str] = None,
+                             metric: Optional[str] = None, multiplier: Optional[float] = None,
+                             offset: Optional[float] = None) -> Channel:
+        payload: PayloadType = {}
+        if label is not None:
+            payload['label'] = label
+        if units is not None:
+            payload['units'] = units
+        if metric is not None:
+            payload['metric'] = metric
+        if multiplier is not None:
+            payload['multiplier'] = multiplier
+        if offset is not None:
+            payload['offset'] = offset
+
+        r = await self._client.request(
+            f'{self._path}/channels/{code}', 'PATCH', json=payload)
+        return Channel.model_validate_json(r.text)
+
+    async def delete_channel(self, code: str) -> bool:
+        r = await self._client.request(f'{self._path}/channels/{code}', 'DELETE')
+        return r.status_code == 204
+
+    async def create_channel(self, project: str,
+                             label: str,
+                             classification: ChannelClassification = ChannelClassification.SECONDARY,
+                             sampling_period: Optional[timedelta] = None,
+                             multiplier: float = 1.0, offset: float = 0.0,
+                             value_range_min: Optional[float] = None, value_range_max: Optional[float] = None,
+                             delta_max: Optional[float] = None,
+                             units: Optional[str] = None,
+                             aggregate: Optional[str] = None,
+                             source: Optional[str] = None,
+                             metric: Optional[str] = None) -> Channel:
+        payload: PayloadType = {
+            'project': project,
+            'label': label,
+            'classification': classification.value,
+            'multiplier': multiplier,
+            'offset': offset,
+        }
+        if sampling_period is not None:
+            payload['sampling_period'] = serialise_timedelta(sampling_period)
+        if value_range_min is not None:
+            payload['value_range_min'] = value_range_min
+        if value_range_max is not None:
+            payload['value_range_max'] = value_range_max
+        if delta_max is not None:
+            payload['delta_max'] = delta_max
+        if units is not None:
+            payload['units'] = units
+        if aggregate is not None:
+            payload['aggregate'] = aggregate
+        if source is not None:
+            payload['source'] = source
+        if metric is not None:
+            payload['metric'] = metric
+
+        r = await self._client.request(f'{self._path}/channels', 'PUT', json=payload)
+        return Channel.model_validate_json(r.text)
+
+    """
+    Expressions
+    """
+
+    async def create_expression(
+        self,
+        project: str,
+        label: str,
+        expression: str,
+        units: Optional[str] = None,
+        aggregate: Optional[str] = None,
+        metric: Optional[str] = None
+    ) -> Expression:
+        payload: PayloadType = {
+            "project": project,
+            "label": label,
+            "expression": expression,
+        }
+        if units is not None:
+            payload["units"] = units
+        if aggregate is not None:
+            payload["aggregate"] = aggregate
+        if metric is not None:
+            payload["metric"] = metric
+
+        r = await self._client.request(
+            f'{self._path}/expressions', 'PUT', json=payload)
+        return Expression.model_validate_json(r.text)
+
+    async def delete_expression(self, code: str) -> bool:
+        r = await self._client.request(f'{self._path}/expressions/{code}', 'DELETE')
+        return r.status_code == 202
+
+    """
+    Datatables
+    """
+
+    async def create_datatable(self, project: str, name: str, sampling_period: timedelta, column_labels: Collection[str]) -> Datatable:
+        payload: PayloadType = {
+            "project": project,
+            "name": name,
+            "sampling_period": serialise_timedelta(sampling_period),
+            "column_labels": list(column_labels),
+        }
+        r = await self._client.request(
+            f'{self._path}/datatables', 'PUT', json=payload)
+        return Datatable.model_validate_json(r.text)
+
+    async def list_datatables(self, project: str) -> list[Datatable]:
+        datatables: list[Datatable] = []
+        params: dict[str, Any] = {
+            "project": project,
+            "limit": 100,
+            "offset": 0,
+        }
+        while True:
+            r = await self._client.request(
+                f'{self._path}/datatables', 'GET', params=params)
+
+            batch = _DatatablelistAdapter.validate_json(r.text)
+            datatables.extend(batch)
+            if len(batch) < params["limit"]:
+                break
+            params["offset"] += params["limit"]
+        return datatables
+
+    """
+    Units
+    """
+
+    async def get_unit(self, code: str) -> Optional[Units]:
+        r = await self._client.request(
+            f'{self._path}/units/{code}', 'GET', raise_for_status=False)
+        if r.status_code == 404:
+            return None
+        raise_for_response(r)
+        return Units.model_validate_json(r.text)
+
+    async def list_units(self) -> list[Units]:
+        r = await self._client.request(f'{self._path}/units', 'GET')
+        return _UnitslistAdapter.validate_json(r.text)
+
+    async def create_unit(self, name: str, unit: str) -> Units:
+        payload: PayloadType = {
+            "name": name,
+            "unit": unit,
+        }
+        r = await self._client.request(f'{self._path}/units', 'PUT', json=payload)
+        return Units.model_validate_json(r.text)
+
+    """
+    Requests
+    """
+
+    async def create_request(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        project: Optional[str] = None,
+        channels: Optional[Collection[str]] = None,
+        classification: Optional[ChannelClassification] = None,
+        frame_format: FrameFormat = FrameFormat.SAMPLES,
+        file_format: FileFormat = FileFormat.PARQUET,
+        channel_format: ChannelFormat = ChannelFormat.CODE,
+        aggregation: Optional[AggregationOptions] = None,
+        timeout: float = 0
+    ) -> GetStatusRequestResponse:
+        if timeout > 20:
+            timeout = 20  # Cap timeout to 20 seconds
+
+        if channels is None and classification is None:
+            raise ValueError("Must supply either channels or classification.")
+
+        payload: PayloadType = {
+            "start_time": start_time.isoformat(),
+            "end_time": end_time.isoformat(),
+            "frame_format": frame_format.value,
+            "file_format": file_format.value,
+            "channel_format": channel_format.value,
+        }
+
+        if project:
+            payload["project"] = project
+
+        if channels:
+            payload["channels"] = list(channels)
+
+        if classification:
+            payload["classification"] = classification.value
+
+        if aggregation is not None:
+            payload["aggregation"] = aggregation.model_dump(mode='json')
+
+        r = await self._client.request(
+            f'{self._path}/requests', 'POST',
+            json=payload,
+            params={"timeout": timeout}
+        )
+        return GetStatusRequestResponse.model_validate_json(r.text)
+
+    async def get_request(self, request_id: str) -> GetStatusRequestResponse:
+        r = await self._client.request(f'{self._path}/requests/{request_id}', 'GET')
+        return GetStatusRequestResponse.model_validate_json(r.text)
+
+    """
+    Request Helpers
+    """
+
+    async def load_presigned_url(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        project: Optional[str] = None,
+        channels: Optional[Collection[str]] = None,
+        classification: Optional[ChannelClassification] = None,
+        frame_format: FrameFormat = FrameFormat.SAMPLES,
+        file_format: FileFormat = FileFormat.PARQUET,
+        channel_format: ChannelFormat = ChannelFormat.CODE,
+        aggregation: Optional[AggregationOptions] = None,
+        poll_interval: float = 0.25,
+        timeout: int = 60
+    ) -> str:
+        """
+        Request a presigned download URL for data and poll until ready.
+
+        Returns:
+            The presigned result_url as a string.
+        Raises:
+            MercutoHTTPException, MercutoClientException on error or timeout.
+        """
+        result = await self.load_data_request(
+            start_time=start_time,
+            end_time=end_time,
+            project=project,
+            channels=channels,
+            classification=classification,
+            frame_format=frame_format,
+            file_format=file_format,
+            channel_format=channel_format,
+            aggregation=aggregation,
+            poll_interval=poll_interval,
+            timeout=timeout
+        )
+        return result.result_url
+
+    async def load_data_request(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        project: Optional[str] = None,
+        channels: Optional[Collection[str]] = None,
+        classification: Optional[ChannelClassification] = None,
+        frame_format: FrameFormat = FrameFormat.SAMPLES,
+        file_format: FileFormat = FileFormat.PARQUET,
+        channel_format: ChannelFormat = ChannelFormat.CODE,
+        aggregation: Optional[AggregationOptions] = None,
+        poll_interval: float = 0.25,
+        timeout: int = 60
+    ) -> GetStatusRequestResponse.GetDataRequestStatusCompletedResult:
+        """
+        Request a presigned download URL for data and poll until ready.
+        Polling yields to the event loop between attempts.
+
+        Returns:
+            The GetStatusRequestResponse
+        Raises:
+            MercutoHTTPException, MercutoClientException on error or timeout.
+        """
+        status = await self.create_request(
+            project=project,
+            channels=channels,
+            start_time=start_time,
+            end_time=end_time,
+            classification=classification,
+            frame_format=frame_format,
+            file_format=file_format,
+            channel_format=channel_format,
+            timeout=poll_interval,
+            aggregation=aggregation
+        )
+        request_id = status.request_id
+
+        if status.status_code == 200 and status.result and status.result.result_url:
+            return status.result
+        if status.status_code >= 400:
+            raise MercutoHTTPException(status.message, status.status_code)
+
+        start_poll = time.time()
+        while True:
+            status = await self.get_request(request_id)
+            if status.status_code == 200 and status.result and status.result.result_url:
+                return status.result
+            if status.status_code >= 400:
+                raise MercutoHTTPException(status.message, status.status_code)
+            if time.time() - start_poll > timeout:
+                raise MercutoClientException(
+                    "Timed out waiting for presigned url.")
+            await asyncio.sleep(poll_interval)
+
+    """
+    Samples
+    """
+
+    async def insert_secondary_samples(
+        self,
+        project: str,
+        samples: Collection[SecondaryDataSample]
+    ) -> None:
+        """
+        Insert secondary samples.
+        """
+        for batch in batched(samples, 5000):
+            payload = _SecondarySamplelistAdapter.dump_json(list(batch))
+            await self._client.request(
+                f'{self._path}/samples/secondary', 'PUT', json=payload, params={"project": project}
+            )
+
+    async def insert_metric_samples(
+        self,
+        project: str,
+        samples: Collection[MetricDataSample]
+    ) -> None:
+        """
+        Insert metric samples.
+        """
+        for batch in batched(samples, 5000):
+            payload = _MetricSamplelistAdapter.dump_json(list(batch))
+            await self._client.request(
+                f'{self._path}/samples/metric', 'PUT', json=payload, params={"project": project}
+            )
+
+    async def load_secondary_samples(
+        self,
+        channels: Collection[str],
+        start_time: datetime,
+        end_time: datetime,
+        limit: int = 100
+    ) -> list[SecondaryDataSample]:
+        """
+        Load up to 100 secondary samples.
+        """
+        params: PayloadType = {
+            "channels": list(channels),
+            "start_time": start_time.isoformat(),
+            "end_time": end_time.isoformat(),
+            "limit": limit
+        }
+        r = await self._client.request(
+            f'{self._path}/samples/secondary', 'GET', params=params
+        )
+        return _SecondarySamplelistAdapter.validate_json(r.text)
+
+    async def load_metric_samples(
+        self,
+        channels: Optional[Collection[str]] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        events: Optional[Collection[str]] = None,
+        project: Optional[str] = None,
+        limit: int = 100
+    ) -> list[MetricDataSample]:
+        """
+        Load up to 100 metric samples.
+        """
+        params: PayloadType = {
+            "limit": limit
+        }
+        if project is not None:
+            params["project"] = project
+        if channels is not None:
+            params["channels"] = list(channels)
+        if start_time is not None:
+            params["start_time"] = start_time.isoformat()
+        if end_time is not None:
+            params["end_time"] = end_time.isoformat()
+        if events is not None:
+            params["event"] = list(events)
+        r = await self._client.request(
+            f'{self._path}/samples/metric', 'GET', params=params
+        )
+        return _MetricSamplelistAdapter.validate_json(r.text)
+
+    async def load_metric_sample(self, channel: str, event: str) -> Optional[float]:
+        """
+        Load a single metric sample for a specific channel and event.
+        """
+        samples = await self.load_metric_samples([channel], events=[event])
+        return samples[0].value if samples else None
+
+    async def delete_metric_samples(self, project: str, event: str, channels: Optional[Collection[str]] = None) -> None:
+        params: PayloadType = {"project": project, "event": event}
+        if channels is not None:
+            params["channels"] = list(channels)
+        await self._client.request(
+            f'{self._path}/samples/metric', 'DELETE', params=params
+        )
+
+    async def upload_file(self, project: str, datatable: str, file: str | bytes | TextIO | BinaryIO,
+                          filename: Optional[str] = None,
+                          timezone: Optional[str] = None) -> None:
+        if isinstance(file, str):
+            with open(file, 'rb') as f:
+                content: bytes | str = f.read()
+            filename = filename or os.path.basename(file)
+        elif isinstance(file, bytes):
+            content = file
+            filename = filename or 'file.dat'
+        else:
+            content = file.read()
+            filename = filename or 'file.dat'
+
+        params: PayloadType = {
+            "project": project,
+            "datatable": datatable,
+        }
+        if timezone is not None:
+            params["timezone"] = timezone
+
+        await self._client.request(f'{self._path}/files/upload/small', 'POST',
+                                   params=params,
+                                   files={'file': (filename, content, 'text/csv')})
+
+    async def get_latest_samples(self, project: str, include_primary: bool = True) -> list[LatestDataSample]:
+        params: PayloadType = {
+            "project": project,
+            "include_primary": include_primary
+        }
+        r = await self._client.request(
+            f'{self._path}/statistics/latest-samples', 'GET', params=params
+        )
+        return _LatestSampleListAdapter.validate_json(r.text)
+
+    async def watch_latest(
+        self,
+        project: str,
+        include_primary: bool = True,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+        idle_backoff: float = DEFAULT_IDLE_BACKOFF
+    ) -> AsyncIterator[list[LatestDataSample]]:
+        """
+        Poll `get_latest_samples` indefinitely and yield the samples whose timestamp or value changed since the
+        previous poll. See `MercutoDataService.watch_latest`. Sampling periods are listed once when iteration starts.
+        """
+        tracker = LatestSampleTracker(min_interval=min_interval, max_interval=max_interval, idle_backoff=idle_backoff)
+        periods = {channel.code: channel.sampling_period for channel in await self.list_channels(project)}
+        while True:
+            changed = tracker.update(await self.get_latest_samples(project, include_primary=include_primary))
+            if changed:
+                yield changed
+            await asyncio.sleep(tracker.next_delay(periods.get))
@@ -0,0 +1,186 @@
+from typing import TYPE_CHECKING, Optional
+
+from ...modules import PayloadType
+from ...modules.identity import (CurrentUser, Healthcheck, HiddenUserAPIKey,
+                                 PermissionGroup, Tenant, User, UserDetails,
+                                 VerifyMyPermissions, VisibleUserAPIKey,
+                                 _HiddenUserAPIKeylistAdapter,
+                                 _PermissionGrouplistAdapter,
+                                 _TenantlistAdapter, _UserlistAdapter)
+
+if TYPE_CHECKING:
+    from ..client import AsyncMercutoClient
+
+
+class AsyncMercutoIdentityService:
+    def __init__(self, client: 'AsyncMercutoClient', path: str = '/identity') -> None:
+        self._client = client
+        self._path = path
+
+    async def healthcheck(self) -> Healthcheck:
+        r = await self._client.request(f"{self._path}/healthcheck", "GET")
+        return Healthcheck.model_validate_json(r.text)
+
+    # --- Verify routes ---
+
+    async def get_my_permissions(self) -> VerifyMyPermissions:
+        r = await self._client.request(f"{self._path}/verify/me", "GET")
+        return VerifyMyPermissions.model_validate_json(r.text)
+
+    # --- User routes ---
+
+    async def list_users(self, tenant: Optional[str] = None) -> list[User]:
+        params: PayloadType = {}
+        if tenant is not None:
+            params["tenant"] = tenant
+        r = await self._client.request(f"{self._path}/users", "GET", params=params)
+        return _UserlistAdapter.validate_json(r.text)
+
+    async def create_user(
+        self,
+        username: str,
+        tenant: str,
+        description: str,
+        group: str,
+        default_password: Optional[str] = None
+    ) -> User:
+        payload: PayloadType = {
+            "username": username,
+            "tenant_code": tenant,
+            "description": description,
+            "group_code": group,
+            "default_password": default_password,
+        }
+        r = await self._client.request(f"{self._path}/users", "PUT", json=payload)
+        return User.model_validate_json(r.text)
+
+    async def get_current_user(self) -> CurrentUser:
+        r = await self._client.request(f"{self._path}/users/me", "GET")
+        return CurrentUser.model_validate_json(r.text)
+
+    async def get_user(self, code: str) -> User:
+        r = await self._client.request(f"{self._path}/users/{code}", "GET")
+        return User.model_validate_json(r.text)
+
+    async def delete_user(self, code: str) -> None:
+        await self._client.request(f"{self._path}/users/{code}", "DELETE")
+
+    async def edit_user(
+        self,
+        code: str,
+        description: str,
+        group: str
+    ) -> User:
+        payload: PayloadType = {
+            "description": description,
+            "group_code": group,
+        }
+        r = await self._client.request(f"{self._path}/users/{code}", "PATCH", json=payload)
+        return User.model_validate_json(r.text)
+
+    async def get_user_details(self, code: str) -> UserDetails:
+        r = await self._client.request(f"{self._path}/users/{code}/details", "GET")
+        return UserDetails.model_validate_json(r.text)
+
+    async def set_user_details(
+        self,
+        code: str,
+        email_address: Optional[str] = None,
+        mobile_number: Optional[str] = None,
+        first_name: Optional[str] = None,
+        last_name: Optional[str] = None
+    ) -> UserDetails:
+        payload: PayloadType = {
+            "email_address": email_address,
+            "mobile_number": mobile_number,
+            "first_name": first_name,
+            "last_name": last_name,
+        }
+        r = await self._client.request(f"{self._path}/users/{code}/details", "PATCH", json=payload)
+        return UserDetails.model_validate_json(r.text)
+
+    async def get_user_api_keys(self, user: str) -> list[HiddenUserAPIKey]:
+        r = await self._client.request(f"{self._path}/users/{user}/api_keys", "GET")
+        return _HiddenUserAPIKeylistAdapter.validate_json(r.text)
+
+    async def generate_api_key_for_user(
+        self,
+        user: str,
+        description: str,
+        custom_policy: Optional[str] = None
+    ) -> VisibleUserAPIKey:
+        payload: PayloadType = {
+            "description": description,
+            "custom_policy": custom_policy,
+        }
+        r = await self._client.request(f"{self._path}/users/{user}/api_keys", "POST", json=payload)
+        return VisibleUserAPIKey.model_validate_json(r.text)
+
+    async def delete_api_key(self, user: str, key_code: str) -> None:
+        await self._client.request(f"{self._path}/users/{user}/api_keys/{key_code}", "DELETE")
+
+    # --- Tenants routes ---
+
+    async def list_tenants(self) -> list[Tenant]:
+        r = await self._client.request(f"{self._path}/tenants", "GET")
+        return _TenantlistAdapter.validate_json(r.text)
+
+    async def get_tenant(self, code: str) -> Tenant:
+        r = await self._client.request(f"{self._path}/tenants/{code}", "GET")
+        return Tenant.model_validate_json(r.text)
+
+    async def create_tenant(
+        self,
+        name: str,
+        description: str,
+        logo_url: Optional[str] = None
+    ) -> Tenant:
+        payload: PayloadType = {
+            "name": name,
+            "description": description,
+            "logo_url": logo_url,
+        }
+        r = await self._client.request(f"{self._path}/tenants", "PUT", json=payload)
+        return Tenant.model_validate_json(r.text)
+
+    # --- Permission Groups routes ---
+
+    async def get_permission_groups(self, tenant: Optional[str] = None) -> list[PermissionGroup]:
+        params: PayloadType = {}
+        if tenant is not None:
+            params["tenant"] = tenant
+        r = await self._client.request(f"{self._path}/permissions", "GET", params=params)
+        return _PermissionGrouplistAdapter.validate_json(r.text)
+
+    async def create_permission_group(
+        self,
+        tenant: str,
+        label: str,
+        acl_policy: str
+    ) -> PermissionGroup:
+        payload: PayloadType = {
+            "tenant": tenant,
+            "label": label,
+            "acl_policy": acl_policy,
+        }
+        r = await self._client.request(f"{self._path}/permissions", "PUT", json=payload)
+        return PermissionGroup.model_validate_json(r.text)
+
+    async def get_permission_group(self, group: str) -> PermissionGroup:
+        r = await self._client.request(f"{self._path}/permissions/{group}", "GET")
+        return PermissionGroup.model_validate_json(r.text)
+
+    async def delete_permission_group(self, group: str) -> None:
+        await self._client.request(f"{self._path}/permissions/{group}", "DELETE")
+
+    async def modify_permission_group(
+        self,
+        group: str,
+        label: str,
+        acl_policy: str
+    ) -> None:
+        payload: PayloadType = {
+            "label": label,
+            "acl_policy": acl_policy,
+        }
+        await self._client.request(f"{self._path}/permissions/{group}", "PATCH", json=payload)
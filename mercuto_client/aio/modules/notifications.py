@@ -0,0 +1,62 @@
+from typing import TYPE_CHECKING, Optional
+
+from ...modules.notifications import (ContactGroup, ContactMethod, Healthcheck,
+                                      NotificationAttachment,
+                                      _ContactGroupListAdapter)
+
+if TYPE_CHECKING:
+    from ..client import AsyncMercutoClient
+
+
+class AsyncMercutoNotificationService:
+    def __init__(self, client: 'AsyncMercutoClient', path: str = '/notifications') -> None:
+        self._client = client
+        self._path = path
+
+    async def healthcheck(self) -> Healthcheck:
+        r = await self._client.request(f"{self._path}/healthcheck", "GET")
+        return Healthcheck.model_validate_json(r.text)
+
+    async def list_contact_groups(self, project: str) -> list[ContactGroup]:
+        r = await self._client.request(f"{self._path}/contact-groups", "GET", params={"project": project})
+        return _ContactGroupListAdapter.validate_json(r.text)
+
+    async def get_contact_group(self, code: str) -> ContactGroup:
+        r = await self._client.request(f"{self._path}/contact-groups/{code}", "GET")
+        return ContactGroup.model_validate_json(r.text)
+
+    async def create_contact_group(self, project: str, label: str, users: dict[str, list[ContactMethod]]) -> ContactGroup:
+        r = await self._client.request(f"{self._path}/contact-groups", "PUT", json={
+            "project": project,
+            "label": label,
+            "users": users
+        })
+        return ContactGroup.model_validate_json(r.text)
+
+    async def issue_notification(self, contact_group: str, subject: str, html: str,
+                                 alternative_plaintext: Optional[str] = None,
+                                 attachments: Optional[list[NotificationAttachment]] = None,
+                                 unsubscribe_placeholder_text: Optional[str] = None) -> None:
+        """
+        Issue a notification to all contacts within a contact group, based on their contact preferences.
+
+        :param contact_group: The code of the contact group to send the notification to.
+        :param subject: The subject of the notification (i.e. email subject line).
+        :param html: The HTML content of the notification.
+        :param alternative_plaintext: Optional plaintext alternative for the notification.
+            Alternative plaintext is used for SMS notifications and for email clients that do not support HTML.
+        :param attachments: Optional list of attachments to include in the notification.
+            Only applicable for email notifications.
+        :param unsubscribe_placeholder_text: Optional placeholder text for unsubscribe links.
+            Any text matching this placeholder will be replaced with an unsubscribe link for email notifications.
+        :return: None
+        """
+
+        await self._client.request(f"{self._path}/contact-groups/{contact_group}/notify", "POST", json={
+            "subject": subject,
+            "html": html,
+            "alternative_plaintext": alternative_plaintext,
+            "attachments": [attachment.model_dump() for attachment in attachments] if attachments else [],
+            "unsubscribe_placeholder_text": unsubscribe_placeholder_text
+        })
+        return
@@ -0,0 +1,304 @@
+import concurrent.futures
+import contextvars
+import itertools
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import (Callable, Generic, Iterable, Iterator, Optional, Sequence,
+                    TypeVar)
+
+import requests
+
+from ._workers import worker_pool
+from .exceptions import MercutoHTTPException
+
+_T = TypeVar('_T')
+
+DEFAULT_MAX_IN_FLIGHT = 4
+
+_REPORT_ATTRIBUTE = 'upload_report'
+
+
+@dataclass
+class BatchResult(Generic[_T]):
+    """
+    Outcome of uploading one batch.
+
+    :param index: Position of the batch, starting at 0.
+    :param offset: Position of the batch's first item in the input.
+    :param count: Number of items in the batch.
+    :param error: Exception raised while sending the batch, None if it succeeded.
+    :param items: The batch's items when it failed, so they can be retried. Empty for successful batches.
+    :param duration: Seconds spent sending the batch.
+    :param nbytes: Size of the encoded batch.
+    :param splits: Number of times the batch (or part of it) was rejected as too large and re-sent in halves.
+    """
+    index: int
+    offset: int
+    count: int
+    error: Optional[BaseException] = None
+    items: Sequence[_T] = ()
+    duration: float = 0.0
+    nbytes: int = 0
+    splits: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class UploadReport(Generic[_T]):
+    """
+    Per-batch results of a batched upload, ordered by batch index.
+    Batches that were never sent (after a failure with `stop_on_error`) are not included.
+    """
+    batches: list[BatchResult[_T]] = field(default_factory=list)
+
+    @property
+    def inserted(self) -> int:
+        return sum(batch.count for batch in self.batches if batch.ok)
+
+    @property
+    def failed(self) -> list[BatchResult[_T]]:
+        return [batch for batch in self.batches if not batch.ok]
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+
+def is_oversized(error: BaseException) -> bool:
+    """
+    True if a batch failed because it was too large for the server (413) or the link (read timeout).
+    """
+    if isinstance(error, MercutoHTTPException):
+        return error.status_code == 413
+    return isinstance(error, requests.ReadTimeout)
+
+
+def upload_batches(batches: Iterable[Sequence[_T]],
+                   encode: Callable[[Sequence[_T]], bytes],
+                   send: Callable[[bytes], object],
+                   max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+                   stop_on_error: bool = True,
+                   split: Optional[Callable[[BaseException], bool]] = None,
+                   observe: Optional[Callable[[BatchResult[_T]], None]] = None) -> UploadReport[_T]:
+    """
+    Encode batches on the calling thread while up to `max_in_flight` previously encoded batches are being sent.
+
+    With `stop_on_error`, no new batch is started after a failure. Batches already in flight are allowed to finish
+    and the first failure (by batch index) is re-raised, with the report attached (see `upload_report`).
+    Otherwise every batch is attempted and failures are only reported.
+
+    :param split: If it returns True for a send error, the batch is encoded and sent again in two halves (recursively).
+    :param observe: Called on the calling thread with the result of every batch as it completes.
+    """
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be at least 1")
+
+    report: UploadReport[_T] = UploadReport()
+    pending: dict[concurrent.futures.Future[None], tuple[BatchResult[_T], Sequence[_T]]] = {}
+
+    def deliver(result: BatchResult[_T], items: Sequence[_T], body: bytes) -> None:
+        try:
+            send(body)
+        except Exception as error:
+            if split is None or len(items) < 2 or not split(error):
+                raise
+            result.splits += 1
+            half = len(items) // 2
+            for part in (items[:half], items[half:]):
+                deliver(result, part, encode(part))
+
+    def timed_deliver(result: BatchResult[_T], items: Sequence[_T], body: bytes) -> None:
+        start = time.monotonic()
+        try:
+            deliver(result, items, body)
+        finally:
+            result.duration = time.monotonic() - start
+
+    def collect(done: Iterable[concurrent.futures.Future[None]]) -> None:
+        for future in done:
+            result, items = pending.pop(future)
+            error = future.exception()
+            if error is not None:
+                result.error = error
+                result.items = items
+            report.batches.append(result)
+            if observe is not None:
+                observe(result)
+
+    executor = worker_pool(max_in_flight, 'mercuto-upload')
+    try:
+        offset = 0
+        for index, items in enumerate(batches):
+            body = encode(items)
+            while len(pending) >= max_in_flight:
+                done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                collect(done)
+            if stop_on_error and not report.ok:
+                break
+            result: BatchResult[_T] = BatchResult(index=index, offset=offset, count=len(items), nbytes=len(body))
+            # Run in a copy of the caller's context so request hooks attribute the batch to the calling service method.
+            future = executor.submit(contextvars.copy_context().run, timed_deliver, result, items, body)
+            pending[future] = (result, items)
+            offset += len(items)
+        collect(concurrent.futures.wait(pending).done)
+    finally:
+        executor.shutdown(wait=True)
+
+    report.batches.sort(key=lambda batch: batch.index)
+    if stop_on_error and report.failed:
+        error = report.failed[0].error
+        assert error is not None
+        setattr(error, _REPORT_ATTRIBUTE, report)
+        raise error
+    return report
+
+
+def upload_report(error: BaseException) -> Optional[UploadReport]:
+    """
+    The report of the upload that `error` stopped, when it was raised by an upload with `stop_on_error`.
+    It shows which batches were sent before the failure, so they need not be sent again.
+    """
+    return getattr(error, _REPORT_ATTRIBUTE, None)
+
+
+@dataclass(frozen=True)
+class BatchSizeConfig:
+    """
+    Bounds and targets for adaptive batch sizing.
+
+    After every batch the size moves towards the number of items the link delivers in `target_seconds`,
+    changing by at most a factor of `growth` (up) or `shrink` (down) per batch.
+    A batch rejected as too large (413) or timing out shrinks the size by `shrink` immediately.
+
+    :param initial: Size of the first batch.
+    :param minimum: Smallest batch size.
+    :param maximum: Largest batch size.
+    :param target_seconds: Desired duration of one batch request. Keep this well below the request timeout.
+    :param max_bytes: Largest encoded batch to aim for, estimated from the size of previous batches.
+    :param growth: Largest factor the size can grow by after a batch.
+    :param shrink: Factor the size shrinks by after an oversized batch, and the most it shrinks by otherwise.
+    """
+    initial: int = 5000
+    minimum: int = 100
+    maximum: int = 50_000
+    target_seconds: float = 2.0
+    max_bytes: int = 16 * 1024 * 1024
+    growth: float = 2.0
+    shrink: float = 0.5
+
+    def __post_init__(self) -> None:
+        if not 1 <= self.minimum <= self.initial <= self.maximum:
+            raise ValueError("Batch sizes must satisfy 1 <= minimum <= initial <= maximum")
+        if self.target_seconds <= 0:
+            raise ValueError("target_seconds must be positive")
+        if self.growth < 1 or not 0 < self.shrink < 1:
+            raise ValueError("growth must be at least 1 and shrink between 0 and 1")
+
+
+@dataclass(frozen=True)
+class BatchSizeStats:
+    """
+    Snapshot of adaptive batch sizing for one endpoint.
+
+    :param size: Size the next batch will use.
+    :param batches: Number of batches sent.
+    :param items: Number of items in those batches.
+    :param oversized: Number of batches rejected as too large or timing out.
+    :param smallest: Smallest batch sent, 0 before the first batch.
+    :param largest: Largest batch sent.
+    :param throughput: Items per second delivered by the last successful batch.
+    """
+    size: int
+    batches: int = 0
+    items: int = 0
+    oversized: int = 0
+    smallest: int = 0
+    largest: int = 0
+    throughput: float = 0.0
+
+
+class AdaptiveBatchSize:
+    """
+    Batch size for one endpoint that follows observed throughput and payload size. Thread safe.
+    """
+
+    def __init__(self, config: BatchSizeConfig) -> None:
+        self._config = config
+        self._lock = threading.Lock()
+        self._size = config.initial
+        self._batches = 0
+        self._items = 0
+        self._oversized = 0
+        self._smallest = 0
+        self._largest = 0
+        self._throughput = 0.0
+
+    @property
+    def size(self) -> int:
+        with self._lock:
+            return self._size
+
+    def batches(self, items: Iterable[_T]) -> Iterator[tuple[_T, ...]]:
+        """
+        Split `items` into batches, reading the current size before each batch.
+        """
+        it = iter(items)
+        while True:
+            chunk = tuple(itertools.islice(it, self.size))
+            if not chunk:
+                break
+            yield chunk
+
+    def observe(self, result: BatchResult) -> None:
+        config = self._config
+        with self._lock:
+            self._batches += 1
+            self._items += result.count
+            self._smallest = min(self._smallest, result.count) if self._smallest else result.count
+            self._largest = max(self._largest, result.count)
+
+            if result.splits or (result.error is not None and is_oversized(result.error)):
+                self._oversized += 1
+                target = min(self._size, result.count) * config.shrink
+            elif result.error is None and result.duration > 0:
+                self._throughput = result.count / result.duration
+                target = self._throughput * config.target_seconds
+                if result.nbytes:
+                    target = min(target, config.max_bytes * result.count / result.nbytes)
+                target = min(max(target, self._size * config.shrink), self._size * config.growth)
+            else:
+                # Other failures say nothing about the batch size.
+                return
+            self._size = int(min(max(target, config.minimum), config.maximum))
+
+    def stats(self) -> BatchSizeStats:
+        with self._lock:
+            return BatchSizeStats(size=self._size, batches=self._batches, items=self._items, oversized=self._oversized,
+                                  smallest=self._smallest, largest=self._largest, throughput=self._throughput)
+
+
+class BatchSizer:
+    """
+    Adaptive batch sizes per endpoint, shared by a client and its copies.
+    """
+
+    def __init__(self, config: BatchSizeConfig) -> None:
+        self.config = config
+        self._lock = threading.Lock()
+        self._sizes: dict[str, AdaptiveBatchSize] = {}
+
+    def get(self, key: str) -> AdaptiveBatchSize:
+        with self._lock:
+            size = self._sizes.get(key)
+            if size is None:
+                size = self._sizes[key] = AdaptiveBatchSize(self.config)
+            return size
+
+    def stats(self) -> dict[str, BatchSizeStats]:
+        with self._lock:
+            sizes = dict(self._sizes)
+        return {key: size.stats() for key, size in sizes.items()}
@@ -0,0 +1,183 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional
+
+import requests
+import requests.structures
+
+# Project and channel metadata that changes rarely but is fetched often. Sample and status endpoints are never cached by default.
+DEFAULT_CACHED_ROUTES: tuple[str, ...] = (
+    r'^/projects(/[^/]+)?$',
+    r'^/v2/data/(channels|datatables|units|expressions)(/[^/]+)?$',
+    r'^/media/cameras(/[^/]+)?$',
+    r'^/notifications/contact-groups(/[^/]+)?$',
+)
+
+MUTATING_METHODS = frozenset({'PUT', 'POST', 'PATCH', 'DELETE'})
+
+
+@dataclass(frozen=True)
+class CacheConfig:
+    """
+    Response cache for metadata GET requests made through `MercutoClient`.
+
+    Entries are keyed by credentials, URL and query parameters. A fresh entry is returned without contacting the API.
+    Once an entry is older than `ttl` it is revalidated with If-None-Match/If-Modified-Since when the server sent an ETag
+    or Last-Modified header, and re-fetched otherwise.
+    Any PUT/POST/PATCH/DELETE request invalidates cached entries for the same resource and its parent collection.
+
+    :param ttl: Seconds an entry is served without revalidation.
+    :param max_entries: Maximum number of cached responses. The least recently used entry is evicted first.
+    :param routes: Regular expressions matched against the request path. Only GET requests to matching paths are cached.
+    """
+    ttl: float = 60.0
+    max_entries: int = 512
+    routes: tuple[str, ...] = DEFAULT_CACHED_ROUTES
+    _compiled_routes: tuple['re.Pattern[str]', ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        object.__setattr__(self, '_compiled_routes', tuple(re.compile(pattern) for pattern in self.routes))
+
+    def matches(self, path: str) -> bool:
+        return any(pattern.search(path) for pattern in self._compiled_routes)
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """
+    Snapshot of response cache activity.
+
+    :param hits: Requests answered from the cache without contacting the API.
+    :param revalidations: Stale entries confirmed unchanged by a 304 response.
+    :param misses: Cacheable requests that were fetched in full.
+    :param evictions: Entries dropped to stay within `max_entries`.
+    :param invalidations: Entries dropped because of a mutating request.
+    :param entries: Number of entries currently cached.
+    """
+    hits: int = 0
+    revalidations: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    entries: int = 0
+
+
+class CacheEntry:
+    __slots__ = ('path', 'status_code', 'headers', 'content', 'encoding', 'url', 'stored_at')
+
+    def __init__(self, path: str, response: requests.Response) -> None:
+        self.path = path
+        self.status_code = response.status_code
+        self.headers = dict(response.headers)
+        self.content = response.content
+        self.encoding = response.encoding
+        self.url = response.url
+        self.stored_at = time.monotonic()
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self.headers.get('ETag') or self.headers.get('etag')
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return self.headers.get('Last-Modified') or self.headers.get('last-modified')
+
+    def validators(self) -> dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def to_response(self) -> requests.Response:
+        response = requests.Response()
+        response.status_code = self.status_code
+        response.headers = requests.structures.CaseInsensitiveDict(self.headers)
+        response._content = self.content
+        response.encoding = self.encoding
+        response.url = self.url
+        return response
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU store of responses, shared by a client and its copies.
+    """
+
+    def __init__(self, config: CacheConfig) -> None:
+        self.config = config
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[str, str], CacheEntry] = OrderedDict()
+        self._hits = 0
+        self._revalidations = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    @staticmethod
+    def key(credentials: str, url: str, params: Optional[dict]) -> tuple[str, str]:
+        # Preparing the URL gives the same canonical query string requests will send.
+        prepared = requests.PreparedRequest()
+        prepared.prepare_url(url, params)
+        assert prepared.url is not None
+        return credentials, prepared.url
+
+    def get(self, key: tuple[str, str]) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return time.monotonic() - entry.stored_at < self.config.ttl
+
+    def record_hit(self) -> None:
+        with self._lock:
+            self._hits += 1
+
+    def revalidated(self, entry: CacheEntry) -> None:
+        with self._lock:
+            entry.stored_at = time.monotonic()
+            self._revalidations += 1
+
+    def store(self, key: tuple[str, str], path: str, response: requests.Response) -> None:
+        if 'no-store' in response.headers.get('Cache-Control', ''):
+            return
+        entry = CacheEntry(path, response)
+        with self._lock:
+            self._misses += 1
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.config.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """
+        Drop entries affected by a change to `path`: the path itself, anything below it and its parent collection.
+        Drops everything when `path` is None.
+        """
+        with self._lock:
+            if path is None:
+                self._invalidations += len(self._entries)
+                self._entries.clear()
+                return
+            path = path.rstrip('/')
+            parent = path.rsplit('/', 1)[0]
+            stale = [key for key, entry in self._entries.items()
+                     if entry.path == parent or entry.path == path or entry.path.startswith(path + '/')]
+            for key in stale:
+                del self._entries[key]
+            self._invalidations += len(stale)
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(hits=self._hits, revalidations=self._revalidations, misses=self._misses,
+                              evictions=self._evictions, invalidations=self._invalidations, entries=len(self._entries))
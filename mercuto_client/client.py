@@ -2,25 +2,41 @@ import contextlib
 import json as json_stdlib
 import logging
 import os
+import threading
 import time
-from typing import (Any, Iterator, Literal, Mapping, Optional, Protocol, Type,
-                    TypeVar)
+from typing import (TYPE_CHECKING, Any, Iterator, Literal, Mapping, Optional,
+                    Protocol, Type, TypeVar, Union)
 
 import requests
 import requests.cookies
 
+from . import instrumentation as _instrumentation
+from . import retry as _retry
 from ._authentication import (IAuthenticationMethod,
                               create_authentication_method)
+from ._workers import is_worker_thread, worker_pool
+from .compression import CompressionConfig, maybe_compress
 from .exceptions import MercutoClientException, MercutoHTTPException
-from .modules.alerts import MercutoAlertService
-from .modules.connect import MercutoConnectService
-from .modules.core import MercutoCoreService
-from .modules.data import MercutoDataService
-from .modules.fatigue import MercutoFatigueService
-from .modules.identity import MercutoIdentityService
-from .modules.media import MercutoMediaService
-from .modules.notifications import MercutoNotificationService
-from .modules.reports import MercutoReportService
+from .instrumentation import RequestHook
+from .retry import NO_RETRY, RetryPolicy, RetryStats
+
+if TYPE_CHECKING:
+    # Imported where they are used, so importing the package does not load them (sqlite3 and uuid for the spool).
+    from .batching import AdaptiveBatchSize, BatchSizeConfig, BatchSizeStats
+    from .caching import CacheConfig, CacheEntry, CacheStats
+    from .modules.alerts import MercutoAlertService
+    from .modules.connect import MercutoConnectService
+    from .modules.core import MercutoCoreService
+    from .modules.data import MercutoDataService
+    from .modules.fatigue import MercutoFatigueService
+    from .modules.identity import MercutoIdentityService
+    from .modules.media import MercutoMediaService
+    from .modules.notifications import MercutoNotificationService
+    from .modules.reports import MercutoReportService
+    from .pooling import PoolConfig, PooledHTTPAdapter, PoolStats
+    from .registry import ChannelIndexStore
+    from .result_cache import ResultCache, ResultCacheConfig, ResultCacheStats
+    from .spool import SampleSpool, SpoolConfig, SpoolStats
 
 logger = logging.getLogger(__name__)
 
@@ -34,7 +50,31 @@ _T = TypeVar('_T', bound=_ModuleBase)
 
 
 class MercutoClient:
-    def __init__(self, url: Optional[str] = None, verify_ssl: bool = True, active_session: Optional[requests.Session] = None) -> None:
+    def __init__(self, url: Optional[str] = None, verify_ssl: bool = True, active_session: Optional[requests.Session] = None,
+                 pool: Optional['PoolConfig'] = None,
+                 retry: Optional[RetryPolicy] = None,
+                 compression: Optional[CompressionConfig] = None,
+                 cache: Optional['CacheConfig'] = None,
+                 thread_safe: bool = False,
+                 batching: Optional['BatchSizeConfig'] = None,
+                 result_cache: Optional['ResultCacheConfig'] = None,
+                 spool: Optional['SpoolConfig'] = None) -> None:
+        """
+        :param url: Base URL of the Mercuto API. Defaults to the MERCUTO_API_URL environment variable or the public API.
+        :param verify_ssl: Verify SSL certificates. The URL must be https when True.
+        :param active_session: Existing session to share connections with. Its adapters are left untouched unless `pool` is given.
+        :param pool: Connection pool settings. Defaults to `PoolConfig()` for new sessions.
+        :param retry: Default retry policy for transient failures. Defaults to `RetryPolicy()`. Use `NO_RETRY` to disable.
+        :param compression: Compress large JSON request bodies. Disabled by default as not every deployment accepts compressed bodies.
+        :param cache: Cache metadata GET responses. Disabled by default.
+        :param thread_safe: Give every thread its own session (sharing one connection pool) so a single client can be used
+            from many threads. See "Thread safety" in the README for the exact guarantees.
+        :param batching: Bounds for adaptive batch sizes of sample uploads. Defaults to `BatchSizeConfig()`.
+        :param result_cache: Keep data request results loaded as DataFrames on disk. Disabled by default.
+        :param spool: Write sample inserts to a local spool that is sent to the API in the background, so inserts
+            succeed while the API is unreachable. Disabled by default. Not shared with copies of the client. Spooled samples
+            are only sent by clients with the URL and credentials they were inserted with.
+        """
         if url is None:
             url = os.environ.get('MERCUTO_API_URL', 'https://api.rockfieldcloud.com.au')
         assert isinstance(url, str)
@@ -48,15 +88,54 @@ class MercutoClient:
         self._url = url
         self.verify_ssl = verify_ssl
 
+        from .batching import BatchSizeConfig, BatchSizer
+        from .pooling import mount_pooled_adapter
+        from .registry import ChannelIndexStore
+
         if active_session is None:
             self._current_session = requests.Session()
+            mount_pooled_adapter(self._current_session, pool)
         else:
             self._current_session = active_session
+            if pool is not None:
+                mount_pooled_adapter(self._current_session, pool)
+
+        # In thread-safe mode _current_session is only a template: its adapters (connection pools) and headers
+        # are shared by the per-thread sessions, its cookies are not.
+        self._thread_safe = thread_safe
+        self._local = threading.local()
 
         self._auth_method: Optional[IAuthenticationMethod] = None
         self._cookies = requests.cookies.RequestsCookieJar()
 
+        self._retry_policy = retry if retry is not None else RetryPolicy()
+        self._retry_counter = _retry.RetryCounter()
+
+        self._hooks = _instrumentation.HookList()
+
+        self._cache = None
+        if cache is not None:
+            from .caching import ResponseCache
+            self._cache = ResponseCache(cache)
+
+        self._compression = compression
+
+        self._batch_sizer = BatchSizer(batching if batching is not None else BatchSizeConfig())
+
+        self._result_cache = None
+        if result_cache is not None:
+            from .result_cache import ResultCache
+            self._result_cache = ResultCache(result_cache)
+
+        self._channel_indexes = ChannelIndexStore()
+
+        self._spool = None
+        if spool is not None:
+            from .spool import SampleSpool
+            self._spool = SampleSpool(spool, self._send_spooled, url, self._spool_credentials)
+
         self._modules: dict[str, _ModuleBase] = {}
+        self._modules_lock = threading.Lock()
 
     def url(self) -> str:
         return self._url
@@ -73,7 +152,20 @@ class MercutoClient:
         self.verify_ssl = verify_ssl
 
     def copy(self) -> 'MercutoClient':
-        return MercutoClient(self._url, self.verify_ssl, self._current_session)
+        """
+        Create an unauthenticated client sharing this client's session, retry policy, retry statistics, request hooks,
+        response cache, compression settings, batch sizes, result cache and channel registry snapshots.
+        In thread-safe mode only the connection pool is shared, the copy gets its own per-thread sessions.
+        """
+        other = MercutoClient(self._url, self.verify_ssl, self._current_session, retry=self._retry_policy, compression=self._compression,
+                              thread_safe=self._thread_safe)
+        other._retry_counter = self._retry_counter
+        other._hooks = self._hooks
+        other._cache = self._cache
+        other._batch_sizer = self._batch_sizer
+        other._result_cache = self._result_cache
+        other._channel_indexes = self._channel_indexes
+        return other
 
     @contextlib.contextmanager
     def as_credentials(self, api_key: Optional[str] = None,
@@ -83,8 +175,9 @@ class MercutoClient:
         """
         Same as .connect(), but as a context manager. Will automatically logout when exiting the context.
         """
-        # TODO: We are passing the current session along to re-use connections for speed. Will this cause security issues?
-        other = MercutoClient(self._url, self.verify_ssl, self._current_session)
+        # The copy re-uses this client's connections for speed. Outside thread-safe mode it also shares the session's cookie jar;
+        # use thread_safe=True to keep session state separate between identities.
+        other = self.copy()
         try:
             yield other.connect(api_key=api_key, service_token=service_token, bearer_token=bearer_token, headers=headers)
         finally:
@@ -115,12 +208,148 @@ class MercutoClient:
         return base
 
     def session(self) -> requests.Session:
-        return self._current_session
+        """
+        The session used for requests made from the calling thread.
+        Threads started by the client itself (see `_workers`) get their own session even outside thread-safe mode.
+        """
+        if not self._thread_safe and not is_worker_thread():
+            return self._current_session
+        session: Optional[requests.Session] = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = self._new_thread_session()
+        return session
+
+    def _new_thread_session(self) -> requests.Session:
+        session = requests.Session()
+        session.headers.update(self._current_session.headers)
+        for prefix, adapter in self._current_session.adapters.items():
+            session.mount(prefix, adapter)
+        return session
+
+    def _pooled_adapter(self) -> Optional['PooledHTTPAdapter']:
+        from .pooling import PooledHTTPAdapter
+        adapter = self._current_session.get_adapter(self._url)
+        return adapter if isinstance(adapter, PooledHTTPAdapter) else None
+
+    def pool_stats(self) -> 'PoolStats':
+        """
+        Connection pool usage for the session used by this client (shared with copies and `as_credentials`).
+        Hits are requests that reused an open connection; misses opened a new one.
+        """
+        adapter = self._pooled_adapter()
+        if adapter is None:
+            raise MercutoClientException("Session does not use a PooledHTTPAdapter, pool statistics are unavailable")
+        return adapter.stats()
+
+    def warm_up(self, connections: int = 1) -> None:
+        """
+        Open `connections` connections to the API concurrently so later requests skip the TCP/TLS handshake.
+        Failures are logged and ignored.
+        """
+        def touch() -> None:
+            try:
+                self.session().head(self._url, timeout=10, verify=self.verify_ssl)
+            except requests.RequestException as e:
+                logger.debug("Connection warm-up to %s failed: %s", self._url, e)
+
+        if connections <= 1:
+            touch()
+            return
+        with worker_pool(connections, 'mercuto-warmup') as executor:
+            for _ in range(connections):
+                executor.submit(touch)
+
+    def retry_stats(self) -> RetryStats:
+        """
+        Retry activity for this client and its copies.
+        """
+        return self._retry_counter.snapshot()
+
+    def batch_size(self, key: str) -> 'AdaptiveBatchSize':
+        """
+        Adaptive batch size for uploads to `key` (e.g. 'samples/secondary'), shared with copies of this client.
+        """
+        return self._batch_sizer.get(key)
+
+    def batch_stats(self) -> dict[str, 'BatchSizeStats']:
+        """
+        Current batch size and batch history per upload endpoint for this client and its copies.
+        """
+        return self._batch_sizer.stats()
+
+    def cache_stats(self) -> 'CacheStats':
+        """
+        Response cache activity for this client and its copies.
+        """
+        if self._cache is None:
+            raise MercutoClientException("Response cache is not enabled")
+        return self._cache.stats()
+
+    def result_cache(self) -> Optional['ResultCache']:
+        """
+        The on-disk data request result cache, if enabled. Shared with copies of this client.
+        """
+        return self._result_cache
+
+    def result_cache_stats(self) -> 'ResultCacheStats':
+        """
+        Data request result cache activity for this client and its copies.
+        """
+        if self._result_cache is None:
+            raise MercutoClientException("Result cache is not enabled")
+        return self._result_cache.stats()
+
+    def spool(self) -> Optional['SampleSpool']:
+        """
+        The sample insert spool, if enabled.
+        """
+        return self._spool
+
+    def spool_stats(self) -> 'SpoolStats':
+        """
+        Samples pending in the spool, how long the oldest has waited, and send activity.
+        """
+        if self._spool is None:
+            raise MercutoClientException("Sample spool is not enabled")
+        return self._spool.stats()
+
+    def _send_spooled(self, kind: str, project: str, body: bytes) -> None:
+        self.data()._put_spooled_samples(kind, project, body)
+
+    def _spool_credentials(self) -> str:
+        return self._auth_method.unique_key() if self._auth_method is not None else ''
+
+    def channel_indexes(self) -> 'ChannelIndexStore':
+        """
+        Channel registry snapshots per project, shared with copies of this client. See `MercutoDataService.channel_registry`.
+        """
+        return self._channel_indexes
+
+    def invalidate_cache(self, path: Optional[str] = None) -> None:
+        """
+        Drop cached responses for `path` (relative to the API URL), its sub-resources and its parent collection,
+        or the whole cache when `path` is None.
+        Use this after changes the cache cannot see, e.g. creating a datatable also creates channels.
+        """
+        if self._cache is not None:
+            self._cache.invalidate(None if path is None else '/' + path.lstrip('/'))
+
+    def add_hook(self, hook: RequestHook) -> None:
+        """
+        Register a hook to be notified about every request made by this client and its copies.
+        See `RequestHook` and `LatencyHistogram`.
+        """
+        self._hooks.add(hook)
+
+    def remove_hook(self, hook: RequestHook) -> None:
+        self._hooks.remove(hook)
 
     def request(self, url: str, method: Literal['GET', 'POST', 'PUT', 'DELETE', 'PATCH', 'HEAD', 'OPTIONS'],
                 params: Optional[dict[str, Any]] = None,
-                json: Optional[dict[str, Any]] = None,
+                json: Optional[Union[dict[str, Any], bytes]] = None,
                 raise_for_status: bool = True,
+                retry: Union[RetryPolicy, bool, None] = None,
+                cache: Optional[bool] = None,
                 **kwargs: Any) -> requests.Response:
         """
         Make an HTTP request to the Mercuto API.
@@ -128,17 +357,30 @@ class MercutoClient:
         :param method: The HTTP method to use (e.g., 'GET', 'POST', etc.).
         :param params: Optional dictionary of query parameters to include in the request.
         :param json: Optional dictionary to send as a JSON payload in the request body.
+            Bytes are treated as an already encoded JSON document and sent without re-serializing.
         :param raise_for_status: Whether to raise an exception for HTTP error responses.
+        :param retry: Override the client's retry policy for this call. False disables retries,
+            True forces retries even if the route is not known to be idempotent.
+        :param cache: Override whether a GET is served from the response cache, if enabled. None uses the configured routes.
         :param kwargs: Additional keyword arguments to pass to the requests method.
         :return: The HTTP response object.
         """
-        return self._http_request(url, method, params=params, json=json, raise_for_status=raise_for_status, **kwargs)
+        return self._http_request(url, method, params=params, json=json, raise_for_status=raise_for_status, retry=retry, cache=cache, **kwargs)
 
     def _http_request(self, url: str, method: str,
                       params: Optional[dict[str, Any]] = None,
-                      json: Optional[dict[str, Any]] = None,
+                      json: Optional[Union[dict[str, Any], bytes]] = None,
                       raise_for_status: bool = True,
+                      retry: Union[RetryPolicy, bool, None] = None,
+                      cache: Optional[bool] = None,
                       **kwargs: Any) -> requests.Response:
+        policy = self._retry_policy
+        if isinstance(retry, RetryPolicy):
+            policy = retry
+        elif retry is False:
+            policy = NO_RETRY
+        idempotent = retry is True or policy.is_idempotent(method, url)
+
         if url.startswith('/'):
             url = url[1:]
         full_url = f"{self._url}/{url}"
@@ -155,61 +397,172 @@ class MercutoClient:
 
         # Custom parsing json to support NAN
         if json is not None and kwargs.get('data') is None:
-            kwargs['data'] = json_stdlib.dumps(json, allow_nan=True)
+            if isinstance(json, bytes):
+                kwargs['data'] = json
+            else:
+                kwargs['data'] = json_stdlib.dumps(json, allow_nan=True).encode('utf-8')
             kwargs['headers']['Content-Type'] = 'application/json'
             json = None
+            if self._compression is not None:
+                kwargs['data'] = maybe_compress(kwargs['data'], kwargs['headers'], self._compression)
+
+        path = f'/{url}'
+        cache_key: Optional[tuple[str, str]] = None
+        cached: Optional['CacheEntry'] = None
+        if self._cache is not None and method == 'GET' and cache is not False and not kwargs.get('stream', False) \
+                and (cache or self._cache.config.matches(path)):
+            credentials = self._auth_method.unique_key() if self._auth_method is not None else ''
+            cache_key = self._cache.key(credentials, full_url, params)
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                if self._cache.is_fresh(cached):
+                    self._cache.record_hit()
+                    return cached.to_response()
+                kwargs['headers'].update(cached.validators())
+
+        event: Optional[_instrumentation.RequestEvent] = None
+        if self._hooks:
+            event = _instrumentation.start_event(self._hooks, method, path)
+        try:
+            resp = self._send(method, full_url, policy, idempotent, event, params=params, json=json, **kwargs)
+            if cache_key is not None and self._cache is not None:
+                if resp.status_code == 304 and cached is not None:
+                    self._cache.revalidated(cached)
+                    resp = cached.to_response()
+                elif resp.status_code == 200:
+                    self._cache.store(cache_key, path, resp)
+            if raise_for_status and not resp.ok:
+                try:
+                    error_json = resp.json()
+                except Exception:
+                    raise MercutoHTTPException(resp.text, resp.status_code)
+                else:
+                    if 'detail' in error_json and isinstance(error_json['detail'], str):
+                        raise MercutoHTTPException(error_json['detail'], resp.status_code)
+                    else:
+                        raise MercutoHTTPException(resp.text, resp.status_code)
+        except Exception as e:
+            if event is not None:
+                event.error = e
+            raise
+        finally:
+            if self._cache is not None:
+                from .caching import MUTATING_METHODS
+                if method in MUTATING_METHODS:
+                    self._cache.invalidate(path)
+            if event is not None:
+                _instrumentation.finish_event(self._hooks, event)
+        resp.cookies.update(self._cookies)
+        return resp
 
-        start = time.time()
-        resp = self._current_session.request(method, full_url, params=params, json=json, **kwargs)
-        duration = time.time() - start
-        logger.debug("Made request to %s %s in %.2f seconds (code=%s)", method, full_url, duration, resp.status_code)
-        if raise_for_status and not resp.ok:
+    def _send(self, method: str, full_url: str, policy: RetryPolicy, idempotent: bool,
+              event: Optional[_instrumentation.RequestEvent], **kwargs: Any) -> requests.Response:
+        # With hooks registered the body is read separately from the headers so both can be timed.
+        read_body = event is not None and not kwargs.get('stream', False)
+        if read_body:
+            kwargs['stream'] = True
+
+        self._retry_counter.record_request()
+        rewind = _retry.replayable_body(kwargs) if policy.max_attempts > 1 else None
+        attempt = 1
+        while True:
+            if attempt > 1 and rewind is not None:
+                rewind()
+            start = time.time()
             try:
-                error_json = resp.json()
-            except Exception:
-                raise MercutoHTTPException(resp.text, resp.status_code)
+                resp = self.session().request(method, full_url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= policy.max_attempts or not policy.should_retry_exception(e, idempotent):
+                    if attempt > 1:
+                        self._retry_counter.record_exhausted()
+                    raise
+                delay = policy.backoff(attempt)
+                logger.warning("Request to %s %s failed (%s), retrying in %.2f seconds (attempt %d/%d)",
+                               method, full_url, e, delay, attempt, policy.max_attempts)
+                self._retry_counter.record_retry(0)
             else:
-                if 'detail' in error_json and isinstance(error_json['detail'], str):
-                    raise MercutoHTTPException(error_json['detail'], resp.status_code)
-                else:
-                    raise MercutoHTTPException(resp.text, resp.status_code)
-        resp.cookies.update(self._cookies)
+                duration = time.time() - start
+                logger.debug("Made request to %s %s in %.2f seconds (code=%s)", method, full_url, duration, resp.status_code)
+                if not policy.should_retry_status(resp.status_code, idempotent):
+                    break
+                if attempt >= policy.max_attempts:
+                    self._retry_counter.record_exhausted()
+                    break
+                retry_after = policy.retry_after(resp)
+                delay = retry_after if retry_after is not None else policy.backoff(attempt)
+                logger.warning("Request to %s %s returned %s, retrying in %.2f seconds (attempt %d/%d)",
+                               method, full_url, resp.status_code, delay, attempt, policy.max_attempts)
+                self._retry_counter.record_retry(resp.status_code)
+                resp.close()
+            if event is not None:
+                event.retries = attempt
+            _retry.sleep(delay)
+            attempt += 1
+
+        if event is not None:
+            event.headers_at = time.monotonic()
+            event.status_code = resp.status_code
+            body = resp.request.body
+            event.bytes_out = len(body) if isinstance(body, (bytes, str)) else 0
+            self._hooks.emit('on_response_headers', event)
+            if read_body:
+                content = resp.content
+                event.body_at = time.monotonic()
+                wire_bytes = resp.raw.tell() if hasattr(resp.raw, 'tell') else 0
+                event.bytes_in = wire_bytes or len(content)
+                self._hooks.emit('on_response_body', event)
         return resp
 
     def _add_and_fetch_module(self, name: str, module: Type[_T]) -> _T:
-        if name not in self._modules:
-            self._modules[name] = module(self)
-        return self._modules[name]  # type: ignore
+        instance = self._modules.get(name)
+        if instance is None:
+            with self._modules_lock:
+                instance = self._modules.get(name)
+                if instance is None:
+                    instance = self._modules[name] = module(self)
+        return instance  # type: ignore
 
     def identity(self) -> 'MercutoIdentityService':
+        from .modules.identity import MercutoIdentityService
         return self._add_and_fetch_module('identity', MercutoIdentityService)
 
     def fatigue(self) -> 'MercutoFatigueService':
+        from .modules.fatigue import MercutoFatigueService
         return self._add_and_fetch_module('fatigue', MercutoFatigueService)
 
     def data(self) -> 'MercutoDataService':
+        from .modules.data import MercutoDataService
         return self._add_and_fetch_module('data', MercutoDataService)
 
     def core(self) -> 'MercutoCoreService':
+        from .modules.core import MercutoCoreService
         return self._add_and_fetch_module('core', MercutoCoreService)
 
     def media(self) -> 'MercutoMediaService':
+        from .modules.media import MercutoMediaService
         return self._add_and_fetch_module('media', MercutoMediaService)
 
     def reports(self) -> 'MercutoReportService':
+        from .modules.reports import MercutoReportService
         return self._add_and_fetch_module('reports', MercutoReportService)
 
     def notifications(self) -> 'MercutoNotificationService':
+        from .modules.notifications import MercutoNotificationService
         return self._add_and_fetch_module('notifications', MercutoNotificationService)
 
     def alerts(self) -> 'MercutoAlertService':
+        from .modules.alerts import MercutoAlertService
         return self._add_and_fetch_module('alerts', MercutoAlertService)
 
     def connectivity(self) -> 'MercutoConnectService':
+        from .modules.connect import MercutoConnectService
         return self._add_and_fetch_module('connect', MercutoConnectService)
 
     def login(self, authentication: IAuthenticationMethod) -> None:
         self._auth_method = authentication
+        adapter = self._pooled_adapter()
+        if adapter is not None and adapter.pool_config.warm_connections > 0:
+            self.warm_up(adapter.pool_config.warm_connections)
 
     def logout(self) -> None:
         self._auth_method = None
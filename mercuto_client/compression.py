@@ -0,0 +1,58 @@
+import zlib
+from dataclasses import dataclass
+from typing import Literal
+
+ContentEncoding = Literal['gzip', 'deflate']
+
+_WBITS: dict[str, int] = {
+    'gzip': 16 + zlib.MAX_WBITS,
+    'deflate': zlib.MAX_WBITS,
+}
+
+# Feed the compressor in slices so the working set stays small for multi-megabyte payloads.
+_CHUNK_SIZE = 256 * 1024
+
+
+@dataclass(frozen=True)
+class CompressionConfig:
+    """
+    Request body compression for `MercutoClient`.
+
+    JSON request bodies of at least `threshold` bytes are compressed and sent with a matching Content-Encoding header.
+    Compressed responses need no configuration: requests asks for them by default and decompresses them transparently.
+
+    :param encoding: 'gzip' or 'deflate' (zlib stream).
+    :param threshold: Minimum uncompressed body size in bytes before compression is applied.
+    :param level: zlib compression level, 1 (fastest) to 9 (smallest). Lower levels suit CPU-constrained devices.
+    """
+    encoding: ContentEncoding = 'gzip'
+    threshold: int = 1024
+    level: int = 6
+
+    def __post_init__(self) -> None:
+        if self.encoding not in _WBITS:
+            raise ValueError(f"Unsupported content encoding: {self.encoding}")
+        if not 0 <= self.level <= 9:
+            raise ValueError("level must be between 0 and 9")
+
+
+def compress_body(body: bytes, config: CompressionConfig) -> bytes:
+    """
+    Compress `body` using a streaming zlib compressor configured for `config.encoding`.
+    """
+    compressor = zlib.compressobj(config.level, zlib.DEFLATED, _WBITS[config.encoding])
+    view = memoryview(body)
+    parts = [compressor.compress(view[i:i + _CHUNK_SIZE]) for i in range(0, len(view), _CHUNK_SIZE)]
+    parts.append(compressor.flush())
+    return b''.join(parts)
+
+
+def maybe_compress(body: bytes, headers: dict[str, str], config: CompressionConfig) -> bytes:
+    """
+    Compress `body` in place of the original and set Content-Encoding if it is above the configured threshold.
+    Bodies that already declare a Content-Encoding are left untouched.
+    """
+    if len(body) < config.threshold or any(k.lower() == 'content-encoding' for k in headers):
+        return body
+    headers['Content-Encoding'] = config.encoding
+    return compress_body(body, config)
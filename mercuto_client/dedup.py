@@ -0,0 +1,121 @@
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import (TYPE_CHECKING, Any, Hashable, Iterable, Optional, Sequence,
+                    TypeVar)
+
+if TYPE_CHECKING:
+    from .batching import UploadReport
+    from .modules.data import Channel, SecondarySampleLike
+
+_S = TypeVar('_S', bound='SecondarySampleLike')
+
+
+def _utc(timestamp: datetime) -> datetime:
+    # Naive timestamps are sent without an offset and stored as UTC.
+    return timestamp if timestamp.tzinfo is not None else timestamp.replace(tzinfo=timezone.utc)
+
+
+def _key(sample: Any) -> Hashable:
+    value = sample.value
+    # NaN never equals itself, so repeated NaN samples would never match. They share the key None instead.
+    return sample.channel, sample.timestamp, None if value != value else value
+
+
+@dataclass(frozen=True)
+class DeduplicationStats:
+    """
+    Samples dropped by `HighWaterMarks.filter`.
+
+    :param stale: Samples at or before their channel's high-water mark.
+    :param duplicates: Exact repeats (channel, timestamp and value) of another sample in the same insert.
+    """
+    stale: int = 0
+    duplicates: int = 0
+
+
+class HighWaterMarks:
+    """
+    Latest timestamp per channel known to be stored by the API, used to skip samples that were already uploaded,
+    e.g. when a logger sends overlapping files. Thread safe.
+
+    Seed it from the channels' `last_valid_timestamp` with `seed`, pass it to `insert_secondary_samples`, and marks advance
+    after every successful upload. Samples older than the mark are dropped too, so do not use it to backfill gaps.
+    """
+
+    def __init__(self) -> None:
+        self._marks: dict[str, datetime] = {}
+        self._lock = threading.Lock()
+        self._stale = 0
+        self._duplicates = 0
+
+    def seed(self, channels: Iterable['Channel']) -> None:
+        """
+        Raise marks to the channels' `last_valid_timestamp`. Marks never move back.
+        """
+        with self._lock:
+            for channel in channels:
+                if channel.last_valid_timestamp is not None:
+                    self._advance(channel.code, _utc(channel.last_valid_timestamp))
+
+    def get(self, channel: str) -> Optional[datetime]:
+        with self._lock:
+            return self._marks.get(channel)
+
+    def stats(self) -> DeduplicationStats:
+        with self._lock:
+            return DeduplicationStats(stale=self._stale, duplicates=self._duplicates)
+
+    def _advance(self, channel: str, timestamp: datetime) -> None:
+        mark = self._marks.get(channel)
+        if mark is None or timestamp > mark:
+            self._marks[channel] = timestamp
+
+    def filter(self, samples: Iterable[_S]) -> list[_S]:
+        """
+        The samples after their channel's mark, without exact duplicates, in their original order.
+        """
+        with self._lock:
+            marks = dict(self._marks)
+        seen: set[Hashable] = set()
+        kept: list[_S] = []
+        stale = duplicates = 0
+        for sample in samples:
+            mark = marks.get(sample.channel)
+            if mark is not None and _utc(sample.timestamp) <= mark:
+                stale += 1
+                continue
+            key = _key(sample)
+            if key in seen:
+                duplicates += 1
+                continue
+            seen.add(key)
+            kept.append(sample)
+        with self._lock:
+            self._stale += stale
+            self._duplicates += duplicates
+        return kept
+
+    def record(self, samples: Sequence['SecondarySampleLike'], report: 'UploadReport[Any]') -> None:
+        """
+        Advance marks over the uploaded `samples`, as reported by `report`. A channel's mark stops short of its earliest
+        sample that was not uploaded, so a retry of the failed batches is not dropped.
+        """
+        uploaded = [False] * len(samples)
+        for batch in report.batches:
+            if batch.ok:
+                uploaded[batch.offset:batch.offset + batch.count] = [True] * batch.count
+        earliest_missing: dict[str, datetime] = {}
+        for sample, ok in zip(samples, uploaded):
+            if not ok:
+                timestamp = _utc(sample.timestamp)
+                missing = earliest_missing.get(sample.channel)
+                if missing is None or timestamp < missing:
+                    earliest_missing[sample.channel] = timestamp
+        with self._lock:
+            for sample, ok in zip(samples, uploaded):
+                if ok:
+                    timestamp = _utc(sample.timestamp)
+                    missing = earliest_missing.get(sample.channel)
+                    if missing is None or timestamp < missing:
+                        self._advance(sample.channel, timestamp)
@@ -72,7 +72,8 @@ def launch_mercuto_ingester(
     max_attempts: int = 1000,
     backup_location: Optional[list[ParseResult]] = None,
     timezone: Optional[str] = None,
-    camera: Optional[str] = None
+    camera: Optional[str] = None,
+    deduplicate: bool = False
 ):
 
     if backup_location is None:
@@ -140,7 +141,8 @@ def launch_mercuto_ingester(
             hostname=hostname,
             verify_ssl=verify_ssl,
             timezone=timezone,
-            camera_code=camera
+            camera_code=camera,
+            deduplicate=deduplicate
         )
 
         if mapping is not None:
@@ -253,6 +255,10 @@ def main():
     parser.add_argument('--camera', type=str,
                         help='Camera code to associate with image uploads. If not provided, image files will error on upload.',
                         default=None)
+    parser.add_argument('--deduplicate',
+                        help='Skip samples at or before the latest timestamp already stored for their channel, and repeated rows. \
+                        Avoids re-uploading overlapping files, but also skips older samples that would fill a gap.',
+                        action='store_true')
 
     args = parser.parse_args()
 
@@ -277,7 +283,8 @@ def main():
         backup_location=args.backup_location,
         hostname=args.hostname,
         timezone=args.timezone,
-        camera=args.camera
+        camera=args.camera,
+        deduplicate=args.deduplicate
     )
 
 
@@ -6,13 +6,14 @@ from typing import Optional
 
 import pytz
 
-from .. import MercutoClient, MercutoHTTPException
+from .. import BatchSizeConfig, MercutoClient, MercutoHTTPException
+from ..dedup import HighWaterMarks
 from ..modules.core import Project
-from ..modules.data import (Channel, ChannelClassification, Datatable,
-                            SecondaryDataSample)
+from ..modules.data import ChannelClassification, SecondarySample
 from ..modules.media import Camera
-from ..util import batched, get_my_public_ip
-from .parsers import detect_parser
+from ..registry import ChannelIndex
+from ..util import get_my_public_ip
+from .parsers import detect_sample_parser
 
 logger = logging.getLogger(__name__)
 
@@ -33,7 +34,8 @@ class MercutoIngester:
                  hostname: str = 'https://api.rockfieldcloud.com.au',
                  verify_ssl: bool = True,
                  timezone: Optional[str] = None,
-                 camera_code: Optional[str] = None) -> None:
+                 camera_code: Optional[str] = None,
+                 deduplicate: bool = False) -> None:
         """
         :param project_code: The Mercuto project code to ingest data into.
         :param api_key: The API key to use for authentication.
@@ -41,8 +43,11 @@ class MercutoIngester:
         :param verify_ssl: Verify SSL certificates for the target server when using https. Default True.
         :param timezone: The timezone to use for data uploads as a string (e.g. 'Australia/Melbourne').
         :param camera_code: Optional camera code to associate with image uploads. If not provided, image uploads will error.
+        :param deduplicate: Skip samples at or before the last timestamp the server has for their channel, and repeated rows.
+            Saves re-uploading overlapping files, but older samples filling a gap are skipped too.
         """
-        self._client = MercutoClient(url=hostname, verify_ssl=verify_ssl)
+        # Start with small batches, uplinks on site are often slow. Batches grow once the link proves fast enough.
+        self._client = MercutoClient(url=hostname, verify_ssl=verify_ssl, batching=BatchSizeConfig(initial=500, minimum=50))
         self._api_key = api_key
         self._project_code = project_code
         self._timezone = timezone
@@ -50,32 +55,55 @@ class MercutoIngester:
         self._camera_code = camera_code
 
         self._project: Optional[Project] = None
-        self._secondary_channels: Optional[list[Channel]] = None
-        self._datatables: Optional[list[Datatable]] = None
+        self._channels: Optional[ChannelIndex] = None
         self._camera: Optional[Camera] = None
 
         self._channel_map: dict[str, str] = {}
+        # Label to code mapping of secondary channels, rebuilt whenever the channel registry reloads.
+        self._label_map: dict[str, str] = {}
+        self._label_map_source: Optional[ChannelIndex] = None
+        self._high_water_marks = HighWaterMarks() if deduplicate else None
 
     def _refresh_mercuto_data(self) -> None:
         with self._client.as_credentials(api_key=self._api_key) as client:
             self._project = client.core().get_project(self._project_code)
             assert self._project.code == self._project_code
 
-            self._secondary_channels = client.data().list_channels(self._project_code, classification=ChannelClassification.SECONDARY)
-            self._datatables = client.data().list_datatables(self._project_code)
+            self._channels = client.data().channel_registry(self._project_code).refresh()
+            self._seed_high_water_marks()
             if self._camera_code is not None:
                 self._camera = client.media().get_camera(self._camera_code)
 
-        self._channel_map.update({c.label: c.code for c in self._secondary_channels})
+    def _update_channels(self) -> None:
+        """
+        Reload channels and datatables if the registry snapshot has expired, so channels created later are picked up.
+        """
+        with self._client.as_credentials(api_key=self._api_key) as client:
+            self._channels = client.data().channel_registry(self._project_code).index()
+        self._seed_high_water_marks()
+
+    def _seed_high_water_marks(self) -> None:
+        if self._high_water_marks is not None and self._channels is not None:
+            self._high_water_marks.seed(self._channels.by_code.values())
+
+    def _labels(self) -> dict[str, str]:
+        if self._channels is None:
+            raise ValueError("Channels not loaded. Call _refresh_mercuto_data() first.")
+        if self._label_map_source is not self._channels:
+            secondary = self._channels.by_classification.get(ChannelClassification.SECONDARY, ())
+            self._label_map = {**self._channel_map, **{c.label: c.code for c in secondary}}
+            self._label_map_source = self._channels
+        return self._label_map
 
     def _can_process(self) -> bool:
-        return self._project is not None and self._secondary_channels is not None and self._datatables is not None
+        return self._project is not None and self._channels is not None
 
     def update_mapping(self, mapping: dict[str, str]) -> None:
         """
         Update the channel label to channel code mapping.
         """
         self._channel_map.update(mapping)
+        self._label_map_source = None
         logger.info(f"Updated channel mapping: {self._channel_map}")
 
     @property
@@ -96,7 +124,7 @@ class MercutoIngester:
         Check if any datatables on the project match this file name.
         Returns the datatable code if a match is found, otherwise None.
         """
-        if self._datatables is None:
+        if self._channels is None:
             raise ValueError("Datatables not loaded. Call _refresh_mercuto_data() first.")
 
         basename = os.path.basename(filename)
@@ -115,20 +143,20 @@ class MercutoIngester:
                 return True
             return False
 
-        for dt in self._datatables:
+        for dt in self._channels.datatables:
             # Match using datatable pattern
             if matches(dt.name):
                 return dt.code
         return None
 
-    def _upload_samples(self, samples: list[SecondaryDataSample]) -> bool:
+    def _upload_samples(self, samples: list[SecondarySample]) -> bool:
         """
         Upload samples to the Mercuto project.
         """
         try:
             with self._client.as_credentials(api_key=self._api_key) as client:
-                for batch in batched(samples, 500):
-                    client.data().insert_secondary_samples(self.project_code, batch)
+                client.data().insert_secondary_samples(self.project_code, samples, max_in_flight=1,
+                                                       high_water_marks=self._high_water_marks)
             return True
         except MercutoHTTPException as e:
             logger.error(f"Failed to upload samples: {e}")
@@ -193,13 +221,14 @@ class MercutoIngester:
         Supported extensions: .dat, .csv
         """
         assert file_path.endswith(('.dat', '.csv'))
+        self._update_channels()
         datatable_code = self.matching_datatable(file_path)
         if datatable_code:
             logger.info(f"Matched datatable code: {datatable_code} for file: {file_path}")
             return self._upload_file(file_path, datatable_code)
         else:
-            parser = detect_parser(file_path)
-            samples = parser(file_path, self._channel_map, timezone=self._timezone_tzinfo)
+            parser = detect_sample_parser(file_path)
+            samples = parser(file_path, self._labels(), timezone=self._timezone_tzinfo)
             if not samples:
                 logging.warning(f"No samples found in file: {file_path}")
                 return True
@@ -2,10 +2,12 @@ from typing import Optional, Protocol
 
 import pytz
 
-from ...modules.data import SecondaryDataSample
-from .campbell import parse_campbell_file
+from ...modules.data import SecondaryDataSample, SecondarySample
+from .campbell import parse_campbell_file, parse_campbell_samples
 from .worldsensing import (parse_worldsensing_compact_file,
-                           parse_worldsensing_standard_file)
+                           parse_worldsensing_compact_samples,
+                           parse_worldsensing_standard_file,
+                           parse_worldsensing_standard_samples)
 
 
 class Parser(Protocol):
@@ -17,6 +19,15 @@ class Parser(Protocol):
         ...
 
 
+class SampleParser(Protocol):
+    def __call__(self, filename: str, label_to_channel_code: dict[str, str],
+                 timezone: Optional[pytz.BaseTzInfo] = None) -> list[SecondarySample]:
+        """
+        Parse the file and return a list of SecondarySample tuples, without building a model per sample.
+        """
+        ...
+
+
 def detect_parser(filename: str) -> Parser:
     """
     Detect the type of the file based on its content.
@@ -34,9 +45,27 @@ def detect_parser(filename: str) -> Parser:
             raise ValueError(f"Unknown file type for {filename}")
 
 
+_SAMPLE_PARSERS: dict[Parser, SampleParser] = {
+    parse_campbell_file: parse_campbell_samples,
+    parse_worldsensing_compact_file: parse_worldsensing_compact_samples,
+    parse_worldsensing_standard_file: parse_worldsensing_standard_samples,
+}
+
+
+def detect_sample_parser(filename: str) -> SampleParser:
+    """
+    Same as `detect_parser`, returning the parser that produces SecondarySample tuples.
+    """
+    return _SAMPLE_PARSERS[detect_parser(filename)]
+
+
 __all__ = [
     "parse_campbell_file",
+    "parse_campbell_samples",
     "parse_worldsensing_standard_file",
+    "parse_worldsensing_standard_samples",
     "parse_worldsensing_compact_file",
+    "parse_worldsensing_compact_samples",
     "detect_parser",
+    "detect_sample_parser",
 ]
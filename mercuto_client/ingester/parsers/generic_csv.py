@@ -5,7 +5,7 @@ from typing import Optional
 import pytz
 from dateutil import parser
 
-from ...modules.data import SecondaryDataSample
+from ...modules.data import SecondaryDataSample, SecondarySample
 
 logger = logging.getLogger(__name__)
 
@@ -58,13 +58,23 @@ def parse_generic_csv_file(filename: str, label_to_channel_code: dict[str, str],
                            header_index: int, data_index: int,
                            timezone: Optional[pytz.BaseTzInfo] = None) -> list[SecondaryDataSample]:
     """
+    Same as `parse_generic_csv_samples`, returning SecondaryDataSample models.
+    """
+    return [sample.to_model() for sample in parse_generic_csv_samples(
+        filename, label_to_channel_code, header_index=header_index, data_index=data_index, timezone=timezone)]
+
+
+def parse_generic_csv_samples(filename: str, label_to_channel_code: dict[str, str],
+                              header_index: int, data_index: int,
+                              timezone: Optional[pytz.BaseTzInfo] = None) -> list[SecondarySample]:
+    """
     header index: Number of lines to skip before header
     data index: Number of lines to skip after the header before data
 
     We are avoiding using pandas here to keep dependencies minimal as this is often run on edge devices.
     """
 
-    output: list[SecondaryDataSample] = []
+    output: list[SecondarySample] = []
     with open(filename, "r") as f:
         for _ in range(header_index):
             next(f, None)
@@ -109,6 +119,5 @@ def parse_generic_csv_file(filename: str, label_to_channel_code: dict[str, str],
 
                 logger.debug(
                     f"Adding entry for label: {header} with value: {value} and timestamp: {timestamp}")
-                output.append(SecondaryDataSample(timestamp=timestamp,
-                              channel=channel_code, value=value))
+                output.append(SecondarySample(channel_code, timestamp, value))
     return output
@@ -2,8 +2,8 @@ from typing import Optional
 
 import pytz
 
-from ...modules.data import SecondaryDataSample
-from .generic_csv import parse_generic_csv_file
+from ...modules.data import SecondaryDataSample, SecondarySample
+from .generic_csv import parse_generic_csv_file, parse_generic_csv_samples
 
 
 def parse_worldsensing_standard_file(filename: str, label_to_channel_code: dict[str, str],
@@ -15,6 +15,12 @@ def parse_worldsensing_standard_file(filename: str, label_to_channel_code: dict[
         filename, label_to_channel_code, header_index=9, data_index=0, timezone=timezone)
 
 
+def parse_worldsensing_standard_samples(filename: str, label_to_channel_code: dict[str, str],
+                                        timezone: Optional[pytz.BaseTzInfo] = None) -> list[SecondarySample]:
+    return parse_generic_csv_samples(
+        filename, label_to_channel_code, header_index=9, data_index=0, timezone=timezone)
+
+
 def parse_worldsensing_compact_file(filename: str, label_to_channel_code: dict[str, str],
                                     timezone: Optional[pytz.BaseTzInfo] = None) -> list[SecondaryDataSample]:
     """
@@ -22,3 +28,9 @@ def parse_worldsensing_compact_file(filename: str, label_to_channel_code: dict[s
     """
     return parse_generic_csv_file(
         filename, label_to_channel_code, header_index=1, data_index=0, timezone=timezone)
+
+
+def parse_worldsensing_compact_samples(filename: str, label_to_channel_code: dict[str, str],
+                                       timezone: Optional[pytz.BaseTzInfo] = None) -> list[SecondarySample]:
+    return parse_generic_csv_samples(
+        filename, label_to_channel_code, header_index=1, data_index=0, timezone=timezone)
@@ -0,0 +1,317 @@
+import bisect
+import contextvars
+import functools
+import inspect
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RequestEvent:
+    """
+    A single logical request made through `MercutoClient`, filled in as the request progresses.
+    All timestamps are `time.monotonic()` values.
+
+    :param method: HTTP method.
+    :param path: Request path relative to the API base URL, including the service prefix.
+    :param route: `path` with identifiers replaced by `{name}` placeholders, e.g. `/v2/data/channels/{code}`.
+    :param module: Service module that made the request (e.g. 'data'), or '' for direct `MercutoClient.request` calls.
+    :param operation: Service method that made the request (e.g. 'get_channel'), or ''.
+    :param status_code: Final HTTP status code, None if no response was received.
+    :param bytes_out: Size of the request body as sent (after compression).
+    :param bytes_in: Size of the response body as received on the wire.
+    :param retries: Number of retries made before the final attempt.
+    :param error: Exception raised for this request, if any.
+    """
+    method: str
+    path: str
+    route: str
+    module: str = ''
+    operation: str = ''
+    status_code: Optional[int] = None
+    bytes_out: int = 0
+    bytes_in: int = 0
+    retries: int = 0
+    error: Optional[BaseException] = None
+    started_at: float = field(default_factory=time.monotonic)
+    headers_at: Optional[float] = None
+    body_at: Optional[float] = None
+    parsed_at: Optional[float] = None
+
+    @property
+    def time_to_headers(self) -> Optional[float]:
+        return None if self.headers_at is None else self.headers_at - self.started_at
+
+    @property
+    def time_to_body(self) -> Optional[float]:
+        return None if self.body_at is None else self.body_at - self.started_at
+
+    @property
+    def total_time(self) -> float:
+        end = self.parsed_at or self.body_at or self.headers_at or time.monotonic()
+        return end - self.started_at
+
+
+class RequestHook:
+    """
+    Base class for request instrumentation. Override any of the callbacks and register with `MercutoClient.add_hook`.
+
+    For every request `on_request_start` is called first and `on_parse_done` last, including for failed requests.
+    `on_response_headers` and `on_response_body` are called once for the final attempt when a response is received.
+    `on_response_body` is skipped for requests made with `stream=True`.
+    When a request is made by a service method, `on_parse_done` is called once that method has parsed the response:
+    when it makes its next request or returns. Requests made from worker threads are done when the response is received.
+
+    Callbacks run synchronously on the requesting thread and should be cheap. Exceptions raised by hooks are logged and ignored.
+    """
+
+    def on_request_start(self, event: RequestEvent) -> None:
+        pass
+
+    def on_response_headers(self, event: RequestEvent) -> None:
+        pass
+
+    def on_response_body(self, event: RequestEvent) -> None:
+        pass
+
+    def on_parse_done(self, event: RequestEvent) -> None:
+        pass
+
+
+class HookList:
+    """
+    Thread-safe set of hooks shared by a client and its copies.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._hooks: tuple[RequestHook, ...] = ()
+
+    def add(self, hook: RequestHook) -> None:
+        with self._lock:
+            self._hooks = self._hooks + (hook,)
+
+    def remove(self, hook: RequestHook) -> None:
+        with self._lock:
+            self._hooks = tuple(h for h in self._hooks if h is not hook)
+
+    def __bool__(self) -> bool:
+        return bool(self._hooks)
+
+    def emit(self, name: str, event: RequestEvent) -> None:
+        for hook in self._hooks:
+            try:
+                getattr(hook, name)(event)
+            except Exception:
+                logger.exception("Request hook %r failed in %s", hook, name)
+
+
+_UUID = re.compile(r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$')
+_NUMBER = re.compile(r'^\d+$')
+
+
+def route_template(path: str, arguments: Optional[dict[str, str]] = None) -> str:
+    """
+    Replace identifiers in `path` with `{name}` placeholders.
+    Segments equal to one of `arguments` (argument name -> value) are named after the argument,
+    remaining UUIDs and integers become `{id}`.
+    """
+    by_value = {v: k for k, v in arguments.items()} if arguments else {}
+    segments = path.split('/')
+    for i, segment in enumerate(segments):
+        if segment in by_value:
+            segments[i] = f'{{{by_value[segment]}}}'
+        elif _UUID.match(segment) or _NUMBER.match(segment):
+            segments[i] = '{id}'
+    return '/'.join(segments)
+
+
+class _Operation:
+    __slots__ = ('module', 'name', 'arguments', 'thread', 'pending')
+
+    def __init__(self, module: str, name: str, arguments: dict[str, str]) -> None:
+        self.module = module
+        self.name = name
+        self.arguments = arguments
+        self.thread = threading.get_ident()
+        # The last request made from the method's own thread, whose response the method may still be parsing.
+        self.pending: Optional[RequestEvent] = None
+
+    def parse_done(self, hooks: HookList) -> None:
+        if self.pending is not None:
+            _parse_done(hooks, self.pending)
+            self.pending = None
+
+
+def _parse_done(hooks: HookList, event: RequestEvent) -> None:
+    event.parsed_at = time.monotonic()
+    hooks.emit('on_parse_done', event)
+
+
+_current_operation: contextvars.ContextVar[Optional[_Operation]] = contextvars.ContextVar('mercuto_operation', default=None)
+
+
+def start_event(hooks: HookList, method: str, path: str) -> RequestEvent:
+    """
+    Create the event for a request and attribute it to the service method currently running, if any.
+    """
+    operation = _current_operation.get()
+    if operation is not None and operation.thread == threading.get_ident():
+        # A service method only starts its next request once it is done with the previous response.
+        operation.parse_done(hooks)
+    if operation is None:
+        event = RequestEvent(method=method, path=path, route=route_template(path))
+    else:
+        event = RequestEvent(method=method, path=path, route=route_template(path, operation.arguments),
+                             module=operation.module, operation=operation.name)
+    hooks.emit('on_request_start', event)
+    return event
+
+
+def finish_event(hooks: HookList, event: RequestEvent) -> None:
+    """
+    Emit `on_parse_done` now, or, for a request made from a service method's own thread, once the method
+    makes its next request or returns.
+    """
+    operation = _current_operation.get()
+    if operation is not None and operation.thread == threading.get_ident():
+        operation.parse_done(hooks)
+        operation.pending = event
+        return
+    _parse_done(hooks, event)
+
+
+_C = TypeVar('_C', bound=type)
+
+
+def instrumented(module: str) -> Callable[[_C], _C]:
+    """
+    Class decorator for service modules. Public methods are wrapped so requests they make are attributed
+    to `module` and the method name, and `on_parse_done` fires once the method has parsed its response.
+    Generator methods are left as they are.
+    """
+    def decorate(cls: _C) -> _C:
+        for name, attr in list(vars(cls).items()):
+            if name.startswith('_') or not inspect.isfunction(attr) or inspect.isgeneratorfunction(attr):
+                continue
+            setattr(cls, name, _wrap(module, attr))
+        return cls
+    return decorate
+
+
+def _wrap(module: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+    names = list(inspect.signature(fn).parameters)[1:]
+
+    @functools.wraps(fn)
+    def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        hooks: Optional[HookList] = getattr(getattr(self, '_client', None), '_hooks', None)
+        if not hooks:
+            return fn(self, *args, **kwargs)
+
+        arguments = {k: v for k, v in zip(names, args) if isinstance(v, str)}
+        arguments.update((k, v) for k, v in kwargs.items() if isinstance(v, str))
+        operation = _Operation(module, fn.__name__, arguments)
+        token = _current_operation.set(operation)
+        try:
+            return fn(self, *args, **kwargs)
+        finally:
+            _current_operation.reset(token)
+            operation.parse_done(hooks)
+    return wrapper
+
+
+DEFAULT_BUCKETS: tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+@dataclass(frozen=True)
+class RouteStats:
+    """
+    Latency summary for one (module, method, route) key.
+
+    :param count: Number of requests.
+    :param errors: Number of requests that raised an exception.
+    :param total_time: Sum of request durations in seconds, from start until parsed.
+    :param bytes_out: Total request bytes sent.
+    :param bytes_in: Total response bytes received.
+    :param buckets: Upper bounds of the histogram buckets in seconds.
+    :param counts: Requests per bucket. Has one more entry than `buckets` for requests slower than the last bound.
+    """
+    count: int
+    errors: int
+    total_time: float
+    bytes_out: int
+    bytes_in: int
+    buckets: tuple[float, ...]
+    counts: tuple[int, ...]
+
+    @property
+    def mean(self) -> float:
+        return self.total_time / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """
+        Upper bucket bound below which at least `q` of the requests completed. Inf if in the overflow bucket.
+        """
+        target = q * self.count
+        seen = 0
+        for bound, n in zip(self.buckets + (float('inf'),), self.counts):
+            seen += n
+            if seen >= target:
+                return bound
+        return float('inf')
+
+
+class LatencyHistogram(RequestHook):
+    """
+    In-memory latency histogram keyed by (module, method, route).
+
+    ```
+    histogram = LatencyHistogram()
+    client.add_hook(histogram)
+    ...
+    for (module, method, route), stats in histogram.top(10):
+        print(module, method, route, stats.count, stats.total_time, stats.quantile(0.95))
+    ```
+    """
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS) -> None:
+        self._buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._data: dict[tuple[str, str, str], list[Any]] = {}
+
+    def on_parse_done(self, event: RequestEvent) -> None:
+        duration = event.total_time
+        index = bisect.bisect_left(self._buckets, duration)
+        key = (event.module, event.method, event.route)
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                entry = self._data[key] = [0, 0, 0.0, 0, 0, [0] * (len(self._buckets) + 1)]
+            entry[0] += 1
+            entry[1] += event.error is not None
+            entry[2] += duration
+            entry[3] += event.bytes_out
+            entry[4] += event.bytes_in
+            entry[5][index] += 1
+
+    def snapshot(self) -> dict[tuple[str, str, str], RouteStats]:
+        with self._lock:
+            return {key: RouteStats(count=e[0], errors=e[1], total_time=e[2], bytes_out=e[3], bytes_in=e[4],
+                                    buckets=self._buckets, counts=tuple(e[5]))
+                    for key, e in self._data.items()}
+
+    def top(self, n: int = 10) -> list[tuple[tuple[str, str, str], RouteStats]]:
+        """
+        The `n` keys with the largest total wall-clock time.
+        """
+        return sorted(self.snapshot().items(), key=lambda item: item[1].total_time, reverse=True)[:n]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._data.clear()
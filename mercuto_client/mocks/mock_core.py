@@ -14,6 +14,9 @@ logger = logging.getLogger(__name__)
 
 
 class MockMercutoCoreService(MercutoCoreService, metaclass=EnforceOverridesMeta):
+    __exclude_enforce__ = {MercutoCoreService.iter_events,
+                           MercutoCoreService.iter_devices}
+
     def __init__(self, client: 'MercutoClient'):
         super().__init__(client=client)
         self._events: dict[str, Event] = {}
@@ -3,18 +3,26 @@ import io
 import logging
 import uuid
 from datetime import datetime, timedelta, timezone
-from typing import BinaryIO, Collection, Optional, TextIO
+from typing import (BinaryIO, Callable, Collection, Iterator, Literal,
+                    Optional, Sequence, TextIO)
 
 import pandas as pd
 
+from ..batching import DEFAULT_MAX_IN_FLIGHT, BatchResult, UploadReport
 from ..client import MercutoClient
+from ..dedup import HighWaterMarks
 from ..exceptions import MercutoHTTPException
+from ..modules._chunked import DEFAULT_CHUNK_SIZE, UploadProgress
+from ..modules._columns import join_sample_rows
 from ..modules.data import (AggregationMethod, AggregationOptions, Channel,
                             ChannelClassification, ChannelFormat, Datatable,
                             DatatableColumn, FileFormat, FrameFormat,
                             GetStatusRequestResponse, LatestDataSample,
-                            MercutoDataService, MetricDataSample,
-                            SecondaryDataSample, Units)
+                            MercutoDataService, MetricDataSample, MetricSample,
+                            MetricSampleLike, SecondaryDataSample,
+                            SecondarySample, SecondarySampleLike, Units,
+                            _MetricSamplelistAdapter,
+                            _SecondarySamplelistAdapter)
 from ._utility import EnforceOverridesMeta
 
 logger = logging.getLogger(__name__)
@@ -23,7 +31,25 @@ logger = logging.getLogger(__name__)
 class MockMercutoDataService(MercutoDataService, metaclass=EnforceOverridesMeta):
     __exclude_enforce__ = {MercutoDataService.load_presigned_url,
                            MercutoDataService.load_metric_sample,
-                           MercutoDataService.load_data_request}
+                           MercutoDataService.load_data_request,
+                           MercutoDataService.wait_for_requests,
+                           MercutoDataService.load_data_requests,
+                           MercutoDataService.channel_registry,
+                           MercutoDataService.watch_latest,
+                           MercutoDataService.iter_secondary_samples,
+                           MercutoDataService.iter_secondary_samples_compact,
+                           MercutoDataService.iter_metric_samples,
+                           MercutoDataService.iter_metric_samples_compact,
+                           MercutoDataService.load_dataframe,
+                           MercutoDataService.aggregate_dataframe,
+                           MercutoDataService.high_water_marks,
+                           MercutoDataService.stream_dataframe,
+                           MercutoDataService.plan_data_request,
+                           MercutoDataService.load_sharded_dataframe,
+                           MercutoDataService.insert_secondary_columns,
+                           MercutoDataService.insert_metric_columns,
+                           MercutoDataService._upload_samples,
+                           MercutoDataService._download_result}
 
     def __init__(self, client: 'MercutoClient'):
         super().__init__(client=client, path='/mock-data-service-method-not-implemented')
@@ -61,6 +87,11 @@ class MockMercutoDataService(MercutoDataService, metaclass=EnforceOverridesMeta)
             selection = filter(lambda ch: ch.metric == metric, selection)
         return list(selection)
 
+    def iter_channels(self, project: str, classification: Optional[ChannelClassification] = None,
+                      aggregate: Optional[str] = None, metric: Optional[str] = None,
+                      show_hidden: bool = False, page_size: int = 100, prefetch: int = 2) -> Iterator[Channel]:
+        return iter(self.list_channels(project, classification=classification, aggregate=aggregate, metric=metric, show_hidden=show_hidden))
+
     def get_channel(self, code: str) -> Optional[Channel]:
         return self._channels.get(code)
 
@@ -246,10 +277,15 @@ class MockMercutoDataService(MercutoDataService, metaclass=EnforceOverridesMeta)
     def insert_metric_samples(
         self,
         project: str,
-        samples: Collection[MetricDataSample]
-    ) -> None:
+        samples: Collection[MetricSampleLike],
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        stop_on_error: bool = True,
+        batch_size: Optional[int] = None
+    ) -> UploadReport[MetricSampleLike]:
+        # The mock accepts everything in a single batch, like a 202 from the API.
+        report: UploadReport[MetricSampleLike] = UploadReport([BatchResult(index=0, offset=0, count=len(samples))] if samples else [])
         if not samples:
-            return
+            return report
 
         # Ensure all channels are of type METRIC
         if not all(
@@ -258,7 +294,7 @@ class MockMercutoDataService(MercutoDataService, metaclass=EnforceOverridesMeta)
             and self._channels[sample.channel].project == project
             for sample in samples
         ):
-            return
+            return report
 
         df = pd.DataFrame([{
             'channel': s.channel,
@@ -276,14 +312,36 @@ class MockMercutoDataService(MercutoDataService, metaclass=EnforceOverridesMeta)
 
         self._metric_buffer = pd.concat(to_concat).sort_index()
         self._update_last_valid_samples()
+        return report
+
+    def _insert_sample_rows(self, kind: Literal['secondary', 'metric'], project: str, rows: Sequence[str],
+                            max_in_flight: int, stop_on_error: bool, batch_size: Optional[int]) -> UploadReport[int]:
+        body = join_sample_rows(rows, range(len(rows)))
+        if kind == 'secondary':
+            self.insert_secondary_samples(project, _SecondarySamplelistAdapter.validate_json(body))
+        else:
+            self.insert_metric_samples(project, _MetricSamplelistAdapter.validate_json(body))
+        return UploadReport([BatchResult(index=0, offset=0, count=len(rows))] if rows else [])
 
     def insert_secondary_samples(
         self,
         project: str,
-        samples: Collection[SecondaryDataSample]
-    ) -> None:
+        samples: Collection[SecondarySampleLike],
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        stop_on_error: bool = True,
+        batch_size: Optional[int] = None,
+        high_water_marks: Optional[HighWaterMarks] = None
+    ) -> UploadReport[SecondarySampleLike]:
+        if high_water_marks is not None:
+            kept = high_water_marks.filter(samples)
+            uploaded = self.insert_secondary_samples(project, kept, max_in_flight, stop_on_error, batch_size)
+            high_water_marks.record(kept, uploaded)
+            return uploaded
+
+        # The mock accepts everything in a single batch, like a 202 from the API.
+        report: UploadReport[SecondarySampleLike] = UploadReport([BatchResult(index=0, offset=0, count=len(samples))] if samples else [])
         if not samples:
-            return
+            return report
 
         # Ensure all channels are of type SECONDARY
         if not all(
@@ -291,7 +349,7 @@ class MockMercutoDataService(MercutoDataService, metaclass=EnforceOverridesMeta)
             and self._channels[sample.channel].project == project
             for sample in samples
         ):
-            return
+            return report
 
         df = pd.DataFrame([{
             'channel': s.channel,
@@ -308,6 +366,7 @@ class MockMercutoDataService(MercutoDataService, metaclass=EnforceOverridesMeta)
 
         self._secondary_and_primary_buffer = pd.concat(to_concat).sort_index()
         self._update_last_valid_samples()
+        return report
 
     def delete_metric_samples(self, project: str, event: str, channels: Optional[Collection[str]] = None) -> None:
         if channels is None:
@@ -353,7 +412,8 @@ class MockMercutoDataService(MercutoDataService, metaclass=EnforceOverridesMeta)
             (end_time is None or idx.get_level_values('timestamp') <= end_time) &
             (events is None or self._metric_buffer['event'].isin(events))
         )
-        filtered = self._metric_buffer[mask]
+        # The API returns samples in timestamp order.
+        filtered = self._metric_buffer[mask].sort_index(level=['timestamp', 'channel'])
         return [
             MetricDataSample(
                 channel=channel,
@@ -364,6 +424,26 @@ class MockMercutoDataService(MercutoDataService, metaclass=EnforceOverridesMeta)
             for (channel, timestamp), row in filtered.iterrows()
         ][:limit]
 
+    def load_metric_samples_compact(
+        self,
+        channels: Optional[Collection[str]] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        events: Optional[Collection[str]] = None,
+        project: Optional[str] = None,
+        limit: int = 100
+    ) -> list[MetricSample]:
+        return [MetricSample.from_model(s) for s in self.load_metric_samples(channels, start_time, end_time, events, project, limit)]
+
+    def load_secondary_samples_compact(
+        self,
+        channels: Collection[str],
+        start_time: datetime,
+        end_time: datetime,
+        limit: int = 100
+    ) -> list[SecondarySample]:
+        return [SecondarySample.from_model(s) for s in self.load_secondary_samples(channels, start_time, end_time, limit)]
+
     def load_secondary_samples(
         self,
         channels: Collection[str],
@@ -377,7 +457,7 @@ class MockMercutoDataService(MercutoDataService, metaclass=EnforceOverridesMeta)
             (idx.get_level_values('timestamp') >= start_time) &
             (idx.get_level_values('timestamp') <= end_time)
         )
-        filtered = self._secondary_and_primary_buffer[mask]
+        filtered = self._secondary_and_primary_buffer[mask].sort_index(level=['timestamp', 'channel'])
         return [
             SecondaryDataSample(
                 channel=channel,
@@ -390,6 +470,9 @@ class MockMercutoDataService(MercutoDataService, metaclass=EnforceOverridesMeta)
     def list_datatables(self, project: str) -> list[Datatable]:
         return [dt for dt in self._datatables.values() if dt.project == project]
 
+    def iter_datatables(self, project: str, page_size: int = 100, prefetch: int = 2) -> Iterator[Datatable]:
+        return iter(self.list_datatables(project))
+
     def create_datatable(self, project: str, name: str, sampling_period: timedelta, column_labels: Collection[str]) -> Datatable:
         if sampling_period <= timedelta(seconds=1):
             classification = ChannelClassification.PRIMARY
@@ -416,7 +499,13 @@ class MockMercutoDataService(MercutoDataService, metaclass=EnforceOverridesMeta)
 
     def upload_file(self, project: str, datatable: str, file: str | bytes | TextIO | BinaryIO,
                     filename: Optional[str] = None,
-                    timezone: Optional[str] = None) -> None:
+                    timezone: Optional[str] = None,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    header_lines: Optional[int] = None,
+                    resume_from: int = 0,
+                    on_progress: Optional[Callable[[UploadProgress], None]] = None,
+                    chunk_timeout: float = 60) -> None:
+        # The mock ingests the whole file at once, chunking only matters for the API.
         frame = pd.read_csv(file, header=1, skiprows=[2, 3],
                             usecols=None, sep=',', index_col=0, na_values=['NAN', '"NAN"'])
         frame.index = pd.to_datetime(frame.index, utc=False)
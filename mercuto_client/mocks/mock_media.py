@@ -15,6 +15,9 @@ logger = logging.getLogger(__name__)
 
 
 class MockMercutoMediaService(MercutoMediaService, metaclass=EnforceOverridesMeta):
+    __exclude_enforce__ = {MercutoMediaService.iter_images,
+                           MercutoMediaService.iter_videos}
+
     def __init__(self, client: 'MercutoClient'):
         super().__init__(client=client)
         self._cameras: dict[str, Camera] = {}
@@ -1,4 +1,4 @@
-import requests
+from typing import Protocol
 
 from ..exceptions import MercutoClientException, MercutoHTTPException
 
@@ -9,7 +9,18 @@ PayloadType = dict[str, _PayloadValueType | _PayloadListType | _PayloadDictType]
 _PayloadType = PayloadType  # For backwards compatibility
 
 
-def raise_for_response(r: requests.Response) -> None:
+class ResponseLike(Protocol):
+    """
+    Minimal response interface shared by `requests.Response` and `httpx.Response`.
+    """
+    @property
+    def status_code(self) -> int: ...
+
+    @property
+    def text(self) -> str: ...
+
+
+def raise_for_response(r: ResponseLike) -> None:
     if 500 <= r.status_code < 600:
         raise MercutoClientException(f"Server error: {r.text}")
     if not (200 <= r.status_code < 300):
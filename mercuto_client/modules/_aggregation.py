@@ -0,0 +1,216 @@
+from datetime import timedelta
+from typing import TYPE_CHECKING, Callable, Optional, Union
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+    from .data import AggregationOptions
+
+# Fixed buckets are aligned to the same origin as TimescaleDB's time_bucket, a Monday.
+BUCKET_ORIGIN = '2000-01-03T00:00:00Z'
+
+_FIXED_PERIODS = {
+    'second': timedelta(seconds=1),
+    'minute': timedelta(minutes=1),
+    'hour': timedelta(hours=1),
+    'day': timedelta(days=1),
+    'week': timedelta(weeks=1),
+}
+_WALL_CLOCK_FLOORS = {'second', 'minute', 'hour'}
+_CALENDAR_MONTHS = {'month': 1, 'year': 12}
+
+
+def _nanoseconds(interval: timedelta) -> int:
+    return (interval.days * 86_400 + interval.seconds) * 1_000_000_000 + interval.microseconds * 1_000
+
+
+def _local(ns: 'np.ndarray', timezone: str) -> 'pd.DatetimeIndex':
+    import pandas as pd
+    return pd.DatetimeIndex(pd.to_datetime(ns, utc=True)).tz_convert(timezone)
+
+
+def _utc_ns(local: 'pd.DatetimeIndex') -> 'np.ndarray':
+    return local.as_unit('ns').asi8
+
+
+def bucket_starts(ns: 'np.ndarray', interval: Union[timedelta, str], timezone: str = 'UTC') -> 'np.ndarray':
+    """
+    Start (UTC nanoseconds) of the bucket holding each timestamp (UTC nanoseconds).
+
+    Fixed intervals are aligned to `BUCKET_ORIGIN`. Shorthand intervals follow the wall clock in `timezone`:
+    'day' buckets start at local midnight, 'week' on Monday, 'month' and 'year' on the first day of the month or year.
+    """
+    import pandas as pd
+
+    if isinstance(interval, timedelta):
+        step = _nanoseconds(interval)
+        if step <= 0:
+            raise ValueError("Aggregation interval must be positive")
+        origin = pd.Timestamp(BUCKET_ORIGIN).value
+        return ns - (ns - origin) % step
+    local = _local(ns, timezone)
+    if interval in _WALL_CLOCK_FLOORS:
+        # Floor the wall clock time and shift back by each sample's own UTC offset, so the repeated hour
+        # when clocks go back forms buckets of its own.
+        step = _nanoseconds(_FIXED_PERIODS[interval])
+        offsets = local.tz_localize(None).as_unit('ns').asi8 - ns
+        return ns - (ns + offsets) % step
+    if interval == 'day':
+        midnight = local.normalize()
+    elif interval == 'week':
+        midnight = local.normalize() - pd.to_timedelta(local.dayofweek, unit='D')
+    elif interval in _CALENDAR_MONTHS:
+        month = local.month if interval == 'month' else 1
+        midnight = pd.DatetimeIndex(pd.to_datetime({'year': local.year, 'month': month, 'day': 1})) \
+            .tz_localize(timezone, ambiguous=False, nonexistent='shift_forward')
+    else:
+        raise ValueError(f"Unsupported aggregation interval: {interval}")
+    return _utc_ns(midnight)
+
+
+def window_starts(ns: 'np.ndarray', interval: Union[timedelta, str], timezone: str = 'UTC') -> 'np.ndarray':
+    """
+    Exclusive start (UTC nanoseconds) of the trailing rolling window ending at each timestamp.
+    Windows are (t - interval, t]. 'month' and 'year' are calendar months in `timezone`, other shorthands are fixed lengths.
+    """
+    import pandas as pd
+
+    if isinstance(interval, timedelta):
+        return ns - _nanoseconds(interval)
+    if interval in _FIXED_PERIODS:
+        return ns - _nanoseconds(_FIXED_PERIODS[interval])
+    if interval in _CALENDAR_MONTHS:
+        return _utc_ns(_local(ns, timezone) - pd.DateOffset(months=_CALENDAR_MONTHS[interval]))
+    raise ValueError(f"Unsupported aggregation interval: {interval}")
+
+
+def _range_reduce(values: 'np.ndarray', left: 'np.ndarray', right: 'np.ndarray',
+                  op: Callable[['np.ndarray', 'np.ndarray'], 'np.ndarray']) -> 'np.ndarray':
+    """
+    op-reduce values[left[i]:right[i] + 1] for every i with a sparse table: O(n log w) for windows of up to w values.
+    """
+    import numpy as np
+
+    lengths = right - left + 1
+    levels = [values]
+    while len(levels[-1]) and (1 << len(levels)) <= lengths.max(initial=0):
+        half = 1 << (len(levels) - 1)
+        previous = levels[-1]
+        levels.append(op(previous[:-half], previous[half:]))
+    out = np.empty(len(left), dtype=values.dtype)
+    orders = np.floor(np.log2(np.maximum(lengths, 1))).astype(np.int64)
+    for order in np.unique(orders):
+        rows = orders == order
+        level = levels[order]
+        out[rows] = op(level[left[rows]], level[right[rows] - (1 << order) + 1])
+    return out
+
+
+def _finish(method: str, count: 'np.ndarray', total: 'np.ndarray', low: 'np.ndarray', high: 'np.ndarray') -> 'np.ndarray':
+    import numpy as np
+
+    if method == 'count':
+        return count.astype(np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if method == 'sum':
+            result = total
+        elif method == 'mean':
+            result = total / count
+        elif method == 'min':
+            result = low
+        elif method == 'max':
+            result = high
+        elif method == 'peak-to-peak':
+            result = high - low
+        elif method == 'greatest':
+            result = np.where(np.abs(high) >= np.abs(low), high, low)
+        else:
+            raise ValueError(f"Unsupported aggregation method: {method}")
+    return np.where(count > 0, result, np.nan)
+
+
+def aggregate_arrays(codes: 'np.ndarray', ns: 'np.ndarray', values: 'np.ndarray', aggregation: 'AggregationOptions',
+                     timezone: str = 'UTC') -> tuple['np.ndarray', 'np.ndarray', 'np.ndarray']:
+    """
+    Aggregate samples given as parallel arrays of integer channel codes, UTC nanosecond timestamps and values,
+    sorted by (code, timestamp). Returns (codes, timestamps, values) of the result.
+
+    Bucketed aggregations produce one sample per channel and bucket, stamped with the bucket start.
+    Rolling aggregations produce one sample per input sample, over the window (t - interval, t].
+    NaN values are ignored. A bucket or window without values aggregates to NaN, or 0 for 'count'.
+    """
+    import numpy as np
+
+    method = aggregation.method.value
+    valid = ~np.isnan(values)
+    zeroed = np.where(valid, values, 0.0)
+    low_values = np.where(valid, values, np.inf)
+    high_values = np.where(valid, values, -np.inf)
+
+    if not aggregation.rolling:
+        buckets = bucket_starts(ns, aggregation.interval, timezone)
+        starts = np.flatnonzero(np.r_[True, (codes[1:] != codes[:-1]) | (buckets[1:] != buckets[:-1])]) if len(ns) else \
+            np.empty(0, dtype=np.int64)
+        if not len(starts):
+            return codes[:0], ns[:0], values[:0]
+        count = np.add.reduceat(valid.astype(np.int64), starts)
+        total = np.add.reduceat(zeroed, starts)
+        low = np.minimum.reduceat(low_values, starts)
+        high = np.maximum.reduceat(high_values, starts)
+        return codes[starts], buckets[starts], _finish(method, count, total, low, high)
+
+    window = window_starts(ns, aggregation.interval, timezone)
+    left = np.empty(len(ns), dtype=np.int64)
+    boundaries = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1], True]) if len(ns) else np.empty(0, dtype=np.int64)
+    for start, end in zip(boundaries[:-1], boundaries[1:]):
+        left[start:end] = start + np.searchsorted(ns[start:end], window[start:end], side='right')
+    right = np.arange(len(ns), dtype=np.int64)
+    counts = np.r_[0, np.cumsum(valid.astype(np.int64))]
+    totals = np.r_[0.0, np.cumsum(zeroed)]
+    count = counts[right + 1] - counts[left]
+    total = totals[right + 1] - totals[left]
+    low = _range_reduce(low_values, left, right, np.minimum)
+    high = _range_reduce(high_values, left, right, np.maximum)
+    return codes, ns, _finish(method, count, total, low, high)
+
+
+def aggregate_frame(frame: 'pd.DataFrame', aggregation: 'AggregationOptions', timezone: Optional[str] = None) -> 'pd.DataFrame':
+    """
+    Apply `aggregation` to a downloaded data request result, keeping its layout: SAMPLES frames with 'channel', 'timestamp'
+    and 'value' columns or a (channel, timestamp) index, or COLUMNS frames indexed by timestamp with a column per channel.
+    Naive timestamps are UTC. See `aggregate_arrays`.
+
+    :param timezone: Time zone of the wall clock that 'day', 'week', 'month' and 'year' buckets follow. Defaults to UTC.
+    """
+    import numpy as np
+    import pandas as pd
+
+    timezone = timezone or 'UTC'
+    indexed = 'value' in frame.columns and {'channel', 'timestamp'} <= set(frame.index.names)
+    columns_format = not indexed and 'value' not in frame.columns
+    if columns_format:
+        # Empty cells are channels without a sample at that timestamp.
+        samples = frame.rename_axis(index='timestamp').reset_index() \
+            .melt(id_vars='timestamp', var_name='channel', value_name='value').dropna(subset=['value'])
+    elif indexed:
+        samples = frame.reset_index()
+    else:
+        samples = frame
+
+    timestamps = pd.DatetimeIndex(samples['timestamp'])
+    tz = timestamps.tz
+    ns = timestamps.as_unit('ns').asi8
+    codes, names = pd.factorize(samples['channel'], sort=True)
+    order = np.lexsort((ns, codes))
+    codes, ns, values = aggregate_arrays(codes[order], ns[order], samples['value'].to_numpy(np.float64)[order], aggregation,
+                                         timezone=timezone)
+
+    result_timestamps = pd.DatetimeIndex(pd.to_datetime(ns, utc=True))
+    result_timestamps = result_timestamps.tz_convert(tz) if tz is not None else result_timestamps.tz_localize(None)
+    result = pd.DataFrame({'channel': names[codes], 'timestamp': result_timestamps, 'value': values})
+    if columns_format:
+        return result.pivot(index='timestamp', columns='channel', values='value').rename_axis(columns=frame.columns.name)
+    if indexed:
+        return result.set_index(list(frame.index.names))
+    return result
@@ -0,0 +1,71 @@
+from dataclasses import dataclass
+from typing import BinaryIO, Iterator
+
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Header lines by the start of a file's first line, as recognised by `ingester.parsers.detect_parser`.
+_HEADER_LINES = (
+    # Campbell TOA5: file information, column names, units and processing.
+    (b'"TOA5",', 4),
+    # Worldsensing compacted CSV: datalogger information and column names.
+    (b'"Datalogger","compacted"', 2),
+    # Worldsensing standard CSV: nine lines of node information and column names.
+    (b'"Node ID",', 10),
+)
+
+
+@dataclass(frozen=True)
+class UploadProgress:
+    """
+    Progress of a chunked file upload.
+
+    :param offset: Bytes of the file acknowledged by the API, always at a line boundary.
+        Pass it as `resume_from` to continue an interrupted upload.
+    :param total: Size of the file in bytes.
+    :param chunks: Number of chunks acknowledged so far in this call.
+    """
+    offset: int
+    total: int
+    chunks: int
+
+    @property
+    def done(self) -> bool:
+        return self.offset >= self.total
+
+
+def detect_header_lines(f: BinaryIO) -> int:
+    """
+    Number of header lines of a datatable file, from its first line. Files of unknown format are taken to be CSV
+    with a single line of column names.
+    """
+    f.seek(0)
+    first_line = f.readline().lstrip(b'\xef\xbb\xbf')
+    for prefix, lines in _HEADER_LINES:
+        if first_line.startswith(prefix):
+            return lines
+    return 1
+
+
+def read_header(f: BinaryIO, header_lines: int) -> bytes:
+    """
+    The first `header_lines` lines of `f`, which are repeated at the start of every chunk.
+    """
+    f.seek(0)
+    return b''.join(f.readline() for _ in range(header_lines))
+
+
+def iter_chunks(f: BinaryIO, start: int, chunk_size: int) -> Iterator[tuple[int, bytes]]:
+    """
+    Yield (end offset, data) for consecutive chunks of `f` from `start`, each about `chunk_size` bytes and
+    extended to the end of its last line, so no row is split between two chunks.
+    """
+    f.seek(start)
+    offset = start
+    while True:
+        data = f.read(chunk_size)
+        if not data:
+            return
+        if not data.endswith(b'\n'):
+            data += f.readline()
+        offset += len(data)
+        yield offset, data
@@ -0,0 +1,144 @@
+import json
+import math
+from datetime import datetime, timezone
+from typing import Any, Collection, Iterable, Optional, Sequence, Union
+
+# A single code/event applies to every row, otherwise one entry per row.
+StrColumn = Union[str, Sequence[str], Any]
+# datetime objects (timezone-aware), numpy datetime64 (UTC), or epoch seconds.
+TimestampColumn = Union[Sequence[datetime], Sequence[float], Any]
+FloatColumn = Union[Sequence[float], Any]
+
+
+def _numpy() -> Any:
+    """
+    numpy if installed, else None. It vectorises validation and timestamp conversion, plain Python keeps the ingester
+    working on minimal edge installs. Imported on first use so the data service does not load it.
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _json_float(value: float) -> str:
+    if math.isnan(value):
+        return 'NaN'
+    if math.isinf(value):
+        return 'Infinity' if value > 0 else '-Infinity'
+    return repr(value)
+
+
+def _encode_strings(column: StrColumn, length: int, name: str) -> list[str]:
+    if isinstance(column, str):
+        return [json.dumps(column)] * length
+    items = column.tolist() if hasattr(column, 'tolist') else list(column)
+    if len(items) != length:
+        raise ValueError(f"{name} has {len(items)} rows, expected {length}")
+    # Codes repeat heavily, so encode each distinct value once.
+    encoded: dict[Any, str] = {}
+    out = []
+    for item in items:
+        text = encoded.get(item)
+        if text is None:
+            if not isinstance(item, str) or not item:
+                raise ValueError(f"{name} must contain non-empty strings, got {item!r}")
+            text = encoded[item] = json.dumps(item)
+        out.append(text)
+    return out
+
+
+def _format_datetime(value: Any) -> str:
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            raise ValueError("timestamps must be timezone-aware")
+        return value.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        if not math.isfinite(value):
+            raise ValueError(f"timestamps must be finite, got {value!r}")
+        return datetime.fromtimestamp(value, timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+    raise ValueError(f"Unsupported timestamp {value!r}")
+
+
+def _encode_timestamps(column: TimestampColumn, length: int) -> list[str]:
+    np = _numpy()
+    if np is not None:
+        array = np.asarray(column)
+        if array.dtype.kind == 'M':
+            if np.isnat(array).any():
+                raise ValueError("timestamps must not contain NaT")
+            return np.datetime_as_string(array.astype('datetime64[us]'), unit='us', timezone='UTC').tolist()
+        if array.dtype.kind in 'iuf':
+            if not np.isfinite(array).all():
+                raise ValueError("timestamps must be finite")
+            micros = np.round(array.astype(np.float64) * 1e6).astype(np.int64).astype('datetime64[us]')
+            return np.datetime_as_string(micros, unit='us', timezone='UTC').tolist()
+    items = column.tolist() if hasattr(column, 'tolist') else list(column)
+    if len(items) != length:
+        raise ValueError(f"timestamps has {len(items)} rows, expected {length}")
+    # pandas Timestamps are datetime subclasses, so tz-aware object columns take this path too.
+    return [_format_datetime(item) for item in items]
+
+
+def _encode_values(column: FloatColumn, length: int) -> list[str]:
+    np = _numpy()
+    if np is not None:
+        array = np.asarray(column, dtype=np.float64)
+        if array.shape != (length,):
+            raise ValueError(f"values has shape {array.shape}, expected ({length},)")
+        encoded = [repr(v) for v in array.tolist()]
+        for index in np.flatnonzero(~np.isfinite(array)).tolist():
+            encoded[index] = _json_float(array[index])
+        return encoded
+    items = [float(v) for v in column]
+    if len(items) != length:
+        raise ValueError(f"values has {len(items)} rows, expected {length}")
+    return [_json_float(v) for v in items]
+
+
+def _check_known_channels(channels: StrColumn, known_channels: Collection[str]) -> None:
+    known = set(known_channels)
+    np = _numpy()
+    if isinstance(channels, str):
+        unknown = set() if channels in known else {channels}
+    elif np is not None:
+        distinct = np.unique(np.asarray(channels, dtype=object))
+        unknown = {c for c in distinct.tolist() if c not in known}
+    else:
+        unknown = set(channels) - known
+    if unknown:
+        raise ValueError(f"Unknown channel codes: {sorted(unknown)}")
+
+
+def encode_sample_rows(channels: StrColumn,
+                       timestamps: TimestampColumn,
+                       values: FloatColumn,
+                       events: Optional[StrColumn] = None,
+                       known_channels: Optional[Collection[str]] = None) -> list[str]:
+    """
+    Validate the columns up front and encode each row as a JSON object, see `join_sample_rows`.
+    Timestamps must be finite, values are encoded with NaN/Infinity literals as the API expects.
+    """
+    length = len(values)
+    if known_channels is not None:
+        _check_known_channels(channels, known_channels)
+    channel_json = _encode_strings(channels, length, 'channels')
+    timestamp_text = _encode_timestamps(timestamps, length)
+    if len(timestamp_text) != length:
+        raise ValueError(f"timestamps has {len(timestamp_text)} rows, expected {length}")
+    value_text = _encode_values(values, length)
+    if events is None:
+        return [f'{{"channel":{channel_json[i]},"timestamp":"{timestamp_text[i]}","value":{value_text[i]}}}'
+                for i in range(length)]
+    event_json = _encode_strings(events, length, 'events')
+    return [f'{{"channel":{channel_json[i]},"timestamp":"{timestamp_text[i]}","value":{value_text[i]},'
+            f'"event":{event_json[i]}}}'
+            for i in range(length)]
+
+
+def join_sample_rows(rows: Sequence[str], positions: Iterable[int]) -> bytes:
+    """
+    JSON body of the rows at `positions`.
+    """
+    return ('[' + ','.join(rows[i] for i in positions) + ']').encode('utf-8')
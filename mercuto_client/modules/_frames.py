@@ -0,0 +1,107 @@
+import base64
+import mmap
+import tempfile
+from typing import IO, TYPE_CHECKING, Any, Iterator, Optional
+
+import requests
+
+from ..exceptions import MercutoHTTPException
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Results up to this size stay in memory, larger ones are spooled to a temporary file.
+DEFAULT_SPOOL_SIZE = 16 * 1024 * 1024
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+def _require_arrow() -> Any:
+    try:
+        import pandas  # noqa: F401
+        import pyarrow
+    except ImportError as e:
+        raise ImportError("Loading data request results into DataFrames requires pandas and pyarrow. "
+                          "Install them with `pip install mercuto-client[dataframe]`.") from e
+    return pyarrow
+
+
+def download_result(url: str, spool_size: int = DEFAULT_SPOOL_SIZE, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    timeout: float = 60, verify: bool = True) -> IO[bytes]:
+    """
+    Download a data request result into a spooled temporary file, `chunk_size` bytes at a time.
+    Presigned URLs carry their own authorisation, so neither client credentials nor the client's session (and its
+    headers) are used. `data:` URLs are decoded locally. The caller must close the returned file.
+
+    :param verify: Verify SSL certificates. Pass the client's `verify_ssl`.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=spool_size)
+    try:
+        if url.startswith('data:'):
+            header, _, payload = url.partition(',')
+            # Decode in chunks that are a multiple of 4 base64 characters.
+            step = chunk_size - chunk_size % 4 or 4
+            for start in range(0, len(payload), step):
+                part = payload[start:start + step]
+                spool.write(base64.b64decode(part) if header.endswith(';base64') else part.encode())
+        else:
+            with requests.get(url, stream=True, timeout=timeout, verify=verify) as response:
+                if not response.ok:
+                    raise MercutoHTTPException(response.text, response.status_code)
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    spool.write(chunk)
+        spool.seek(0)
+        return spool  # type: ignore[return-value]
+    except BaseException:
+        spool.close()
+        raise
+
+
+def _arrow_buffer(spool: IO[bytes], spool_size: int) -> Any:
+    """
+    Zero-copy view of the downloaded file: a memory map once spooled to disk, otherwise the in-memory bytes.
+    """
+    pa = _require_arrow()
+    spool.seek(0, 2)
+    size = spool.tell()
+    spool.seek(0)
+    if size == 0:
+        return pa.py_buffer(b'')
+    if size <= spool_size:
+        return pa.py_buffer(spool.read())
+    return pa.py_buffer(mmap.mmap(spool.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+def read_frame(spool: IO[bytes], file_format: str, spool_size: int = DEFAULT_SPOOL_SIZE,
+               columns: Optional[list[str]] = None) -> 'pd.DataFrame':
+    pa = _require_arrow()
+    if file_format == 'FEATHER':
+        import pyarrow.feather
+        return pyarrow.feather.read_table(pa.BufferReader(_arrow_buffer(spool, spool_size)), columns=columns).to_pandas()
+    if file_format == 'PARQUET':
+        import pyarrow.parquet
+        return pyarrow.parquet.read_table(pa.BufferReader(_arrow_buffer(spool, spool_size)), columns=columns).to_pandas()
+    import pandas as pd
+    return pd.read_csv(spool, usecols=columns)
+
+
+def iter_frames(spool: IO[bytes], file_format: str, spool_size: int = DEFAULT_SPOOL_SIZE,
+                columns: Optional[list[str]] = None, csv_chunk_rows: int = 100_000) -> Iterator['pd.DataFrame']:
+    """
+    Yield the result one piece at a time: per record batch for Feather, per row group for Parquet
+    and per `csv_chunk_rows` rows for CSV. Only the current piece is decoded into memory.
+    """
+    pa = _require_arrow()
+    if file_format == 'FEATHER':
+        reader = pa.ipc.open_file(pa.BufferReader(_arrow_buffer(spool, spool_size)))
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            yield (batch.select(columns) if columns is not None else batch).to_pandas()
+    elif file_format == 'PARQUET':
+        import pyarrow.parquet
+        parquet = pyarrow.parquet.ParquetFile(pa.BufferReader(_arrow_buffer(spool, spool_size)))
+        for i in range(parquet.num_row_groups):
+            yield parquet.read_row_group(i, columns=columns, use_pandas_metadata=True).to_pandas()
+    else:
+        import pandas as pd
+        with pd.read_csv(spool, usecols=columns, chunksize=csv_chunk_rows) as chunks:
+            yield from chunks
@@ -0,0 +1,73 @@
+import math
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Callable, Iterable, Optional
+
+if TYPE_CHECKING:
+    from .data import LatestDataSample
+
+DEFAULT_MIN_INTERVAL = 1.0
+DEFAULT_MAX_INTERVAL = 60.0
+DEFAULT_IDLE_BACKOFF = 2.0
+
+
+def _same_value(a: float, b: float) -> bool:
+    # NaN is never equal to itself, but a channel stuck at NaN has not changed.
+    return a == b or (math.isnan(a) and math.isnan(b))
+
+
+class LatestSampleTracker:
+    """
+    State of a `watch_latest` feed: the previous latest sample of each channel and the delay before the next poll.
+
+    The next poll is scheduled for when the earliest channel is due a new sample (its last timestamp plus its sampling
+    period), within [min_interval, max_interval]. Channels already overdue are ignored, as they are late or stopped.
+    Without any channel due, the next poll is after `min_interval`.
+    While polls return no changes, the delay grows by `idle_backoff` per idle poll, up to `max_interval`.
+    """
+
+    def __init__(self, min_interval: float = DEFAULT_MIN_INTERVAL, max_interval: float = DEFAULT_MAX_INTERVAL,
+                 idle_backoff: float = DEFAULT_IDLE_BACKOFF) -> None:
+        if min_interval <= 0 or max_interval < min_interval:
+            raise ValueError("Intervals must satisfy 0 < min_interval <= max_interval")
+        if idle_backoff < 1:
+            raise ValueError("idle_backoff must be at least 1")
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.idle_backoff = idle_backoff
+        self.latest: dict[str, 'LatestDataSample'] = {}
+        self.idle_polls = 0
+
+    def update(self, samples: Iterable['LatestDataSample']) -> list['LatestDataSample']:
+        """
+        Record a poll and return the samples whose timestamp or value changed, including channels seen for the first time.
+        """
+        changed = []
+        for sample in samples:
+            previous = self.latest.get(sample.channel)
+            if previous is None or previous.timestamp != sample.timestamp or not _same_value(previous.value, sample.value):
+                self.latest[sample.channel] = sample
+                changed.append(sample)
+        self.idle_polls = 0 if changed else self.idle_polls + 1
+        return changed
+
+    def next_delay(self, sampling_period: Callable[[str], Optional[timedelta]], now: Optional[datetime] = None) -> float:
+        """
+        Seconds to wait before the next poll.
+
+        :param sampling_period: Sampling period of a channel code, None when unknown.
+        """
+        now = now if now is not None else datetime.now(timezone.utc)
+        due: list[float] = []
+        for sample in self.latest.values():
+            period = sampling_period(sample.channel)
+            if not period:
+                continue
+            timestamp = sample.timestamp if sample.timestamp.tzinfo is not None else sample.timestamp.replace(tzinfo=timezone.utc)
+            seconds = (timestamp + period - now).total_seconds()
+            if seconds > 0:
+                due.append(seconds)
+        delay = max(self.min_interval, min(due, default=self.min_interval))
+        if self.idle_polls:
+            # Capped exponent, the delay has long reached max_interval by then.
+            delay = max(delay, self.min_interval * self.idle_backoff ** min(self.idle_polls, 64))
+        return min(delay, self.max_interval)
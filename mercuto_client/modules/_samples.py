@@ -0,0 +1,93 @@
+import json
+import math
+from datetime import datetime
+from typing import Any, Callable, Iterable, Optional, TypeVar, Union
+
+import pydantic_core
+
+from ._columns import _json_float
+
+_T = TypeVar('_T')
+
+
+def format_timestamp(value: datetime) -> str:
+    """
+    Format a timestamp the way pydantic serializes datetimes: ISO 8601, 'Z' for UTC, no offset for naive values.
+    """
+    text = value.isoformat()
+    if text.endswith('+00:00'):
+        return text[:-6] + 'Z'
+    return text
+
+
+def parse_timestamp(text: str) -> datetime:
+    # fromisoformat only understands 'Z' from Python 3.11, and not every ISO 8601 variant before that.
+    if text.endswith('Z'):
+        text = text[:-1] + '+00:00'
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        from dateutil import parser
+        return parser.isoparse(text)
+
+
+def _encode_value(value: float) -> str:
+    value = float(value)
+    return repr(value) if math.isfinite(value) else _json_float(value)
+
+
+def encode_sample_tuples(samples: Iterable[Any], with_event: bool = False) -> bytes:
+    """
+    Encode (channel, timestamp, value[, event]) tuples to the JSON body accepted by the sample insert endpoints.
+    Anything with `channel`, `timestamp`, `value` (and `event`) attributes is accepted as well.
+    """
+    if with_event:
+        items = [s if isinstance(s, tuple) else (s.channel, s.timestamp, s.value, s.event) for s in samples]
+    else:
+        items = [s if isinstance(s, tuple) else (s.channel, s.timestamp, s.value) for s in samples]
+
+    # Codes and timestamps repeat across the channels of a logger row, encode each distinct one once.
+    # Equal instants in different zones compare equal but format differently, so the zone is part of the key.
+    strings: dict[str, str] = {}
+    timestamps: dict[tuple[datetime, Any], str] = {}
+    last_timestamp: Optional[datetime] = None
+    last_text = ''
+    rows = []
+    for sample in items:
+        channel = strings.get(sample[0])
+        if channel is None:
+            channel = strings[sample[0]] = json.dumps(sample[0], ensure_ascii=False)
+        timestamp = sample[1]
+        if timestamp is not last_timestamp:
+            key = (timestamp, timestamp.tzinfo)
+            last_text = timestamps.get(key) or timestamps.setdefault(key, format_timestamp(timestamp))
+            last_timestamp = timestamp
+        value = sample[2]
+        # x - x is 0.0 only for finite floats.
+        value_text = repr(value) if value.__class__ is float and value - value == 0.0 else _encode_value(value)
+        if with_event:
+            event = strings.get(sample[3])
+            if event is None:
+                event = strings[sample[3]] = json.dumps(sample[3], ensure_ascii=False)
+            rows.append(f'{{"channel":{channel},"timestamp":"{last_text}","value":{value_text},"event":{event}}}')
+        else:
+            rows.append(f'{{"channel":{channel},"timestamp":"{last_text}","value":{value_text}}}')
+    return ('[' + ','.join(rows) + ']').encode('utf-8')
+
+
+def decode_sample_tuples(body: Union[str, bytes], make: Callable[..., _T], with_event: bool = False) -> list[_T]:
+    """
+    Decode a JSON list of samples into `make(channel, timestamp, value[, event])` without model validation.
+    """
+    timestamps: dict[str, datetime] = {}
+    out = []
+    for row in pydantic_core.from_json(body):
+        text = row['timestamp']
+        timestamp: Optional[datetime] = timestamps.get(text)
+        if timestamp is None:
+            timestamp = timestamps[text] = parse_timestamp(text)
+        if with_event:
+            out.append(make(row['channel'], timestamp, float(row['value']), row['event']))
+        else:
+            out.append(make(row['channel'], timestamp, float(row['value'])))
+    return out
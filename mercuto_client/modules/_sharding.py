@@ -0,0 +1,145 @@
+import math
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Optional, Sequence
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+DEFAULT_MAX_SAMPLES_PER_REQUEST = 2_000_000
+DEFAULT_MAX_CHANNELS_PER_REQUEST = 200
+# Used for channels without a sampling period, such as event metrics.
+DEFAULT_SAMPLING_PERIOD = timedelta(minutes=1)
+
+_SHORTHAND_PERIODS = {
+    'second': timedelta(seconds=1),
+    'minute': timedelta(minutes=1),
+    'hour': timedelta(hours=1),
+    'day': timedelta(days=1),
+    'week': timedelta(weeks=1),
+    'month': timedelta(days=28),
+    'year': timedelta(days=365),
+}
+
+
+@dataclass(frozen=True)
+class DataRequestShard:
+    """
+    One data request of a sharded (channels x time range) request.
+
+    :param channels: Channel codes in this request.
+    :param start_time: Start of the window.
+    :param end_time: End of the window. Windows of the same channels share their boundaries.
+    :param expected_samples: Estimated number of samples in the result, from the channels' sampling periods. 0 when unknown.
+    """
+    channels: tuple[str, ...]
+    start_time: datetime
+    end_time: datetime
+    expected_samples: int = 0
+
+
+def effective_period(sampling_period: Optional[timedelta], aggregation_interval: Optional[object] = None) -> timedelta:
+    """
+    Period between samples in a result: the channel's sampling period, or the aggregation interval when coarser.
+    """
+    period = sampling_period if sampling_period else DEFAULT_SAMPLING_PERIOD
+    if isinstance(aggregation_interval, str):
+        aggregation_interval = _SHORTHAND_PERIODS.get(aggregation_interval)
+    if isinstance(aggregation_interval, timedelta) and aggregation_interval > period:
+        period = aggregation_interval
+    return period
+
+
+def plan_shards(channels: Sequence[tuple[str, timedelta]], start_time: datetime, end_time: datetime,
+                max_samples: int = DEFAULT_MAX_SAMPLES_PER_REQUEST,
+                max_channels: int = DEFAULT_MAX_CHANNELS_PER_REQUEST) -> list[DataRequestShard]:
+    """
+    Split a request for (channel code, sampling period) pairs over [start_time, end_time] into requests of
+    at most `max_samples` expected samples and `max_channels` channels.
+
+    Channels with similar sampling periods are grouped so that each group covers the whole range in as few
+    windows as possible, then each group's range is split into equal windows.
+    """
+    if end_time <= start_time:
+        raise ValueError("end_time must be after start_time")
+    if max_samples < 1 or max_channels < 1:
+        raise ValueError("max_samples and max_channels must be at least 1")
+    duration = (end_time - start_time).total_seconds()
+
+    # Fastest channels first, so every group holds channels of similar rates.
+    ordered = sorted(channels, key=lambda item: (item[1], item[0]))
+    groups: list[tuple[list[str], float]] = []
+    codes: list[str] = []
+    rate = 0.0
+    for code, period in ordered:
+        channel_rate = 1 / max(period.total_seconds(), 1e-6)
+        if codes and (len(codes) >= max_channels or (rate + channel_rate) * duration > max_samples):
+            groups.append((codes, rate))
+            codes, rate = [], 0.0
+        codes.append(code)
+        rate += channel_rate
+    if codes:
+        groups.append((codes, rate))
+
+    shards = []
+    for codes, rate in groups:
+        total = rate * duration
+        windows = max(1, math.ceil(total / max_samples))
+        step = (end_time - start_time) / windows
+        for i in range(windows):
+            window_start = start_time + step * i
+            window_end = end_time if i == windows - 1 else start_time + step * (i + 1)
+            shards.append(DataRequestShard(tuple(codes), window_start, window_end, math.ceil(total / windows)))
+    return shards
+
+
+def merge_frames(frames: Sequence['pd.DataFrame'], columns_format: bool) -> 'pd.DataFrame':
+    """
+    Merge shard results in timestamp order, dropping the duplicates returned for shared window boundaries.
+
+    SAMPLES frames are stacked, COLUMNS frames (one column per channel, indexed by timestamp) are stacked per
+    channel group and then joined side by side.
+    """
+    import pandas as pd
+
+    frames = [frame for frame in frames if len(frame)]
+    if not frames:
+        return pd.DataFrame()
+    if columns_format:
+        by_group: dict[tuple[str, ...], list[pd.DataFrame]] = {}
+        for frame in frames:
+            by_group.setdefault(tuple(map(str, frame.columns)), []).append(frame)
+        stacked = [pd.concat(group) for group in by_group.values()]
+        stacked = [frame[~frame.index.duplicated()] for frame in stacked]
+        return pd.concat(stacked, axis=1).sort_index()
+
+    merged = pd.concat(frames)
+    if 'timestamp' in merged.columns:
+        keys = [c for c in ('timestamp', 'channel') if c in merged.columns]
+        return merged.drop_duplicates(subset=keys).sort_values(keys, kind='stable').reset_index(drop=True)
+    merged = merged[~merged.index.duplicated()]
+    if 'timestamp' in (merged.index.names or []):
+        return merged.sort_index(level='timestamp', sort_remaining=True)
+    return merged.sort_index()
+
+
+def slice_frame(frame: 'pd.DataFrame', start_time: datetime, end_time: datetime, columns_format: bool) -> 'pd.DataFrame':
+    """
+    Rows of a result frame with start_time <= timestamp <= end_time.
+    """
+    import pandas as pd
+
+    if not len(frame):
+        return frame
+    if not columns_format and 'timestamp' in frame.columns:
+        timestamps = frame['timestamp']
+    elif 'timestamp' in (frame.index.names or []) and frame.index.nlevels > 1:
+        timestamps = frame.index.get_level_values('timestamp').to_series(index=frame.index)
+    else:
+        timestamps = frame.index.to_series(index=frame.index)
+    start, end = pd.Timestamp(start_time), pd.Timestamp(end_time)
+    if getattr(timestamps.dt, 'tz', None) is None and start.tzinfo is not None:
+        # Naive result timestamps are UTC.
+        start, end = start.tz_convert('UTC').tz_localize(None), end.tz_convert('UTC').tz_localize(None)
+    mask = (timestamps >= start) & (timestamps <= end)
+    return frame[mask.to_numpy()]
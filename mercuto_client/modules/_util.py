@@ -3,7 +3,10 @@ from datetime import timedelta
 from pydantic import BaseModel as _BaseModel
 from pydantic import ConfigDict, TypeAdapter
 
-_TimedeltaAdapter = TypeAdapter(timedelta)
+# Building validators dominates import time, so models and adapters are built on first use instead.
+DEFERRED = ConfigDict(defer_build=True)
+
+_TimedeltaAdapter = TypeAdapter(timedelta, config=DEFERRED)
 
 
 def serialise_timedelta(td: timedelta) -> str:
@@ -14,5 +17,6 @@ def serialise_timedelta(td: timedelta) -> str:
 
 class BaseModel(_BaseModel):
     model_config = ConfigDict(
-        extra='allow'
+        extra='allow',
+        defer_build=True,
     )
@@ -8,8 +8,9 @@ from .data import AggregationMethod
 if TYPE_CHECKING:
     from ..client import MercutoClient
 
+from ..instrumentation import instrumented
 from . import PayloadType
-from ._util import BaseModel
+from ._util import DEFERRED, BaseModel
 
 
 class Healthcheck(BaseModel):
@@ -89,12 +90,13 @@ class AlarmLog(BaseModel):
 
 
 # --- TypeAdapters for lists ---
-_ConditionListAdapter = TypeAdapter(list[Condition])
-_AlarmListAdapter = TypeAdapter(list[Alarm])
-_ConditionLogListAdapter = TypeAdapter(list[ConditionLog])
-_AlarmLogListAdapter = TypeAdapter(list[AlarmLog])
+_ConditionListAdapter = TypeAdapter(list[Condition], config=DEFERRED)
+_AlarmListAdapter = TypeAdapter(list[Alarm], config=DEFERRED)
+_ConditionLogListAdapter = TypeAdapter(list[ConditionLog], config=DEFERRED)
+_AlarmLogListAdapter = TypeAdapter(list[AlarmLog], config=DEFERRED)
 
 
+@instrumented('alerts')
 class MercutoAlertService:
     def __init__(self, client: 'MercutoClient', path: str = '/v2/alerts') -> None:
         self._client = client
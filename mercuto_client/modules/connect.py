@@ -7,8 +7,9 @@ if TYPE_CHECKING:
     from ..client import MercutoClient
 
 from ..exceptions import MercutoHTTPException
+from ..instrumentation import instrumented
 from . import PayloadType
-from ._util import BaseModel
+from ._util import DEFERRED, BaseModel
 
 # ── WireGuard Peers ──────────────────────────────────────
 
@@ -95,13 +96,14 @@ class WireguardEvent(BaseModel):
 
 
 # --- TypeAdapters for lists ---
-_WireguardPeerListAdapter = TypeAdapter(list[WireguardPeer])
-_SshTunnelListAdapter = TypeAdapter(list[SshTunnel])
-_WireguardPeerSummaryListAdapter = TypeAdapter(list[WireguardPeerSummary])
-_WireguardSnapshotListAdapter = TypeAdapter(list[WireguardSnapshot])
-_WireguardEventListAdapter = TypeAdapter(list[WireguardEvent])
+_WireguardPeerListAdapter = TypeAdapter(list[WireguardPeer], config=DEFERRED)
+_SshTunnelListAdapter = TypeAdapter(list[SshTunnel], config=DEFERRED)
+_WireguardPeerSummaryListAdapter = TypeAdapter(list[WireguardPeerSummary], config=DEFERRED)
+_WireguardSnapshotListAdapter = TypeAdapter(list[WireguardSnapshot], config=DEFERRED)
+_WireguardEventListAdapter = TypeAdapter(list[WireguardEvent], config=DEFERRED)
 
 
+@instrumented('connect')
 class MercutoConnectService:
     def __init__(self, client: 'MercutoClient', path: str = '/connect') -> None:
         self._client = client
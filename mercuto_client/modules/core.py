@@ -1,10 +1,12 @@
 from datetime import datetime, timedelta
-from typing import TYPE_CHECKING, Any, Literal, Optional
+from typing import TYPE_CHECKING, Any, Iterator, Literal, Optional
 
 from pydantic import TypeAdapter
 
+from ..instrumentation import instrumented
+from ..pagination import DEFAULT_PAGE_SIZE, DEFAULT_PREFETCH, paginate
 from . import PayloadType
-from ._util import BaseModel, serialise_timedelta
+from ._util import DEFERRED, BaseModel, serialise_timedelta
 
 if TYPE_CHECKING:
     from ..client import MercutoClient
@@ -219,14 +221,15 @@ class EventAggregate(BaseModel):
     options: Optional[dict[str, Any]] = None
 
 
-_ProjectListAdapter = TypeAdapter(list[Project])
-_EventsListAdapter = TypeAdapter(list[Event])
-_DevicesListAdapter = TypeAdapter(list[Device])
-_DeviceTypeListAdapter = TypeAdapter(list[DeviceType])
-_DeviceGroupListAdapter = TypeAdapter(list[DeviceGroup])
-_ConditionListAdapter = TypeAdapter(list[Condition])
+_ProjectListAdapter = TypeAdapter(list[Project], config=DEFERRED)
+_EventsListAdapter = TypeAdapter(list[Event], config=DEFERRED)
+_DevicesListAdapter = TypeAdapter(list[Device], config=DEFERRED)
+_DeviceTypeListAdapter = TypeAdapter(list[DeviceType], config=DEFERRED)
+_DeviceGroupListAdapter = TypeAdapter(list[DeviceGroup], config=DEFERRED)
+_ConditionListAdapter = TypeAdapter(list[Condition], config=DEFERRED)
 
 
+@instrumented('core')
 class MercutoCoreService:
     def __init__(self, client: 'MercutoClient') -> None:
         self._client = client
@@ -330,6 +333,19 @@ class MercutoCoreService:
         r = self._client.request('/events', 'GET', params=params)
         return _EventsListAdapter.validate_json(r.text)
 
+    def iter_events(self, project: str,
+                    start_time: Optional[datetime] = None,
+                    end_time: Optional[datetime] = None,
+                    ascending: bool = True,
+                    page_size: int = DEFAULT_PAGE_SIZE,
+                    prefetch: int = DEFAULT_PREFETCH) -> Iterator[Event]:
+        """
+        Lazily iterate over all events for a project, requesting up to `prefetch` pages ahead. See `paginate`.
+        """
+        return paginate(lambda limit, offset: self.list_events(project, start_time=start_time, end_time=end_time,
+                                                               limit=limit, offset=offset, ascending=ascending),
+                        page_size=page_size, prefetch=prefetch)
+
     def get_event(self, event: str) -> Event:
         r = self._client.request(f'/events/{event}', 'GET')
         return Event.model_validate_json(r.text)
@@ -383,6 +399,14 @@ class MercutoCoreService:
         r = self._client.request('/alerts/conditions', 'GET', params=params)
         return _ConditionListAdapter.validate_json(r.text)
 
+    def iter_conditions(self, project: str, page_size: int = DEFAULT_PAGE_SIZE,
+                        prefetch: int = DEFAULT_PREFETCH) -> Iterator[Condition]:
+        """
+        Lazily iterate over all alert conditions for a project, requesting up to `prefetch` pages ahead. See `paginate`.
+        """
+        return paginate(lambda limit, offset: self.list_conditions(project, limit=limit, offset=offset),
+                        page_size=page_size, prefetch=prefetch)
+
     def get_condition(self, code: str) -> Condition:
         r = self._client.request(f'/alerts/conditions/{code}', 'GET')
         return Condition.model_validate_json(r.text)
@@ -454,6 +478,25 @@ class MercutoCoreService:
         r = self._client.request('/alerts/logs', 'GET', params=params)
         return AlertSummary.model_validate_json(r.text)
 
+    def iter_alert_logs(
+            self,
+            project: str | None = None,
+            configuration: str | None = None,
+            channels: list[str] | None = None,
+            start_time: datetime | str | None = None,
+            end_time: datetime | str | None = None,
+            latest_only: bool = False,
+            page_size: int = DEFAULT_PAGE_SIZE,
+            prefetch: int = DEFAULT_PREFETCH,
+    ) -> Iterator[AlertLog]:
+        """
+        Lazily iterate over all matching alert logs, requesting up to `prefetch` pages ahead. See `paginate`.
+        """
+        return paginate(lambda limit, offset: self.list_alert_logs(project=project, configuration=configuration, channels=channels,
+                                                                   start_time=start_time, end_time=end_time, limit=limit,
+                                                                   offset=offset, latest_only=latest_only).alerts,
+                        page_size=page_size, prefetch=prefetch)
+
     # DEVICES
 
     def list_device_types(self) -> list[DeviceType]:
@@ -478,6 +521,14 @@ class MercutoCoreService:
         r = self._client.request('/devices', 'GET', params=params)
         return _DevicesListAdapter.validate_json(r.text)
 
+    def iter_devices(self, project_code: str, page_size: int = DEFAULT_PAGE_SIZE,
+                     prefetch: int = DEFAULT_PREFETCH) -> Iterator[Device]:
+        """
+        Lazily iterate over all devices for a project, requesting up to `prefetch` pages ahead. See `paginate`.
+        """
+        return paginate(lambda limit, offset: self.list_devices(project_code, limit=limit, offset=offset),
+                        page_size=page_size, prefetch=prefetch)
+
     def get_device(self, device_code: str) -> Device:
         r = self._client.request(f'/devices/{device_code}', 'GET')
         return Device.model_validate_json(r.text)
@@ -1,19 +1,49 @@
+import contextvars
 import enum
+import io
+import json
 import os
 import time
 from contextlib import nullcontext
-from datetime import datetime, timedelta
-from typing import (TYPE_CHECKING, Any, BinaryIO, Collection, Literal,
-                    Optional, TextIO, Union)
+from datetime import datetime, timedelta, timezone
+from typing import (IO, TYPE_CHECKING, Any, BinaryIO, Callable, Collection,
+                    Iterator, Literal, NamedTuple, Optional, Sequence, TextIO,
+                    TypeVar, Union)
 
-from pydantic import TypeAdapter
+from pydantic import ConfigDict, TypeAdapter
 
+from .._workers import worker_pool
+from ..batching import (DEFAULT_MAX_IN_FLIGHT, BatchResult, UploadReport,
+                        is_oversized, upload_batches, upload_report)
+from ..dedup import HighWaterMarks
 from ..exceptions import MercutoClientException, MercutoHTTPException
+from ..instrumentation import instrumented
+from ..pagination import (DEFAULT_PAGE_SIZE, DEFAULT_PREFETCH, paginate,
+                          paginate_by_timestamp)
+from ..registry import (DEFAULT_MISS_REFRESH_INTERVAL, DEFAULT_TTL,
+                        ChannelRegistry)
+from ..result_cache import result_key
+from ..spool import SampleSpool
 from ..util import batched
 from . import PayloadType, raise_for_response
-from ._util import BaseModel, serialise_timedelta
+from ._aggregation import aggregate_frame
+from ._chunked import (DEFAULT_CHUNK_SIZE, UploadProgress, detect_header_lines,
+                       iter_chunks, read_header)
+from ._columns import (FloatColumn, StrColumn, TimestampColumn,
+                       encode_sample_rows, join_sample_rows)
+from ._frames import download_result, iter_frames, read_frame
+from ._latest import (DEFAULT_IDLE_BACKOFF, DEFAULT_MAX_INTERVAL,
+                      DEFAULT_MIN_INTERVAL, LatestSampleTracker)
+from ._samples import decode_sample_tuples, encode_sample_tuples
+from ._sharding import (DEFAULT_MAX_CHANNELS_PER_REQUEST,
+                        DEFAULT_MAX_SAMPLES_PER_REQUEST, DataRequestShard,
+                        effective_period, merge_frames, plan_shards,
+                        slice_frame)
+from ._util import DEFERRED, BaseModel, serialise_timedelta
 
 if TYPE_CHECKING:
+    import pandas as pd
+
     from ..client import MercutoClient
 
 
@@ -68,12 +98,17 @@ class Datatable(BaseModel):
 
 
 class SecondaryDataSample(BaseModel):
+    # The API accepts NaN/Infinity literals, keep them when dumping straight to JSON bytes.
+    model_config = ConfigDict(ser_json_inf_nan='constants')
+
     channel: str
     timestamp: datetime
     value: float
 
 
 class MetricDataSample(BaseModel):
+    model_config = ConfigDict(ser_json_inf_nan='constants')
+
     channel: str
     timestamp: datetime
     value: float
@@ -86,13 +121,56 @@ class LatestDataSample(BaseModel):
     value: float
 
 
-_ChannellistAdapter = TypeAdapter(list[Channel])
-_ExpressionlistAdapter = TypeAdapter(list[Expression])
-_DatatablelistAdapter = TypeAdapter(list[Datatable])
-_UnitslistAdapter = TypeAdapter(list[Units])
-_MetricSamplelistAdapter = TypeAdapter(list[MetricDataSample])
-_SecondarySamplelistAdapter = TypeAdapter(list[SecondaryDataSample])
-_LatestSampleListAdapter = TypeAdapter(list[LatestDataSample])
+class SecondarySample(NamedTuple):
+    """
+    Compact, unvalidated alternative to `SecondaryDataSample` for large sample sets.
+    A plain tuple: no per-instance `__dict__` and no validation on construction.
+    """
+    channel: str
+    timestamp: datetime
+    value: float
+
+    @classmethod
+    def from_model(cls, sample: SecondaryDataSample) -> 'SecondarySample':
+        return cls(sample.channel, sample.timestamp, sample.value)
+
+    def to_model(self) -> SecondaryDataSample:
+        return SecondaryDataSample(channel=self.channel, timestamp=self.timestamp, value=self.value)
+
+
+class MetricSample(NamedTuple):
+    """
+    Compact, unvalidated alternative to `MetricDataSample`, see `SecondarySample`.
+    """
+    channel: str
+    timestamp: datetime
+    value: float
+    event: str
+
+    @classmethod
+    def from_model(cls, sample: MetricDataSample) -> 'MetricSample':
+        return cls(sample.channel, sample.timestamp, sample.value, sample.event)
+
+    def to_model(self) -> MetricDataSample:
+        return MetricDataSample(channel=self.channel, timestamp=self.timestamp, value=self.value, event=self.event)
+
+
+SecondarySampleLike = Union[SecondaryDataSample, SecondarySample]
+MetricSampleLike = Union[MetricDataSample, MetricSample]
+
+
+_ChannellistAdapter = TypeAdapter(list[Channel], config=DEFERRED)
+_ExpressionlistAdapter = TypeAdapter(list[Expression], config=DEFERRED)
+_DatatablelistAdapter = TypeAdapter(list[Datatable], config=DEFERRED)
+_UnitslistAdapter = TypeAdapter(list[Units], config=DEFERRED)
+_MetricSamplelistAdapter = TypeAdapter(list[MetricDataSample], config=DEFERRED)
+_SecondarySamplelistAdapter = TypeAdapter(list[SecondaryDataSample], config=DEFERRED)
+_LatestSampleListAdapter = TypeAdapter(list[LatestDataSample], config=DEFERRED)
+
+_T = TypeVar('_T')
+
+# Upper bound on the delay between two polls of a pending data request.
+DEFAULT_MAX_POLL_INTERVAL = 5.0
 
 
 class FrameFormat(enum.Enum):
@@ -156,6 +234,45 @@ class Healthcheck(BaseModel):
     status: str
 
 
+def _completed_result(status: GetStatusRequestResponse) -> Optional[GetStatusRequestResponse.GetDataRequestStatusCompletedResult]:
+    """
+    The result of a completed data request, None while it is pending. Raises for a failed request.
+    """
+    if status.status_code == 200 and status.result and status.result.result_url:
+        return status.result
+    if status.status_code >= 400:
+        raise MercutoHTTPException(status.message, status.status_code)
+    return None
+
+
+def _secondary_sample_params(channels: Collection[str], start_time: datetime, end_time: datetime, limit: int) -> PayloadType:
+    return {
+        "channels": list(channels),
+        "start_time": start_time.isoformat(),
+        "end_time": end_time.isoformat(),
+        "limit": limit
+    }
+
+
+def _metric_sample_params(channels: Optional[Collection[str]], start_time: Optional[datetime], end_time: Optional[datetime],
+                          events: Optional[Collection[str]], project: Optional[str], limit: int) -> PayloadType:
+    params: PayloadType = {
+        "limit": limit
+    }
+    if project is not None:
+        params["project"] = project
+    if channels is not None:
+        params["channels"] = list(channels)
+    if start_time is not None:
+        params["start_time"] = start_time.isoformat()
+    if end_time is not None:
+        params["end_time"] = end_time.isoformat()
+    if events is not None:
+        params["event"] = list(events)
+    return params
+
+
+@instrumented('data')
 class MercutoDataService:
     def __init__(self, client: 'MercutoClient', path: str = '/v2/data') -> None:
         self._client = client
@@ -178,10 +295,18 @@ class MercutoDataService:
     def list_channels(self, project: str, classification: Optional[ChannelClassification] = None,
                       aggregate: Optional[str] = None, metric: Optional[str] = None,
                       show_hidden: bool = False) -> list[Channel]:
+        return list(self.iter_channels(project, classification=classification, aggregate=aggregate,
+                                       metric=metric, show_hidden=show_hidden))
+
+    def iter_channels(self, project: str, classification: Optional[ChannelClassification] = None,
+                      aggregate: Optional[str] = None, metric: Optional[str] = None,
+                      show_hidden: bool = False, page_size: int = DEFAULT_PAGE_SIZE,
+                      prefetch: int = DEFAULT_PREFETCH) -> Iterator[Channel]:
+        """
+        Lazily iterate over all channels in a project, requesting up to `prefetch` pages ahead. See `paginate`.
+        """
         params: dict[str, Any] = {
             'project': project,
-            'limit': 100,
-            'offset': 0,
             'show_hidden': show_hidden,
         }
         if classification:
@@ -191,17 +316,23 @@ class MercutoDataService:
         if metric:
             params['metric'] = metric
 
-        all_channels: list[Channel] = []
-        while True:
+        def fetch_page(limit: int, offset: int) -> list[Channel]:
             r = self._client.request(
-                f'{self._path}/channels', 'GET', params=params)
+                f'{self._path}/channels', 'GET', params={**params, 'limit': limit, 'offset': offset})
+            return _ChannellistAdapter.validate_json(r.text)
 
-            channels = _ChannellistAdapter.validate_json(r.text)
-            all_channels.extend(channels)
-            if len(channels) < params['limit']:
-                break
-            params['offset'] += params['limit']
-        return all_channels
+        return paginate(fetch_page, page_size=page_size, prefetch=prefetch)
+
+    def channel_registry(self, project: str, ttl: float = DEFAULT_TTL,
+                         miss_refresh_interval: float = DEFAULT_MISS_REFRESH_INTERVAL) -> ChannelRegistry:
+        """
+        Indexed view of all channels and datatables in a project, for repeated lookups without listing them every time.
+        Snapshots are shared with copies of this client and reloaded through this service. See `ChannelRegistry`.
+        """
+        def load() -> tuple[list[Channel], list[Datatable]]:
+            return self.list_channels(project), self.list_datatables(project)
+
+        return ChannelRegistry(project, load, self._client.channel_indexes(), ttl=ttl, miss_refresh_interval=miss_refresh_interval)
 
     def get_channel(self, code: str) -> Optional[Channel]:
         r = self._client.request(
@@ -321,22 +452,19 @@ class MercutoDataService:
         return Datatable.model_validate_json(r.text)
 
     def list_datatables(self, project: str) -> list[Datatable]:
-        datatables: list[Datatable] = []
-        params: dict[str, Any] = {
-            "project": project,
-            "limit": 100,
-            "offset": 0,
-        }
-        while True:
+        return list(self.iter_datatables(project))
+
+    def iter_datatables(self, project: str, page_size: int = DEFAULT_PAGE_SIZE,
+                        prefetch: int = DEFAULT_PREFETCH) -> Iterator[Datatable]:
+        """
+        Lazily iterate over all datatables in a project, requesting up to `prefetch` pages ahead. See `paginate`.
+        """
+        def fetch_page(limit: int, offset: int) -> list[Datatable]:
             r = self._client.request(
-                f'{self._path}/datatables', 'GET', params=params)
+                f'{self._path}/datatables', 'GET', params={"project": project, "limit": limit, "offset": offset})
+            return _DatatablelistAdapter.validate_json(r.text)
 
-            batch = _DatatablelistAdapter.validate_json(r.text)
-            datatables.extend(batch)
-            if len(batch) < params["limit"]:
-                break
-            params["offset"] += params["limit"]
-        return datatables
+        return paginate(fetch_page, page_size=page_size, prefetch=prefetch)
 
     """
     Units
@@ -470,10 +598,12 @@ class MercutoDataService:
         channel_format: ChannelFormat = ChannelFormat.CODE,
         aggregation: Optional[AggregationOptions] = None,
         poll_interval: float = 0.25,
-        timeout: int = 60
+        timeout: int = 60,
+        max_poll_interval: float = DEFAULT_MAX_POLL_INTERVAL
     ) -> GetStatusRequestResponse.GetDataRequestStatusCompletedResult:
         """
         Request a presigned download URL for data and poll until ready.
+        The delay between polls starts at `poll_interval` and doubles up to `max_poll_interval`.
 
         Returns:
             The GetStatusRequestResponse
@@ -494,26 +624,290 @@ class MercutoDataService:
             timeout=poll_interval,
             aggregation=aggregation
         )
-        request_id = status.request_id
+        _, result = next(self.wait_for_requests([status], poll_interval=poll_interval, max_poll_interval=max_poll_interval,
+                                                timeout=timeout, max_in_flight=1))
+        return result
 
-        # If already complete, return immediately
-        if status.status_code == 200 and status.result and status.result.result_url:
-            return status.result
-        if status.status_code >= 400:
-            raise MercutoHTTPException(status.message, status.status_code)
+    def wait_for_requests(
+        self,
+        requests: Sequence[Union[str, GetStatusRequestResponse]],
+        poll_interval: float = 0.25,
+        max_poll_interval: float = DEFAULT_MAX_POLL_INTERVAL,
+        timeout: float = 600,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT
+    ) -> Iterator[tuple[int, GetStatusRequestResponse.GetDataRequestStatusCompletedResult]]:
+        """
+        Wait on many data requests at once and yield (index, result) pairs in the order the requests complete,
+        where index is the position of the request in `requests`.
 
-        # Otherwise, poll for completion
-        start_poll = time.time()
-        while True:
-            status = self.get_request(request_id)
-            if status.status_code == 200 and status.result and status.result.result_url:
-                return status.result
-            if status.status_code >= 400:
-                raise MercutoHTTPException(status.message, status.status_code)
-            if time.time() - start_poll > timeout:
-                raise MercutoClientException(
-                    "Timed out waiting for presigned url.")
-            time.sleep(poll_interval)
+        All requests are polled from one loop. Each pending request is first polled `poll_interval` seconds
+        after the wait starts, and the delay doubles after every poll up to `max_poll_interval`.
+        Polls that fall due together are sent concurrently, up to `max_in_flight` at a time.
+
+        :param requests: Request IDs, or statuses returned by `create_request`. Completed statuses are yielded straight away.
+        :param timeout: Seconds to wait for all requests to complete.
+        Raises:
+            MercutoHTTPException for the first request that failed, MercutoClientException on timeout.
+        """
+        deadline = time.monotonic() + timeout
+        # index -> (request id, time of the next poll, delay before that poll)
+        pending: dict[int, tuple[str, float, float]] = {}
+        for index, request in enumerate(requests):
+            if isinstance(request, str):
+                pending[index] = (request, time.monotonic() + poll_interval, poll_interval)
+                continue
+            result = _completed_result(request)
+            if result is not None:
+                yield index, result
+            else:
+                pending[index] = (request.request_id, time.monotonic() + poll_interval, poll_interval)
+        if not pending:
+            return
+
+        with worker_pool(min(max_in_flight, len(pending)), 'mercuto-poll') as executor:
+            while pending:
+                now = time.monotonic()
+                due = [index for index, (_, next_poll, _) in pending.items() if next_poll <= now]
+                if not due:
+                    if now >= deadline:
+                        raise MercutoClientException(f"Timed out waiting for {len(pending)} of {len(requests)} data requests.")
+                    time.sleep(min(min(next_poll for _, next_poll, _ in pending.values()), deadline) - now)
+                    continue
+                polls = [executor.submit(contextvars.copy_context().run, self.get_request, pending[index][0]) for index in due]
+                for index, poll in zip(due, polls):
+                    status = poll.result()
+                    result = _completed_result(status)
+                    if result is not None:
+                        del pending[index]
+                        yield index, result
+                    else:
+                        request_id, _, delay = pending[index]
+                        delay = min(delay * 2, max_poll_interval)
+                        pending[index] = (request_id, time.monotonic() + delay, delay)
+
+    def load_data_requests(
+        self,
+        requests: Sequence[DataRequestShard],
+        project: Optional[str] = None,
+        frame_format: FrameFormat = FrameFormat.SAMPLES,
+        file_format: FileFormat = FileFormat.PARQUET,
+        channel_format: ChannelFormat = ChannelFormat.CODE,
+        aggregation: Optional[AggregationOptions] = None,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        poll_interval: float = 0.25,
+        max_poll_interval: float = DEFAULT_MAX_POLL_INTERVAL,
+        timeout: float = 600
+    ) -> Iterator[tuple[int, GetStatusRequestResponse.GetDataRequestStatusCompletedResult]]:
+        """
+        Create a data request for each (channels, time window) in `requests`, such as those from `plan_data_request`,
+        and yield (index, result) pairs as they complete. See `wait_for_requests`.
+
+        Up to `max_in_flight` requests are created concurrently. Nothing is requested until iteration starts.
+        """
+        def create(request: DataRequestShard) -> GetStatusRequestResponse:
+            return self.create_request(
+                request.start_time, request.end_time, project=project, channels=request.channels, frame_format=frame_format,
+                file_format=file_format, channel_format=channel_format, aggregation=aggregation, timeout=0)
+
+        with worker_pool(max_in_flight, 'mercuto-requests') as executor:
+            created = [executor.submit(contextvars.copy_context().run, create, request) for request in requests]
+            statuses = [future.result() for future in created]
+        yield from self.wait_for_requests(statuses, poll_interval=poll_interval, max_poll_interval=max_poll_interval,
+                                          timeout=timeout, max_in_flight=max_in_flight)
+
+    def load_dataframe(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        project: Optional[str] = None,
+        channels: Optional[Collection[str]] = None,
+        classification: Optional[ChannelClassification] = None,
+        frame_format: FrameFormat = FrameFormat.SAMPLES,
+        file_format: FileFormat = FileFormat.PARQUET,
+        channel_format: ChannelFormat = ChannelFormat.CODE,
+        aggregation: Optional[AggregationOptions] = None,
+        poll_interval: float = 0.25,
+        timeout: int = 60,
+        columns: Optional[list[str]] = None,
+        cache: Optional[bool] = None
+    ) -> 'pd.DataFrame':
+        """
+        Run a data request and load its result into a DataFrame. Requires pandas and pyarrow.
+
+        The result is downloaded in chunks to a spooled temporary file rather than held as one response body,
+        and Feather results are memory mapped instead of read into memory.
+        Use `stream_dataframe` to keep peak memory bounded for results larger than memory.
+
+        :param columns: Only load these columns.
+        :param cache: Use the client's result cache (see `ResultCacheConfig`) when enabled, the default.
+            False always fetches the full range and leaves the cache untouched.
+        """
+        def fetch(fetch_start: datetime, fetch_end: datetime, fetch_columns: Optional[list[str]]) -> 'pd.DataFrame':
+            result = self.load_data_request(
+                start_time=fetch_start, end_time=fetch_end, project=project, channels=channels, classification=classification,
+                frame_format=frame_format, file_format=file_format, channel_format=channel_format, aggregation=aggregation,
+                poll_interval=poll_interval, timeout=timeout
+            )
+            with self._download_result(result.result_url) as spool:
+                return read_frame(spool, file_format.value, columns=fetch_columns)
+
+        result_cache = self._client.result_cache() if cache is not False else None
+        if result_cache is None or file_format == FileFormat.CSV:
+            return fetch(start_time, end_time, columns)
+
+        columns_format = frame_format == FrameFormat.COLUMNS
+        # Clients of other servers or identities sharing the directory may see different data for the same request.
+        key = result_key(url=self._client.url(),
+                         credentials=self._client.credentials_key() if self._client.is_logged_in() else None,
+                         project=project, channels=sorted(channels) if channels is not None else None,
+                         classification=classification.value if classification else None, frame_format=frame_format.value,
+                         file_format=file_format.value, channel_format=channel_format.value,
+                         aggregation=aggregation.model_dump(mode='json') if aggregation is not None else None)
+        # Samples newer than this may still arrive, so stored ranges end before it.
+        settled = datetime.now(timezone.utc) - timedelta(seconds=result_cache.config.settle_margin)
+        if end_time.tzinfo is None:
+            settled = settled.replace(tzinfo=None)
+
+        def store(store_start: datetime, store_end: datetime, result: 'pd.DataFrame') -> None:
+            covered_end = min(store_end, settled)
+            if covered_end <= store_start or aggregation is not None and covered_end < store_end:
+                return
+            if covered_end < store_end:
+                result = slice_frame(result, store_start, covered_end, columns_format=columns_format)
+            result_cache.put(key, store_start, covered_end, result)
+
+        cached = result_cache.get(key)
+        frame: Optional['pd.DataFrame'] = None
+        if cached is not None and ((cached.start_time, cached.end_time) == (start_time, end_time) or
+                                   aggregation is None and start_time <= cached.end_time and cached.start_time <= end_time):
+            try:
+                with open(cached.path, 'rb') as f:
+                    frame = read_frame(f, FileFormat.PARQUET.value)
+            except FileNotFoundError:
+                # Evicted by another client sharing the directory.
+                pass
+
+        if frame is None or cached is None:
+            result_cache.record(hit=False)
+            frame = fetch(start_time, end_time, None)
+            store(start_time, end_time, frame)
+        else:
+            # Only fetch what the cached range is missing at either end. Both ends are inclusive, merge_frames drops the overlap.
+            pieces = [frame]
+            if start_time < cached.start_time:
+                pieces.append(fetch(start_time, cached.start_time, None))
+            if end_time > cached.end_time:
+                pieces.append(fetch(cached.end_time, end_time, None))
+            result_cache.record(hit=True, partial=len(pieces) > 1)
+            if len(pieces) > 1:
+                frame = merge_frames(pieces, columns_format=columns_format)
+                store(min(start_time, cached.start_time), max(end_time, cached.end_time), frame)
+
+        frame = slice_frame(frame, start_time, end_time, columns_format=columns_format)
+        return frame[columns] if columns is not None else frame
+
+    def stream_dataframe(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        project: Optional[str] = None,
+        channels: Optional[Collection[str]] = None,
+        classification: Optional[ChannelClassification] = None,
+        frame_format: FrameFormat = FrameFormat.SAMPLES,
+        file_format: FileFormat = FileFormat.PARQUET,
+        channel_format: ChannelFormat = ChannelFormat.CODE,
+        aggregation: Optional[AggregationOptions] = None,
+        poll_interval: float = 0.25,
+        timeout: int = 60,
+        columns: Optional[list[str]] = None
+    ) -> Iterator['pd.DataFrame']:
+        """
+        Run a data request and yield its result piece by piece: one DataFrame per Parquet row group,
+        per Feather record batch or per 100,000 CSV rows. Requires pandas and pyarrow.
+
+        The request is only made once iteration starts. The downloaded file is kept in a spooled temporary file
+        until the generator is exhausted or closed.
+        """
+        result = self.load_data_request(
+            start_time=start_time, end_time=end_time, project=project, channels=channels, classification=classification,
+            frame_format=frame_format, file_format=file_format, channel_format=channel_format, aggregation=aggregation,
+            poll_interval=poll_interval, timeout=timeout
+        )
+        with self._download_result(result.result_url) as spool:
+            yield from iter_frames(spool, file_format.value, columns=columns)
+
+    def plan_data_request(
+        self,
+        channels: Collection[Channel],
+        start_time: datetime,
+        end_time: datetime,
+        aggregation: Optional[AggregationOptions] = None,
+        max_samples_per_request: int = DEFAULT_MAX_SAMPLES_PER_REQUEST,
+        max_channels_per_request: int = DEFAULT_MAX_CHANNELS_PER_REQUEST
+    ) -> list[DataRequestShard]:
+        """
+        Split a data request into (channel group x time window) requests, sized from each channel's sampling period
+        (or a coarser non-rolling aggregation interval) so that no request exceeds `max_samples_per_request` samples.
+        Channels without a sampling period are assumed to produce one sample a minute.
+        """
+        interval = aggregation.interval if aggregation is not None and not aggregation.rolling else None
+        return plan_shards([(channel.code, effective_period(channel.sampling_period, interval)) for channel in channels],
+                           start_time, end_time, max_samples=max_samples_per_request, max_channels=max_channels_per_request)
+
+    def load_sharded_dataframe(
+        self,
+        channels: Collection[Channel],
+        start_time: datetime,
+        end_time: datetime,
+        project: Optional[str] = None,
+        frame_format: FrameFormat = FrameFormat.SAMPLES,
+        file_format: FileFormat = FileFormat.PARQUET,
+        channel_format: ChannelFormat = ChannelFormat.CODE,
+        aggregation: Optional[AggregationOptions] = None,
+        max_samples_per_request: int = DEFAULT_MAX_SAMPLES_PER_REQUEST,
+        max_channels_per_request: int = DEFAULT_MAX_CHANNELS_PER_REQUEST,
+        max_in_flight: int = 4,
+        poll_interval: float = 0.25,
+        timeout: int = 600,
+        max_poll_interval: float = DEFAULT_MAX_POLL_INTERVAL
+    ) -> 'pd.DataFrame':
+        """
+        Load a long or wide range of data as one DataFrame, using the requests from `plan_data_request`.
+
+        Up to `max_in_flight` requests are created, polled and downloaded concurrently. Each result is downloaded
+        as soon as it is ready. Results are merged in timestamp order, dropping the duplicate samples that
+        adjacent windows return for their shared boundary. Requires pandas and pyarrow.
+
+        :param timeout: Seconds to wait for all requests to complete.
+        """
+        shards = self.plan_data_request(channels, start_time, end_time, aggregation=aggregation,
+                                        max_samples_per_request=max_samples_per_request,
+                                        max_channels_per_request=max_channels_per_request)
+
+        def download(result: GetStatusRequestResponse.GetDataRequestStatusCompletedResult) -> 'pd.DataFrame':
+            with self._download_result(result.result_url) as spool:
+                return read_frame(spool, file_format.value)
+
+        with worker_pool(max_in_flight, 'mercuto-shards') as executor:
+            completed = self.load_data_requests(
+                shards, project=project, frame_format=frame_format, file_format=file_format, channel_format=channel_format,
+                aggregation=aggregation, max_in_flight=max_in_flight, poll_interval=poll_interval,
+                max_poll_interval=max_poll_interval, timeout=timeout)
+            downloads = {index: executor.submit(contextvars.copy_context().run, download, result) for index, result in completed}
+            frames = [downloads[index].result() for index in range(len(shards))]
+        return merge_frames(frames, columns_format=frame_format == FrameFormat.COLUMNS)
+
+    def aggregate_dataframe(self, frame: 'pd.DataFrame', aggregation: AggregationOptions,
+                            timezone: Optional[str] = None) -> 'pd.DataFrame':
+        """
+        Aggregate an already downloaded, unaggregated result locally, as the server would for `aggregation`,
+        instead of running another data request. Requires pandas.
+
+        Fixed intervals are aligned like the server's buckets, 'day', 'week', 'month' and 'year' follow the wall clock
+        in `timezone` (UTC by default). Rolling windows end at, and include, each sample.
+        'greatest' is the value of largest magnitude.
+        """
+        return aggregate_frame(frame, aggregation, timezone=timezone)
 
     """
     Samples
@@ -522,36 +916,187 @@ class MercutoDataService:
     def insert_secondary_samples(
         self,
         project: str,
-        samples: Collection[SecondaryDataSample]
-    ) -> None:
+        samples: Collection[SecondarySampleLike],
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        stop_on_error: bool = True,
+        batch_size: Optional[int] = None,
+        high_water_marks: Optional[HighWaterMarks] = None
+    ) -> UploadReport[SecondarySampleLike]:
         """
-        Insert secondary samples.
+        Insert secondary samples in batches.
+        Each batch is serialized directly to JSON bytes, NaN values are sent as NaN.
+        `SecondarySample` tuples are encoded without going through pydantic.
+        The next batch is serialized while up to `max_in_flight` batches are being uploaded.
+
+        :param stop_on_error: If True, stop starting new batches after a failure and re-raise it once in-flight batches finish.
+            The report so far is attached to the exception, see `batching.upload_report`.
+            If False, attempt every batch and report failures (with their samples) in the returned report.
+        :param batch_size: Fixed number of samples per request. By default the size adapts to the observed throughput,
+            see `MercutoClient.batch_stats()`. Batches rejected as too large (413) or timing out are re-sent in halves.
+        :param high_water_marks: Skip samples at or before their channel's mark and exact duplicates, then advance the
+            marks over the uploaded samples. See `high_water_marks()`.
+        :return: Per-batch results. With `high_water_marks`, offsets refer to the samples left after skipping.
+
+        When the client has a spool (see `SpoolConfig`), the batches are written to it and this returns at once.
+        The report then covers the spooled batches, the other options are ignored and high-water marks do not advance.
         """
-        for batch in batched(samples, 5000):
-            payload = _SecondarySamplelistAdapter.dump_python(
-                list(batch), mode='json')
-            self._client.request(
-                f'{self._path}/samples/secondary', 'PUT', json=payload, params={"project": project}
-            )
-
-            # No return value, 202 accepted
+        def encode(batch: Sequence[SecondarySampleLike]) -> bytes:
+            if all(isinstance(sample, SecondaryDataSample) for sample in batch):
+                return _SecondarySamplelistAdapter.dump_json(list(batch))  # type: ignore[arg-type]
+            return encode_sample_tuples(batch)
+
+        if high_water_marks is None:
+            return self._upload_samples('secondary', project, samples, encode, max_in_flight, stop_on_error, batch_size)
+        kept = high_water_marks.filter(samples)
+        if self._client.spool() is not None:
+            # Spooled samples are not stored yet, a later insert of the same samples must not be dropped.
+            return self._upload_samples('secondary', project, kept, encode, max_in_flight, stop_on_error, batch_size)
+        try:
+            report = self._upload_samples('secondary', project, kept, encode, max_in_flight, stop_on_error, batch_size)
+        except Exception as e:
+            # Batches sent before the failure still advance the marks.
+            partial = upload_report(e)
+            if partial is not None:
+                high_water_marks.record(kept, partial)
+            raise
+        high_water_marks.record(kept, report)
+        return report
+
+    def high_water_marks(self, project: str) -> HighWaterMarks:
+        """
+        High-water marks for the secondary channels of `project`, seeded from their `last_valid_timestamp`.
+        Pass them to every `insert_secondary_samples` call for the project to skip samples the API already has.
+        """
+        marks = HighWaterMarks()
+        marks.seed(self.list_channels(project, classification=ChannelClassification.SECONDARY))
+        return marks
 
     def insert_metric_samples(
         self,
         project: str,
-        samples: Collection[MetricDataSample]
-    ) -> None:
+        samples: Collection[MetricSampleLike],
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        stop_on_error: bool = True,
+        batch_size: Optional[int] = None
+    ) -> UploadReport[MetricSampleLike]:
         """
-        Insert metric samples.
+        Insert metric samples. Batches are uploaded the same way as `insert_secondary_samples`.
         """
-        for batch in batched(samples, 5000):
-            payload = _MetricSamplelistAdapter.dump_python(
-                list(batch), mode='json')
-            self._client.request(
-                f'{self._path}/samples/metric', 'PUT', json=payload, params={"project": project}
-            )
-
-        # No return value, 202 accepted
+        def encode(batch: Sequence[MetricSampleLike]) -> bytes:
+            if all(isinstance(sample, MetricDataSample) for sample in batch):
+                return _MetricSamplelistAdapter.dump_json(list(batch))  # type: ignore[arg-type]
+            return encode_sample_tuples(batch, with_event=True)
+
+        return self._upload_samples('metric', project, samples, encode, max_in_flight, stop_on_error, batch_size)
+
+    def _upload_samples(self, kind: Literal['secondary', 'metric'], project: str, samples: Collection[_T],
+                        encode: Callable[[Sequence[_T]], bytes], max_in_flight: int, stop_on_error: bool,
+                        batch_size: Optional[int]) -> UploadReport[_T]:
+        spool = self._client.spool()
+        if spool is not None:
+            return self._spool_samples(spool, kind, project, samples, encode)
+        adaptive = self._client.batch_size(f'samples/{kind}')
+        return upload_batches(
+            batched(samples, batch_size) if batch_size is not None else adaptive.batches(samples),
+            encode,
+            lambda body: self._put_samples(kind, project, body),
+            max_in_flight=max_in_flight, stop_on_error=stop_on_error, split=is_oversized, observe=adaptive.observe)
+
+    def _spool_samples(self, spool: SampleSpool, kind: Literal['secondary', 'metric'], project: str, samples: Collection[_T],
+                       encode: Callable[[Sequence[_T]], bytes]) -> UploadReport[_T]:
+        report: UploadReport[_T] = UploadReport()
+        encoded = []
+        offset = 0
+        for index, batch in enumerate(batched(samples, spool.config.batch_size)):
+            body = encode(batch)
+            encoded.append((body, len(batch)))
+            report.batches.append(BatchResult(index=index, offset=offset, count=len(batch), nbytes=len(body)))
+            offset += len(batch)
+        spool.append(kind, project, encoded)
+        return report
+
+    def _download_result(self, url: str) -> IO[bytes]:
+        return download_result(url, verify=self._client.verify_ssl)
+
+    def _put_samples(self, kind: str, project: str, body: bytes,
+                     retry: Optional[bool] = None) -> None:
+        self._client.request(f'{self._path}/samples/{kind}', 'PUT', json=body, params={"project": project}, retry=retry)
+
+    def _put_spooled_samples(self, kind: str, project: str, body: bytes) -> None:
+        """
+        Send a request merged by the spool. Like other uploads, it is re-sent in halves when rejected as too large (413)
+        or timing out.
+        """
+        samples = json.loads(body)
+        adaptive = self._client.batch_size(f'samples/{kind}')
+        upload_batches(
+            [samples],
+            # The whole request is sent as spooled, only halves are encoded again.
+            lambda batch: body if batch is samples else json.dumps(list(batch)).encode(),
+            lambda part: self._put_samples(kind, project, part, retry=True),
+            max_in_flight=1, split=is_oversized, observe=adaptive.observe)
+
+    def insert_secondary_columns(
+        self,
+        project: str,
+        channels: StrColumn = None,
+        timestamps: TimestampColumn = None,
+        values: FloatColumn = None,
+        *,
+        frame: Any = None,
+        known_channels: Optional[Collection[str]] = None,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        stop_on_error: bool = True,
+        batch_size: Optional[int] = None
+    ) -> UploadReport[int]:
+        """
+        Insert secondary samples from parallel columns without building a model per row.
+        Every row is validated and encoded up front, then batches are uploaded the same way as `insert_secondary_samples`.
+
+        :param channels: Channel code per row, or a single code for every row.
+        :param timestamps: Timezone-aware datetimes, numpy datetime64 values (UTC) or epoch seconds.
+        :param values: Float values. NaN and infinity are sent as-is.
+        :param frame: DataFrame-like object with 'channel', 'timestamp' and 'value' columns, instead of the separate columns.
+        :param known_channels: If given, every channel code must be one of these.
+        :return: Per-batch results. The items of failed batches are row positions.
+        """
+        if frame is not None:
+            channels, timestamps, values = frame['channel'], frame['timestamp'], frame['value']
+        if channels is None or timestamps is None or values is None:
+            raise ValueError("Either channels, timestamps and values, or frame must be provided")
+        rows = encode_sample_rows(channels, timestamps, values, known_channels=known_channels)
+        return self._insert_sample_rows('secondary', project, rows, max_in_flight, stop_on_error, batch_size)
+
+    def insert_metric_columns(
+        self,
+        project: str,
+        channels: StrColumn = None,
+        timestamps: TimestampColumn = None,
+        values: FloatColumn = None,
+        events: StrColumn = None,
+        *,
+        frame: Any = None,
+        known_channels: Optional[Collection[str]] = None,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        stop_on_error: bool = True,
+        batch_size: Optional[int] = None
+    ) -> UploadReport[int]:
+        """
+        Insert metric samples from parallel columns without building a model per row.
+        Same as `insert_secondary_columns`, with an additional event code per row (or one for every row).
+        A `frame` must also have an 'event' column.
+        """
+        if frame is not None:
+            channels, timestamps, values, events = frame['channel'], frame['timestamp'], frame['value'], frame['event']
+        if channels is None or timestamps is None or values is None or events is None:
+            raise ValueError("Either channels, timestamps, values and events, or frame must be provided")
+        rows = encode_sample_rows(channels, timestamps, values, events=events, known_channels=known_channels)
+        return self._insert_sample_rows('metric', project, rows, max_in_flight, stop_on_error, batch_size)
+
+    def _insert_sample_rows(self, kind: Literal['secondary', 'metric'], project: str, rows: Sequence[str],
+                            max_in_flight: int, stop_on_error: bool, batch_size: Optional[int]) -> UploadReport[int]:
+        return self._upload_samples(kind, project, range(len(rows)), lambda positions: join_sample_rows(rows, positions),
+                                    max_in_flight, stop_on_error, batch_size)
 
     def load_secondary_samples(
         self,
@@ -563,18 +1108,28 @@ class MercutoDataService:
         """
         Load up to 100 secondary samples.
         """
-        params: PayloadType = {
-            "channels": list(channels),
-            "start_time": start_time.isoformat(),
-            "end_time": end_time.isoformat(),
-            "limit": limit
-        }
         r = self._client.request(
-            f'{self._path}/samples/secondary', 'GET', params=params
+            f'{self._path}/samples/secondary', 'GET', params=_secondary_sample_params(channels, start_time, end_time, limit)
         )
 
         return _SecondarySamplelistAdapter.validate_json(r.text)
 
+    def load_secondary_samples_compact(
+        self,
+        channels: Collection[str],
+        start_time: datetime,
+        end_time: datetime,
+        limit: int = 100
+    ) -> list[SecondarySample]:
+        """
+        Same as `load_secondary_samples`, returning `SecondarySample` tuples decoded without model validation.
+        """
+        r = self._client.request(
+            f'{self._path}/samples/secondary', 'GET', params=_secondary_sample_params(channels, start_time, end_time, limit)
+        )
+
+        return decode_sample_tuples(r.content, SecondarySample)
+
     def load_metric_samples(
         self,
         channels: Optional[Collection[str]] = None,
@@ -587,25 +1142,96 @@ class MercutoDataService:
         """
         Load up to 100 metric samples.
         """
-        params: PayloadType = {
-            "limit": limit
-        }
-        if project is not None:
-            params["project"] = project
-        if channels is not None:
-            params["channels"] = list(channels)
-        if start_time is not None:
-            params["start_time"] = start_time.isoformat()
-        if end_time is not None:
-            params["end_time"] = end_time.isoformat()
-        if events is not None:
-            params["event"] = list(events)
         r = self._client.request(
-            f'{self._path}/samples/metric', 'GET', params=params
+            f'{self._path}/samples/metric', 'GET', params=_metric_sample_params(channels, start_time, end_time, events, project, limit)
         )
 
         return _MetricSamplelistAdapter.validate_json(r.text)
 
+    def load_metric_samples_compact(
+        self,
+        channels: Optional[Collection[str]] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        events: Optional[Collection[str]] = None,
+        project: Optional[str] = None,
+        limit: int = 100
+    ) -> list[MetricSample]:
+        """
+        Same as `load_metric_samples`, returning `MetricSample` tuples decoded without model validation.
+        """
+        r = self._client.request(
+            f'{self._path}/samples/metric', 'GET', params=_metric_sample_params(channels, start_time, end_time, events, project, limit)
+        )
+
+        return decode_sample_tuples(r.content, MetricSample, with_event=True)
+
+    def iter_secondary_samples(
+        self,
+        channels: Collection[str],
+        start_time: datetime,
+        end_time: datetime,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True
+    ) -> Iterator[SecondaryDataSample]:
+        """
+        Lazily iterate over all secondary samples in [start_time, end_time], in timestamp order, one page at a time.
+        See `paginate_by_timestamp`.
+        """
+        return paginate_by_timestamp(
+            lambda cursor, limit: self.load_secondary_samples(channels, cursor or start_time, end_time, limit=limit),
+            key=lambda sample: sample.channel, start_time=start_time, page_size=page_size, prefetch=prefetch)
+
+    def iter_secondary_samples_compact(
+        self,
+        channels: Collection[str],
+        start_time: datetime,
+        end_time: datetime,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True
+    ) -> Iterator[SecondarySample]:
+        """
+        Same as `iter_secondary_samples`, yielding `SecondarySample` tuples decoded without model validation.
+        """
+        return paginate_by_timestamp(
+            lambda cursor, limit: self.load_secondary_samples_compact(channels, cursor or start_time, end_time, limit=limit),
+            key=lambda sample: sample.channel, start_time=start_time, page_size=page_size, prefetch=prefetch)
+
+    def iter_metric_samples(
+        self,
+        channels: Optional[Collection[str]] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        events: Optional[Collection[str]] = None,
+        project: Optional[str] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True
+    ) -> Iterator[MetricDataSample]:
+        """
+        Lazily iterate over all matching metric samples, in timestamp order, one page at a time.
+        See `paginate_by_timestamp`.
+        """
+        return paginate_by_timestamp(
+            lambda cursor, limit: self.load_metric_samples(channels, cursor, end_time, events, project, limit=limit),
+            key=lambda sample: (sample.channel, sample.event), start_time=start_time, page_size=page_size, prefetch=prefetch)
+
+    def iter_metric_samples_compact(
+        self,
+        channels: Optional[Collection[str]] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        events: Optional[Collection[str]] = None,
+        project: Optional[str] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True
+    ) -> Iterator[MetricSample]:
+        """
+        Same as `iter_metric_samples`, yielding `MetricSample` tuples decoded without model validation.
+        """
+        return paginate_by_timestamp(
+            lambda cursor, limit: self.load_metric_samples_compact(channels, cursor, end_time, events, project, limit=limit),
+            key=lambda sample: (sample.channel, sample.event), start_time=start_time, page_size=page_size, prefetch=prefetch)
+
     def load_metric_sample(self, channel: str, event: str) -> Optional[float]:
         """
         Load a single metric sample for a specific channel and event.
@@ -623,10 +1249,32 @@ class MercutoDataService:
 
     def upload_file(self, project: str, datatable: str, file: str | bytes | TextIO | BinaryIO,
                     filename: Optional[str] = None,
-                    timezone: Optional[str] = None) -> None:
+                    timezone: Optional[str] = None,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    header_lines: Optional[int] = None,
+                    resume_from: int = 0,
+                    on_progress: Optional[Callable[[UploadProgress], None]] = None,
+                    chunk_timeout: float = 60) -> None:
+        """
+        Upload a datatable file.
+
+        Paths, bytes and seekable binary files larger than `chunk_size` are uploaded in chunks of whole lines, each
+        starting with the file's header lines, so a failure only repeats one chunk. Every chunk is retried
+        with the client's retry policy, and `on_progress` is called after each acknowledged chunk.
+        To continue after a failure, pass the last reported `UploadProgress.offset` as `resume_from`.
+        Smaller files and text streams are uploaded in a single request.
+
+        :param header_lines: Number of header lines repeated in every chunk. By default 4 for Campbell TOA5 files,
+            2 for Worldsensing compacted and 10 for Worldsensing standard CSV files, otherwise 1.
+        :param resume_from: Offset to continue from. Only paths, bytes and seekable binary files can be resumed.
+        :param chunk_timeout: Seconds to wait for each chunk upload.
+        """
         if isinstance(file, str):
             ctx = open(file, 'rb')
             filename = filename or os.path.basename(file)
+        elif isinstance(file, bytes):
+            ctx = nullcontext(io.BytesIO(file))  # type: ignore
+            filename = filename or 'file.dat'
         else:
             ctx = nullcontext(file)  # type: ignore
             filename = filename or 'file.dat'
@@ -639,9 +1287,30 @@ class MercutoDataService:
             params["timezone"] = timezone
 
         with ctx as f:
-            self._client.request(f'{self._path}/files/upload/small', 'POST',
-                                 params=params,
-                                 files={'file': (filename, f, 'text/csv')})
+            if isinstance(f, io.TextIOBase) or not f.seekable():
+                total = None
+            else:
+                position = f.tell()
+                total = f.seek(0, os.SEEK_END)
+                f.seek(position)
+            if resume_from and total is None:
+                raise ValueError("resume_from requires a path, bytes or a seekable binary file")
+            if total is None or (total <= chunk_size and resume_from == 0):
+                self._client.request(f'{self._path}/files/upload/small', 'POST',
+                                     params=params,
+                                     files={'file': (filename, f, 'text/csv')})
+                return
+
+            header = read_header(f, header_lines if header_lines is not None else detect_header_lines(f))
+            chunks = 0
+            for offset, data in iter_chunks(f, max(resume_from, len(header)), chunk_size):
+                self._client.request(f'{self._path}/files/upload/small', 'POST',
+                                     params=params,
+                                     files={'file': (filename, header + data, 'text/csv')},
+                                     retry=True, timeout=chunk_timeout)
+                chunks += 1
+                if on_progress is not None:
+                    on_progress(UploadProgress(offset=offset, total=total, chunks=chunks))
 
     def get_latest_samples(self, project: str, include_primary: bool = True) -> list[LatestDataSample]:
         params: PayloadType = {
@@ -653,3 +1322,31 @@ class MercutoDataService:
         )
 
         return _LatestSampleListAdapter.validate_json(r.text)
+
+    def watch_latest(
+        self,
+        project: str,
+        include_primary: bool = True,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+        idle_backoff: float = DEFAULT_IDLE_BACKOFF
+    ) -> Iterator[list[LatestDataSample]]:
+        """
+        Poll `get_latest_samples` indefinitely and yield the samples whose timestamp or value changed since the
+        previous poll. The first poll yields every channel. Polls without changes are not yielded.
+
+        Polls are timed from each channel's sampling period, taken from the project's `channel_registry`, and slow down
+        while nothing changes. See `LatestSampleTracker`. Stop by closing the generator or breaking out of the loop.
+        """
+        tracker = LatestSampleTracker(min_interval=min_interval, max_interval=max_interval, idle_backoff=idle_backoff)
+        registry = self.channel_registry(project)
+
+        def sampling_period(code: str) -> Optional[timedelta]:
+            channel = registry.index().by_code.get(code)
+            return channel.sampling_period if channel is not None else None
+
+        while True:
+            changed = tracker.update(self.get_latest_samples(project, include_primary=include_primary))
+            if changed:
+                yield changed
+            time.sleep(tracker.next_delay(sampling_period))
@@ -6,8 +6,9 @@ from pydantic import Field, TypeAdapter
 if TYPE_CHECKING:
     from ..client import MercutoClient
 
+from ..instrumentation import instrumented
 from . import PayloadType
-from ._util import BaseModel
+from ._util import DEFERRED, BaseModel
 
 
 class RainflowConfiguration(BaseModel):
@@ -44,11 +45,12 @@ class Healthcheck(BaseModel):
     status: str
 
 
-_RainflowConfigurationlistAdapter = TypeAdapter(list[RainflowConfiguration])
-_FatigueConnectionlistAdapter = TypeAdapter(list[FatigueConnection])
-_ConnectionRemnantCapacitylistAdapter = TypeAdapter(list[ConnectionRemnantCapacity])
+_RainflowConfigurationlistAdapter = TypeAdapter(list[RainflowConfiguration], config=DEFERRED)
+_FatigueConnectionlistAdapter = TypeAdapter(list[FatigueConnection], config=DEFERRED)
+_ConnectionRemnantCapacitylistAdapter = TypeAdapter(list[ConnectionRemnantCapacity], config=DEFERRED)
 
 
+@instrumented('fatigue')
 class MercutoFatigueService:
     def __init__(self, client: 'MercutoClient', path: str = '/fatigue') -> None:
         self._client = client
@@ -5,8 +5,9 @@ from pydantic import TypeAdapter
 if TYPE_CHECKING:
     from ..client import MercutoClient
 
+from ..instrumentation import instrumented
 from . import PayloadType
-from ._util import BaseModel
+from ._util import DEFERRED, BaseModel
 
 
 class PermissionGroup(BaseModel):
@@ -74,12 +75,13 @@ class Healthcheck(BaseModel):
 
 
 # --- TypeAdapters for lists ---
-_PermissionGrouplistAdapter = TypeAdapter(list[PermissionGroup])
-_TenantlistAdapter = TypeAdapter(list[Tenant])
-_UserlistAdapter = TypeAdapter(list[User])
-_HiddenUserAPIKeylistAdapter = TypeAdapter(list[HiddenUserAPIKey])
+_PermissionGrouplistAdapter = TypeAdapter(list[PermissionGroup], config=DEFERRED)
+_TenantlistAdapter = TypeAdapter(list[Tenant], config=DEFERRED)
+_UserlistAdapter = TypeAdapter(list[User], config=DEFERRED)
+_HiddenUserAPIKeylistAdapter = TypeAdapter(list[HiddenUserAPIKey], config=DEFERRED)
 
 
+@instrumented('identity')
 class MercutoIdentityService:
     def __init__(self, client: 'MercutoClient', path: str = '/identity') -> None:
         self._client = client
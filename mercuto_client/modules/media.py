@@ -1,6 +1,6 @@
 import os
 from datetime import timedelta
-from typing import TYPE_CHECKING, Literal, Optional
+from typing import TYPE_CHECKING, Iterator, Literal, Optional
 
 from pydantic import TypeAdapter
 
@@ -10,8 +10,10 @@ if TYPE_CHECKING:
 from datetime import datetime
 
 from ..exceptions import MercutoHTTPException
+from ..instrumentation import instrumented
+from ..pagination import DEFAULT_PAGE_SIZE, DEFAULT_PREFETCH, paginate
 from . import PayloadType
-from ._util import BaseModel
+from ._util import DEFERRED, BaseModel
 
 CameraType = Literal['BOSCH', 'DIRECT_RTSP', 'STATIC', 'ROCKFIELD-CAMERA-SERVER-VERSION-2', 'VIDAR']
 
@@ -89,11 +91,12 @@ class Camera(BaseModel):
 
 
 # --- TypeAdapters for lists ---
-_ImagelistAdapter = TypeAdapter(list[Image])
-_VideolistAdapter = TypeAdapter(list[Video])
-_CameralistAdapter = TypeAdapter(list[Camera])
+_ImagelistAdapter = TypeAdapter(list[Image], config=DEFERRED)
+_VideolistAdapter = TypeAdapter(list[Video], config=DEFERRED)
+_CameralistAdapter = TypeAdapter(list[Camera], config=DEFERRED)
 
 
+@instrumented('media')
 class MercutoMediaService:
     def __init__(self, client: 'MercutoClient', path: str = '/media') -> None:
         self._client = client
@@ -134,6 +137,21 @@ class MercutoMediaService:
         r = self._client.request(f"{self._path}/images", "GET", params=params)
         return _ImagelistAdapter.validate_json(r.text)
 
+    def iter_images(self, project: str,
+                    camera: Optional[str] = None,
+                    event: Optional[str] = None,
+                    start_time: Optional[datetime] = None,
+                    end_time: Optional[datetime] = None,
+                    ascending: bool = True,
+                    page_size: int = DEFAULT_PAGE_SIZE,
+                    prefetch: int = DEFAULT_PREFETCH) -> Iterator[Image]:
+        """
+        Lazily iterate over all matching images, requesting up to `prefetch` pages ahead. See `paginate`.
+        """
+        return paginate(lambda limit, offset: self.list_images(project, camera=camera, event=event, start_time=start_time,
+                                                               end_time=end_time, limit=limit, offset=offset, ascending=ascending),
+                        page_size=page_size, prefetch=prefetch)
+
     def get_image(self, image_code: str) -> Image:
         r = self._client.request(f"{self._path}/images/{image_code}", "GET")
         return Image.model_validate_json(r.text)
@@ -204,6 +222,21 @@ class MercutoMediaService:
         r = self._client.request(f"{self._path}/videos", "GET", params=params)
         return _VideolistAdapter.validate_json(r.text)
 
+    def iter_videos(self, project: str,
+                    camera: Optional[str] = None,
+                    event: Optional[str] = None,
+                    start_time: Optional[datetime] = None,
+                    end_time: Optional[datetime] = None,
+                    ascending: bool = True,
+                    page_size: int = DEFAULT_PAGE_SIZE,
+                    prefetch: int = DEFAULT_PREFETCH) -> Iterator[Video]:
+        """
+        Lazily iterate over all matching videos, requesting up to `prefetch` pages ahead. See `paginate`.
+        """
+        return paginate(lambda limit, offset: self.list_videos(project, camera=camera, event=event, start_time=start_time,
+                                                               end_time=end_time, limit=limit, offset=offset, ascending=ascending),
+                        page_size=page_size, prefetch=prefetch)
+
     def get_video(self, video_code: str) -> Video:
         r = self._client.request(f"{self._path}/videos/{video_code}", "GET")
         return Video.model_validate_json(r.text)
@@ -5,7 +5,8 @@ from pydantic import TypeAdapter
 if TYPE_CHECKING:
     from ..client import MercutoClient
 
-from ._util import BaseModel
+from ..instrumentation import instrumented
+from ._util import DEFERRED, BaseModel
 
 ContactMethod = Literal['EMAIL', 'SMS']
 
@@ -31,9 +32,10 @@ class Healthcheck(BaseModel):
 
 
 # --- TypeAdapters for lists ---
-_ContactGroupListAdapter = TypeAdapter(list[ContactGroup])
+_ContactGroupListAdapter = TypeAdapter(list[ContactGroup], config=DEFERRED)
 
 
+@instrumented('notifications')
 class MercutoNotificationService:
     def __init__(self, client: 'MercutoClient', path: str = '/notifications') -> None:
         self._client = client
@@ -5,8 +5,9 @@ from typing import (TYPE_CHECKING, BinaryIO, Literal, Optional, Protocol,
 from pydantic import AwareDatetime, TypeAdapter
 
 from ..exceptions import MercutoHTTPException
+from ..instrumentation import instrumented
 from . import PayloadType
-from ._util import BaseModel
+from ._util import DEFERRED, BaseModel
 
 if TYPE_CHECKING:
     from ..client import MercutoClient
@@ -51,8 +52,8 @@ class Healthcheck(BaseModel):
     status: str
 
 
-_ReportConfigurationListAdapter = TypeAdapter(list[ReportConfiguration])
-_ReportLogListAdapter = TypeAdapter(list[ReportLog])
+_ReportConfigurationListAdapter = TypeAdapter(list[ReportConfiguration], config=DEFERRED)
+_ReportLogListAdapter = TypeAdapter(list[ReportLog], config=DEFERRED)
 
 """
 The below types are used for defining report generation functions.
@@ -91,6 +92,7 @@ class ReportHandler(Protocol):
         ...
 
 
+@instrumented('reports')
 class MercutoReportService:
     def __init__(self, client: 'MercutoClient', path: str = '/reports') -> None:
         self._client = client
@@ -0,0 +1,136 @@
+import collections
+import concurrent.futures
+import contextvars
+from datetime import datetime
+from typing import (Callable, Hashable, Iterator, Optional, Protocol, Sequence,
+                    TypeVar)
+
+from ._workers import worker_pool
+
+_T = TypeVar('_T')
+
+
+class _Timestamped(Protocol):
+    @property
+    def timestamp(self) -> datetime: ...
+
+
+_S = TypeVar('_S', bound=_Timestamped)
+
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_PREFETCH = 2
+DEFAULT_MAX_IN_FLIGHT = 4
+
+
+def paginate(fetch_page: Callable[[int, int], Sequence[_T]],
+             page_size: int = DEFAULT_PAGE_SIZE,
+             prefetch: int = DEFAULT_PREFETCH,
+             max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+             offset: int = 0) -> Iterator[_T]:
+    """
+    Lazily iterate over every item of a limit/offset paged endpoint.
+
+    The first page is fetched on its own. If it is full, up to `prefetch` following pages are requested
+    in the background while the caller consumes the current one, with at most `max_in_flight` requests running at once.
+    Iteration stops at the first page shorter than `page_size`. Pages already requested past that point are discarded.
+
+    :param fetch_page: Called with (limit, offset) and returns one page of items.
+    :param page_size: Number of items requested per page.
+    :param prefetch: Number of pages to request ahead of the page being consumed. 0 fetches sequentially.
+    :param max_in_flight: Maximum number of page requests running concurrently.
+    :param offset: Offset of the first item.
+    """
+    if page_size < 1:
+        raise ValueError("page_size must be at least 1")
+    if prefetch < 0:
+        raise ValueError("prefetch must not be negative")
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be at least 1")
+
+    page = fetch_page(page_size, offset)
+    yield from page
+    if len(page) < page_size:
+        return
+    offset += page_size
+
+    if prefetch == 0:
+        while True:
+            page = fetch_page(page_size, offset)
+            yield from page
+            if len(page) < page_size:
+                return
+            offset += page_size
+
+    executor = worker_pool(min(max_in_flight, prefetch + 1), 'mercuto-paginate')
+    pending: collections.deque[concurrent.futures.Future[Sequence[_T]]] = collections.deque()
+    try:
+        for _ in range(prefetch + 1):
+            pending.append(executor.submit(contextvars.copy_context().run, fetch_page, page_size, offset))
+            offset += page_size
+        while pending:
+            page = pending.popleft().result()
+            if len(page) < page_size:
+                yield from page
+                return
+            # Keep the window full while the caller works through this page.
+            pending.append(executor.submit(contextvars.copy_context().run, fetch_page, page_size, offset))
+            offset += page_size
+            yield from page
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def paginate_by_timestamp(fetch_page: Callable[[Optional[datetime], int], Sequence[_S]],
+                          key: Callable[[_S], Hashable],
+                          start_time: Optional[datetime] = None,
+                          page_size: int = DEFAULT_PAGE_SIZE,
+                          prefetch: bool = True) -> Iterator[_S]:
+    """
+    Lazily iterate over an endpoint that returns the first `limit` samples at or after a start time, in timestamp order.
+
+    Pages are requested from a (timestamp, key) cursor: the timestamp of the last sample yielded and the keys of the
+    samples yielded at that timestamp. Each page starts at the cursor timestamp with its limit raised by the number of
+    those samples, which are skipped, so samples sharing a timestamp across a page boundary are neither lost nor repeated
+    even when more than `page_size` of them share one timestamp.
+    Iteration stops at the first page shorter than its limit. Memory use does not grow with the length of the range.
+
+    :param fetch_page: Called with (start time, limit) and returns one page of samples.
+    :param key: Identifies a sample among those sharing its timestamp, such as its channel.
+    :param start_time: Start of the range, None for the endpoint's default.
+    :param page_size: Number of samples requested per page.
+    :param prefetch: Request the next page in the background as soon as the current one arrives,
+        while the caller consumes it.
+    """
+    if page_size < 1:
+        raise ValueError("page_size must be at least 1")
+
+    executor = worker_pool(1, 'mercuto-paginate') if prefetch else None
+
+    def request(cursor: Optional[datetime], limit: int) -> Callable[[], Sequence[_S]]:
+        if executor is None:
+            return lambda: fetch_page(cursor, limit)
+        return executor.submit(contextvars.copy_context().run, fetch_page, cursor, limit).result
+
+    cursor = start_time
+    seen: set[Hashable] = set()
+    limit = page_size
+    page = request(cursor, limit)
+    try:
+        while True:
+            samples = page()
+            new = [sample for sample in samples if sample.timestamp != cursor or key(sample) not in seen]
+            if len(samples) < limit or not new:
+                yield from new
+                return
+            last = new[-1].timestamp
+            if last != cursor:
+                cursor, seen = last, set()
+            seen.update(key(sample) for sample in new if sample.timestamp == last)
+            limit = page_size + len(seen)
+            page = request(cursor, limit)
+            yield from new
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
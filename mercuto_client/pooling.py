@@ -0,0 +1,188 @@
+import logging
+import socket
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPConnectionPool, HTTPSConnectionPool, PoolManager
+from urllib3.connection import HTTPConnection
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    """
+    Connection pool settings applied to the `requests.Session` used by `MercutoClient`.
+
+    :param max_hosts: Number of per-host connection pools to keep. Only matters when talking to several hosts
+        (e.g. the API and presigned storage URLs).
+    :param max_per_host: Maximum number of idle connections kept per host. Set this to at least the number of
+        threads sharing the client, otherwise connections are discarded after each request and new TLS
+        handshakes are needed.
+    :param block: If True, never open more than `max_per_host` connections to a host and wait for a free one instead.
+    :param idle_timeout: Seconds without any requests after which pooled connections are closed rather than reused.
+        Avoids reusing connections that a proxy or NAT has silently dropped. None keeps connections forever.
+    :param tcp_keepalive: Enable TCP keep-alive probes on new connections.
+    :param tcp_keepalive_idle: Seconds of inactivity before keep-alive probes are sent.
+    :param tcp_keepalive_interval: Seconds between keep-alive probes.
+    :param warm_connections: Number of connections to open to the API when `MercutoClient.login()` is called.
+    """
+    max_hosts: int = 10
+    max_per_host: int = 10
+    block: bool = False
+    idle_timeout: Optional[float] = None
+    tcp_keepalive: bool = False
+    tcp_keepalive_idle: int = 60
+    tcp_keepalive_interval: int = 10
+    warm_connections: int = 0
+
+    def socket_options(self) -> list[tuple[int, int, int]]:
+        options: list[tuple[int, int, int]] = list(HTTPConnection.default_socket_options)
+        if not self.tcp_keepalive:
+            return options
+        options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+        if hasattr(socket, 'TCP_KEEPIDLE'):
+            options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, self.tcp_keepalive_idle))
+        elif hasattr(socket, 'TCP_KEEPALIVE'):
+            # macOS
+            options.append((socket.IPPROTO_TCP, socket.TCP_KEEPALIVE, self.tcp_keepalive_idle))
+        if hasattr(socket, 'TCP_KEEPINTVL'):
+            options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, self.tcp_keepalive_interval))
+        return options
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    """
+    Snapshot of connection pool usage.
+
+    :param requests: Number of times a connection was taken from the pool.
+    :param new_connections: Number of connections opened (pool misses).
+    :param discarded: Number of connections closed because the pool was full.
+    :param idle_expiries: Number of times the pool was flushed due to `PoolConfig.idle_timeout`.
+    """
+    requests: int = 0
+    new_connections: int = 0
+    discarded: int = 0
+    idle_expiries: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.requests - self.new_connections
+
+    @property
+    def misses(self) -> int:
+        return self.new_connections
+
+
+class _PoolStatsCounter:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts = {'requests': 0, 'new_connections': 0, 'discarded': 0, 'idle_expiries': 0}
+
+    def record(self, name: str) -> None:
+        with self._lock:
+            self._counts[name] += 1
+
+    def snapshot(self) -> PoolStats:
+        with self._lock:
+            return PoolStats(**self._counts)
+
+
+class _CountingPoolMixin:
+    _mercuto_stats: _PoolStatsCounter
+
+    def _get_conn(self, timeout: Optional[float] = None) -> Any:
+        self._mercuto_stats.record('requests')
+        return super()._get_conn(timeout)  # type: ignore[misc]
+
+    def _new_conn(self) -> Any:
+        self._mercuto_stats.record('new_connections')
+        return super()._new_conn()  # type: ignore[misc]
+
+    def _put_conn(self, conn: Any) -> None:
+        pool = getattr(self, 'pool', None)
+        if conn is not None and pool is not None and pool.full():
+            self._mercuto_stats.record('discarded')
+        super()._put_conn(conn)  # type: ignore[misc]
+
+
+class _CountingHTTPConnectionPool(_CountingPoolMixin, HTTPConnectionPool):
+    pass
+
+
+class _CountingHTTPSConnectionPool(_CountingPoolMixin, HTTPSConnectionPool):
+    pass
+
+
+class _CountingPoolManager(PoolManager):
+    def __init__(self, stats: _PoolStatsCounter, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._mercuto_stats = stats
+        self.pool_classes_by_scheme = {'http': _CountingHTTPConnectionPool,
+                                       'https': _CountingHTTPSConnectionPool}
+
+    def _new_pool(self, scheme: str, host: str, port: int, request_context: Optional[dict[str, Any]] = None) -> HTTPConnectionPool:
+        pool = super()._new_pool(scheme, host, port, request_context=request_context)
+        pool._mercuto_stats = self._mercuto_stats  # type: ignore[attr-defined]
+        return pool
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    `requests` transport adapter that applies a `PoolConfig` and records pool hits and misses.
+    """
+
+    def __init__(self, config: Optional[PoolConfig] = None) -> None:
+        self.pool_config = config if config is not None else PoolConfig()
+        self._stats = _PoolStatsCounter()
+        self._activity_lock = threading.Lock()
+        self._in_flight = 0
+        self._last_used: Optional[float] = None
+        super().__init__(pool_connections=self.pool_config.max_hosts,
+                         pool_maxsize=self.pool_config.max_per_host,
+                         pool_block=self.pool_config.block)
+
+    def init_poolmanager(self, connections: int, maxsize: int, block: bool = False, **pool_kwargs: Any) -> None:
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+        pool_kwargs.setdefault('socket_options', self.pool_config.socket_options())
+        self.poolmanager = _CountingPoolManager(self._stats, num_pools=connections, maxsize=maxsize,
+                                                block=block, **pool_kwargs)
+
+    def _expire_idle_connections(self) -> None:
+        idle_timeout = self.pool_config.idle_timeout
+        with self._activity_lock:
+            if (idle_timeout is not None and self._in_flight == 0 and self._last_used is not None
+                    and time.monotonic() - self._last_used > idle_timeout):
+                logger.debug("Connection pool idle for more than %.1f seconds, closing pooled connections", idle_timeout)
+                self.poolmanager.clear()
+                self._stats.record('idle_expiries')
+            self._in_flight += 1
+
+    def send(self, request: requests.PreparedRequest, *args: Any, **kwargs: Any) -> requests.Response:
+        self._expire_idle_connections()
+        try:
+            return super().send(request, *args, **kwargs)
+        finally:
+            with self._activity_lock:
+                self._in_flight -= 1
+                self._last_used = time.monotonic()
+
+    def stats(self) -> PoolStats:
+        return self._stats.snapshot()
+
+
+def mount_pooled_adapter(session: requests.Session, config: Optional[PoolConfig] = None) -> PooledHTTPAdapter:
+    """
+    Mount a `PooledHTTPAdapter` on the session for both http and https URLs.
+    """
+    adapter = PooledHTTPAdapter(config)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return adapter
@@ -0,0 +1,183 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import (TYPE_CHECKING, Callable, Hashable, Iterable, Optional,
+                    TypeVar)
+
+if TYPE_CHECKING:
+    from .modules.data import Channel, ChannelClassification, Datatable
+
+DEFAULT_TTL = 300.0
+# A lookup miss reloads the project at most this often, so repeated unknown labels do not hammer the API.
+DEFAULT_MISS_REFRESH_INTERVAL = 10.0
+
+_K = TypeVar('_K', bound=Hashable)
+
+ChannelLoader = Callable[[], tuple[list['Channel'], list['Datatable']]]
+
+
+def _group(channels: Iterable['Channel'], key: Callable[['Channel'], Optional[_K]]) -> dict[_K, tuple['Channel', ...]]:
+    groups: dict[_K, list['Channel']] = {}
+    for channel in channels:
+        value = key(channel)
+        if value is not None:
+            groups.setdefault(value, []).append(channel)
+    return {value: tuple(group) for value, group in groups.items()}
+
+
+@dataclass(frozen=True)
+class ChannelIndex:
+    """
+    Snapshot of a project's channels and datatables, indexed for constant time lookups. Never modified once built.
+
+    :param loaded_at: `time.monotonic()` when the snapshot was loaded.
+    :param by_column: Channel of each (datatable code, column label).
+    """
+    channels: tuple['Channel', ...]
+    datatables: tuple['Datatable', ...]
+    loaded_at: float
+    by_code: dict[str, 'Channel']
+    by_label: dict[str, tuple['Channel', ...]]
+    by_column: dict[tuple[str, str], 'Channel']
+    by_classification: dict['ChannelClassification', tuple['Channel', ...]]
+    by_metric: dict[str, tuple['Channel', ...]]
+    by_aggregate: dict[str, tuple['Channel', ...]]
+    datatables_by_code: dict[str, 'Datatable']
+
+    @classmethod
+    def build(cls, channels: Iterable['Channel'], datatables: Iterable['Datatable'], loaded_at: float) -> 'ChannelIndex':
+        channels, datatables = tuple(channels), tuple(datatables)
+        by_code = {channel.code: channel for channel in channels}
+        return cls(
+            channels=channels,
+            datatables=datatables,
+            loaded_at=loaded_at,
+            by_code=by_code,
+            by_label=_group(channels, lambda channel: channel.label),
+            by_column={(datatable.code, column.column_label): by_code[column.channel]
+                       for datatable in datatables for column in datatable.columns if column.channel in by_code},
+            by_classification=_group(channels, lambda channel: channel.classification),
+            by_metric=_group(channels, lambda channel: channel.metric),
+            by_aggregate=_group(channels, lambda channel: channel.aggregate),
+            datatables_by_code={datatable.code: datatable for datatable in datatables},
+        )
+
+    def age(self) -> float:
+        return time.monotonic() - self.loaded_at
+
+
+class ChannelIndexStore:
+    """
+    Latest `ChannelIndex` of each project, shared by a client and its copies. Thread safe.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._indexes: dict[str, ChannelIndex] = {}
+        self._load_locks: dict[str, threading.Lock] = {}
+
+    def get(self, project: str) -> Optional[ChannelIndex]:
+        with self._lock:
+            return self._indexes.get(project)
+
+    def refresh(self, project: str, load: ChannelLoader, max_age: float) -> ChannelIndex:
+        """
+        Load a new index for `project` unless the current one is younger than `max_age` seconds.
+        Concurrent refreshes of the same project share a single load.
+        """
+        with self._lock:
+            load_lock = self._load_locks.setdefault(project, threading.Lock())
+        with load_lock:
+            current = self.get(project)
+            if current is not None and current.age() < max_age:
+                return current
+            channels, datatables = load()
+            index = ChannelIndex.build(channels, datatables, time.monotonic())
+            with self._lock:
+                self._indexes[project] = index
+            return index
+
+    def invalidate(self, project: Optional[str] = None) -> None:
+        """
+        Drop the index of `project`, or of every project when None, so the next lookup reloads it.
+        """
+        with self._lock:
+            if project is None:
+                self._indexes.clear()
+            else:
+                self._indexes.pop(project, None)
+
+
+class ChannelRegistry:
+    """
+    Constant time lookups of a project's channels by code, label, datatable column, classification, metric and aggregate,
+    backed by a snapshot of `list_channels` and `list_datatables`. Create with `MercutoDataService.channel_registry`.
+
+    Snapshots are shared by a client and its copies, and reloaded through the client that created this registry when
+    older than `ttl` seconds. A lookup of an unknown code, label or column reloads the snapshot first if it is older than
+    `miss_refresh_interval` seconds, to pick up channels created since.
+    """
+
+    def __init__(self, project: str, load: ChannelLoader, store: ChannelIndexStore,
+                 ttl: float = DEFAULT_TTL, miss_refresh_interval: float = DEFAULT_MISS_REFRESH_INTERVAL) -> None:
+        self.project = project
+        self.ttl = ttl
+        self.miss_refresh_interval = miss_refresh_interval
+        self._load = load
+        self._store = store
+
+    def index(self) -> ChannelIndex:
+        """
+        The current snapshot, reloaded first if missing or older than `ttl`.
+        """
+        current = self._store.get(self.project)
+        if current is not None and current.age() < self.ttl:
+            return current
+        return self._store.refresh(self.project, self._load, max_age=self.ttl)
+
+    def refresh(self) -> ChannelIndex:
+        """
+        Reload the snapshot now.
+        """
+        return self._store.refresh(self.project, self._load, max_age=0)
+
+    def _lookup(self, find: Callable[[ChannelIndex], Optional['Channel']]) -> Optional['Channel']:
+        found = find(self.index())
+        if found is None:
+            found = find(self._store.refresh(self.project, self._load, max_age=self.miss_refresh_interval))
+        return found
+
+    def get(self, code: str) -> Optional['Channel']:
+        return self._lookup(lambda index: index.by_code.get(code))
+
+    def get_by_label(self, label: str, classification: Optional['ChannelClassification'] = None) -> Optional['Channel']:
+        """
+        The channel labelled `label`, limited to `classification` when given. Labels are not unique across classifications.
+        """
+        def find(index: ChannelIndex) -> Optional['Channel']:
+            for channel in index.by_label.get(label, ()):
+                if classification is None or channel.classification == classification:
+                    return channel
+            return None
+        return self._lookup(find)
+
+    def get_by_column(self, datatable: str, column_label: str) -> Optional['Channel']:
+        """
+        The channel fed by column `column_label` of the datatable with code `datatable`.
+        """
+        return self._lookup(lambda index: index.by_column.get((datatable, column_label)))
+
+    def with_classification(self, classification: 'ChannelClassification') -> tuple['Channel', ...]:
+        return self.index().by_classification.get(classification, ())
+
+    def with_metric(self, metric: str) -> tuple['Channel', ...]:
+        return self.index().by_metric.get(metric, ())
+
+    def with_aggregate(self, aggregate: str) -> tuple['Channel', ...]:
+        return self.index().by_aggregate.get(aggregate, ())
+
+    def channels(self) -> tuple['Channel', ...]:
+        return self.index().channels
+
+    def datatables(self) -> tuple['Datatable', ...]:
+        return self.index().datatables
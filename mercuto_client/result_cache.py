@@ -0,0 +1,216 @@
+import contextlib
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Iterator, Optional
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+_INDEX = 'index.json'
+_INDEX_LOCK = 'index.lock'
+
+
+def default_directory() -> str:
+    return os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache')), 'mercuto', 'results')
+
+
+@dataclass(frozen=True)
+class ResultCacheConfig:
+    """
+    On-disk cache for data request results loaded with `MercutoDataService.load_dataframe`.
+
+    Results are keyed by API URL, credentials, project, channels, classification, frame/file/channel format and aggregation,
+    and cover a time range. Several processes may share the directory.
+    A request overlapping a cached range only fetches the missing head and tail from the API and stitches them in.
+    Results with an aggregation (including rolling windows) are only reused for exactly the same range, as aggregates
+    depend on the range they were computed over.
+
+    :param directory: Where results are stored. Defaults to `$XDG_CACHE_HOME/mercuto/results`.
+    :param max_bytes: Total size of stored results. The least recently used results are deleted first.
+    :param settle_margin: Seconds during which samples may still arrive late. A stored range ends at most this long before
+        it was fetched, so later samples are fetched again. Aggregated results reaching into it are not stored.
+    """
+    directory: str = ''
+    max_bytes: int = 2 * 1024 ** 3
+    settle_margin: float = 300.0
+
+    def __post_init__(self) -> None:
+        if self.max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1")
+        if self.settle_margin < 0:
+            raise ValueError("settle_margin must not be negative")
+        if not self.directory:
+            object.__setattr__(self, 'directory', default_directory())
+
+
+@dataclass(frozen=True)
+class ResultCacheStats:
+    """
+    Snapshot of result cache activity in this process.
+
+    :param hits: Requests answered entirely from the cache.
+    :param partial_hits: Requests that reused a cached range and fetched only the missing head and/or tail.
+    :param misses: Requests fetched in full.
+    :param evictions: Results deleted to stay within `max_bytes`.
+    :param entries: Number of stored results.
+    :param size: Total size of stored results in bytes.
+    """
+    hits: int = 0
+    partial_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    size: int = 0
+
+
+@dataclass(frozen=True)
+class CachedRange:
+    path: str
+    start_time: datetime
+    end_time: datetime
+
+
+def result_key(**parameters: Any) -> str:
+    """
+    Stable key for the request parameters that determine the content of a result, apart from its time range.
+    """
+    encoded = json.dumps(parameters, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()[:32]
+
+
+@contextlib.contextmanager
+def _file_lock(path: str) -> Iterator[None]:
+    """
+    Exclusive lock on `path` held across processes, created if missing.
+    """
+    with open(path, 'a+b') as f:
+        if sys.platform == 'win32':
+            import msvcrt
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK gives up after 10 seconds.
+                    pass
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+class ResultCache:
+    """
+    Size-bounded LRU store of result frames as Parquet files, with a JSON index. Thread safe, and safe to share a
+    directory between processes: index updates hold a lock file in the directory.
+    Files and the index are replaced atomically, so a crash never leaves a half-written result behind.
+    """
+
+    def __init__(self, config: ResultCacheConfig) -> None:
+        self.config = config
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._partial_hits = 0
+        self._misses = 0
+        self._evictions = 0
+        os.makedirs(config.directory, exist_ok=True)
+
+    def _index_path(self) -> str:
+        return os.path.join(self.config.directory, _INDEX)
+
+    @contextlib.contextmanager
+    def _locked(self) -> Iterator[None]:
+        # The file lock serialises processes sharing the directory, the thread lock the threads of this one.
+        with self._lock, _file_lock(os.path.join(self.config.directory, _INDEX_LOCK)):
+            yield
+
+    def _read_index(self) -> dict[str, dict[str, Any]]:
+        try:
+            with open(self._index_path(), 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write_index(self, index: dict[str, dict[str, Any]]) -> None:
+        temp = f'{self._index_path()}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(temp, 'w') as f:
+            json.dump(index, f)
+        os.replace(temp, self._index_path())
+
+    def get(self, key: str) -> Optional[CachedRange]:
+        with self._locked():
+            index = self._read_index()
+            entry = index.get(key)
+            if entry is None or not os.path.exists(os.path.join(self.config.directory, entry['file'])):
+                return None
+            entry['used_at'] = time.time()
+            self._write_index(index)
+            return CachedRange(os.path.join(self.config.directory, entry['file']),
+                               datetime.fromisoformat(entry['start_time']), datetime.fromisoformat(entry['end_time']))
+
+    def record(self, hit: bool, partial: bool = False) -> None:
+        with self._lock:
+            if hit and partial:
+                self._partial_hits += 1
+            elif hit:
+                self._hits += 1
+            else:
+                self._misses += 1
+
+    def put(self, key: str, start_time: datetime, end_time: datetime, frame: 'pd.DataFrame') -> None:
+        filename = f'{key}.{int(time.time() * 1e6)}.parquet'
+        path = os.path.join(self.config.directory, filename)
+        temp = f'{path}.tmp'
+        frame.to_parquet(temp)
+        os.replace(temp, path)
+        size = os.path.getsize(path)
+        with self._locked():
+            index = self._read_index()
+            previous = index.get(key)
+            index[key] = {'file': filename, 'start_time': start_time.isoformat(), 'end_time': end_time.isoformat(),
+                          'size': size, 'used_at': time.time()}
+            if previous is not None and previous['file'] != filename:
+                self._remove(previous['file'])
+            total = sum(entry['size'] for entry in index.values())
+            for old_key, entry in sorted(index.items(), key=lambda item: item[1]['used_at']):
+                if total <= self.config.max_bytes or old_key == key:
+                    continue
+                self._remove(entry['file'])
+                del index[old_key]
+                total -= entry['size']
+                self._evictions += 1
+            self._write_index(index)
+
+    def _remove(self, filename: str) -> None:
+        try:
+            os.remove(os.path.join(self.config.directory, filename))
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        with self._locked():
+            for entry in self._read_index().values():
+                self._remove(entry['file'])
+            self._write_index({})
+
+    def stats(self) -> ResultCacheStats:
+        with self._lock:
+            index = self._read_index()
+            return ResultCacheStats(hits=self._hits, partial_hits=self._partial_hits, misses=self._misses,
+                                    evictions=self._evictions, entries=len(index),
+                                    size=sum(entry['size'] for entry in index.values()))
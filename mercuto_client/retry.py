@@ -0,0 +1,183 @@
+import email.utils
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Mapping, Optional
+
+import requests
+
+# Sample inserts are keyed on (channel, timestamp) server side, so re-sending a batch is harmless.
+DEFAULT_IDEMPOTENT_ROUTES: frozenset[tuple[str, str]] = frozenset({
+    ('PUT', r'/samples/(secondary|metric)$'),
+})
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Controls how `MercutoClient` retries transient failures.
+
+    Only idempotent requests are retried on a retryable status code or a read timeout/connection error:
+    any method in `idempotent_methods`, or a (method, path regex) pair in `idempotent_routes`.
+    Requests that failed to connect (`requests.ConnectTimeout`) never reached the server and are retried for any method.
+    File bodies are rewound, or read into memory when they cannot seek, so every attempt sends them in full.
+
+    :param max_attempts: Total number of attempts, including the first. 1 disables retries.
+    :param backoff_base: Delay in seconds before the first retry. Doubles for every further retry.
+    :param backoff_max: Upper bound on the delay between attempts, including delays requested with Retry-After.
+    :param jitter: Randomise each delay uniformly between 0 and the computed backoff ("full jitter").
+    :param retry_statuses: HTTP status codes that are considered transient.
+    :param respect_retry_after: Wait for the duration given in a Retry-After response header when present.
+    """
+    max_attempts: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 30.0
+    jitter: bool = True
+    retry_statuses: frozenset[int] = frozenset({429, 502, 503, 504})
+    idempotent_methods: frozenset[str] = frozenset({'GET', 'HEAD', 'OPTIONS'})
+    idempotent_routes: frozenset[tuple[str, str]] = DEFAULT_IDEMPOTENT_ROUTES
+    respect_retry_after: bool = True
+    _compiled_routes: tuple[tuple[str, 're.Pattern[str]'], ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        object.__setattr__(self, '_compiled_routes',
+                           tuple((method.upper(), re.compile(pattern)) for method, pattern in self.idempotent_routes))
+
+    def is_idempotent(self, method: str, path: str) -> bool:
+        method = method.upper()
+        if method in self.idempotent_methods:
+            return True
+        return any(method == m and pattern.search(path) for m, pattern in self._compiled_routes)
+
+    def should_retry_exception(self, exc: Exception, idempotent: bool) -> bool:
+        if isinstance(exc, requests.ConnectTimeout):
+            return True
+        return idempotent and isinstance(exc, (requests.ConnectionError, requests.Timeout))
+
+    def should_retry_status(self, status_code: int, idempotent: bool) -> bool:
+        return idempotent and status_code in self.retry_statuses
+
+    def backoff(self, retry_number: int) -> float:
+        """
+        Delay before retry number `retry_number` (starting at 1).
+        """
+        delay = min(self.backoff_max, self.backoff_base * (2 ** (retry_number - 1)))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    def retry_after(self, response: requests.Response) -> Optional[float]:
+        """
+        Delay requested by the server through the Retry-After header, capped at `backoff_max`.
+        """
+        if not self.respect_retry_after:
+            return None
+        value = response.headers.get('Retry-After')
+        if value is None:
+            return None
+        value = value.strip()
+        if value.isdigit():
+            delay = float(value)
+        else:
+            try:
+                when = email.utils.parsedate_to_datetime(value)
+            except (TypeError, ValueError):
+                return None
+            if when.tzinfo is None:
+                when = when.replace(tzinfo=timezone.utc)
+            delay = (when - datetime.now(timezone.utc)).total_seconds()
+        return min(self.backoff_max, max(0.0, delay))
+
+
+NO_RETRY = RetryPolicy(max_attempts=1)
+
+
+@dataclass(frozen=True)
+class RetryStats:
+    """
+    Snapshot of retry activity for a client.
+
+    :param requests: Number of logical requests made (each may span several attempts).
+    :param retries: Number of additional attempts made after a transient failure.
+    :param exhausted: Number of requests that still failed after using all attempts.
+    :param by_status: Number of retries triggered per HTTP status code. Exceptions are counted under 0.
+    """
+    requests: int = 0
+    retries: int = 0
+    exhausted: int = 0
+    by_status: dict[int, int] = field(default_factory=dict)
+
+
+class RetryCounter:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._retries = 0
+        self._exhausted = 0
+        self._by_status: dict[int, int] = {}
+
+    def record_request(self) -> None:
+        with self._lock:
+            self._requests += 1
+
+    def record_retry(self, status_code: int) -> None:
+        with self._lock:
+            self._retries += 1
+            self._by_status[status_code] = self._by_status.get(status_code, 0) + 1
+
+    def record_exhausted(self) -> None:
+        with self._lock:
+            self._exhausted += 1
+
+    def snapshot(self) -> RetryStats:
+        with self._lock:
+            return RetryStats(requests=self._requests, retries=self._retries,
+                              exhausted=self._exhausted, by_status=dict(self._by_status))
+
+
+def replayable_body(kwargs: dict[str, Any]) -> Callable[[], None]:
+    """
+    Make the file objects in the `files` and `data` of request `kwargs` safe to send more than once. Seekable files are
+    left in place and the returned function seeks them back to their current position, others are read into memory.
+    Call it before every retry, as a stream read by the first attempt would otherwise be sent empty.
+    """
+    positions: list[tuple[Any, int]] = []
+
+    def replayable(value: Any, name: str) -> Any:
+        if not hasattr(value, 'read'):
+            return value
+        if hasattr(value, 'seekable') and value.seekable():
+            positions.append((value, value.tell()))
+            return value
+        # requests takes the file name from the file object, keep it with the contents.
+        return (requests.utils.guess_filename(value) or name, value.read())
+
+    files = kwargs.get('files')
+    if files:
+        rebuilt = []
+        for name, value in (files.items() if isinstance(files, Mapping) else files):
+            if isinstance(value, tuple):
+                contents = replayable(value[1], name)
+                value = (value[0], contents[1] if isinstance(contents, tuple) else contents, *value[2:])
+            else:
+                value = replayable(value, name)
+            rebuilt.append((name, value))
+        kwargs['files'] = dict(rebuilt) if isinstance(files, Mapping) else rebuilt
+    if kwargs.get('data') is not None:
+        data = replayable(kwargs['data'], 'data')
+        kwargs['data'] = data[1] if isinstance(data, tuple) else data
+
+    def rewind() -> None:
+        for f, position in positions:
+            f.seek(position)
+    return rewind
+
+
+def sleep(seconds: float) -> None:
+    # Indirection so tests can skip real waits.
+    time.sleep(seconds)
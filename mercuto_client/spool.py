@@ -0,0 +1,323 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional
+
+from ._workers import mark_worker_thread
+from .exceptions import MercutoHTTPException
+
+logger = logging.getLogger(__name__)
+
+# Client errors that say nothing about the samples themselves: the spool keeps them and tries again later.
+# Requests too large for the API (413) are re-sent in halves by the sender instead.
+_TRANSIENT_CLIENT_ERRORS = frozenset({401, 403, 408, 413, 429})
+
+
+def default_path(url: str) -> str:
+    # One database per API, so clients of different deployments never share one.
+    name = hashlib.sha256(url.encode()).hexdigest()[:16]
+    return os.path.join(os.environ.get('XDG_STATE_HOME', os.path.expanduser('~/.local/state')), 'mercuto', f'spool-{name}.sqlite3')
+
+
+@dataclass(frozen=True)
+class SpoolConfig:
+    """
+    Local write-ahead spool for sample inserts.
+
+    With a spool, `insert_secondary_samples`, `insert_metric_samples` and the columnar inserts append the encoded samples
+    to an SQLite database and return at once. A background thread sends them to the API in order, merging consecutive
+    inserts for the same project into requests of up to `batch_size` samples, and retries with exponential backoff while
+    the API is unreachable.
+
+    Every insert is stored with the API URL and (a hash of) the credentials it was made with, and is only ever sent by a
+    client with the same URL and credentials, so several clients and processes can share a database.
+
+    :param path: SQLite database file. Defaults to `$XDG_STATE_HOME/mercuto/spool-<hash of the API URL>.sqlite3`.
+    :param batch_size: Maximum number of samples per request to the API. Requests rejected as too large (413) or timing
+        out are re-sent in halves.
+    :param flush_interval: Seconds the flusher waits for more samples when the spool is empty.
+    :param backoff_base: Delay in seconds after the first failed send. Doubles for every further failure.
+    :param backoff_max: Upper bound on the delay between failed sends.
+    :param claim_timeout: Seconds after which samples claimed by another flusher that never finished sending them,
+        such as a process that crashed, are sent again.
+    """
+    path: str = ''
+    batch_size: int = 50_000
+    flush_interval: float = 1.0
+    backoff_base: float = 1.0
+    backoff_max: float = 60.0
+    claim_timeout: float = 300.0
+
+    def __post_init__(self) -> None:
+        if self.batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        if self.claim_timeout <= 0:
+            raise ValueError("claim_timeout must be positive")
+
+
+@dataclass(frozen=True)
+class SpoolStats:
+    """
+    Snapshot of a sample spool.
+
+    Counts cover the samples of the client's URL and credentials.
+
+    :param pending: Samples waiting to be sent.
+    :param lag: Seconds since the oldest pending sample was spooled, 0 when nothing is pending.
+    :param sent: Samples sent by this process.
+    :param failures: Failed sends by this process. Failed samples stay pending.
+    :param rejected: Samples the API refused (an HTTP 4xx that retrying cannot fix). They are kept in the database
+        with the error and never sent again.
+    :param last_error: The most recent failure, if any.
+    """
+    pending: int = 0
+    lag: float = 0.0
+    sent: int = 0
+    failures: int = 0
+    rejected: int = 0
+    last_error: Optional[str] = None
+
+
+def _is_rejected(error: BaseException) -> bool:
+    return isinstance(error, MercutoHTTPException) and 400 <= error.status_code < 500 \
+        and error.status_code not in _TRANSIENT_CLIENT_ERRORS
+
+
+def _merge(bodies: Iterable[bytes]) -> bytes:
+    # Every body is a JSON array of samples.
+    items = [body.strip()[1:-1].strip() for body in bodies]
+    return b'[' + b','.join(item for item in items if item) + b']'
+
+
+class SampleSpool:
+    """
+    Write-ahead log of sample inserts in SQLite, drained to the API by a background thread. Thread safe, and safe to share
+    a database between processes.
+
+    Inserts are sent strictly in the order they were spooled, so samples of a channel arrive in order. A failed send
+    blocks everything behind it until it succeeds. An insert merged with others that the API rejects is re-sent on its own,
+    so only the offending insert is set aside. Rows are claimed before they are sent, so two flushers never send the same
+    rows, and a flusher waits while the oldest rows are being sent by another.
+
+    :param send: Sends one request: (kind, project, JSON body), where kind is 'secondary' or 'metric'.
+    :param url: API URL of the client, stored with every insert.
+    :param credentials: Returns the key of the client's current credentials, '' when not logged in.
+        Only a hash of it is stored.
+    """
+
+    def __init__(self, config: SpoolConfig, send: Callable[[str, str, bytes], None], url: str,
+                 credentials: Callable[[], str]) -> None:
+        self.config = config
+        self.path = config.path or default_path(url)
+        self._send = send
+        self._url = url
+        self._credentials = credentials
+        # Identifies this spool's claims among the flushers sharing the database.
+        self._claimant = uuid.uuid4().hex
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("""
+        CREATE TABLE IF NOT EXISTS spool (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            url TEXT NOT NULL,
+            credentials TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            project TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            body BLOB NOT NULL,
+            spooled_at REAL NOT NULL,
+            error TEXT,
+            claimed_by TEXT,
+            claimed_at REAL
+        )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS spool_owner ON spool (url, credentials, id)")
+        self._db.commit()
+        self._db_lock = threading.Lock()
+        # Held while a batch is claimed and sent, so flush() and the flusher of this spool take turns.
+        self._send_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Set under _db_lock. A flusher still sending when the spool is closed closes the database as it exits.
+        self._closed = False
+        self._exited = False
+        self._isolate = False
+        self._sent = 0
+        self._failures = 0
+        self._last_error: Optional[str] = None
+
+    def _owner(self) -> tuple[str, str]:
+        return self._url, hashlib.sha256(self._credentials().encode()).hexdigest()
+
+    def append(self, kind: str, project: str, batches: Iterable[tuple[bytes, int]]) -> None:
+        """
+        Durably store (JSON body, sample count) batches for `project` and wake the flusher.
+        """
+        now = time.time()
+        url, credentials = self._owner()
+        with self._db_lock:
+            with self._db:
+                self._db.executemany(
+                    "INSERT INTO spool (url, credentials, kind, project, count, body, spooled_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(url, credentials, kind, project, count, body, now) for body, count in batches])
+        self.start()
+        self._wake.set()
+
+    def start(self) -> None:
+        """
+        Start the background flusher, if not running. Inserting samples starts it, call this to send samples
+        left over from an earlier run without inserting new ones.
+        """
+        with self._db_lock:
+            if self._thread is not None or self._stopped.is_set():
+                return
+            self._thread = threading.Thread(target=self._run, name='mercuto-spool', daemon=True)
+            self._thread.start()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Send pending samples from the calling thread until the spool is empty.
+        Errors are raised rather than retried. Waits while another flusher is sending the oldest samples.
+
+        :return: False if `timeout` seconds passed before the spool was empty.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if not self._send_next():
+                if not self.stats().pending:
+                    return True
+                # Another flusher holds the oldest samples.
+                time.sleep(0.05)
+            if deadline is not None and time.monotonic() >= deadline:
+                return not self.stats().pending
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop the flusher, waiting up to `timeout` seconds for a send in progress. Pending samples stay in the database.
+        If the send is still running after `timeout`, the flusher closes the database once it finishes.
+        """
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        with self._db_lock:
+            self._closed = True
+            if self._thread is not None and not self._exited:
+                return
+        with self._send_lock, self._db_lock:
+            self._db.close()
+
+    def stats(self) -> SpoolStats:
+        owner = self._owner()
+        with self._db_lock:
+            pending, oldest = self._db.execute(
+                "SELECT COALESCE(SUM(count), 0), MIN(spooled_at) FROM spool WHERE url = ? AND credentials = ? AND error IS NULL",
+                owner).fetchone()
+            rejected, = self._db.execute(
+                "SELECT COALESCE(SUM(count), 0) FROM spool WHERE url = ? AND credentials = ? AND error IS NOT NULL", owner).fetchone()
+            return SpoolStats(pending=pending, lag=max(0.0, time.time() - oldest) if oldest is not None else 0.0,
+                              sent=self._sent, failures=self._failures, rejected=rejected, last_error=self._last_error)
+
+    def _claim_batch(self) -> tuple[list[int], str, str, list[bytes], int]:
+        """
+        Claim the oldest pending rows that can be merged into one request.
+        Nothing is claimed while the oldest row is claimed by another flusher, to keep the order.
+        """
+        owner = self._owner()
+        now = time.time()
+        with self._db_lock:
+            with self._db:
+                # Take the write lock before reading, so no other process claims the same rows in between.
+                self._db.execute("BEGIN IMMEDIATE")
+                rows = self._db.execute(
+                    "SELECT id, kind, project, count, body, claimed_by, claimed_at FROM spool "
+                    "WHERE url = ? AND credentials = ? AND error IS NULL ORDER BY id LIMIT ?",
+                    (*owner, 1 if self._isolate else 1000)).fetchall()
+                ids: list[int] = []
+                bodies: list[bytes] = []
+                total = 0
+                for row_id, kind, project, count, body, claimed_by, claimed_at in rows:
+                    if claimed_by is not None and claimed_by != self._claimant and claimed_at > now - self.config.claim_timeout:
+                        break
+                    if ids and ((kind, project) != (rows[0][1], rows[0][2]) or total + count > self.config.batch_size):
+                        break
+                    ids.append(row_id)
+                    bodies.append(body)
+                    total += count
+                if not ids:
+                    return [], '', '', [], 0
+                self._db.executemany("UPDATE spool SET claimed_by = ?, claimed_at = ? WHERE id = ?",
+                                     [(self._claimant, now, row_id) for row_id in ids])
+        return ids, rows[0][1], rows[0][2], bodies, total
+
+    def _send_next(self) -> bool:
+        """
+        Send the oldest pending batch. Returns False if nothing could be claimed.
+        """
+        with self._send_lock:
+            if self._closed:
+                return False
+            ids, kind, project, bodies, count = self._claim_batch()
+            if not ids:
+                return False
+            try:
+                self._send(kind, project, _merge(bodies))
+            except Exception as e:
+                self._last_error = str(e)
+                rejected = _is_rejected(e) and len(ids) == 1
+                with self._db_lock:
+                    with self._db:
+                        self._db.executemany("UPDATE spool SET claimed_by = NULL, claimed_at = NULL, error = ? WHERE id = ?",
+                                             [(str(e) if rejected else None, row_id) for row_id in ids])
+                if not _is_rejected(e):
+                    self._failures += 1
+                    raise
+                if len(ids) > 1:
+                    # Find the offending insert by sending them one at a time.
+                    self._isolate = True
+                    return True
+                logger.error("Spooled %d %s samples for project %s were rejected: %s", count, kind, project, e)
+                self._isolate = False
+                return True
+            with self._db_lock:
+                with self._db:
+                    self._db.executemany("DELETE FROM spool WHERE id = ?", [(row_id,) for row_id in ids])
+            self._sent += count
+            self._isolate = False
+            return True
+
+    def _run(self) -> None:
+        mark_worker_thread()
+        try:
+            self._flush_until_stopped()
+        finally:
+            with self._send_lock, self._db_lock:
+                self._exited = True
+                if self._closed:
+                    self._db.close()
+
+    def _flush_until_stopped(self) -> None:
+        failures = 0
+        while not self._stopped.is_set():
+            try:
+                sent = self._send_next()
+            except Exception as e:
+                failures += 1
+                delay = min(self.config.backoff_max, self.config.backoff_base * 2 ** (failures - 1))
+                logger.warning("Sending spooled samples failed (attempt %d), retrying in %.1fs: %s", failures, delay, e)
+                self._stopped.wait(delay)
+                continue
+            failures = 0
+            if not sent:
+                self._wake.wait(self.config.flush_interval)
+                self._wake.clear()